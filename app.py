@@ -1,20 +1,22 @@
 import streamlit as st
+import atexit
 import cv2
-import tempfile
-import os
 from pathlib import Path
-import mediapipe as mp
 import logging
+import time
 from datetime import datetime
-from moviepy.editor import ImageSequenceClip
+import numpy as np
 
 # Importações do projeto
-from src.pose_estimation import PoseExtractor
 from src.comparador_movimento import ComparadorMovimento
+from src.comparison_params import ComparisonParams, DistanceMetric
 from src.pose_storage import PoseStorage
+from src.pose_track import PoseTrack
+from src.preview import create_preview_video as render_preview_video, track_annotator
 # from src.comparison_params import ComparisonParams  # Não usado na implementação atual
 from src.gerador_relatorio import ReportGenerator
-from src.comparison_results import DanceComparison
+from src.job_queue import JobQueue, JOB_DONE, JOB_FAILED, JOB_QUEUED, JOB_RUNNING
+from src.temp_files import TempFileRegistry
 
 # Configuração da página
 st.set_page_config(
@@ -27,15 +29,14 @@ st.set_page_config(
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Inicialização do MediaPipe Pose para preview
-mp_pose = mp.solutions.pose
-mp_drawing = mp.solutions.drawing_utils
-pose = mp_pose.Pose(
-    static_image_mode=False,
-    model_complexity=2,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
-)
+# Banco com o estado das tarefas de extração (no diretório de armazenamento)
+JOBS_DB_NAME = "jobs.sqlite"
+
+# Vídeos extraídos em paralelo, cada um em um processo worker da fila de tarefas
+EXTRACTION_WORKERS = 2
+
+# Intervalo entre as atualizações da página enquanto há extrações em andamento (segundos)
+JOB_POLL_SECONDS = 1.0
 
 # Inicialização dos componentes do sistema
 @st.cache_resource
@@ -44,164 +45,118 @@ def init_system_components():
     storage_dir = Path("data/pose")
     storage_dir.mkdir(parents=True, exist_ok=True)
 
-    pose_storage = PoseStorage(storage_dir)
-    pose_extractor = PoseExtractor()
-    comparador = ComparadorMovimento()
-
-    return pose_storage, pose_extractor, comparador
-
-def process_video_frame_preview(frame):
-    """Processa um frame do vídeo para preview e retorna o frame com o esqueleto desenhado."""
-    try:
-        # Converte BGR para RGB
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-        # Processa o frame
-        results = pose.process(frame_rgb)
-
-        # Desenha o esqueleto se detectado
-        if results.pose_landmarks:
-            mp_drawing.draw_landmarks(
-                frame_rgb,
-                results.pose_landmarks,
-                mp_pose.POSE_CONNECTIONS
-            )
-
-        return frame_rgb
-    except Exception as e:
-        logger.error(f"Erro ao processar frame para preview: {str(e)}")
-        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-def create_preview_video(video_path, progress_bar, max_frames=150):
-    """Cria um vídeo de preview com esqueleto desenhado (limitado para performance)."""
-    cap = cv2.VideoCapture(video_path)
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    fps = int(cap.get(cv2.CAP_PROP_FPS))
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-
-    # Limita o número de frames para preview
-    frames_to_process = min(total_frames, max_frames)
-    frame_step = max(1, total_frames // frames_to_process)
+    # O índice de similaridade de poses é atualizado a cada vídeo extraído
+    pose_storage = PoseStorage(storage_dir, pose_index=True)
+    # A extração de poses roda nos processos da fila de tarefas (init_job_queue):
+    # o processo do servidor não carrega o MediaPipe
+    comparador = ComparadorMovimento(comparison_params=ComparisonParams(metric=DistanceMetric.DTW))
 
-    frames = []
-    frame_count = 0
+    return pose_storage, comparador
 
-    for i in range(0, total_frames, frame_step):
-        if frame_count >= max_frames:
-            break
-
-        cap.set(cv2.CAP_PROP_POS_FRAMES, i)
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        processed_frame = process_video_frame_preview(frame)
-        processed_frame_bgr = cv2.cvtColor(processed_frame, cv2.COLOR_RGB2BGR)
-        processed_frame_bgr = cv2.resize(processed_frame_bgr, (width, height))
-        # MoviePy espera RGB
-        frames.append(cv2.cvtColor(processed_frame_bgr, cv2.COLOR_BGR2RGB))
-
-        frame_count += 1
-        progress_bar.progress(frame_count / frames_to_process)
-
-    cap.release()
-
-    if not frames:
-        return None
+@st.cache_resource
+def init_job_queue():
+    """Inicializa a fila de tarefas em segundo plano, compartilhada por todas as sessões."""
+    pose_storage, _ = init_system_components()
+    # Pool de processos: uma falha do MediaPipe não derruba o servidor, e a
+    # extração não disputa o GIL com os scripts das sessões. A fila usa o mesmo
+    # PoseStorage do app: cada upload tem o hash calculado uma única vez
+    return JobQueue(pose_storage.storage_dir / JOBS_DB_NAME, storage=pose_storage,
+                    workers=EXTRACTION_WORKERS)
 
-    # Salva o vídeo usando MoviePy (codec H264)
-    output_path = tempfile.NamedTemporaryFile(delete=False, suffix='.mp4').name
-    clip = ImageSequenceClip(frames, fps=fps)
-    clip.write_videofile(output_path, codec='libx264', audio=False, verbose=False, logger=None)
-    return output_path
+@st.cache_resource
+def init_temp_files():
+    """Registro dos arquivos temporários dos uploads, compartilhado por todas as sessões."""
+    temp_files = TempFileRegistry()
+    # Os arquivos que restarem são removidos ao encerrar o servidor
+    atexit.register(temp_files.cleanup)
+    return temp_files
+
+def create_preview_video(video_path, video_data, comparison_params, progress_bar, max_frames=150):
+    """Cria um vídeo de preview com o esqueleto dos landmarks já extraídos (sem nova inferência)."""
+    track = PoseTrack.from_pose_data(video_data)
+    return render_preview_video(
+        video_path,
+        max_frames=max_frames,
+        annotate=track_annotator(track, normalized=comparison_params.normalize),
+        progress_callback=progress_bar.progress
+    )
+
+def save_uploaded_video(uploaded_file, slot):
+    """Grava o vídeo enviado em um arquivo temporário uma única vez (não a cada rerun)."""
+    temp_files = init_temp_files()
+    saved = st.session_state[f"video{slot}_upload"]
+    if saved is not None and saved[0] == uploaded_file.file_id:
+        if temp_files.touch(saved[1]):
+            return saved[1]
+        # O arquivo foi removido por falta de uso: grava de novo o mesmo upload
+    else:
+        # Um novo arquivo no campo descarta o estado do anterior
+        discard_uploaded_video(slot)
+
+    video_path = temp_files.create(uploaded_file.getvalue(),
+                                   suffix=f".{uploaded_file.name.split('.')[-1]}")
+    st.session_state[f"video{slot}_upload"] = (uploaded_file.file_id, video_path)
+    return video_path
+
+def discard_uploaded_video(slot):
+    """
+    Libera o arquivo temporário do vídeo de um campo e descarta o estado associado.
 
-def fix_comparison_results(results):
+    O arquivo é removido pela limpeza periódica (ver main) quando nenhuma
+    extração em andamento o estiver lendo.
+    """
+    saved = st.session_state[f"video{slot}_upload"]
+    if saved is not None:
+        init_temp_files().release(saved[1])
+    st.session_state[f"video{slot}_upload"] = None
+    for key in ("processed", "preview", "job"):
+        st.session_state[f"video{slot}_{key}"] = None
+    st.session_state.landmark_comparison = None
+    st.session_state.comparison_results = None
+    st.session_state.comparison_settings = None
+
+def track_extraction(slot, video_path, job_queue, pose_storage):
     """
-    Corrige os resultados de comparação, convertendo dicionários em objetos DanceComparison.
+    Acompanha a extração de poses de um vídeo, que roda em segundo plano na fila de tarefas.
 
-    Args:
-        results: ComparisonResults que pode ter frame_comparisons como dicionários
+    A tarefa é identificada pelo hash do vídeo: depois de recarregar a página,
+    enviar o mesmo vídeo retoma o acompanhamento da extração em andamento.
 
     Returns:
-        ComparisonResults com frame_comparisons corrigidos
+        bool: True enquanto a extração estiver na fila ou em execução
     """
-    if not results or not results.frame_comparisons:
-        return results
-
-    try:
-        # Verifica se os frame_comparisons são dicionários e os converte para objetos
-        fixed_frame_comparisons = []
-
-        for fc in results.frame_comparisons:
-            if isinstance(fc, dict):
-                # Converte dicionário para objeto DanceComparison
-                dance_comparison = DanceComparison(
-                    frame_number=fc.get('frame_number', 0),
-                    timestamp=fc.get('timestamp', 0.0),
-                    similarity_score=fc.get('similarity_score', 0.0),
-                    landmark_similarities=fc.get('landmark_similarities', {}),
-                    alignment_metrics=fc.get('alignment_metrics', {})
-                )
-                fixed_frame_comparisons.append(dance_comparison)
-            else:
-                # Já é um objeto, mantém como está
-                fixed_frame_comparisons.append(fc)
-
-        # Atualiza os frame_comparisons
-        results.frame_comparisons = fixed_frame_comparisons
-        logger.info(f"Corrigidos {len(fixed_frame_comparisons)} frame comparisons")
-
-    except Exception as e:
-        logger.error(f"Erro ao corrigir frame_comparisons: {str(e)}")
-
-    return results
-
-def process_video_with_pose_extractor(video_path, pose_extractor, pose_storage):
-    """Processa um vídeo usando o PoseExtractor do projeto."""
-    try:
-        # Verifica se já existe dados processados
-        video_data = pose_storage.load_pose_data(video_path)
-        if video_data is not None:
-            logger.info(f"Dados de pose já existem para: {video_path}")
-            return video_data
-
-        # Processa o vídeo
-        logger.info(f"Processando vídeo: {video_path}")
-        success = pose_extractor.process_video(video_path)
-        if not success:
-            logger.error(f"Falha ao processar vídeo: {video_path}")
-            return None
-
-        # Obtém os landmarks processados
-        landmarks = pose_extractor.get_landmarks()
-        if not landmarks:
-            logger.error(f"Nenhum landmark extraído do vídeo: {video_path}")
-            return None
-
-        # Obtém as informações do vídeo
-        fps = pose_extractor.get_fps()
-        resolution = pose_extractor.get_resolution()
-        total_frames = pose_extractor.get_total_frames()
-
-        # Salva os dados de pose
-        success = pose_storage.save_pose_data(
-            video_path=video_path,
-            fps=fps,
-            resolution=resolution,
-            total_frames=total_frames,
-            frame_landmarks=landmarks
-        )
-
-        if not success:
-            logger.error(f"Falha ao salvar dados de pose: {video_path}")
-            return None
-
-        return pose_storage.load_pose_data(video_path)
-
-    except Exception as e:
-        logger.error(f"Erro ao processar vídeo: {str(e)}")
-        return None
+    job_id = st.session_state[f"video{slot}_job"]
+    job = job_queue.get(job_id) if job_id is not None else None
+    if job is None:
+        job = job_queue.submit_extraction(video_path)
+        st.session_state[f"video{slot}_job"] = job.job_id
+
+    if job.is_active:
+        if job.status == JOB_QUEUED:
+            st.progress(0.0, text=f"Vídeo {slot} na fila de processamento...")
+        else:
+            st.progress(job.progress, text=f"Processando Vídeo {slot}: "
+                                           f"{job.frames_done}/{job.total_frames} frames")
+        return True
+
+    if job.status == JOB_FAILED:
+        st.error(f"Falha ao processar o Vídeo {slot}: {job.error}")
+    elif st.session_state[f"video{slot}_processed"] is None:
+        st.session_state[f"video{slot}_processed"] = pose_storage.load_pose_data(video_path)
+    return False
+
+def display_recent_jobs(job_queue):
+    """Lista as tarefas recentes na barra lateral (todas as sessões)."""
+    jobs = job_queue.recent_jobs(limit=5)
+    if not jobs:
+        return
+    status_labels = {JOB_QUEUED: "⏳ na fila", JOB_RUNNING: "⚙️ em execução",
+                     JOB_DONE: "✅ concluída", JOB_FAILED: "❌ falhou"}
+    st.sidebar.subheader("Tarefas de Extração")
+    for job in jobs:
+        progress = f" ({job.progress:.0%})" if job.status == JOB_RUNNING else ""
+        st.sidebar.caption(f"#{job.job_id} {Path(job.video_path).name}: "
+                           f"{status_labels.get(job.status, job.status)}{progress}")
 
 def display_comparison_results(results):
     """Exibe os resultados da comparação de forma organizada."""
@@ -234,34 +189,10 @@ def display_comparison_results(results):
     if results.frame_comparisons:
         st.subheader("📈 Similaridade por Frame")
 
-        # Debug: mostra informações sobre os frame_comparisons
-        logger.info(f"Processando {len(results.frame_comparisons)} frame comparisons")
-        if results.frame_comparisons:
-            first_fc = results.frame_comparisons[0]
-            logger.info(f"Tipo do primeiro frame comparison: {type(first_fc)}")
-            if isinstance(first_fc, dict):
-                logger.info(f"Chaves do dicionário: {list(first_fc.keys())}")
-
         try:
-            # Extrai dados dos frame comparisons (suporta tanto objetos quanto dicionários)
-            frame_numbers = []
-            similarity_scores = []
-
-            for i, fc in enumerate(results.frame_comparisons):
-                if hasattr(fc, 'frame_number'):
-                    # É um objeto DanceComparison
-                    frame_numbers.append(fc.frame_number)
-                    similarity_scores.append(fc.similarity_score)
-                elif isinstance(fc, dict):
-                    # É um dicionário
-                    frame_numbers.append(fc.get('frame_number', i))  # usa índice como fallback
-                    similarity_scores.append(fc.get('similarity_score', 0.0))
-                else:
-                    logger.warning(f"Formato de frame comparison não reconhecido: {type(fc)}")
-                    # Tenta usar como fallback
-                    frame_numbers.append(i)
-                    similarity_scores.append(0.0)
-                    continue
+            # As comparações por frame ficam em colunas: o gráfico usa os arrays diretamente
+            frame_numbers = results.frame_comparisons.frame_numbers.tolist()
+            similarity_scores = results.frame_comparisons.scores.tolist()
 
             if frame_numbers and similarity_scores:
                 import matplotlib.pyplot as plt
@@ -348,7 +279,8 @@ def main():
     st.markdown("Compare dois vídeos de dança e analise a similaridade dos movimentos usando detecção de pose avançada.")
 
     # Inicializa os componentes do sistema
-    pose_storage, pose_extractor, comparador = init_system_components()
+    pose_storage, comparador = init_system_components()
+    job_queue = init_job_queue()
 
     # Inicializa variáveis de estado
     if 'video1_processed' not in st.session_state:
@@ -359,8 +291,16 @@ def main():
         st.session_state.video1_preview = None
     if 'video2_preview' not in st.session_state:
         st.session_state.video2_preview = None
+    for slot in (1, 2):
+        for key in ("upload", "job"):
+            if f'video{slot}_{key}' not in st.session_state:
+                st.session_state[f'video{slot}_{key}'] = None
     if 'comparison_results' not in st.session_state:
         st.session_state.comparison_results = None
+    if 'landmark_comparison' not in st.session_state:
+        st.session_state.landmark_comparison = None
+    if 'comparison_settings' not in st.session_state:
+        st.session_state.comparison_settings = None
 
     # Interface de upload de vídeos
     st.header("📹 Upload dos Vídeos")
@@ -388,32 +328,44 @@ def main():
     # Processamento e preview dos vídeos
     video1_path = None
     video2_path = None
+    extracting = False
+
+    for slot, uploaded_file in ((1, uploaded_file1), (2, uploaded_file2)):
+        # Um vídeo removido do campo libera o arquivo temporário
+        if uploaded_file is None and st.session_state[f"video{slot}_upload"] is not None:
+            discard_uploaded_video(slot)
 
     if uploaded_file1 is not None:
         # Salva o primeiro vídeo temporariamente
-        tfile1 = tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file1.name.split('.')[-1]}")
-        tfile1.write(uploaded_file1.read())
-        tfile1.close()
-        video1_path = tfile1.name
+        video1_path = save_uploaded_video(uploaded_file1, 1)
+
+        # Extrai as poses uma única vez, em segundo plano; o preview desenha os landmarks salvos
+        if st.session_state.video1_processed is None:
+            extracting |= track_extraction(1, video1_path, job_queue, pose_storage)
 
         # Cria preview se ainda não foi criado
-        if st.session_state.video1_preview is None:
+        if st.session_state.video1_preview is None and st.session_state.video1_processed is not None:
             with st.spinner('Criando preview do Vídeo 1...'):
                 progress_bar1 = st.progress(0)
-                st.session_state.video1_preview = create_preview_video(video1_path, progress_bar1)
+                st.session_state.video1_preview = create_preview_video(
+                    video1_path, st.session_state.video1_processed, comparador.comparison_params,
+                    progress_bar1)
 
     if uploaded_file2 is not None:
         # Salva o segundo vídeo temporariamente
-        tfile2 = tempfile.NamedTemporaryFile(delete=False, suffix=f".{uploaded_file2.name.split('.')[-1]}")
-        tfile2.write(uploaded_file2.read())
-        tfile2.close()
-        video2_path = tfile2.name
+        video2_path = save_uploaded_video(uploaded_file2, 2)
+
+        # Extrai as poses uma única vez, em segundo plano; o preview desenha os landmarks salvos
+        if st.session_state.video2_processed is None:
+            extracting |= track_extraction(2, video2_path, job_queue, pose_storage)
 
         # Cria preview se ainda não foi criado
-        if st.session_state.video2_preview is None:
+        if st.session_state.video2_preview is None and st.session_state.video2_processed is not None:
             with st.spinner('Criando preview do Vídeo 2...'):
                 progress_bar2 = st.progress(0)
-                st.session_state.video2_preview = create_preview_video(video2_path, progress_bar2)
+                st.session_state.video2_preview = create_preview_video(
+                    video2_path, st.session_state.video2_processed, comparador.comparison_params,
+                    progress_bar2)
 
     # Exibe os previews dos vídeos
     if st.session_state.video1_preview or st.session_state.video2_preview:
@@ -481,83 +433,95 @@ def main():
             with col4:
                 ankle_weight = st.slider("Tornozelos", 0.1, 1.0, 0.6, 0.1)
 
+            tolerance = st.slider("Tolerância", 0.0, 1.0, comparador.comparison_params.tolerance, 0.05,
+                                  help="Similaridade mínima de um frame = 1 - tolerância")
+
+        # Configura os pesos dos landmarks
+        landmark_weights = {
+            "shoulder": shoulder_weight,
+            "hip": hip_weight,
+            "knee": knee_weight,
+            "ankle": ankle_weight
+        }
+
         # Botão de comparação
-        if st.button("🚀 Iniciar Comparação", type="primary"):
-            with st.spinner('Processando vídeos e realizando comparação...'):
+        if extracting:
+            st.caption("A comparação fica disponível quando a extração das poses terminar.")
+        if st.button("🚀 Iniciar Comparação", type="primary", disabled=extracting):
+            with st.spinner('Realizando comparação...'):
                 try:
-                    # Processa os vídeos usando o PoseExtractor
-                    st.info("Processando Vídeo 1...")
-                    video1_data = process_video_with_pose_extractor(video1_path, pose_extractor, pose_storage)
-
+                    # Usa os dados extraídos em segundo plano
+                    video1_data = st.session_state.video1_processed
                     if video1_data is None:
                         st.error("Falha ao processar o Vídeo 1")
                         return
 
-                    st.info("Processando Vídeo 2...")
-                    video2_data = process_video_with_pose_extractor(video2_path, pose_extractor, pose_storage)
-
+                    video2_data = st.session_state.video2_processed
                     if video2_data is None:
                         st.error("Falha ao processar o Vídeo 2")
                         return
 
-                    # Verifica se já existe uma comparação
-                    results = pose_storage.load_comparison_results(video1_path, video2_path)
+                    # Verifica se já existe uma comparação com os mesmos vídeos e parâmetros.
+                    # Os pesos e a tolerância não fazem parte da chave: mudá-los só repondera os arrays
+                    cache_params = comparador.landmark_cache_params()
+                    comparison = pose_storage.load_landmark_comparison(
+                        video1_path, video2_path,
+                        params=cache_params,
+                        comparator_version=comparador.version
+                    )
 
-                    # Corrige os resultados se necessário (converte dicionários para objetos)
-                    if results is not None:
-                        results = fix_comparison_results(results)
+                    if comparison is not None:
                         st.info("Comparação existente carregada do cache.")
-
-                    if results is None:
+                    else:
                         st.info("Realizando comparação...")
 
-                        # Obtém os landmarks no formato do comparador
-                        video1_landmarks = pose_storage.get_pose_data(video1_path)
-                        video2_landmarks = pose_storage.get_pose_data(video2_path)
-
-                        if video1_landmarks is None or video2_landmarks is None:
-                            st.error("Falha ao obter landmarks dos vídeos")
-                            return
-
-                        # Configura os pesos dos landmarks
-                        landmark_weights = {
-                            "shoulder": shoulder_weight,
-                            "hip": hip_weight,
-                            "knee": knee_weight,
-                            "ankle": ankle_weight
-                        }
-
-                        # Compara os vídeos
-                        results = comparador.compare_videos(
-                            video1_landmarks=video1_landmarks,
-                            video2_landmarks=video2_landmarks,
-                            video1_fps=video1_data.fps,
-                            video2_fps=video2_data.fps,
+                        # Monta os tracks densos (uma linha por frame do vídeo)
+                        track1 = PoseTrack.from_pose_data(video1_data, dtype=np.float64).to_dense()
+                        track2 = PoseTrack.from_pose_data(video2_data, dtype=np.float64).to_dense()
+
+                        # Alinha os vídeos e calcula as similaridades por landmark
+                        comparison = comparador.prepare_tracks(
+                            track1, track2,
                             video1_resolution=video1_data.resolution,
-                            video2_resolution=video2_data.resolution,
-                            video1_landmark_weights=landmark_weights,
-                            video2_landmark_weights=landmark_weights
+                            video2_resolution=video2_data.resolution
                         )
 
-                        # Atualiza os caminhos dos vídeos
-                        results.video1_path = video1_path
-                        results.video2_path = video2_path
-
-                        # Salva os resultados
-                        pose_storage.save_comparison_results(
+                        # Salva os arrays da comparação
+                        pose_storage.save_landmark_comparison(
                             video1_path=video1_path,
                             video2_path=video2_path,
-                            results=results
+                            comparison=comparison,
+                            params=cache_params,
+                            comparator_version=comparador.version
                         )
 
-                    # Armazena os resultados no estado da sessão
-                    st.session_state.comparison_results = results
+                    stats = pose_storage.results_cache.stats()
+                    st.caption(f"Cache de comparações: {stats['hits']} acertos, {stats['misses']} falhas")
+
+                    # Armazena os arrays no estado da sessão; os resultados são pontuados abaixo
+                    st.session_state.landmark_comparison = comparison
+                    st.session_state.comparison_settings = None
                     st.success("Comparação concluída com sucesso!")
 
                 except Exception as e:
                     st.error(f"Erro durante a comparação: {str(e)}")
                     logger.error(f"Erro durante a comparação: {str(e)}")
 
+        # Pontua a comparação com os pesos e a tolerância atuais (só refaz a redução ponderada)
+        settings = (landmark_weights, tolerance)
+        if (st.session_state.landmark_comparison is not None
+                and st.session_state.comparison_settings != settings):
+            results = comparador.rescore(
+                st.session_state.landmark_comparison,
+                video1_landmark_weights=landmark_weights,
+                video2_landmark_weights=landmark_weights,
+                tolerance=tolerance
+            )
+            results.video1_path = video1_path
+            results.video2_path = video2_path
+            st.session_state.comparison_results = results
+            st.session_state.comparison_settings = settings
+
     # Exibe os resultados da comparação
     if st.session_state.comparison_results:
         st.header("📊 Resultados da Comparação")
@@ -585,18 +549,14 @@ def main():
             except Exception as e:
                 st.error(f"Erro ao gerar relatório: {str(e)}")
 
-    # Limpeza de arquivos temporários
-    if video1_path:
-        try:
-            os.unlink(video1_path)
-        except:
-            pass
+    # Remove os uploads liberados ou sem uso que nenhuma extração está lendo
+    init_temp_files().sweep(in_use=job_queue.has_active_job)
 
-    if video2_path:
-        try:
-            os.unlink(video2_path)
-        except:
-            pass
+    # Atualiza a página até que as extrações em segundo plano terminem
+    display_recent_jobs(job_queue)
+    if extracting:
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,5 @@
+"""
+Benchmarks de desempenho do MotionCompare.
+
+Executados com `python -m benchmarks.run` (ver benchmarks/run.py).
+"""
@@ -0,0 +1,190 @@
+"""
+Casos de benchmark: cada caso prepara os dados fora da medição e retorna a operação medida.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from src.comparador_movimento import ComparadorMovimento
+from src.comparison_params import ComparisonParams, DistanceMetric
+from src.comparison_results import ComparisonResults
+from src.gerador_relatorio import ReportGenerator
+from src.pose_storage import PoseStorage
+from src.report.exporters import CSVExporter, JSONExporter
+from src.results_cache import ResultsCache
+
+from .synthetic import (RESOLUTION, iter_track_frames, placeholder_video, render_stick_figure_video,
+                        synthetic_track)
+
+# Limite de frames dos casos que montam um objeto Python por frame ou landmark
+# (listas de dicionários, JSON, relatórios): acima disso o custo é dominado pela memória
+OBJECT_FRAME_LIMIT = 100_000
+
+# Prepara o caso para um tamanho (frames, diretório de trabalho) e retorna a operação medida
+CaseSetup = Callable[[int, Path], Callable[[], None]]
+
+@dataclass
+class BenchmarkCase:
+    """Operação medida pelos benchmarks."""
+    name: str
+    setup: CaseSetup
+    kind: str = "track"  # "track" (tamanho em frames de pose) ou "video" (frames de vídeo)
+    max_frames: Optional[int] = None  # Tamanhos maiores são pulados
+    description: str = ""
+
+def _save_stream(storage: PoseStorage, video: str, track) -> None:
+    if not storage.save_pose_stream(video, track.fps, RESOLUTION, len(track), iter_track_frames(track)):
+        raise RuntimeError(f"Falha ao salvar dados de pose de {video}")
+
+def _storage_save(storage_format: str) -> CaseSetup:
+    def setup(frames: int, workdir: Path) -> Callable[[], None]:
+        track = synthetic_track(frames)
+        video = placeholder_video(workdir / "video.mp4", f"save-{storage_format}-{frames}")
+        storage = PoseStorage(str(workdir / "pose"), storage_format=storage_format)
+        return lambda: _save_stream(storage, video, track)
+    return setup
+
+def _storage_load_json(frames: int, workdir: Path) -> Callable[[], None]:
+    video = placeholder_video(workdir / "video.mp4", f"load-json-{frames}")
+    storage = PoseStorage(str(workdir / "pose"), storage_format="json")
+    _save_stream(storage, video, synthetic_track(frames))
+
+    def run() -> None:
+        storage.clear_cache()
+        if storage.load_pose_data(video) is None:
+            raise RuntimeError("Falha ao carregar dados de pose")
+    return run
+
+def _storage_load_npy(frames: int, workdir: Path) -> Callable[[], None]:
+    video = placeholder_video(workdir / "video.mp4", f"load-npy-{frames}")
+    storage = PoseStorage(str(workdir / "pose"), storage_format="npy")
+    _save_stream(storage, video, synthetic_track(frames))
+
+    def run() -> None:
+        track = storage.load_pose_track(video, mmap=False)
+        if track is None:
+            raise RuntimeError("Falha ao carregar track de pose")
+    return run
+
+def _compare_videos(frames: int, workdir: Path) -> Callable[[], None]:
+    landmarks1 = synthetic_track(frames).to_landmarks()
+    landmarks2 = synthetic_track(frames, phase=0.3).to_landmarks()
+    comparador = ComparadorMovimento()
+    return lambda: comparador.compare_videos(landmarks1, landmarks2, 30.0, 30.0, RESOLUTION, RESOLUTION)
+
+def _compare_tracks(metric: DistanceMetric) -> CaseSetup:
+    def setup(frames: int, workdir: Path) -> Callable[[], None]:
+        track1 = synthetic_track(frames, dtype=np.float64)
+        track2 = synthetic_track(frames, phase=0.3, dtype=np.float64)
+        comparador = ComparadorMovimento(comparison_params=ComparisonParams(metric=metric))
+        return lambda: comparador.compare_tracks(track1, track2, RESOLUTION, RESOLUTION)
+    return setup
+
+def synthetic_results(frames: int) -> ComparisonResults:
+    """
+    Resultados de uma comparação entre dois tracks sintéticos.
+
+    Args:
+        frames: Número de frames de cada track
+
+    Returns:
+        ComparisonResults com um frame comparado por frame do track
+    """
+    comparador = ComparadorMovimento()
+    return comparador.compare_tracks(synthetic_track(frames, dtype=np.float64),
+                                     synthetic_track(frames, phase=0.3, dtype=np.float64),
+                                     RESOLUTION, RESOLUTION)
+
+def _cache_set(frames: int, workdir: Path) -> Callable[[], None]:
+    cache = ResultsCache(str(workdir / "cache"), max_age_hours=None)
+    results = synthetic_results(frames)
+
+    def run() -> None:
+        if not cache.set("benchmark", results):
+            raise RuntimeError("Falha ao gravar resultados no cache")
+    return run
+
+def _cache_get(frames: int, workdir: Path) -> Callable[[], None]:
+    # Sem cache em memória: cada leitura decodifica o arquivo
+    cache = ResultsCache(str(workdir / "cache"), max_age_hours=None)
+    cache.set("benchmark", synthetic_results(frames))
+
+    def run() -> None:
+        if cache.get("benchmark") is None:
+            raise RuntimeError("Falha ao ler resultados do cache")
+    return run
+
+def _report_generate(frames: int, workdir: Path) -> Callable[[], None]:
+    results = synthetic_results(frames)
+    return lambda: ReportGenerator(results).generate()
+
+def export_data(results: ComparisonResults) -> Dict:
+    """
+    Dados de exportação de uma comparação: uma linha por frame comparado.
+
+    Args:
+        results: Resultados da comparação
+
+    Returns:
+        Dicionário com "results" (linhas) e "metadata", no formato dos exportadores
+    """
+    table = results.frame_comparisons
+    rows = [
+        {"frame": int(frame), "timestamp": float(timestamp), "score": float(score)}
+        for frame, timestamp, score in zip(table.frame_numbers, table.timestamps, table.scores)
+    ]
+    return {
+        "results": rows,
+        "metadata": {"global_score": float(results.global_score), "frames": len(rows)}
+    }
+
+def _export(exporter_cls, suffix: str) -> CaseSetup:
+    def setup(frames: int, workdir: Path) -> Callable[[], None]:
+        data = export_data(synthetic_results(frames))
+        output_path = str(workdir / f"export{suffix}")
+        # A validação dos dados faz parte da exportação (ocorre no construtor)
+        return lambda: exporter_cls(data).export(output_path)
+    return setup
+
+def _process_video(frames: int, workdir: Path) -> Callable[[], None]:
+    # Importado aqui para que os demais casos não precisem carregar o MediaPipe
+    from src.pose_estimation import PoseExtractor
+
+    video = render_stick_figure_video(workdir / "stick_figure.mp4", frames)
+    extractor = PoseExtractor()
+
+    def run() -> None:
+        if not extractor.process_video(video):
+            raise RuntimeError("Falha ao processar o vídeo")
+    return run
+
+CASES: List[BenchmarkCase] = [
+    BenchmarkCase("extraction.process_video", _process_video, kind="video",
+                  description="PoseExtractor.process_video em um vídeo com boneco de palito"),
+    BenchmarkCase("storage.save_json", _storage_save("json"),
+                  description="PoseStorage.save_pose_stream no formato JSON"),
+    BenchmarkCase("storage.save_npy", _storage_save("npy"),
+                  description="PoseStorage.save_pose_stream no formato binário"),
+    BenchmarkCase("storage.load_json", _storage_load_json, max_frames=OBJECT_FRAME_LIMIT,
+                  description="PoseStorage.load_pose_data de um arquivo JSON (sem cache em memória)"),
+    BenchmarkCase("storage.load_npy", _storage_load_npy,
+                  description="PoseStorage.load_pose_track de arquivos binários (leitura completa)"),
+    BenchmarkCase("comparison.compare_videos", _compare_videos, max_frames=OBJECT_FRAME_LIMIT,
+                  description="ComparadorMovimento.compare_videos com listas de landmarks"),
+    BenchmarkCase("comparison.compare_tracks", _compare_tracks(DistanceMetric.EUCLIDEAN),
+                  description="ComparadorMovimento.compare_tracks (frame a frame)"),
+    BenchmarkCase("comparison.compare_tracks_dtw", _compare_tracks(DistanceMetric.DTW),
+                  max_frames=OBJECT_FRAME_LIMIT,
+                  description="ComparadorMovimento.compare_tracks com DTW"),
+    BenchmarkCase("cache.set", _cache_set, description="ResultsCache.set (gravação em disco)"),
+    BenchmarkCase("cache.get", _cache_get, description="ResultsCache.get (leitura do disco)"),
+    BenchmarkCase("report.generate", _report_generate, max_frames=OBJECT_FRAME_LIMIT,
+                  description="ReportGenerator.generate"),
+    BenchmarkCase("export.json", _export(JSONExporter, ".json"), max_frames=OBJECT_FRAME_LIMIT,
+                  description="JSONExporter.export com uma linha por frame"),
+    BenchmarkCase("export.csv", _export(CSVExporter, ".csv"), max_frames=OBJECT_FRAME_LIMIT,
+                  description="CSVExporter.export com uma linha por frame"),
+]
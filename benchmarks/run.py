@@ -0,0 +1,287 @@
+"""
+Executa os benchmarks e compara os tempos com uma execução de referência.
+
+Exemplos:
+    python -m benchmarks.run --frames 1000 10000 --output benchmarks/results/latest.json
+    python -m benchmarks.run --cases storage comparison --baseline benchmarks/results/baseline.json
+    python -m benchmarks.run --frames 1000000 --cases storage.load_npy comparison.compare_tracks
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from src.comparador_movimento import COMPARATOR_VERSION
+
+from .cases import CASES, BenchmarkCase
+
+# Configuração do logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Versão do formato do arquivo de resultados
+RESULTS_FORMAT_VERSION = 1
+
+# Tamanhos padrão dos tracks sintéticos e dos vídeos
+DEFAULT_FRAMES = [1000, 10000]
+DEFAULT_VIDEO_FRAMES = 150
+
+# Fração de aumento do tempo mediano considerada regressão
+DEFAULT_TOLERANCE = 0.2
+
+def select_cases(patterns: Optional[List[str]] = None) -> List[BenchmarkCase]:
+    """
+    Seleciona os casos pelo nome completo ou pelo grupo (prefixo antes do ponto).
+
+    Args:
+        patterns: Nomes ou grupos (ex: "storage", "cache.get"); None seleciona todos
+
+    Returns:
+        Casos selecionados, na ordem do registro
+
+    Raises:
+        ValueError: Se algum padrão não corresponder a nenhum caso
+    """
+    if not patterns:
+        return list(CASES)
+    selected = []
+    for pattern in patterns:
+        matches = [case for case in CASES if case.name == pattern or case.name.split(".")[0] == pattern]
+        if not matches:
+            raise ValueError(f"Benchmark desconhecido: {pattern}")
+        selected.extend(case for case in matches if case not in selected)
+    return [case for case in CASES if case in selected]
+
+def run_case(case: BenchmarkCase, frames: int, repeat: int, workdir: Path) -> Dict:
+    """
+    Prepara e mede um caso para um tamanho.
+
+    A preparação (geração dos dados, carregamento de modelos) fica fora da
+    medição; a operação é executada repeat vezes.
+
+    Args:
+        case: Caso de benchmark
+        frames: Tamanho em frames
+        repeat: Número de execuções medidas
+        workdir: Diretório de trabalho vazio
+
+    Returns:
+        Resultado com status "ok", "skipped" ou "error"
+    """
+    result = {"case": case.name, "kind": case.kind, "frames": frames}
+    if case.max_frames is not None and frames > case.max_frames:
+        return {**result, "status": "skipped",
+                "reason": f"acima do limite do caso ({case.max_frames} frames)"}
+    try:
+        operation = case.setup(frames, workdir)
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            operation()
+            runs.append(time.perf_counter() - start)
+    except Exception as e:
+        logger.error(f"Erro no benchmark {case.name} ({frames} frames): {str(e)}")
+        return {**result, "status": "error", "error": str(e)}
+
+    median = statistics.median(runs)
+    return {
+        **result,
+        "status": "ok",
+        "runs": runs,
+        "median_seconds": median,
+        "min_seconds": min(runs),
+        "frames_per_second": frames / median if median > 0 else None
+    }
+
+def compare_with_baseline(results: List[Dict], baseline: List[Dict],
+                          tolerance: float = DEFAULT_TOLERANCE) -> List[Dict]:
+    """
+    Compara os tempos medianos com os de uma execução de referência.
+
+    Args:
+        results: Resultados da execução atual
+        baseline: Resultados da execução de referência
+        tolerance: Aumento relativo do tempo aceito antes de indicar regressão
+
+    Returns:
+        Uma entrada por resultado medido, com a razão atual / referência e o
+        status "regression", "improvement", "unchanged" ou "new" (sem referência)
+    """
+    reference = {(entry["case"], entry["frames"]): entry for entry in baseline
+                 if entry.get("status") == "ok"}
+    comparisons = []
+    for entry in results:
+        if entry.get("status") != "ok":
+            continue
+        key = (entry["case"], entry["frames"])
+        comparison = {"case": entry["case"], "frames": entry["frames"],
+                      "median_seconds": entry["median_seconds"]}
+        if key not in reference:
+            comparisons.append({**comparison, "status": "new"})
+            continue
+        baseline_median = reference[key]["median_seconds"]
+        ratio = entry["median_seconds"] / baseline_median if baseline_median > 0 else float("inf")
+        if ratio > 1 + tolerance:
+            status = "regression"
+        elif ratio < 1 / (1 + tolerance):
+            status = "improvement"
+        else:
+            status = "unchanged"
+        comparisons.append({**comparison, "baseline_seconds": baseline_median,
+                            "ratio": ratio, "status": status})
+    return comparisons
+
+def environment_info() -> Dict:
+    """Informações do ambiente gravadas com os resultados."""
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "comparator_version": COMPARATOR_VERSION
+    }
+    try:
+        import mediapipe
+        info["mediapipe"] = mediapipe.__version__
+    except ImportError:
+        pass
+    return info
+
+def run_benchmarks(cases: List[BenchmarkCase], frames: List[int], video_frames: int,
+                   repeat: int) -> List[Dict]:
+    """
+    Executa os casos para cada tamanho, cada um em um diretório temporário próprio.
+
+    Args:
+        cases: Casos selecionados
+        frames: Tamanhos dos casos de tracks
+        video_frames: Tamanho dos casos de vídeo
+        repeat: Número de execuções medidas por caso e tamanho
+
+    Returns:
+        Lista de resultados (ver run_case)
+    """
+    results = []
+    with tempfile.TemporaryDirectory(prefix="motioncompare-bench-") as temp_dir:
+        for case in cases:
+            sizes = [video_frames] if case.kind == "video" else frames
+            for size in sizes:
+                workdir = Path(temp_dir) / f"{case.name}-{size}"
+                workdir.mkdir()
+                logger.info(f"Executando {case.name} ({size} frames)")
+                results.append(run_case(case, size, repeat, workdir))
+    return results
+
+def format_results(results: List[Dict], comparisons: Optional[List[Dict]] = None) -> str:
+    """Formata os resultados (e a comparação com a referência) como tabela de texto."""
+    status_by_key = {(entry["case"], entry["frames"]): entry for entry in comparisons or []}
+    lines = [f"{'benchmark':<32} {'frames':>9} {'mediana (s)':>12} {'frames/s':>12}  referência"]
+    for entry in results:
+        if entry["status"] != "ok":
+            detail = entry.get("reason") or entry.get("error", "")
+            lines.append(f"{entry['case']:<32} {entry['frames']:>9} {entry['status']:>12}  {detail}")
+            continue
+        comparison = status_by_key.get((entry["case"], entry["frames"]))
+        baseline = ""
+        if comparison is not None:
+            baseline = comparison["status"]
+            if "ratio" in comparison:
+                baseline += f" ({comparison['ratio']:.2f}x)"
+        fps = entry["frames_per_second"]
+        lines.append(f"{entry['case']:<32} {entry['frames']:>9} {entry['median_seconds']:>12.4f} "
+                     f"{fps if fps is not None else float('nan'):>12.1f}  {baseline}")
+    return "\n".join(lines)
+
+def main(args: Optional[List[str]] = None) -> int:
+    """
+    Executa os benchmarks pela linha de comando.
+
+    Returns:
+        0 se não houver regressões nem erros, 1 caso contrário
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks de desempenho do MotionCompare")
+    parser.add_argument('--frames', type=int, nargs='+', default=DEFAULT_FRAMES,
+                        help="Tamanhos dos tracks sintéticos em frames (padrão: 1000 10000)")
+    parser.add_argument('--video-frames', type=int, default=DEFAULT_VIDEO_FRAMES,
+                        help=f"Frames dos vídeos sintéticos (padrão: {DEFAULT_VIDEO_FRAMES})")
+    parser.add_argument('--cases', nargs='+',
+                        help="Casos ou grupos executados (ex: storage cache.get; padrão: todos)")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Execuções medidas de cada caso (padrão: 3)")
+    parser.add_argument('--output', default="benchmarks/results/latest.json",
+                        help="Arquivo JSON dos resultados")
+    parser.add_argument('--baseline', help="Resultados de referência (JSON) para comparação")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Aumento relativo do tempo aceito antes de indicar regressão (padrão: 0.2)")
+    parser.add_argument('--list', action='store_true', help="Lista os casos disponíveis")
+    parsed_args = parser.parse_args(args)
+
+    if parsed_args.list:
+        for case in CASES:
+            limit = f" (até {case.max_frames} frames)" if case.max_frames else ""
+            print(f"{case.name:<32} {case.description}{limit}")
+        return 0
+    if parsed_args.repeat < 1 or parsed_args.video_frames < 1 or min(parsed_args.frames) < 1:
+        parser.error("--frames, --video-frames e --repeat devem ser maiores ou iguais a 1")
+    try:
+        cases = select_cases(parsed_args.cases)
+    except ValueError as e:
+        parser.error(str(e))
+
+    baseline = None
+    if parsed_args.baseline:
+        with open(parsed_args.baseline, "r") as f:
+            baseline = json.load(f)
+
+    results = run_benchmarks(cases, parsed_args.frames, parsed_args.video_frames, parsed_args.repeat)
+    report = {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment_info(),
+        "settings": {"frames": parsed_args.frames, "video_frames": parsed_args.video_frames,
+                     "repeat": parsed_args.repeat},
+        "results": results
+    }
+    comparisons = None
+    if baseline is not None:
+        comparisons = compare_with_baseline(results, baseline.get("results", []), parsed_args.tolerance)
+        report["baseline"] = {"path": parsed_args.baseline, "tolerance": parsed_args.tolerance,
+                              "environment": baseline.get("environment", {}),
+                              "comparisons": comparisons}
+        if baseline.get("environment", {}).get("platform") != report["environment"]["platform"]:
+            logger.warning("A referência foi gerada em outra plataforma; os tempos podem não ser comparáveis")
+
+    output_path = Path(parsed_args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(format_results(results, comparisons))
+    print(f"Resultados salvos em: {output_path}")
+
+    regressions = [entry for entry in comparisons or [] if entry["status"] == "regression"]
+    errors = [entry for entry in results if entry["status"] == "error"]
+    for entry in regressions:
+        print(f"Regressão: {entry['case']} ({entry['frames']} frames) "
+              f"{entry['ratio']:.2f}x mais lento que a referência")
+    return 1 if regressions or errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Dados sintéticos para os benchmarks: tracks de pose e vídeos com bonecos de palito.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from src.pose_models import PoseLandmark
+from src.pose_track import PoseTrack
+
+# Resolução dos vídeos e dos dados de pose sintéticos
+RESOLUTION = (640, 480)
+
+# Landmarks do MediaPipe Pose
+NUM_LANDMARKS = 33
+
+def synthetic_track(n_frames: int, fps: float = 30.0, phase: float = 0.0, seed: int = 0,
+                    missing_every: int = 0, dtype=np.float32) -> PoseTrack:
+    """
+    Gera um track denso com um movimento periódico de cada landmark.
+
+    Os arrays são gerados de forma vetorizada, então tracks de 1M frames
+    custam apenas a memória do array (n_frames x 33 x 4).
+
+    Args:
+        n_frames: Número de frames
+        fps: Frames por segundo
+        phase: Deslocamento de fase do movimento (tracks com fases diferentes
+            não são idênticos)
+        seed: Semente da posição de repouso dos landmarks
+        missing_every: Marca um a cada missing_every frames como sem pose (0: nenhum)
+        dtype: Tipo de ponto flutuante do array
+
+    Returns:
+        PoseTrack com n_frames linhas
+    """
+    rng = np.random.default_rng(seed)
+    rest = np.column_stack([rng.uniform(0.3, 0.7, NUM_LANDMARKS), np.linspace(0.1, 0.9, NUM_LANDMARKS)])
+    offsets = rng.uniform(0.0, 2 * np.pi, NUM_LANDMARKS)
+
+    t = np.arange(n_frames, dtype=np.float64)[:, None] / fps
+    angle = 2 * np.pi * 0.5 * t + phase + offsets
+    data = np.empty((n_frames, NUM_LANDMARKS, 4), dtype=dtype)
+    data[..., 0] = rest[:, 0] + 0.05 * np.sin(angle)
+    data[..., 1] = rest[:, 1] + 0.03 * np.cos(angle)
+    data[..., 2] = 0.1 * np.sin(angle / 2)
+    data[..., 3] = 0.9
+    if missing_every > 0:
+        data[::missing_every] = np.nan
+    return PoseTrack(data, fps=fps)
+
+def iter_track_frames(track: PoseTrack) -> Iterator[Tuple[int, Optional[Dict[int, PoseLandmark]]]]:
+    """
+    Gera as tuplas (frame_number, landmarks) de um track sem montar a lista inteira.
+
+    Args:
+        track: Track de pose
+
+    Yields:
+        Tuplas no formato de PoseExtractor.iter_video / PoseStorage.save_pose_stream
+    """
+    for row in range(len(track)):
+        yield int(track.frame_numbers[row]), track.landmarks_at(row)
+
+def placeholder_video(path: Union[str, Path], content: str) -> str:
+    """
+    Cria um arquivo que faz o papel do vídeo de origem no armazenamento.
+
+    O PoseStorage identifica os vídeos pelo hash do conteúdo, então cada
+    conteúdo distinto corresponde a um vídeo distinto.
+
+    Args:
+        path: Caminho do arquivo
+        content: Conteúdo que identifica o vídeo
+
+    Returns:
+        Caminho do arquivo
+    """
+    Path(path).write_bytes(content.encode("utf-8") * 64)
+    return str(path)
+
+def _stick_figure_joints(frame_idx: int, fps: float, size: Tuple[int, int]) -> Dict[str, Tuple[int, int]]:
+    """Posição em pixels das articulações do boneco em um frame."""
+    width, height = size
+    t = frame_idx / fps
+    swing = np.sin(2 * np.pi * 0.5 * t)
+    cx = width / 2 + 0.1 * width * np.sin(2 * np.pi * 0.1 * t)
+    unit = height / 8
+
+    def point(dx: float, dy: float) -> Tuple[int, int]:
+        return int(round(cx + dx * unit)), int(round(height * 0.15 + dy * unit))
+
+    return {
+        "head": point(0, 0),
+        "neck": point(0, 0.8),
+        "hip": point(0, 3.2),
+        "left_hand": point(-1.6, 1.2 + 1.2 * swing),
+        "right_hand": point(1.6, 1.2 - 1.2 * swing),
+        "left_elbow": point(-0.9, 1.4 + 0.5 * swing),
+        "right_elbow": point(0.9, 1.4 - 0.5 * swing),
+        "left_knee": point(-0.5 - 0.3 * swing, 4.4),
+        "right_knee": point(0.5 + 0.3 * swing, 4.4),
+        "left_foot": point(-0.7 - 0.5 * swing, 5.6),
+        "right_foot": point(0.7 + 0.5 * swing, 5.6),
+    }
+
+# Segmentos do boneco de palito
+STICK_FIGURE_BONES = [
+    ("neck", "hip"), ("neck", "left_elbow"), ("left_elbow", "left_hand"),
+    ("neck", "right_elbow"), ("right_elbow", "right_hand"), ("hip", "left_knee"),
+    ("left_knee", "left_foot"), ("hip", "right_knee"), ("right_knee", "right_foot"),
+]
+
+def render_stick_figure_video(path: Union[str, Path], n_frames: int,
+                              size: Tuple[int, int] = RESOLUTION, fps: float = 30.0) -> str:
+    """
+    Renderiza um vídeo com um boneco de palito dançando (braços e pernas em movimento).
+
+    Args:
+        path: Caminho do vídeo (.mp4)
+        n_frames: Número de frames
+        size: Resolução (largura, altura)
+        fps: Frames por segundo
+
+    Returns:
+        Caminho do vídeo
+    """
+    width, height = size
+    thickness = max(2, height // 40)
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), fps, size)
+    try:
+        for frame_idx in range(n_frames):
+            frame = np.full((height, width, 3), 235, dtype=np.uint8)
+            joints = _stick_figure_joints(frame_idx, fps, size)
+            for start, end in STICK_FIGURE_BONES:
+                cv2.line(frame, joints[start], joints[end], (60, 80, 160), thickness, cv2.LINE_AA)
+            cv2.circle(frame, joints["head"], int(height / 16), (120, 170, 220), -1, cv2.LINE_AA)
+            writer.write(frame)
+    finally:
+        writer.release()
+    return str(path)
@@ -7,16 +7,20 @@ import sys
 import logging
 from typing import List, Optional, Tuple
 import cv2
+import numpy as np
 from tqdm import tqdm
 import json
 from pathlib import Path
 
-from .pose_estimation import PoseExtractor
+from .pose_estimation import PoseExtractor, compare_extraction_modes
 from .comparison_params import ComparisonParams, DistanceMetric
+from .extraction_params import ExtractionParams
 from .comparison_results import ComparisonResults
-from .results_cache import ResultsCache
 from .pose_storage import PoseStorage
+from .pose_track import PoseTrack
 from .comparador_movimento import ComparadorMovimento
+from .batch_compare import BatchComparator, collect_candidates
+from .live_comparison import LIVE_MODEL_COMPLEXITY, LiveComparator
 
 # Configuração do logging
 logging.basicConfig(
@@ -72,13 +76,13 @@ Exemplos de uso:
   python analisador_cli.py -v video.mp4 -o output.mp4 -r 720p
   python analisador_cli.py -v video.mp4 -f 30 --verbose
   python analisador_cli.py -v video.mp4 --config params.json
+  python analisador_cli.py --command batch --reference ref.mp4 --candidates videos/ -w 4
         """
     )
 
     parser.add_argument(
         '-v', '--video',
-        required=True,
-        help='Caminho do arquivo de vídeo a ser processado'
+        help='Caminho do arquivo de vídeo a ser processado (comandos process e adaptive-report)'
     )
 
     parser.add_argument(
@@ -95,8 +99,61 @@ Exemplos de uso:
 
     parser.add_argument(
         '-f', '--fps',
+        type=float,
+        help='FPS alvo de processamento; frames intermediários são pulados (opcional)'
+    )
+
+    parser.add_argument(
+        '--stride',
+        type=int,
+        default=1,
+        help='Processa apenas 1 a cada N frames (padrão: 1)'
+    )
+
+    parser.add_argument(
+        '--interpolate',
+        action='store_true',
+        help='Interpola os landmarks dos frames pulados em vez de deixá-los vazios'
+    )
+
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=1,
+        help='Número de processos para extração paralela de pose; no comando batch, '
+             'número de vídeos extraídos em paralelo (padrão: 1)'
+    )
+
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        help='Sobrepõe decodificação, inferência e escrita em threads separadas'
+    )
+
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Grava os landmarks em disco durante a extração, com uso de memória limitado'
+    )
+
+    parser.add_argument(
+        '--complexity',
+        type=int,
+        choices=[0, 1, 2],
+        help='Complexidade do modelo MediaPipe Pose (padrão: 2; 1 no comando live)'
+    )
+
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        help='Usa o modelo pesado apenas em keyframes e o modelo leve na região da pessoa'
+    )
+
+    parser.add_argument(
+        '--keyframe-interval',
         type=int,
-        help='FPS de processamento (opcional)'
+        default=30,
+        help='Intervalo de frames entre keyframes no modo adaptativo (padrão: 30)'
     )
 
     parser.add_argument(
@@ -160,37 +217,140 @@ Exemplos de uso:
         help='Desativar normalização'
     )
 
+    parser.add_argument(
+        '--dtw-mode',
+        choices=['full', 'band', 'fast', 'subsequence'],
+        help='Modo do alinhamento DTW: matriz completa, banda de Sakoe-Chiba, multi-resolução (FastDTW) '
+             'ou subsequence (localiza o primeiro vídeo, um trecho curto, dentro do segundo)'
+    )
+
+    parser.add_argument(
+        '--dtw-band',
+        type=float,
+        help='Meia-largura da banda de Sakoe-Chiba como fração da duração (0-1)'
+    )
+
+    parser.add_argument(
+        '--dtw-radius',
+        type=int,
+        help='Raio da janela em cada resolução do modo FastDTW'
+    )
+
+    parser.add_argument(
+        '--start-time',
+        type=float,
+        help='Início do trecho comparado em segundos; apenas os frames do trecho são carregados (opcional)'
+    )
+
+    parser.add_argument(
+        '--end-time',
+        type=float,
+        help='Fim do trecho comparado em segundos, exclusivo (opcional)'
+    )
+
     parser.add_argument(
         '--storage-dir',
         default="data/pose",
         help="Diretório para armazenar os dados de pose"
     )
 
+    parser.add_argument(
+        '--storage-format',
+        choices=['json', 'npy'],
+        default='json',
+        help="Formato dos dados de pose: JSON ou arrays binários mapeáveis em memória (padrão: json)"
+    )
+
+    parser.add_argument(
+        '--fingerprint-mode',
+        choices=['full', 'sampled'],
+        default='full',
+        help="Identificação dos vídeos: SHA-256 do arquivo inteiro ou de blocos amostrados, "
+             "mais rápido para vídeos muito grandes (padrão: full)"
+    )
+
+    parser.add_argument(
+        '--pose-index',
+        action='store_true',
+        help="Insere cada vídeo extraído no índice de similaridade de poses (pose_index.npz) "
+             "do diretório de armazenamento (comandos process, compare, batch e live)"
+    )
+
     parser.add_argument(
         '--command',
-        choices=['process', 'compare'],
+        choices=['process', 'compare', 'adaptive-report', 'batch', 'live'],
         required=True,
         help="Comando a ser executado"
     )
 
+    parser.add_argument(
+        '--reference',
+        help="Vídeo de referência dos comandos batch e live"
+    )
+
+    parser.add_argument(
+        '--candidates',
+        help="Diretório ou manifesto (um caminho por linha) com os vídeos candidatos do comando batch"
+    )
+
+    parser.add_argument(
+        '--summary',
+        default="batch_summary.csv",
+        help="Tabela de resumo do comando batch; se já existir, a execução é retomada "
+             "(padrão: batch_summary.csv)"
+    )
+
+    parser.add_argument(
+        '--source',
+        default="0",
+        help="Fonte do comando live: índice da câmera, URL de stream ou arquivo de vídeo "
+             "(lido no ritmo do FPS) (padrão: 0)"
+    )
+
     parser.add_argument(
         'video1',
+        nargs='?',
         help="Caminho do primeiro vídeo para comparação"
     )
 
     parser.add_argument(
         'video2',
+        nargs='?',
         help="Caminho do segundo vídeo para comparação"
     )
 
+    # None indica que a opção não foi informada (mantém o padrão de ComparisonParams)
+    parser.set_defaults(temporal_sync=None, normalize=None)
+
     parsed_args = parser.parse_args(args)
 
     # Validações
-    if not validate_file_path(parsed_args.video):
-        parser.error(f"Arquivo não encontrado ou sem permissão de leitura: {parsed_args.video}")
+    if parsed_args.command in ('process', 'adaptive-report') and not parsed_args.video:
+        parser.error(f"O comando {parsed_args.command} requer o vídeo (-v/--video)")
 
-    if not validate_video_format(parsed_args.video):
-        parser.error(f"Formato de vídeo não suportado. Formatos aceitos: {', '.join(SUPPORTED_FORMATS)}")
+    if parsed_args.command == 'compare' and not (parsed_args.video1 and parsed_args.video2):
+        parser.error("O comando compare requer os dois vídeos (video1 e video2)")
+
+    if parsed_args.command == 'batch':
+        if not parsed_args.reference or not parsed_args.candidates:
+            parser.error("O comando batch requer --reference e --candidates")
+        if not validate_file_path(parsed_args.reference):
+            parser.error(f"Arquivo não encontrado ou sem permissão de leitura: {parsed_args.reference}")
+        if not os.path.isdir(parsed_args.candidates) and not validate_file_path(parsed_args.candidates):
+            parser.error(f"Diretório ou manifesto de candidatos não encontrado: {parsed_args.candidates}")
+
+    if parsed_args.command == 'live':
+        if not parsed_args.reference:
+            parser.error("O comando live requer --reference")
+        if not validate_file_path(parsed_args.reference):
+            parser.error(f"Arquivo não encontrado ou sem permissão de leitura: {parsed_args.reference}")
+
+    if parsed_args.video is not None:
+        if not validate_file_path(parsed_args.video):
+            parser.error(f"Arquivo não encontrado ou sem permissão de leitura: {parsed_args.video}")
+
+        if not validate_video_format(parsed_args.video):
+            parser.error(f"Formato de vídeo não suportado. Formatos aceitos: {', '.join(SUPPORTED_FORMATS)}")
 
     if parsed_args.output and not validate_video_format(parsed_args.output):
         parser.error(f"Formato de saída não suportado. Formatos aceitos: {', '.join(SUPPORTED_FORMATS)}")
@@ -198,6 +358,15 @@ Exemplos de uso:
     if parsed_args.fps is not None and parsed_args.fps <= 0:
         parser.error("FPS deve ser um número positivo")
 
+    if parsed_args.workers < 1:
+        parser.error("Número de workers deve ser um número positivo")
+        
+    if parsed_args.stride < 1:
+        parser.error("Stride deve ser um número positivo")
+        
+    if parsed_args.keyframe_interval < 1:
+        parser.error("Intervalo de keyframes deve ser um número positivo")
+
     # Validação dos parâmetros de comparação
     if parsed_args.config:
         if not validate_file_path(parsed_args.config):
@@ -211,6 +380,19 @@ Exemplos de uso:
     if parsed_args.tolerance is not None and not 0 <= parsed_args.tolerance <= 1:
         parser.error("Tolerância deve estar entre 0 e 1")
 
+    if parsed_args.dtw_band is not None and not 0 < parsed_args.dtw_band <= 1:
+        parser.error("Banda do DTW deve estar entre 0 (exclusivo) e 1")
+
+    if parsed_args.dtw_radius is not None and parsed_args.dtw_radius < 1:
+        parser.error("Raio do DTW deve ser um número positivo")
+
+    if parsed_args.start_time is not None and parsed_args.start_time < 0:
+        parser.error("Início do trecho deve ser não negativo")
+
+    if (parsed_args.start_time is not None and parsed_args.end_time is not None
+            and parsed_args.end_time <= parsed_args.start_time):
+        parser.error("Fim do trecho deve ser maior que o início")
+
     if parsed_args.landmark_weights:
         try:
             weights = json.loads(parsed_args.landmark_weights)
@@ -222,6 +404,11 @@ Exemplos de uso:
         except json.JSONDecodeError:
             parser.error("Formato inválido para pesos dos landmarks")
 
+    # O comando live usa o modelo leve, a menos que a complexidade seja informada
+    if parsed_args.complexity is None:
+        parsed_args.complexity = (LIVE_MODEL_COMPLEXITY if parsed_args.command == 'live'
+                                  else ExtractionParams.model_complexity)
+
     # Configuração do nível de logging
     if parsed_args.verbose:
         logger.setLevel(logging.DEBUG)
@@ -253,6 +440,12 @@ def get_comparison_params(args: argparse.Namespace) -> ComparisonParams:
         params.temporal_sync = args.temporal_sync
     if args.normalize is not None:
         params.normalize = args.normalize
+    if args.dtw_mode:
+        params.dtw_mode = args.dtw_mode
+    if args.dtw_band is not None:
+        params.dtw_band = args.dtw_band
+    if args.dtw_radius is not None:
+        params.dtw_radius = args.dtw_radius
     
     return params
 
@@ -316,14 +509,15 @@ def compare_videos(video1_path: str, video2_path: str,
         Optional[ComparisonResults]: Resultados da comparação ou None em caso de erro
     """
     try:
-        # Inicializa o cache
-        cache = ResultsCache()
-        
-        # Gera uma chave única para o cache baseada nos vídeos e parâmetros
-        cache_key = f"{video1_path}_{video2_path}_{hash(str(comparison_params))}"
+        # Cache endereçado por conteúdo: hashes dos vídeos, parâmetros e versão do comparador
+        storage = PoseStorage()
+        comparador = ComparadorMovimento(comparison_params=comparison_params)
+        cache_params = comparador.cache_params()
         
         # Tenta recuperar do cache
-        cached_results = cache.get(cache_key)
+        cached_results = storage.load_comparison_results(
+            video1_path, video2_path, params=cache_params, comparator_version=comparador.version
+        )
         if cached_results is not None:
             logger.info("Resultados recuperados do cache")
             return cached_results
@@ -347,7 +541,10 @@ def compare_videos(video1_path: str, video2_path: str,
         results = extractor.compare_videos()
         
         # Armazena no cache
-        cache.set(cache_key, results)
+        storage.save_comparison_results(
+            video1_path, video2_path, results,
+            params=cache_params, comparator_version=comparador.version
+        )
         
         return results
         
@@ -381,7 +578,11 @@ class AnalisadorCLI:
         storage_dir: str = "data/pose",
         pose_storage: Optional[PoseStorage] = None,
         pose_extractor: Optional[PoseExtractor] = None,
-        comparador: Optional[ComparadorMovimento] = None
+        comparador: Optional[ComparadorMovimento] = None,
+        streaming: bool = False,
+        storage_format: str = "json",
+        fingerprint_mode: str = "full",
+        pose_index: bool = False
     ):
         """
         Inicializa o analisador CLI.
@@ -390,12 +591,19 @@ class AnalisadorCLI:
             pose_storage: Instância de PoseStorage (injeção para testes)
             pose_extractor: Instância de PoseExtractor (injeção para testes)
             comparador: Instância de ComparadorMovimento (injeção para testes)
+            streaming: Se True, grava os landmarks em disco à medida que são extraídos
+            storage_format: Formato dos dados de pose salvos ("json" ou "npy")
+            fingerprint_mode: Identificação dos vídeos ("full" ou "sampled")
+            pose_index: Se True, os vídeos processados são inseridos no índice de poses
         """
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
-        self.pose_storage = pose_storage or PoseStorage(self.storage_dir)
+        self.pose_storage = pose_storage or PoseStorage(self.storage_dir, storage_format=storage_format,
+                                                        fingerprint_mode=fingerprint_mode,
+                                                        pose_index=pose_index)
         self.pose_extractor = pose_extractor or PoseExtractor()
         self.comparador = comparador or ComparadorMovimento()
+        self.streaming = streaming
         
     def process_video(self, video_path: str, output_path: Optional[str] = None,
                      resolution: Optional[Tuple[int, int]] = None) -> bool:
@@ -416,6 +624,9 @@ class AnalisadorCLI:
                 logger.info(f"Vídeo já processado: {video_path}")
                 return True
                 
+            if self.streaming:
+                return self._process_video_streaming(video_path, output_path, resolution)
+                
             # Processa o vídeo
             success = self.pose_extractor.process_video(
                 video_path=video_path,
@@ -458,19 +669,62 @@ class AnalisadorCLI:
             logger.error(f"Erro ao processar vídeo: {str(e)}")
             return False
             
+    def _process_video_streaming(self, video_path: str, output_path: Optional[str] = None,
+                                 resolution: Optional[Tuple[int, int]] = None) -> bool:
+        """
+        Processa um vídeo gravando os landmarks em disco à medida que são extraídos.
+        
+        Args:
+            video_path: Caminho do vídeo
+            output_path: Caminho para salvar o vídeo processado (opcional)
+            resolution: Resolução do vídeo processado (opcional)
+            
+        Returns:
+            bool: True se o processamento foi bem-sucedido
+        """
+        frames = self.pose_extractor.iter_video(
+            video_path=video_path,
+            output_path=output_path,
+            resolution=resolution
+        )
+        success = self.pose_storage.save_pose_stream(
+            video_path=video_path,
+            fps=self.pose_extractor.get_fps(),
+            resolution=self.pose_extractor.get_resolution(),
+            total_frames=self.pose_extractor.get_total_frames(),
+            frames=frames
+        )
+        
+        if not success:
+            logger.error(f"Falha ao salvar dados de pose: {video_path}")
+            return False
+            
+        logger.info(f"Vídeo processado com sucesso: {video_path}")
+        return True
+            
     def compare_videos(self, video1_path: str, video2_path: str,
-                      output_path: Optional[str] = None) -> Optional[ComparisonResults]:
+                      output_path: Optional[str] = None,
+                      start_time: Optional[float] = None,
+                      end_time: Optional[float] = None) -> Optional[ComparisonResults]:
         """
         Compara dois vídeos.
         
+        Com start_time ou end_time, compara apenas o trecho [start_time, end_time)
+        de cada vídeo (ver compare_range).
+        
         Args:
             video1_path: Caminho do primeiro vídeo
             video2_path: Caminho do segundo vídeo
-            output_path: Caminho para salvar os resultados (opcional)
+            output_path: Mantido por compatibilidade (os resultados sempre são salvos no cache)
+            start_time: Início do trecho em segundos (opcional)
+            end_time: Fim do trecho em segundos, exclusivo (opcional)
             
         Returns:
             ComparisonResults ou None se a comparação falhar
         """
+        if start_time is not None or end_time is not None:
+            return self.compare_range(video1_path, video2_path, start_time, end_time)
+            
         try:
             # Verifica se os vídeos já foram processados
             video1_data = self.pose_storage.load_pose_data(video1_path)
@@ -488,8 +742,13 @@ class AnalisadorCLI:
                     return None
                 video2_data = self.pose_storage.load_pose_data(video2_path)
                 
-            # Verifica se já existe uma comparação
-            results = self.pose_storage.load_comparison_results(video1_path, video2_path)
+            # Verifica se já existe uma comparação com o mesmo conteúdo e parâmetros
+            cache_params = self.comparador.cache_params()
+            results = self.pose_storage.load_comparison_results(
+                video1_path, video2_path,
+                params=cache_params,
+                comparator_version=self.comparador.version
+            )
             if results is not None:
                 logger.info(f"Comparação já existe para: {video1_path} e {video2_path}")
                 return results
@@ -516,15 +775,16 @@ class AnalisadorCLI:
             results.video1_path = video1_path
             results.video2_path = video2_path
             
-            # Salva os resultados
-            if output_path:
-                success = self.pose_storage.save_comparison_results(
-                    video1_path=video1_path,
-                    video2_path=video2_path,
-                    results=results
-                )
-                if not success:
-                    logger.error(f"Falha ao salvar resultados da comparação: {output_path}")
+            # Salva os resultados no cache
+            success = self.pose_storage.save_comparison_results(
+                video1_path=video1_path,
+                video2_path=video2_path,
+                results=results,
+                params=cache_params,
+                comparator_version=self.comparador.version
+            )
+            if not success:
+                logger.error(f"Falha ao salvar resultados da comparação: {video1_path} e {video2_path}")
                     
             logger.info(f"Vídeos comparados com sucesso: {video1_path} e {video2_path}")
             return results
@@ -533,12 +793,220 @@ class AnalisadorCLI:
             logger.error(f"Erro ao comparar vídeos: {str(e)}")
             return None
 
+    def compare_range(self, video1_path: str, video2_path: str,
+                      start_time: Optional[float] = None,
+                      end_time: Optional[float] = None) -> Optional[ComparisonResults]:
+        """
+        Compara o trecho [start_time, end_time) de dois vídeos.
+        
+        Apenas os frames do trecho são lidos do disco (PoseStorage.load_track_range),
+        sem carregar os dados completos dos vídeos. O trecho faz parte da chave
+        do cache de resultados.
+        
+        Args:
+            video1_path: Caminho do primeiro vídeo
+            video2_path: Caminho do segundo vídeo
+            start_time: Início do trecho em segundos (None: início dos vídeos)
+            end_time: Fim do trecho em segundos, exclusivo (None: fim dos vídeos)
+            
+        Returns:
+            ComparisonResults ou None se a comparação falhar
+        """
+        try:
+            infos = []
+            for video_path in (video1_path, video2_path):
+                info = self.pose_storage.load_pose_info(video_path)
+                if info is None:
+                    logger.info(f"Processando vídeo: {video_path}")
+                    if not self.process_video(video_path):
+                        return None
+                    info = self.pose_storage.load_pose_info(video_path)
+                    if info is None:
+                        return None
+                infos.append(info)
+            info1, info2 = infos
+                
+            time_range = {"start_time": start_time, "end_time": end_time}
+            cache_params = {**self.comparador.cache_params(), "time_range": time_range}
+            results = self.pose_storage.load_comparison_results(
+                video1_path, video2_path,
+                params=cache_params,
+                comparator_version=self.comparador.version
+            )
+            if results is not None:
+                logger.info(f"Comparação já existe para o trecho de: {video1_path} e {video2_path}")
+                return results
+                
+            track1 = self.pose_storage.load_track_range(video1_path, start_time, end_time)
+            track2 = self.pose_storage.load_track_range(video2_path, start_time, end_time)
+            if track1 is None or track2 is None or not len(track1) or not len(track2):
+                logger.error("Nenhum frame com pose no trecho selecionado")
+                return None
+                
+            results = self.comparador.compare_tracks(
+                _dense_range(track1, info1["total_frames"], start_time, end_time),
+                _dense_range(track2, info2["total_frames"], start_time, end_time),
+                video1_resolution=info1["resolution"],
+                video2_resolution=info2["resolution"]
+            )
+            results.video1_path = video1_path
+            results.video2_path = video2_path
+            results.metadata["time_range"] = time_range
+            
+            if not self.pose_storage.save_comparison_results(
+                video1_path=video1_path,
+                video2_path=video2_path,
+                results=results,
+                params=cache_params,
+                comparator_version=self.comparador.version
+            ):
+                logger.error(f"Falha ao salvar resultados da comparação: {video1_path} e {video2_path}")
+                
+            logger.info(f"Trecho comparado com sucesso: {video1_path} e {video2_path}")
+            return results
+            
+        except Exception as e:
+            logger.error(f"Erro ao comparar trecho dos vídeos: {str(e)}")
+            return None
+
+def _dense_range(track: PoseTrack, total_frames: int, start_time: Optional[float],
+                 end_time: Optional[float]) -> PoseTrack:
+    """
+    Converte o track de um trecho em um track denso cuja linha 0 é o primeiro frame do trecho.
+    
+    Args:
+        track: Frames armazenados no trecho (frame_numbers absolutos)
+        total_frames: Total de frames do vídeo
+        start_time: Início do trecho em segundos (None: início do vídeo)
+        end_time: Fim do trecho em segundos, exclusivo (None: fim do vídeo)
+        
+    Returns:
+        PoseTrack denso (float64) com uma linha por frame do trecho
+    """
+    # Tolerância para timestamps exatamente na fronteira do trecho
+    first = 0 if start_time is None else int(np.ceil(start_time * track.fps - 1e-9))
+    last = total_frames if end_time is None else min(total_frames, int(np.ceil(end_time * track.fps - 1e-9)))
+    shifted = PoseTrack(np.asarray(track.data, dtype=np.float64), track.frame_numbers - first,
+                        track.valid, fps=track.fps, total_frames=max(last - first, 0))
+    return shifted.to_dense()
+
+def run_batch(args: argparse.Namespace, extraction_params: ExtractionParams) -> int:
+    """
+    Executa o comando batch: compara todos os candidatos com o vídeo de referência.
+    
+    Args:
+        args: Argumentos da linha de comando
+        extraction_params: Parâmetros de extração (args.workers vídeos em paralelo)
+        
+    Returns:
+        int: Código de saída (1 se algum candidato falhou)
+    """
+    candidates = collect_candidates(args.candidates)
+    if not candidates:
+        logger.error(f"Nenhum vídeo candidato encontrado em: {args.candidates}")
+        return 1
+        
+    batch = BatchComparator(
+        reference_path=args.reference,
+        storage_dir=args.storage_dir,
+        storage_format=args.storage_format,
+        fingerprint_mode=args.fingerprint_mode,
+        extraction_params=extraction_params,
+        comparison_params=get_comparison_params(args),
+        workers=args.workers,
+        pose_index=args.pose_index
+    )
+    try:
+        results = batch.run(candidates, args.summary)
+    except RuntimeError as e:
+        logger.error(str(e))
+        return 1
+        
+    # Exibe os resultados em ordem decrescente de score
+    print(f"\nResultados do lote (referência: {args.reference}):")
+    ranked = sorted(results, key=lambda r: (r.status != "ok", -(r.global_score or 0.0)))
+    for result in ranked:
+        if result.status == "ok":
+            print(f"{result.global_score:6.2f}  {result.video_path}")
+        else:
+            print(f"  erro  {result.video_path}: {result.error}")
+    print(f"Resumo gravado em: {args.summary}")
+    
+    return 1 if any(result.status != "ok" for result in results) else 0
+
+def run_live(analisador: AnalisadorCLI, args: argparse.Namespace) -> int:
+    """
+    Executa o comando live: compara a fonte ao vivo com o vídeo de referência.
+    
+    A referência é processada antes, se ainda não houver dados de pose
+    armazenados. A similaridade móvel é atualizada a cada frame até o fim da
+    fonte ou Ctrl+C.
+    
+    Args:
+        analisador: Analisador com o armazenamento, o extrator e o comparador
+        args: Argumentos da linha de comando
+        
+    Returns:
+        int: Código de saída
+    """
+    pose_data = analisador.pose_storage.load_pose_data(args.reference)
+    if pose_data is None:
+        logger.info(f"Processando vídeo de referência: {args.reference}")
+        if not analisador.process_video(args.reference):
+            logger.error("Falha ao processar o vídeo de referência")
+            return 1
+        pose_data = analisador.pose_storage.load_pose_data(args.reference)
+    reference = PoseTrack.from_pose_data(pose_data, dtype=np.float64).to_dense()
+    
+    source = int(args.source) if args.source.isdigit() else args.source
+    live = LiveComparator(reference, extractor=analisador.pose_extractor,
+                          comparador=analisador.comparador,
+                          landmark_weights=analisador.comparador.comparison_params.landmark_weights)
+    try:
+        for score in live.run(source):
+            rolling = f"{score.rolling_similarity:.2f}" if score.rolling_similarity is not None else "-"
+            position = (f"{score.reference_frame / reference.fps:6.2f} s"
+                        if score.reference_frame is not None and reference.fps > 0 else "     -")
+            print(f"\r{score.timestamp:7.2f} s  referência {position}  similaridade {rolling}  "
+                  f"descartados {score.dropped_frames}", end="", flush=True)
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+    except KeyboardInterrupt:
+        pass
+    print()
+    stats = live.stats
+    print(f"Frames pontuados: {stats['frames_scored']}, descartados: {stats['dropped_frames']}, "
+          f"latência média: {stats['mean_latency'] * 1000:.0f} ms")
+    return 0
+
 def main():
     """Função principal do CLI."""
     args = parse_arguments()
     
     # Inicializa o analisador
-    analisador = AnalisadorCLI(storage_dir=args.storage_dir)
+    extraction_params = ExtractionParams(
+        num_workers=args.workers,
+        pipeline=args.pipeline,
+        frame_stride=args.stride,
+        target_fps=args.fps,
+        fill_skipped="interpolate" if args.interpolate else "gap",
+        model_complexity=args.complexity,
+        adaptive=args.adaptive,
+        keyframe_interval=args.keyframe_interval
+    )
+    if args.command == "batch":
+        return run_batch(args, extraction_params)
+        
+    analisador = AnalisadorCLI(
+        storage_dir=args.storage_dir,
+        pose_extractor=PoseExtractor(extraction_params=extraction_params),
+        comparador=ComparadorMovimento(comparison_params=get_comparison_params(args)),
+        streaming=args.stream,
+        storage_format=args.storage_format,
+        fingerprint_mode=args.fingerprint_mode,
+        pose_index=args.pose_index
+    )
     
     # Executa o comando
     if args.command == "process":
@@ -555,7 +1023,9 @@ def main():
         results = analisador.compare_videos(
             video1_path=args.video1,
             video2_path=args.video2,
-            output_path=args.output
+            output_path=args.output,
+            start_time=args.start_time,
+            end_time=args.end_time
         )
         if results is None:
             logger.error("Falha ao comparar vídeos")
@@ -568,6 +1038,23 @@ def main():
         print(f"Similaridade Máxima: {results.overall_metrics['max_similarity']:.2f}")
         print(f"Qualidade do Alinhamento: {results.overall_metrics['alignment_quality']:.2f}")
         print(f"Alinhamento Temporal: {results.overall_metrics['temporal_alignment']:.2f}")
+        if "start_frame" in results.temporal_alignment:
+            alignment = results.temporal_alignment
+            print(f"Trecho encontrado no segundo vídeo: {alignment['start_seconds']:.2f} s a "
+                  f"{alignment['end_seconds']:.2f} s (score {alignment['score']:.2f})")
+        
+        stats = analisador.pose_storage.results_cache.stats()
+        logger.info(f"Cache de comparações: {stats['hits']} acertos, {stats['misses']} falhas")
+        
+    elif args.command == "live":
+        return run_live(analisador, args)
+        
+    elif args.command == "adaptive-report":
+        report = compare_extraction_modes(args.video, extraction_params)
+        if report is None:
+            logger.error("Falha ao gerar relatório de extração adaptativa")
+            return 1
+        print(f"\n{report}")
         
     else:
         logger.error("Comando inválido")
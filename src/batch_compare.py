@@ -0,0 +1,349 @@
+import csv
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, TextIO, Tuple
+
+import numpy as np
+
+from .comparador_movimento import ComparadorMovimento
+from .comparison_params import ComparisonParams
+from .extraction_params import ExtractionParams
+from .extraction_worker import init_extraction_worker
+from .pose_storage import PoseStorage
+from .pose_track import PoseTrack
+
+# Configuração do logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Extensões de vídeo aceitas ao listar um diretório de candidatos
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov')
+
+# Colunas da tabela de resumo
+SUMMARY_FIELDS = [
+    "reference", "video", "status", "global_score", "average_similarity",
+    "min_similarity", "max_similarity", "std_similarity", "frames_compared", "error"
+]
+
+# Armazenamento e extrator do processo worker (criados uma única vez por processo)
+_worker_state: Dict = {}
+
+def collect_candidates(source: str) -> List[str]:
+    """
+    Lista os vídeos candidatos de um diretório ou de um manifesto.
+
+    O manifesto é um arquivo de texto com um caminho de vídeo por linha;
+    linhas vazias e iniciadas por # são ignoradas, e caminhos relativos são
+    resolvidos a partir do diretório do manifesto.
+
+    Args:
+        source: Diretório com os vídeos ou arquivo de manifesto
+
+    Returns:
+        Lista ordenada (diretório) ou na ordem do manifesto, sem repetições
+    """
+    source_path = Path(source)
+    if source_path.is_dir():
+        videos = sorted(str(path) for path in source_path.iterdir()
+                        if path.is_file() and path.suffix.lower() in VIDEO_EXTENSIONS)
+    else:
+        videos = []
+        with open(source_path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                path = Path(line)
+                if not path.is_absolute():
+                    path = source_path.parent / path
+                videos.append(str(path))
+    return list(dict.fromkeys(videos))
+
+def _init_worker(storage_dir: str, storage_format: str, fingerprint_mode: str,
+                 extraction_params: ExtractionParams, pose_index: bool = False) -> None:
+    """Inicializa o processo worker: o MediaPipe é carregado uma única vez por processo."""
+    init_extraction_worker(_worker_state, storage_dir, storage_format, fingerprint_mode,
+                           extraction_params, pose_index)
+
+def _extract_worker(video_path: str) -> Tuple[str, bool, str]:
+    """
+    Extrai e grava os dados de pose de um vídeo no processo worker.
+
+    Args:
+        video_path: Caminho do vídeo
+
+    Returns:
+        Tupla (video_path, sucesso, mensagem de erro)
+    """
+    storage = _worker_state["storage"]
+    extractor = _worker_state["extractor"]
+    try:
+        # O extrator do worker é reaproveitado: descarta o rastreamento do vídeo anterior
+        extractor.reset()
+        frames = extractor.iter_video(video_path)
+        success = storage.save_pose_stream(
+            video_path=video_path,
+            fps=extractor.get_fps(),
+            resolution=extractor.get_resolution(),
+            total_frames=extractor.get_total_frames(),
+            frames=frames
+        )
+        return video_path, success, "" if success else "Falha ao extrair dados de pose"
+    except Exception as e:
+        return video_path, False, str(e)
+
+@dataclass
+class BatchResult:
+    """Resultado da comparação de um candidato com a referência."""
+    video_path: str
+    status: str  # "ok" ou "error"
+    global_score: Optional[float] = None
+    overall_metrics: Optional[Dict[str, float]] = None
+    frames_compared: int = 0
+    error: str = ""
+
+    def to_row(self, reference_path: str) -> Dict[str, str]:
+        """Converte o resultado em uma linha da tabela de resumo."""
+        metrics = self.overall_metrics or {}
+
+        def fmt(value: Optional[float]) -> str:
+            return "" if value is None else f"{value:.6f}"
+
+        return {
+            "reference": reference_path,
+            "video": self.video_path,
+            "status": self.status,
+            "global_score": fmt(self.global_score),
+            "average_similarity": fmt(metrics.get("average_similarity")),
+            "min_similarity": fmt(metrics.get("min_similarity")),
+            "max_similarity": fmt(metrics.get("max_similarity")),
+            "std_similarity": fmt(metrics.get("std_similarity")),
+            "frames_compared": str(self.frames_compared),
+            "error": self.error
+        }
+
+def completed_videos(summary_path: str, reference_path: str) -> Set[str]:
+    """
+    Retorna os candidatos já comparados com sucesso em uma execução anterior.
+
+    Args:
+        summary_path: Tabela de resumo (CSV)
+        reference_path: Vídeo de referência da execução atual
+
+    Returns:
+        Conjunto de caminhos com status "ok" para a mesma referência
+    """
+    if not os.path.exists(summary_path):
+        return set()
+    with open(summary_path, "r", newline="") as f:
+        return {
+            row["video"] for row in csv.DictReader(f)
+            if row.get("status") == "ok" and row.get("reference") == reference_path
+        }
+
+class BatchComparator:
+    """
+    Compara vários vídeos candidatos com um único vídeo de referência.
+
+    Os vídeos sem dados de pose no armazenamento são extraídos em um pool de
+    processos, em que cada worker carrega o MediaPipe uma única vez e processa
+    vídeos inteiros. O track da referência é carregado uma única vez e cada
+    candidato é comparado com ele. Cada resultado é anexado à tabela de resumo
+    assim que fica pronto, de forma que uma execução interrompida pode ser
+    retomada: os candidatos já presentes no resumo são pulados, e os dados de
+    pose e comparações já calculados são reaproveitados do armazenamento.
+    """
+
+    def __init__(self, reference_path: str, storage_dir: str = "data/pose",
+                 storage_format: str = "json", fingerprint_mode: str = "full",
+                 extraction_params: Optional[ExtractionParams] = None,
+                 comparison_params: Optional[ComparisonParams] = None,
+                 workers: int = 1, pose_index: bool = False):
+        """
+        Inicializa o comparador em lote.
+
+        Args:
+            reference_path: Vídeo de referência
+            storage_dir: Diretório de armazenamento dos dados de pose
+            storage_format: Formato dos novos dados de pose ("json" ou "npy")
+            fingerprint_mode: Identificação dos vídeos ("full" ou "sampled")
+            extraction_params: Parâmetros de extração (num_workers é ignorado: cada
+                worker processa um vídeo inteiro)
+            comparison_params: Parâmetros de comparação
+            workers: Número de vídeos extraídos em paralelo
+            pose_index: Se True, os vídeos extraídos são inseridos no índice de poses
+        """
+        if workers < 1:
+            raise ValueError("workers deve ser maior ou igual a 1")
+        self.reference_path = reference_path
+        self.storage_dir = str(storage_dir)
+        self.storage_format = storage_format
+        self.fingerprint_mode = fingerprint_mode
+        self.extraction_params = replace(extraction_params or ExtractionParams(), num_workers=1)
+        self.workers = workers
+        self.pose_index = pose_index
+        self.storage = PoseStorage(self.storage_dir, storage_format=storage_format,
+                                   fingerprint_mode=fingerprint_mode, pose_index=pose_index)
+        self.comparador = ComparadorMovimento(comparison_params=comparison_params)
+        self._reference = None
+
+    def extract_missing(self, videos: List[str]) -> Dict[str, str]:
+        """
+        Extrai os dados de pose dos vídeos que ainda não estão no armazenamento.
+
+        Args:
+            videos: Caminhos dos vídeos
+
+        Returns:
+            Dicionário vídeo -> mensagem de erro dos vídeos cuja extração falhou
+        """
+        errors = {}
+        missing = []
+        for video_path in videos:
+            try:
+                if not self.storage.has_pose_data(video_path):
+                    missing.append(video_path)
+            except OSError as e:
+                errors[video_path] = str(e)
+        if not missing:
+            return errors
+
+        logger.info(f"Extraindo poses de {len(missing)} vídeo(s) com {self.workers} worker(s)")
+        init_args = (self.storage_dir, self.storage_format, self.fingerprint_mode,
+                     self.extraction_params, self.pose_index)
+        if self.workers == 1:
+            _init_worker(*init_args)
+            try:
+                outcomes = [_extract_worker(video_path) for video_path in missing]
+            finally:
+                _worker_state["finalizer"]()
+                _worker_state.clear()
+        else:
+            # spawn evita herdar o estado do MediaPipe do processo pai
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(missing)), mp_context=context,
+                                     initializer=_init_worker, initargs=init_args) as executor:
+                futures = {executor.submit(_extract_worker, video_path): video_path
+                           for video_path in missing}
+                outcomes = []
+                for future in as_completed(futures):
+                    try:
+                        outcomes.append(future.result())
+                    except Exception as e:
+                        # Ex.: worker encerrado abruptamente (BrokenProcessPool)
+                        outcomes.append((futures[future], False, str(e)))
+                    logger.info(f"Extração {len(outcomes)}/{len(missing)}: {outcomes[-1][0]}")
+
+        for video_path, success, error in outcomes:
+            if not success:
+                logger.error(f"Falha ao extrair {video_path}: {error}")
+                errors[video_path] = error
+        return errors
+
+    def _load_track(self, video_path: str) -> Tuple[PoseTrack, Tuple[int, int]]:
+        """Carrega o track denso (float64) e a resolução de um vídeo armazenado."""
+        pose_data = self.storage.load_pose_data(video_path)
+        if pose_data is None:
+            raise ValueError(f"Dados de pose não encontrados para: {video_path}")
+        track = PoseTrack.from_pose_data(pose_data, dtype=np.float64).to_dense()
+        return track, pose_data.resolution
+
+    def compare_candidate(self, video_path: str) -> BatchResult:
+        """
+        Compara um candidato com a referência (usando o cache de resultados).
+
+        Args:
+            video_path: Caminho do candidato
+
+        Returns:
+            BatchResult com o score ou o erro
+        """
+        try:
+            cache_params = self.comparador.cache_params()
+            results = self.storage.load_comparison_results(
+                self.reference_path, video_path,
+                params=cache_params, comparator_version=self.comparador.version
+            )
+            if results is None:
+                if self._reference is None:
+                    self._reference = self._load_track(self.reference_path)
+                reference_track, reference_resolution = self._reference
+                track, resolution = self._load_track(video_path)
+                results = self.comparador.compare_tracks(
+                    reference_track, track,
+                    video1_resolution=reference_resolution,
+                    video2_resolution=resolution
+                )
+                results.video1_path = self.reference_path
+                results.video2_path = video_path
+                self.storage.save_comparison_results(
+                    self.reference_path, video_path, results,
+                    params=cache_params, comparator_version=self.comparador.version
+                )
+            return BatchResult(video_path, "ok", results.global_score, dict(results.overall_metrics),
+                               len(results.frame_scores))
+        except Exception as e:
+            logger.error(f"Erro ao comparar {video_path}: {str(e)}")
+            return BatchResult(video_path, "error", error=str(e))
+
+    def run(self, candidates: List[str], summary_path: str) -> List[BatchResult]:
+        """
+        Extrai, compara e registra todos os candidatos.
+
+        Args:
+            candidates: Caminhos dos vídeos candidatos
+            summary_path: Tabela de resumo (CSV); se já existir, a execução é retomada
+
+        Returns:
+            Resultados dos candidatos processados nesta execução
+        """
+        done = completed_videos(summary_path, self.reference_path)
+        pending = [video_path for video_path in candidates
+                   if video_path != self.reference_path and video_path not in done]
+        if done:
+            logger.info(f"Retomando lote: {len(done)} candidato(s) já comparado(s)")
+
+        errors = self.extract_missing([self.reference_path] + pending)
+        if self.reference_path in errors:
+            raise RuntimeError(f"Falha ao extrair a referência: {errors[self.reference_path]}")
+
+        results = []
+        with _open_summary(summary_path) as (f, writer):
+            for position, video_path in enumerate(pending, 1):
+                if video_path in errors:
+                    result = BatchResult(video_path, "error", error=errors[video_path])
+                else:
+                    result = self.compare_candidate(video_path)
+                writer.writerow(result.to_row(self.reference_path))
+                # Grava cada linha imediatamente para que uma interrupção não perca resultados
+                f.flush()
+                os.fsync(f.fileno())
+                results.append(result)
+                logger.info(f"Comparação {position}/{len(pending)}: {video_path} ({result.status})")
+        return results
+
+@contextmanager
+def _open_summary(summary_path: str) -> Iterator[Tuple[TextIO, csv.DictWriter]]:
+    """Abre a tabela de resumo para anexar linhas, escrevendo o cabeçalho se necessário."""
+    exists = os.path.exists(summary_path) and os.path.getsize(summary_path) > 0
+    needs_newline = False
+    if exists:
+        # Uma linha incompleta (interrupção durante a escrita) é terminada antes de anexar
+        with open(summary_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) not in (b"\n", b"\r")
+    with open(summary_path, "a", newline="") as f:
+        if needs_newline:
+            f.write("\r\n")
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        if not exists:
+            writer.writeheader()
+        yield f, writer
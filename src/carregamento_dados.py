@@ -1,5 +1,5 @@
 import logging
-from typing import Tuple, Optional, Dict, List
+from typing import Callable, Tuple, Optional, Dict, List
 from pathlib import Path
 import numpy as np
 from dataclasses import dataclass
@@ -113,13 +113,20 @@ class PoseDataLoader:
             warnings=warnings
         )
 
-    def load_pose_data(self, video_path1: str, video_path2: str) -> Tuple[Optional[PoseData], Optional[PoseData], PoseDataValidationResult]:
+    def load_pose_data(self, video_path1: str, video_path2: str,
+                       start_time: Optional[float] = None,
+                       end_time: Optional[float] = None) -> Tuple[Optional[PoseData], Optional[PoseData], PoseDataValidationResult]:
         """
         Carrega e valida os dados de pose de dois vídeos.
         
+        Com start_time ou end_time, apenas os frames com timestamp no intervalo
+        [start_time, end_time) são lidos do disco (ver PoseStorage.load_frames).
+        
         Args:
             video_path1: Caminho do primeiro vídeo
             video_path2: Caminho do segundo vídeo
+            start_time: Início do intervalo em segundos (opcional)
+            end_time: Fim do intervalo em segundos, exclusivo (opcional)
             
         Returns:
             Tuple contendo:
@@ -128,9 +135,13 @@ class PoseDataLoader:
             - Resultado da validação
         """
         try:
-            # Carrega os dados
-            data1 = self.storage.load_pose_data(video_path1)
-            data2 = self.storage.load_pose_data(video_path2)
+            # Carrega os dados (apenas o intervalo pedido, se houver)
+            if start_time is None and end_time is None:
+                data1 = self.storage.load_pose_data(video_path1)
+                data2 = self.storage.load_pose_data(video_path2)
+            else:
+                data1 = self.storage.load_pose_data_range(video_path1, start_time, end_time)
+                data2 = self.storage.load_pose_data_range(video_path2, start_time, end_time)
             
             if not data1 or not data2:
                 return None, None, PoseDataValidationResult(
@@ -168,3 +179,79 @@ class PoseDataLoader:
                 [f"Erro ao carregar dados: {str(e)}"],
                 []
             )
+
+    def frame_loader(self, video_path1: str, video_path2: str
+                     ) -> Tuple[Optional[Callable[[int, int], List[Dict]]], int]:
+        """
+        Cria uma função que carrega sob demanda os frames dos dois vídeos para o visualizador.
+        
+        A função recebe um intervalo de índices [start, stop) e lê do disco
+        apenas os frames correspondentes de cada vídeo, no formato de frame
+        usado pelos relatórios (reference_pose, comparison_pose e metrics).
+        O índice i corresponde ao frame i de cada vídeo.
+        
+        Args:
+            video_path1: Caminho do vídeo de referência
+            video_path2: Caminho do vídeo comparado
+            
+        Returns:
+            Tupla (função de carregamento, número de frames), ou (None, 0) se
+            os dados de um dos vídeos não forem encontrados
+        """
+        info1 = self.storage.load_pose_info(video_path1)
+        info2 = self.storage.load_pose_info(video_path2)
+        if info1 is None or info2 is None:
+            return None, 0
+        # Sem FPS válido os índices não podem ser convertidos em timestamps
+        fps1 = info1["fps"] if info1["fps"] > 0 else None
+        fps2 = info2["fps"] if info2["fps"] > 0 else None
+        for video_path, fps in ((video_path1, fps1), (video_path2, fps2)):
+            if fps is None:
+                logger.warning(f"FPS inválido nos dados de {video_path}; os frames serão filtrados pelo número")
+            
+        def load(start: int, stop: int) -> List[Dict]:
+            frames1 = self._frames_by_index(video_path1, fps1, start, stop)
+            frames2 = self._frames_by_index(video_path2, fps2, start, stop)
+            return [
+                {
+                    'reference_pose': _report_pose(frames1.get(i)),
+                    'comparison_pose': _report_pose(frames2.get(i)),
+                    'metrics': {
+                        'reference_visibility': _mean_visibility(frames1.get(i)),
+                        'comparison_visibility': _mean_visibility(frames2.get(i))
+                    }
+                }
+                for i in range(start, stop)
+            ]
+            
+        return load, min(info1["total_frames"], info2["total_frames"])
+
+    def _frames_by_index(self, video_path: str, fps: Optional[float], start: int, stop: int
+                         ) -> Dict[int, PoseFrame]:
+        """
+        Carrega os frames [start, stop) de um vídeo, indexados pelo número do frame.
+
+        Sem FPS (None), todos os frames do vídeo são carregados e filtrados pelo número.
+        """
+        if fps is None:
+            frames = self.storage.load_frames(video_path) or []
+        else:
+            # Meio frame de margem evita perder frames por arredondamento dos timestamps
+            frames = self.storage.load_frames(video_path, (start - 0.5) / fps, (stop - 0.5) / fps) or []
+        return {frame.frame_number: frame for frame in frames if start <= frame.frame_number < stop}
+
+def _report_pose(frame: Optional[PoseFrame]) -> Dict:
+    """Converte um frame armazenado na pose do formato de relatório (keypoints x, y)."""
+    if frame is None or not frame.landmarks:
+        return {'keypoints': np.empty((0, 2)), 'connections': []}
+    ids = sorted(frame.landmarks)
+    return {
+        'keypoints': np.array([[frame.landmarks[i].x, frame.landmarks[i].y] for i in ids]),
+        'connections': []
+    }
+
+def _mean_visibility(frame: Optional[PoseFrame]) -> float:
+    """Visibilidade média dos landmarks de um frame (0 sem pose)."""
+    if frame is None or not frame.landmarks:
+        return 0.0
+    return float(np.mean([landmark.visibility for landmark in frame.landmarks.values()]))
@@ -1,4 +1,5 @@
 import numpy as np
+from functools import partial
 from typing import Dict, List, Tuple, Optional, Union
 import logging
 from dataclasses import dataclass
@@ -9,8 +10,11 @@ import mediapipe as mp
 from datetime import datetime
 
 from .comparison_params import ComparisonParams, DistanceMetric
-from .comparison_results import ComparisonResults, DanceComparison
+from .comparison_results import ComparisonResults, DanceComparison, FrameComparisonTable
+from .dtw import DTWResult, RowCostFunction, SubsequenceMatch, align_sequences, subsequence_dtw
+from .landmark_comparison import LandmarkComparison
 from .pose_models import PoseLandmark
+from .pose_track import PoseTrack, NUM_LANDMARKS
 
 # Configuração do logging
 logging.basicConfig(
@@ -19,6 +23,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Versão do algoritmo de comparação (faz parte da chave do cache de resultados)
+COMPARATOR_VERSION = "1.2.0"
+
+# Id de cada landmark do MediaPipe Pose pelo nome (ex: "left_shoulder" -> 11)
+LANDMARK_IDS = {landmark.name.lower(): landmark.value for landmark in mp.solutions.pose.PoseLandmark}
+
 @dataclass
 class FrameData:
     """Classe para armazenar dados de um frame."""
@@ -32,14 +42,59 @@ class FrameData:
         self.confidence = self.confidence.astype(np.float64)
 
 class ComparadorMovimento:
-    def __init__(self, min_visibility: float = 0.5):
+    version = COMPARATOR_VERSION
+
+    def __init__(self, min_visibility: float = 0.5,
+                 comparison_params: Optional[ComparisonParams] = None):
         """
         Inicializa o comparador de movimento.
         
         Args:
             min_visibility: Visibilidade mínima para considerar um landmark válido
+            comparison_params: Parâmetros de comparação (padrão: ComparisonParams())
         """
         self.min_visibility = min_visibility
+        self.comparison_params = comparison_params or ComparisonParams()
+        
+    def cache_params(self, video1_landmark_weights: Optional[Dict[str, float]] = None,
+                     video2_landmark_weights: Optional[Dict[str, float]] = None) -> Dict:
+        """
+        Retorna todos os parâmetros que afetam o resultado de uma comparação.
+        
+        Usado para compor a chave do cache de resultados: qualquer mudança nos
+        parâmetros ou nos pesos gera uma chave diferente.
+        
+        Args:
+            video1_landmark_weights: Pesos dos landmarks do primeiro vídeo
+            video2_landmark_weights: Pesos dos landmarks do segundo vídeo
+            
+        Returns:
+            Dicionário serializável em JSON com os parâmetros
+        """
+        return {
+            "comparison_params": self.comparison_params.to_dict(),
+            "min_visibility": self.min_visibility,
+            "video1_landmark_weights": video1_landmark_weights,
+            "video2_landmark_weights": video2_landmark_weights
+        }
+        
+    def landmark_cache_params(self) -> Dict:
+        """
+        Retorna os parâmetros que afetam os arrays de LandmarkComparison.
+        
+        Os pesos dos landmarks e a tolerância não fazem parte da chave: mudá-los
+        reaproveita os arrays armazenados (ver prepare_tracks e rescore).
+        
+        Returns:
+            Dicionário serializável em JSON com os parâmetros
+        """
+        comparison_params = self.comparison_params.to_dict()
+        for key in ("landmark_weights", "tolerance"):
+            comparison_params.pop(key)
+        return {
+            "comparison_params": comparison_params,
+            "min_visibility": self.min_visibility
+        }
         
     def compare_videos(self, video1_landmarks: List[Optional[Dict[int, PoseLandmark]]],
                       video2_landmarks: List[Optional[Dict[int, PoseLandmark]]],
@@ -68,12 +123,6 @@ class ComparadorMovimento:
         if not video1_landmarks or not video2_landmarks:
             raise ValueError("Listas de landmarks não podem estar vazias")
             
-        # Prepara os pesos dos landmarks
-        if video1_landmark_weights is None:
-            video1_landmark_weights = {str(i): 1.0 for i in range(33)}
-        if video2_landmark_weights is None:
-            video2_landmark_weights = {str(i): 1.0 for i in range(33)}
-            
         # Calcula o número de frames processados
         video1_processed_frames = sum(1 for frame in video1_landmarks if frame is not None)
         video2_processed_frames = sum(1 for frame in video2_landmarks if frame is not None)
@@ -82,76 +131,456 @@ class ComparadorMovimento:
         video1_landmarks_per_frame = len(next(frame for frame in video1_landmarks if frame is not None))
         video2_landmarks_per_frame = len(next(frame for frame in video2_landmarks if frame is not None))
         
-        # Compara os frames
-        frame_comparisons = []
-        frame_scores = []
-        for frame_number, (frame1, frame2) in enumerate(zip(video1_landmarks, video2_landmarks)):
-            if frame1 is None or frame2 is None:
-                continue
-                
-            # Verifica se todos os landmarks têm visibilidade menor que min_visibility
-            all_low_visibility1 = all(l.visibility < self.min_visibility for l in frame1.values())
-            all_low_visibility2 = all(l.visibility < self.min_visibility for l in frame2.values())
-            
-            if all_low_visibility1 or all_low_visibility2:
-                continue
-                
-            # Calcula a similaridade entre os frames
-            similarity_score, landmark_similarities = self._compare_frames(
-                frame1, frame2,
-                video1_landmark_weights,
-                video2_landmark_weights
-            )
+        # Empilha os landmarks em arrays (T, num_landmarks, 4), com NaN para ausentes
+        num_landmarks = max(NUM_LANDMARKS, _max_landmark_id(video1_landmarks) + 1,
+                            _max_landmark_id(video2_landmarks) + 1)
+        track1 = PoseTrack.from_landmarks(video1_landmarks, video1_fps, num_landmarks, dtype=np.float64)
+        track2 = PoseTrack.from_landmarks(video2_landmarks, video2_fps, num_landmarks, dtype=np.float64)
+        
+        return self.compare_tracks(
+            track1, track2,
+            video1_resolution=video1_resolution,
+            video2_resolution=video2_resolution,
+            video1_landmark_weights=video1_landmark_weights,
+            video2_landmark_weights=video2_landmark_weights,
+            video1_processed_frames=video1_processed_frames,
+            video2_processed_frames=video2_processed_frames,
+            video1_landmarks_per_frame=video1_landmarks_per_frame,
+            video2_landmarks_per_frame=video2_landmarks_per_frame
+        )
+
+    def compare_tracks(self, track1: PoseTrack, track2: PoseTrack,
+                       video1_resolution: Tuple[int, int],
+                       video2_resolution: Tuple[int, int],
+                       video1_landmark_weights: Optional[Dict[str, float]] = None,
+                       video2_landmark_weights: Optional[Dict[str, float]] = None,
+                       video1_processed_frames: Optional[int] = None,
+                       video2_processed_frames: Optional[int] = None,
+                       video1_landmarks_per_frame: Optional[int] = None,
+                       video2_landmarks_per_frame: Optional[int] = None) -> ComparisonResults:
+        """
+        Compara dois vídeos representados como PoseTrack densos (uma linha por frame).
+        
+        Args:
+            track1: Track do primeiro vídeo
+            track2: Track do segundo vídeo
+            video1_resolution: Resolução do primeiro vídeo (width, height)
+            video2_resolution: Resolução do segundo vídeo (width, height)
+            video1_landmark_weights: Pesos dos landmarks do primeiro vídeo
+            video2_landmark_weights: Pesos dos landmarks do segundo vídeo
+            video1_processed_frames: Frames com landmarks no primeiro vídeo (padrão: frames válidos)
+            video2_processed_frames: Frames com landmarks no segundo vídeo (padrão: frames válidos)
+            video1_landmarks_per_frame: Landmarks por frame do primeiro vídeo (padrão: primeiro frame válido)
+            video2_landmarks_per_frame: Landmarks por frame do segundo vídeo (padrão: primeiro frame válido)
             
-            # Calcula as métricas de alinhamento
-            alignment_metrics = self._calculate_alignment_metrics(frame1, frame2)
+        Returns:
+            ComparisonResults: Resultados da comparação
+        """
+        weights = self._weight_vector(video1_landmark_weights or {}, video2_landmark_weights or {},
+                                      max(track1.num_landmarks, track2.num_landmarks))
+        comparison = self.prepare_tracks(
+            track1, track2, video1_resolution, video2_resolution,
+            alignment_weights=weights,
+            video1_processed_frames=video1_processed_frames,
+            video2_processed_frames=video2_processed_frames,
+            video1_landmarks_per_frame=video1_landmarks_per_frame,
+            video2_landmarks_per_frame=video2_landmarks_per_frame
+        )
+        return self.rescore(comparison, video1_landmark_weights, video2_landmark_weights)
+
+    def prepare_tracks(self, track1: PoseTrack, track2: PoseTrack,
+                       video1_resolution: Tuple[int, int],
+                       video2_resolution: Tuple[int, int],
+                       alignment_weights: Optional[np.ndarray] = None,
+                       video1_processed_frames: Optional[int] = None,
+                       video2_processed_frames: Optional[int] = None,
+                       video1_landmarks_per_frame: Optional[int] = None,
+                       video2_landmarks_per_frame: Optional[int] = None) -> LandmarkComparison:
+        """
+        Executa a parte da comparação que não depende dos pesos nem da tolerância.
+        
+        Alinha os tracks (com DTW, se configurado) e calcula a similaridade de
+        cada landmark em cada par de frames alinhado. O resultado pode ser
+        armazenado (PoseStorage.save_landmark_comparison) e pontuado com
+        quaisquer pesos por rescore, sem recalcular as distâncias.
+        
+        Args:
+            track1: Track do primeiro vídeo
+            track2: Track do segundo vídeo
+            video1_resolution: Resolução do primeiro vídeo (width, height)
+            video2_resolution: Resolução do segundo vídeo (width, height)
+            alignment_weights: Pesos dos landmarks no custo do DTW (padrão: 1.0 para
+                todos, o que torna o alinhamento independente dos pesos do score)
+            video1_processed_frames: Frames com landmarks no primeiro vídeo (padrão: frames válidos)
+            video2_processed_frames: Frames com landmarks no segundo vídeo (padrão: frames válidos)
+            video1_landmarks_per_frame: Landmarks por frame do primeiro vídeo (padrão: primeiro frame válido)
+            video2_landmarks_per_frame: Landmarks por frame do segundo vídeo (padrão: primeiro frame válido)
             
-            # Cria o objeto de comparação do frame
-            frame_comparison = DanceComparison(
-                frame_number=frame_number,
-                timestamp=frame_number / video1_fps,
-                similarity_score=float(similarity_score),
-                landmark_similarities=landmark_similarities,
-                alignment_metrics=alignment_metrics
-            )
+        Returns:
+            LandmarkComparison com os arrays por par de frames e por landmark
+        """
+        num_landmarks = max(track1.num_landmarks, track2.num_landmarks)
+        if alignment_weights is None:
+            alignment_weights = np.ones(num_landmarks)
+        
+        params = self.comparison_params
+        temporal_alignment = {}
+        if params.metric == DistanceMetric.DTW and params.temporal_sync:
+            # Alinha as sequências com DTW e compara os frames correspondentes
+            idx1, idx2, temporal_alignment = self._align_tracks(track1, track2, alignment_weights)
+        else:
+            # Compara os frames de mesmo índice
+            idx1 = idx2 = np.arange(min(len(track1), len(track2)))
+        arrays = self._landmark_arrays(track1.data, track2.data, idx1, idx2, num_landmarks)
+        
+        return LandmarkComparison(
+            frames1=arrays["frames1"],
+            frames2=arrays["frames2"],
+            similarities=arrays["similarities"],
+            translations=arrays["translations"],
+            scales=arrays["scales"],
+            temporal_alignment=temporal_alignment,
+            video_info={
+                "video1_fps": track1.fps,
+                "video2_fps": track2.fps,
+                "video1_resolution": video1_resolution,
+                "video2_resolution": video2_resolution,
+                "video1_total_frames": len(track1),
+                "video2_total_frames": len(track2),
+                "video1_processed_frames": (int(track1.valid.sum()) if video1_processed_frames is None
+                                            else video1_processed_frames),
+                "video2_processed_frames": (int(track2.valid.sum()) if video2_processed_frames is None
+                                            else video2_processed_frames),
+                "video1_landmarks_per_frame": (_landmarks_per_frame(track1) if video1_landmarks_per_frame is None
+                                               else video1_landmarks_per_frame),
+                "video2_landmarks_per_frame": (_landmarks_per_frame(track2) if video2_landmarks_per_frame is None
+                                               else video2_landmarks_per_frame)
+            }
+        )
+
+    def rescore(self, comparison: LandmarkComparison,
+                video1_landmark_weights: Optional[Dict[str, float]] = None,
+                video2_landmark_weights: Optional[Dict[str, float]] = None,
+                tolerance: Optional[float] = None) -> ComparisonResults:
+        """
+        Pontua uma comparação preparada com os pesos e a tolerância informados.
+        
+        É apenas uma redução ponderada sobre os arrays de prepare_tracks: mudar
+        os pesos ou a tolerância não recalcula distâncias nem o alinhamento.
+        
+        Args:
+            comparison: Resultado de prepare_tracks
+            video1_landmark_weights: Pesos dos landmarks do primeiro vídeo (id ou nome do landmark)
+            video2_landmark_weights: Pesos dos landmarks do segundo vídeo
+            tolerance: Tolerância de similaridade (padrão: a de comparison_params)
             
-            frame_comparisons.append(frame_comparison)
-            frame_scores.append(float(similarity_score))
+        Returns:
+            ComparisonResults: Resultados da comparação
+        """
+        # Prepara os pesos dos landmarks
+        if video1_landmark_weights is None:
+            video1_landmark_weights = {str(i): 1.0 for i in range(33)}
+        if video2_landmark_weights is None:
+            video2_landmark_weights = {str(i): 1.0 for i in range(33)}
+        if tolerance is None:
+            tolerance = self.comparison_params.tolerance
             
+        weights = self._weight_vector(video1_landmark_weights, video2_landmark_weights,
+                                      comparison.num_landmarks)
+        scores = _weighted_scores(comparison.similarities, weights)
+        
+        video1_fps = comparison.video_info["video1_fps"]
+        frame_comparisons = self._build_frame_comparisons({
+            "frames1": comparison.frames1,
+            "scores": scores,
+            "similarities": comparison.similarities,
+            "translations": comparison.translations,
+            "scales": comparison.scales
+        }, video1_fps)
+        frame_scores = scores.tolist()
+        
         # Calcula as métricas gerais
-        overall_metrics = self._calculate_overall_metrics(frame_comparisons)
+        overall_metrics = self._overall_metrics_from_arrays(
+            scores, comparison.translations, np.zeros_like(comparison.translations),
+            comparison.scales, tolerance
+        )
         
         # Calcula o score global
         global_score = float(np.mean(frame_scores)) if frame_scores else 0.0
         
         # Cria o objeto de resultados
-        results = ComparisonResults(
+        return ComparisonResults(
             video1_path="",  # Será preenchido pelo chamador
             video2_path="",  # Será preenchido pelo chamador
-            video1_fps=video1_fps,
-            video2_fps=video2_fps,
-            video1_resolution=video1_resolution,
-            video2_resolution=video2_resolution,
-            video1_total_frames=len(video1_landmarks),
-            video2_total_frames=len(video2_landmarks),
-            video1_processed_frames=video1_processed_frames,
-            video2_processed_frames=video2_processed_frames,
-            video1_landmarks_per_frame=video1_landmarks_per_frame,
-            video2_landmarks_per_frame=video2_landmarks_per_frame,
+            **comparison.video_info,
             video1_landmark_weights=video1_landmark_weights,
             video2_landmark_weights=video2_landmark_weights,
             frame_comparisons=frame_comparisons,
             overall_metrics=overall_metrics,
             global_score=global_score,
             frame_scores=frame_scores,
+            temporal_alignment=dict(comparison.temporal_alignment),
             metadata={
                 "comparison_date": datetime.now().isoformat(),
                 "comparison_duration": len(frame_comparisons) / video1_fps,
-                "comparison_version": "1.0.0"
+                "comparison_version": COMPARATOR_VERSION
             }
         )
+
+    def _align_tracks(self, track1: PoseTrack, track2: PoseTrack,
+                      weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray, Dict]:
+        """
+        Alinha temporalmente dois tracks com DTW.
+        
+        O custo de cada par de frames é 1 - similaridade ponderada (a mesma usada
+        no score dos frames). O caminho de alinhamento é reduzido a um frame do
+        segundo vídeo por frame do primeiro (o de menor custo no caminho).
         
-        return results
+        No modo "subsequence", o primeiro track (um trecho curto) é localizado em
+        qualquer ponto do segundo e o alinhamento inclui o início e o fim do trecho
+        encontrado (ver find_subsequence).
+        
+        Args:
+            track1: Track do primeiro vídeo
+            track2: Track do segundo vídeo
+            weights: Peso de cada landmark
+            
+        Returns:
+            Tupla (idx1, idx2, temporal_alignment) com os índices dos frames
+            correspondentes e os detalhes do alinhamento
+        """
+        params = self.comparison_params
+        cost_fn = partial(self._pair_costs, weights=weights)
+        if params.dtw_mode == "subsequence":
+            result: DTWResult = subsequence_dtw(
+                track1.data, track2.data, cost_fn,
+                row_cost_fn=self._row_cost_function(track1.data, track2.data, weights)
+            )[0]
+        else:
+            result = align_sequences(track1.data, track2.data, cost_fn,
+                                     mode=params.dtw_mode, band=params.dtw_band,
+                                     radius=params.dtw_radius)
+        path = result.path
+        
+        # Mantém, para cada frame do primeiro vídeo, o par de menor custo do caminho
+        path_costs = cost_fn(track1.data, track2.data, path[:, 0], path[:, 1])
+        order = np.lexsort((path_costs, path[:, 0]))
+        _, first = np.unique(path[order, 0], return_index=True)
+        idx1, idx2 = path[order[first], 0], path[order[first], 1]
+        
+        offsets = idx2 - idx1
+        if track1.fps > 0 and track2.fps > 0:
+            offset_seconds = float(np.median(idx2 / track2.fps - idx1 / track1.fps))
+        else:
+            offset_seconds = 0.0
+        
+        logger.info(f"Alinhamento DTW ({params.dtw_mode}): {result.cells} células avaliadas, "
+                    f"custo médio {result.normalized_distance:.4f}")
+        
+        temporal_alignment = {
+            "method": "dtw",
+            "mode": params.dtw_mode,
+            "path": path.tolist(),
+            "distance": result.distance,
+            "normalized_distance": result.normalized_distance,
+            "cells": result.cells,
+            "offset_frames": float(np.median(offsets)),
+            "offset_seconds": offset_seconds
+        }
+        if isinstance(result, SubsequenceMatch):
+            temporal_alignment.update(_match_details(result, track2.fps))
+        return idx1, idx2, temporal_alignment
+
+    def find_subsequence(self, query_track: PoseTrack, track: PoseTrack,
+                         max_matches: int = 1,
+                         landmark_weights: Optional[Dict[str, float]] = None) -> List[Dict]:
+        """
+        Localiza um trecho curto (ex.: uma frase de 4 s) dentro de um track longo.
+        
+        Usa subsequence DTW com o mesmo custo do alinhamento (1 - similaridade
+        ponderada): a varredura é exata e cada frame do trecho é comparado a todo
+        o track longo de uma vez. Para comparar o trecho com a melhor ocorrência
+        frame a frame, use compare_tracks com dtw_mode="subsequence".
+        
+        Args:
+            query_track: Track do trecho procurado
+            track: Track longo
+            max_matches: Número máximo de ocorrências (sem sobreposição)
+            landmark_weights: Pesos dos landmarks (padrão: 1.0 para todos)
+            
+        Returns:
+            Lista de dicionários (start_frame, end_frame, start_seconds,
+            end_seconds, distance, normalized_distance e score), da melhor
+            para a pior ocorrência
+        """
+        weights = self._weight_vector(landmark_weights or {}, landmark_weights or {},
+                                      max(query_track.num_landmarks, track.num_landmarks))
+        matches = subsequence_dtw(
+            query_track.data, track.data, partial(self._pair_costs, weights=weights),
+            max_matches=max_matches,
+            row_cost_fn=self._row_cost_function(query_track.data, track.data, weights)
+        )
+        return [_match_details(match, track.fps) for match in matches]
+
+    def _row_cost_function(self, data1: np.ndarray, data2: np.ndarray,
+                           weights: np.ndarray) -> RowCostFunction:
+        """
+        Cria a função de custo de um frame do primeiro vídeo contra todos os do segundo.
+        
+        Equivalente a _pair_costs(data1, data2, [i] * T2, range(T2)), mas sem
+        copiar os frames a cada linha: as distâncias vêm de |a|² + |b|² - 2a·b e
+        as somas ponderadas de produtos matriciais com a visibilidade do frame i.
+        
+        Args:
+            data1: Array (T1, num_landmarks, 4) do primeiro vídeo
+            data2: Array (T2, num_landmarks, 4) do segundo vídeo
+            weights: Peso de cada landmark
+            
+        Returns:
+            Função i -> custo de (data1[i], data2[j]) para cada j
+        """
+        num_landmarks = len(weights)
+        visible2 = data2[:, :num_landmarks, 3] >= self.min_visibility
+        coords2 = np.where(visible2[..., None], data2[:, :num_landmarks, :3], 0.0).astype(np.float64)
+        norms2 = np.einsum('tlk,tlk->tl', coords2, coords2)
+        weights2 = np.where(visible2, weights, 0.0)
+        
+        def row_costs(i: int) -> np.ndarray:
+            visible1 = (data1[i, :num_landmarks, 3] >= self.min_visibility).astype(np.float64)
+            coords1 = np.where(visible1[:, None] > 0, data1[i, :num_landmarks, :3], 0.0).astype(np.float64)
+            squared = (norms2 + np.sum(coords1 ** 2, axis=1)
+                       - 2.0 * np.einsum('tlk,lk->tl', coords2, coords1))
+            similarities = 1.0 / (1.0 + np.sqrt(np.maximum(squared, 0.0)))
+            total_weight = weights2 @ visible1
+            scores = np.divide((similarities * weights2) @ visible1, total_weight,
+                               out=np.zeros_like(total_weight), where=total_weight > 0)
+            return 1.0 - scores
+        
+        return row_costs
+
+    def _pair_costs(self, data1: np.ndarray, data2: np.ndarray,
+                    idx1: np.ndarray, idx2: np.ndarray, weights: np.ndarray) -> np.ndarray:
+        """
+        Calcula o custo de DTW (1 - similaridade ponderada) de pares de frames.
+        
+        Args:
+            data1: Array (T1, num_landmarks, 4) do primeiro vídeo
+            data2: Array (T2, num_landmarks, 4) do segundo vídeo
+            idx1: Índices dos frames do primeiro vídeo
+            idx2: Índices dos frames do segundo vídeo
+            weights: Peso de cada landmark
+            
+        Returns:
+            np.ndarray: Custo de cada par (1.0 quando não há landmarks visíveis nos dois frames)
+        """
+        num_landmarks = len(weights)
+        frames1 = data1[idx1, :num_landmarks]
+        frames2 = data2[idx2, :num_landmarks]
+        visible = (frames1[..., 3] >= self.min_visibility) & (frames2[..., 3] >= self.min_visibility)
+        
+        distances = np.sqrt(np.sum((frames1[..., :3] - frames2[..., :3]) ** 2, axis=2))
+        weighted = np.where(visible, weights / (1.0 + distances), 0.0).sum(axis=1)
+        total_weight = np.where(visible, weights, 0.0).sum(axis=1)
+        scores = np.divide(weighted, total_weight, out=np.zeros_like(total_weight),
+                           where=total_weight > 0)
+        return 1.0 - scores
+
+    def _weight_vector(self, weights1: Dict[str, float], weights2: Dict[str, float],
+                       num_landmarks: int) -> np.ndarray:
+        """
+        Converte os pesos por landmark dos dois vídeos no vetor de pesos médios.
+        
+        Args:
+            weights1: Pesos dos landmarks do primeiro vídeo (ver landmark_weight_vector)
+            weights2: Pesos dos landmarks do segundo vídeo
+            num_landmarks: Tamanho do vetor
+            
+        Returns:
+            np.ndarray: Peso (w1 + w2) / 2 de cada landmark (1.0 para landmarks sem peso)
+        """
+        return (landmark_weight_vector(weights1, num_landmarks)
+                + landmark_weight_vector(weights2, num_landmarks)) / 2
+
+    def _landmark_arrays(self, data1: np.ndarray, data2: np.ndarray,
+                         idx1: np.ndarray, idx2: np.ndarray,
+                         num_landmarks: int) -> Dict[str, np.ndarray]:
+        """
+        Compara pares de frames de dois vídeos com operações vetorizadas.
+        
+        Calcula apenas os arrays que não dependem dos pesos; os scores por
+        frame são obtidos depois com _weighted_scores (ver rescore). Os pares
+        (idx1[k], idx2[k]) em que algum dos frames não tem landmarks visíveis
+        são descartados, como no laço original por frame.
+        
+        Args:
+            data1: Array (T1, num_landmarks, 4) com x, y, z e visibility (NaN para ausentes)
+            data2: Array (T2, num_landmarks, 4)
+            idx1: Índices dos frames do primeiro vídeo
+            idx2: Índices dos frames do segundo vídeo
+            num_landmarks: Número de landmarks comparados
+            
+        Returns:
+            Dicionário com os arrays dos pares mantidos: frames1, frames2,
+            similarities (NaN onde o landmark não foi comparado), translations
+            e scales
+        """
+        idx1 = np.asarray(idx1, dtype=np.int64)
+        idx2 = np.asarray(idx2, dtype=np.int64)
+        
+        # Visibilidade por landmark (NaN, ou seja ausente, nunca é visível)
+        visible1 = data1[idx1, :num_landmarks, 3] >= self.min_visibility
+        visible2 = data2[idx2, :num_landmarks, 3] >= self.min_visibility
+        
+        # Descarta pares com todos os landmarks de algum frame abaixo da visibilidade mínima
+        keep = visible1.any(axis=1) & visible2.any(axis=1)
+        idx1, idx2 = idx1[keep], idx2[keep]
+        visible = visible1[keep] & visible2[keep]
+        coords1 = data1[idx1, :num_landmarks, :3]
+        coords2 = data2[idx2, :num_landmarks, :3]
+        
+        # Similaridade 1 / (1 + d) de cada landmark visível nos dois frames
+        distances = np.sqrt(np.sum((coords1 - coords2) ** 2, axis=2))
+        similarities = np.where(visible, 1.0 / (1.0 + distances), np.nan)
+        
+        # Métricas de alinhamento sobre todos os landmarks presentes em cada frame
+        if len(idx1):
+            center1 = np.nanmean(coords1, axis=1)
+            center2 = np.nanmean(coords2, axis=1)
+            scale1 = np.nanstd(coords1.reshape(len(idx1), -1), axis=1)
+            scale2 = np.nanstd(coords2.reshape(len(idx2), -1), axis=1)
+        else:
+            center1 = center2 = np.zeros((0, 3))
+            scale1 = scale2 = np.zeros(0)
+        scales = np.divide(scale2, scale1, out=np.ones_like(scale1), where=scale1 > 0)
+        
+        return {
+            "frames1": idx1,
+            "frames2": idx2,
+            "similarities": similarities,
+            "translations": center2 - center1,
+            "scales": scales
+        }
+
+    def _build_frame_comparisons(self, comparison: Dict[str, np.ndarray],
+                                 fps: float) -> FrameComparisonTable:
+        """
+        Cria a tabela de comparações por frame a partir dos arrays de _landmark_arrays.
+        
+        Args:
+            comparison: Arrays de _landmark_arrays com os scores de _weighted_scores (ver rescore)
+            fps: FPS do primeiro vídeo (usado no timestamp)
+            
+        Returns:
+            FrameComparisonTable com uma linha por par de frames
+        """
+        return FrameComparisonTable(
+            frame_numbers=comparison["frames1"],
+            timestamps=comparison["frames1"] / fps,
+            scores=comparison["scores"],
+            landmark_similarities=comparison["similarities"],
+            translations=comparison["translations"],
+            scales=comparison["scales"]
+        )
         
     def _compare_frames(self, frame1: Dict[int, PoseLandmark],
                        frame2: Dict[int, PoseLandmark],
@@ -260,12 +689,13 @@ class ComparadorMovimento:
             "scale": scale
         }
         
-    def _calculate_overall_metrics(self, frame_comparisons: List[DanceComparison]) -> Dict:
+    def _calculate_overall_metrics(self, frame_comparisons: Union[FrameComparisonTable,
+                                                                  List[DanceComparison]]) -> Dict:
         """
         Calcula as métricas gerais da comparação.
         
         Args:
-            frame_comparisons: Lista de comparações de frames
+            frame_comparisons: Tabela ou lista de comparações de frames
             
         Returns:
             Dict: Métricas gerais
@@ -277,42 +707,147 @@ class ComparadorMovimento:
                 "max_similarity": 0.0,
                 "std_similarity": 0.0,
                 "alignment_quality": 0.0,
-                "temporal_alignment": 0.0
+                "temporal_alignment": 0.0,
+                "within_tolerance": 0.0
             }
             
-        # Extrai as similaridades
-        similarities = [fc.similarity_score for fc in frame_comparisons]
+        # As colunas da tabela já são as similaridades e as métricas de alinhamento
+        if not isinstance(frame_comparisons, FrameComparisonTable):
+            frame_comparisons = FrameComparisonTable.from_comparisons(frame_comparisons)
+        
+        return self._overall_metrics_from_arrays(
+            frame_comparisons.scores, frame_comparisons.translations,
+            frame_comparisons.rotations, frame_comparisons.scales
+        )
+
+    def _overall_metrics_from_arrays(self, similarities: np.ndarray, translations: np.ndarray,
+                                     rotations: np.ndarray, scales: np.ndarray,
+                                     tolerance: Optional[float] = None) -> Dict:
+        """
+        Calcula as métricas gerais a partir dos arrays por frame.
         
+        Args:
+            similarities: Similaridade de cada frame
+            translations: Translação (K, 3) de cada frame
+            rotations: Rotação (K, 3) de cada frame
+            scales: Escala de cada frame
+            tolerance: Tolerância de similaridade (padrão: a de comparison_params)
+            
+        Returns:
+            Dict: Métricas gerais
+        """
+        if tolerance is None:
+            tolerance = self.comparison_params.tolerance
+        if len(similarities) == 0:
+            return {
+                "average_similarity": 0.0,
+                "min_similarity": 0.0,
+                "max_similarity": 0.0,
+                "std_similarity": 0.0,
+                "alignment_quality": 0.0,
+                "temporal_alignment": 0.0,
+                "within_tolerance": 0.0
+            }
+            
         # Calcula as métricas
         average_similarity = np.mean(similarities)
         min_similarity = np.min(similarities)
         max_similarity = np.max(similarities)
         std_similarity = np.std(similarities)
         
-        # Calcula a qualidade do alinhamento
-        alignment_qualities = [
-            np.mean([
-                abs(m["translation"][0]),
-                abs(m["translation"][1]),
-                abs(m["translation"][2]),
-                abs(m["rotation"][0]),
-                abs(m["rotation"][1]),
-                abs(m["rotation"][2]),
-                abs(1.0 - m["scale"])
-            ])
-            for fc in frame_comparisons
-            for m in [fc.alignment_metrics]
-        ]
-        alignment_quality = 1.0 - np.mean(alignment_qualities)
+        # Calcula a qualidade do alinhamento (média dos desvios de cada frame)
+        deviations = np.concatenate([
+            np.abs(translations),
+            np.abs(rotations),
+            np.abs(1.0 - scales)[:, None]
+        ], axis=1)
+        alignment_quality = 1.0 - np.mean(np.mean(deviations, axis=1))
         
         # Calcula o alinhamento temporal
         temporal_alignment = 1.0 - (std_similarity / average_similarity if average_similarity > 0 else 0.0)
         
+        # Fração dos frames com similaridade dentro da tolerância
+        within_tolerance = np.mean(similarities >= 1.0 - tolerance)
+        
         return {
             "average_similarity": float(average_similarity),
             "min_similarity": float(min_similarity),
             "max_similarity": float(max_similarity),
             "std_similarity": float(std_similarity),
             "alignment_quality": float(alignment_quality),
-            "temporal_alignment": float(temporal_alignment)
+            "temporal_alignment": float(temporal_alignment),
+            "within_tolerance": float(within_tolerance)
         }
+
+def landmark_weight_vector(landmark_weights: Dict[str, float], num_landmarks: int) -> np.ndarray:
+    """
+    Converte um dicionário de pesos no vetor de peso de cada landmark.
+    
+    As chaves podem ser o id do landmark ("11"), o nome do MediaPipe
+    ("left_shoulder") ou um grupo ("shoulder" vale para left_shoulder e
+    right_shoulder). Em caso de conflito, o id tem prioridade sobre o nome,
+    e o nome sobre o grupo.
+    
+    Args:
+        landmark_weights: Pesos dos landmarks
+        num_landmarks: Tamanho do vetor
+        
+    Returns:
+        np.ndarray: Peso de cada landmark (1.0 para landmarks sem peso)
+    """
+    weights = np.ones(num_landmarks, dtype=np.float64)
+    names = {key.lower(): value for key, value in landmark_weights.items()}
+    for name, landmark_id in LANDMARK_IDS.items():
+        if landmark_id >= num_landmarks:
+            continue
+        if name in names:
+            weights[landmark_id] = names[name]
+        else:
+            group = name.split("_", 1)[1] if name.startswith(("left_", "right_")) else None
+            if group in names:
+                weights[landmark_id] = names[group]
+    for i in range(num_landmarks):
+        if str(i) in landmark_weights:
+            weights[i] = landmark_weights[str(i)]
+    return weights
+
+def _weighted_scores(similarities: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Calcula o score ponderado de cada par de frames.
+    
+    Args:
+        similarities: Array (P, L) de similaridades (NaN onde o landmark não foi comparado)
+        weights: Peso de cada landmark
+        
+    Returns:
+        np.ndarray: Média ponderada das similaridades de cada par (0.0 sem landmarks comparados)
+    """
+    compared = ~np.isnan(similarities)
+    total_weight = np.where(compared, weights, 0.0).sum(axis=1)
+    weighted_sum = np.where(compared, similarities * weights, 0.0).sum(axis=1)
+    return np.divide(weighted_sum, total_weight, out=np.zeros_like(total_weight),
+                     where=total_weight > 0)
+
+def _match_details(match: SubsequenceMatch, fps: float) -> Dict:
+    """Converte uma ocorrência de subsequence DTW em frames e segundos do track longo."""
+    frame_time = 1.0 / fps if fps > 0 else 0.0
+    return {
+        "start_frame": match.start,
+        "end_frame": match.end,
+        "start_seconds": match.start * frame_time,
+        "end_seconds": (match.end + 1) * frame_time,
+        "distance": match.distance,
+        "normalized_distance": match.normalized_distance,
+        "score": 1.0 - match.normalized_distance
+    }
+
+def _max_landmark_id(frame_landmarks: List[Optional[Dict[int, PoseLandmark]]]) -> int:
+    """Retorna o maior id de landmark presente na lista de frames (-1 se não houver)."""
+    return max((int(max(frame)) for frame in frame_landmarks if frame), default=-1)
+
+def _landmarks_per_frame(track: PoseTrack) -> int:
+    """Retorna o número de landmarks presentes no primeiro frame válido do track."""
+    valid_rows = np.flatnonzero(track.valid)
+    if not len(valid_rows):
+        raise ValueError("O track não possui frames com landmarks")
+    return int((~np.isnan(track.data[valid_rows[0], :, 0])).sum())
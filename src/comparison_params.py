@@ -4,6 +4,8 @@ from enum import Enum
 import json
 from pathlib import Path
 
+from .dtw import DTW_MODES
+
 class DistanceMetric(Enum):
     EUCLIDEAN = "euclidean"
     DTW = "dtw"
@@ -15,6 +17,9 @@ class ComparisonParams:
     landmark_weights: Dict[str, float] = field(default_factory=dict)
     temporal_sync: bool = True
     normalize: bool = True
+    dtw_mode: str = "fast"
+    dtw_band: float = 0.1
+    dtw_radius: int = 10
 
     def __post_init__(self):
         """Valida os parâmetros após a inicialização."""
@@ -38,6 +43,13 @@ class ComparisonParams:
                 if not 0 <= weight <= 1:
                     raise ValueError("Pesos dos landmarks devem estar entre 0 e 1")
 
+        if self.dtw_mode not in DTW_MODES:
+            raise ValueError(f"Modo de DTW inválido: {self.dtw_mode}")
+        if not 0 < self.dtw_band <= 1:
+            raise ValueError("dtw_band deve estar entre 0 (exclusivo) e 1")
+        if not isinstance(self.dtw_radius, int) or self.dtw_radius < 1:
+            raise ValueError("dtw_radius deve ser um inteiro maior ou igual a 1")
+
     def to_dict(self) -> dict:
         """Converte os parâmetros para um dicionário."""
         return {
@@ -45,7 +57,10 @@ class ComparisonParams:
             "tolerance": self.tolerance,
             "landmark_weights": self.landmark_weights,
             "temporal_sync": self.temporal_sync,
-            "normalize": self.normalize
+            "normalize": self.normalize,
+            "dtw_mode": self.dtw_mode,
+            "dtw_band": self.dtw_band,
+            "dtw_radius": self.dtw_radius
         }
 
     @classmethod
@@ -75,5 +90,6 @@ class ComparisonParams:
             f"  Tolerância: {self.tolerance}\n"
             f"  Pesos dos Landmarks: {self.landmark_weights}\n"
             f"  Sincronização Temporal: {self.temporal_sync}\n"
-            f"  Normalização: {self.normalize}"
+            f"  Normalização: {self.normalize}\n"
+            f"  DTW: {self.dtw_mode} (banda: {self.dtw_band}, raio: {self.dtw_radius})"
         ) 
@@ -1,5 +1,8 @@
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Any
+from collections.abc import Sequence
+from dataclasses import dataclass, asdict, fields
+from typing import List, Dict, Any, Iterable, Optional, Union
+import base64
+import copy
 import json
 import logging
 from datetime import datetime
@@ -15,6 +18,8 @@ class ComparisonResults:
     Campos principais:
         - global_score (float): Score global de similaridade entre os vídeos.
         - frame_scores (List[float]): Scores de similaridade por frame.
+        - frame_comparisons (FrameComparisonTable): Comparação de cada frame em colunas
+          (listas de DanceComparison ou dicionários são convertidas).
         - temporal_alignment (dict): Detalhes da comparação temporal.
         - landmark_details (dict): Informações detalhadas por landmark.
         - metadata (dict): Metadados da análise (caminhos, datas, parâmetros, etc).
@@ -51,7 +56,7 @@ class ComparisonResults:
     video2_landmarks_per_frame: int = 0
     video1_landmark_weights: dict = None
     video2_landmark_weights: dict = None
-    frame_comparisons: list = None
+    frame_comparisons: 'FrameComparisonTable' = None
     overall_metrics: dict = None
     metadata: dict = None
     # Campos antigos para compatibilidade
@@ -75,7 +80,11 @@ class ComparisonResults:
         if self.video2_landmark_weights is None:
             self.video2_landmark_weights = {}
         if self.frame_comparisons is None:
-            self.frame_comparisons = []
+            self.frame_comparisons = FrameComparisonTable()
+        elif isinstance(self.frame_comparisons, dict):
+            self.frame_comparisons = FrameComparisonTable.from_dict(self.frame_comparisons)
+        elif not isinstance(self.frame_comparisons, FrameComparisonTable):
+            self.frame_comparisons = FrameComparisonTable.from_comparisons(self.frame_comparisons)
         if self.overall_metrics is None:
             self.overall_metrics = {}
         if self.metadata is None:
@@ -84,8 +93,13 @@ class ComparisonResults:
     def to_dict(self) -> Dict[str, Any]:
         """
         Serializa os resultados para um dicionário Python.
+
+        As comparações por frame são serializadas em colunas (ver FrameComparisonTable.to_dict).
         """
-        return asdict(self)
+        data = copy.deepcopy({field.name: getattr(self, field.name) for field in fields(self)
+                              if field.name != "frame_comparisons"})
+        data["frame_comparisons"] = self.frame_comparisons.to_dict()
+        return data
 
     def to_json(self) -> str:
         """
@@ -281,3 +295,168 @@ class DanceComparison:
         # Implemente a lógica para calcular o alinhamento entre dois landmarks
         # Retorne um dicionário com as métricas de alinhamento
         pass
+
+class FrameComparisonTable(Sequence):
+    """
+    Comparações por frame armazenadas em colunas (um array por campo).
+
+    Substitui a lista de DanceComparison: cada frame é uma linha dos arrays, e
+    os objetos DanceComparison só são criados quando acessados
+    (table[k], iteração). A coluna j de landmark_similarities é o landmark de
+    id j, com NaN onde o landmark não foi comparado.
+
+    Exemplo de uso:
+        >>> table = FrameComparisonTable([0, 1], [0.0, 1 / 30], [0.9, 0.8], [[0.9, np.nan], [0.8, 0.8]])
+        >>> table[1].landmark_similarities
+        {'0': 0.8, '1': 0.8}
+    """
+    __slots__ = ("frame_numbers", "timestamps", "scores", "landmark_similarities",
+                 "translations", "rotations", "scales")
+
+    def __init__(self, frame_numbers: Optional[Iterable[int]] = None,
+                 timestamps: Optional[Iterable[float]] = None,
+                 scores: Optional[Iterable[float]] = None,
+                 landmark_similarities: Optional[Iterable] = None,
+                 translations: Optional[Iterable] = None,
+                 rotations: Optional[Iterable] = None,
+                 scales: Optional[Iterable[float]] = None):
+        """
+        Inicializa a tabela.
+
+        Args:
+            frame_numbers: Número de cada frame (K,)
+            timestamps: Instante de cada frame em segundos (K,)
+            scores: Score de similaridade de cada frame (K,)
+            landmark_similarities: Similaridade (K, L) de cada landmark (NaN: não comparado)
+            translations: Translação (K, 3) de cada frame (padrão: zeros)
+            rotations: Rotação (K, 3) de cada frame (padrão: zeros)
+            scales: Escala de cada frame (K,) (padrão: 1.0)
+        """
+        self.frame_numbers = np.asarray(frame_numbers if frame_numbers is not None else [], dtype=np.int64)
+        size = len(self.frame_numbers)
+        self.timestamps = (np.zeros(size) if timestamps is None
+                           else np.asarray(timestamps, dtype=np.float64))
+        self.scores = np.zeros(size) if scores is None else np.asarray(scores, dtype=np.float64)
+        self.landmark_similarities = (np.zeros((size, 0)) if landmark_similarities is None
+                                      else _as_rows(landmark_similarities, size))
+        self.translations = np.zeros((size, 3)) if translations is None else _as_rows(translations, size, 3)
+        self.rotations = np.zeros((size, 3)) if rotations is None else _as_rows(rotations, size, 3)
+        self.scales = np.ones(size) if scales is None else np.asarray(scales, dtype=np.float64)
+        for name in ("timestamps", "scores", "scales"):
+            if len(getattr(self, name)) != size:
+                raise ValueError(f"A coluna {name} deve ter {size} linhas")
+
+    def __len__(self) -> int:
+        return len(self.frame_numbers)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union['DanceComparison', 'FrameComparisonTable']:
+        if isinstance(index, slice):
+            return FrameComparisonTable(
+                self.frame_numbers[index], self.timestamps[index], self.scores[index],
+                self.landmark_similarities[index], self.translations[index],
+                self.rotations[index], self.scales[index]
+            )
+        row = self.landmark_similarities[index]
+        landmark_ids = np.flatnonzero(~np.isnan(row))
+        return DanceComparison(
+            frame_number=int(self.frame_numbers[index]),
+            timestamp=float(self.timestamps[index]),
+            similarity_score=float(self.scores[index]),
+            landmark_similarities={str(i): s for i, s in zip(landmark_ids.tolist(), row[landmark_ids].tolist())},
+            alignment_metrics={
+                "translation": self.translations[index].tolist(),
+                "rotation": self.rotations[index].tolist(),
+                "scale": float(self.scales[index])
+            }
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FrameComparisonTable):
+            return NotImplemented
+        return all(np.array_equal(getattr(self, name), getattr(other, name), equal_nan=True)
+                   for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"FrameComparisonTable(frames={len(self)}, "
+                f"landmarks={self.landmark_similarities.shape[1]})")
+
+    def to_list(self) -> List['DanceComparison']:
+        """Cria um DanceComparison para cada frame."""
+        return list(self)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Serializa a tabela em colunas.
+
+        Cada coluna é gravada como os bytes do array em base64 (sem perda de
+        precisão, NaN inclusive), o que é muito menor e mais rápido de gerar
+        que uma lista de números em JSON.
+        """
+        return {name: _encode_array(getattr(self, name)) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FrameComparisonTable':
+        """
+        Cria a tabela a partir do dicionário de to_dict (colunas também podem ser listas).
+        """
+        columns = {}
+        for name in cls.__slots__:
+            value = data.get(name)
+            if isinstance(value, dict):
+                value = _decode_array(value)
+            elif value is not None:
+                value = np.array(value, dtype=np.float64)  # None vira NaN
+            columns[name] = value
+        return cls(**columns)
+
+    @classmethod
+    def from_comparisons(cls, comparisons: Iterable[Union['DanceComparison', Dict[str, Any]]]) -> 'FrameComparisonTable':
+        """
+        Cria a tabela a partir de uma lista de DanceComparison (ou de seus dicionários).
+
+        Args:
+            comparisons: Comparações por frame; as chaves de landmark_similarities
+                são os ids dos landmarks ("0", "1", ...)
+
+        Returns:
+            FrameComparisonTable com uma linha por comparação
+        """
+        comparisons = [DanceComparison.from_dict(c) if isinstance(c, dict) else c for c in comparisons]
+        num_landmarks = max((int(key) + 1 for c in comparisons for key in c.landmark_similarities),
+                            default=0)
+        similarities = np.full((len(comparisons), num_landmarks), np.nan)
+        for k, comparison in enumerate(comparisons):
+            for key, value in comparison.landmark_similarities.items():
+                similarities[k, int(key)] = value
+        return cls(
+            [c.frame_number for c in comparisons],
+            [c.timestamp for c in comparisons],
+            [c.similarity_score for c in comparisons],
+            similarities,
+            [c.alignment_metrics.get("translation", [0.0, 0.0, 0.0]) for c in comparisons],
+            [c.alignment_metrics.get("rotation", [0.0, 0.0, 0.0]) for c in comparisons],
+            [c.alignment_metrics.get("scale", 1.0) for c in comparisons]
+        )
+
+def _as_rows(values: Iterable, size: int, width: int = -1) -> np.ndarray:
+    """Converte uma coluna em array (size, width), aceitando listas vazias."""
+    array = np.asarray(values, dtype=np.float64)
+    if array.size == 0:
+        return np.zeros((size, max(width, 0)))
+    return array.reshape(size, width)
+
+def _encode_array(array: np.ndarray) -> Dict[str, Any]:
+    """Serializa um array como dtype, shape e bytes em base64."""
+    array = np.ascontiguousarray(array)
+    return {
+        "dtype": array.dtype.newbyteorder("<").str,
+        "shape": list(array.shape),
+        "data": base64.b64encode(array.astype(array.dtype.newbyteorder("<"), copy=False).tobytes()).decode("ascii")
+    }
+
+def _decode_array(data: Dict[str, Any]) -> np.ndarray:
+    """Recria um array serializado por _encode_array."""
+    array = np.frombuffer(base64.b64decode(data["data"]), dtype=np.dtype(data["dtype"]))
+    return array.reshape(data["shape"]).astype(array.dtype.newbyteorder("="))
@@ -0,0 +1,368 @@
+import logging
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+# Configuração do logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Modos de alinhamento suportados
+DTW_MODES = ("full", "band", "fast", "subsequence")
+
+# Número máximo de pares de frames avaliados por chamada da função de custo
+COST_CHUNK_SIZE = 16384
+
+# Função de custo: (X, Y, i, j) -> custo de cada par (X[i[k]], Y[j[k]])
+CostFunction = Callable[[np.ndarray, np.ndarray, np.ndarray, np.ndarray], np.ndarray]
+
+# Função de custo por linha: i -> custo de (X[i], Y[j]) para todo j
+RowCostFunction = Callable[[int], np.ndarray]
+
+@dataclass
+class DTWResult:
+    """Resultado de um alinhamento DTW."""
+    path: np.ndarray  # Array (k, 2) com os pares (i, j) alinhados, em ordem
+    distance: float  # Custo acumulado do caminho
+    cells: int  # Número de células da matriz de custo avaliadas
+
+    @property
+    def normalized_distance(self) -> float:
+        """Custo médio por passo do caminho."""
+        return self.distance / len(self.path) if len(self.path) else 0.0
+
+@dataclass
+class SubsequenceMatch(DTWResult):
+    """Ocorrência de uma sequência curta dentro de uma sequência longa."""
+    start: int  # Primeira linha da sequência longa no caminho
+    end: int  # Última linha da sequência longa no caminho (inclusiva)
+
+def euclidean_cost(X: np.ndarray, Y: np.ndarray, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    """
+    Custo euclidiano entre as linhas de duas sequências de features.
+
+    Args:
+        X: Sequência (n, ...) de features
+        Y: Sequência (m, ...) de features
+        i: Índices em X
+        j: Índices em Y
+
+    Returns:
+        Distância euclidiana de cada par (X[i[k]], Y[j[k]])
+    """
+    diff = (X[i] - Y[j]).reshape(len(i), -1)
+    return np.sqrt(np.sum(diff ** 2, axis=1))
+
+def coarsen_sequence(X: np.ndarray) -> np.ndarray:
+    """
+    Reduz uma sequência pela metade, tirando a média de pares de linhas consecutivas.
+
+    Valores NaN são ignorados na média (o resultado só é NaN se os dois valores forem NaN).
+
+    Args:
+        X: Sequência (n, ...) de features
+
+    Returns:
+        Sequência (ceil(n / 2), ...) de features
+    """
+    n = len(X)
+    if n % 2:
+        X = np.concatenate([X, X[-1:]])
+    pairs = X.reshape((len(X) // 2, 2) + X.shape[1:])
+    present = ~np.isnan(pairs)
+    sums = np.where(present, pairs, 0.0).sum(axis=1)
+    counts = present.sum(axis=1)
+    return np.divide(sums, counts, out=np.full(sums.shape, np.nan), where=counts > 0)
+
+def full_window(n: int, m: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Janela sem restrição: todas as colunas em todas as linhas."""
+    return np.zeros(n, dtype=np.int64), np.full(n, m, dtype=np.int64)
+
+def sakoe_chiba_window(n: int, m: int, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Janela de Sakoe-Chiba ao redor da diagonal (escalada para sequências de tamanhos diferentes).
+
+    Args:
+        n: Tamanho da primeira sequência
+        m: Tamanho da segunda sequência
+        radius: Meia-largura da banda em frames
+
+    Returns:
+        Tupla (lo, hi) com o intervalo de colunas [lo[i], hi[i]) de cada linha
+    """
+    if n == 1 or m == 1:
+        return full_window(n, m)
+    slope = (m - 1) / (n - 1)
+    # A banda precisa cobrir a inclinação para manter as linhas conectadas
+    radius = max(radius, slope, 1.0)
+    center = np.arange(n) * slope
+    lo = np.clip(np.ceil(center - radius), 0, m - 1).astype(np.int64)
+    hi = np.clip(np.floor(center + radius) + 1, 1, m).astype(np.int64)
+    return lo, hi
+
+def _expand_path_window(path: np.ndarray, n: int, m: int,
+                        radius: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Projeta um caminho da resolução reduzida para a resolução completa (FastDTW).
+
+    Cada célula (i, j) do caminho grosseiro cobre as linhas 2i..2i+1 e as
+    colunas 2j..2j+1; a janela resultante é expandida em radius células.
+
+    Args:
+        path: Caminho (k, 2) na resolução reduzida
+        n: Tamanho da primeira sequência na resolução completa
+        m: Tamanho da segunda sequência na resolução completa
+        radius: Expansão da janela em células
+
+    Returns:
+        Tupla (lo, hi) com o intervalo de colunas de cada linha
+    """
+    lo = np.full(n, m, dtype=np.int64)
+    hi = np.zeros(n, dtype=np.int64)
+    for di in (0, 1):
+        rows = np.minimum(2 * path[:, 0] + di, n - 1)
+        np.minimum.at(lo, rows, 2 * path[:, 1])
+        np.maximum.at(hi, rows, np.minimum(2 * path[:, 1] + 2, m))
+
+    # Expande a janela em radius linhas e colunas
+    lo = np.maximum(lo - radius, 0)
+    hi = np.minimum(hi + radius, m)
+    for shift in range(1, radius + 1):
+        lo[shift:] = np.minimum(lo[shift:], lo[:-shift])
+        lo[:-shift] = np.minimum(lo[:-shift], lo[shift:])
+        hi[shift:] = np.maximum(hi[shift:], hi[:-shift])
+        hi[:-shift] = np.maximum(hi[:-shift], hi[shift:])
+
+    # Garante uma janela monotônica que contém o início e o fim
+    lo = np.minimum.accumulate(lo[::-1])[::-1]
+    hi = np.maximum.accumulate(hi)
+    lo[0], hi[-1] = 0, m
+    return lo, hi
+
+def dtw(X: np.ndarray, Y: np.ndarray, cost_fn: CostFunction = euclidean_cost,
+        window: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> DTWResult:
+    """
+    Alinha duas sequências com Dynamic Time Warping restrito a uma janela.
+
+    A matriz acumulada é calculada linha a linha. A dependência horizontal
+    D[i, j] = c[i, j] + D[i, j - 1] é resolvida de forma vetorizada: com
+    S = cumsum(c[i]), D[i] = S + minimum.accumulate(a - S), em que
+    a[j] = c[i, j] + min(D[i-1, j-1], D[i-1, j]).
+
+    Args:
+        X: Sequência (n, ...) de features
+        Y: Sequência (m, ...) de features
+        cost_fn: Função de custo entre pares de linhas
+        window: Intervalos (lo, hi) de colunas por linha (padrão: matriz completa)
+
+    Returns:
+        DTWResult com o caminho ótimo dentro da janela
+    """
+    n, m = len(X), len(Y)
+    if n == 0 or m == 0:
+        raise ValueError("As sequências não podem estar vazias")
+    lo, hi = window if window is not None else full_window(n, m)
+    widths = hi - lo
+    offsets = np.concatenate([[0], np.cumsum(widths)])
+
+    # Custos de todas as células da janela, calculados em blocos
+    rows = np.repeat(np.arange(n), widths)
+    cols = np.arange(offsets[-1]) - np.repeat(offsets[:-1] - lo, widths)
+    costs = np.empty(offsets[-1], dtype=np.float64)
+    for start in range(0, len(costs), COST_CHUNK_SIZE):
+        chunk = slice(start, start + COST_CHUNK_SIZE)
+        costs[chunk] = cost_fn(X, Y, rows[chunk], cols[chunk])
+
+    # Matriz acumulada (armazenada apenas dentro da janela)
+    acc = np.empty_like(costs)
+    acc[:offsets[1]] = np.cumsum(costs[:offsets[1]])
+    for i in range(1, n):
+        row_costs = costs[offsets[i]:offsets[i + 1]]
+        # D[i-1] nas colunas lo[i]-1 .. hi[i]-1 (diagonal e vertical)
+        previous = np.full(widths[i] + 1, np.inf)
+        first, last = max(lo[i] - 1, lo[i - 1]), min(hi[i], hi[i - 1])
+        if first < last:
+            base = offsets[i - 1] - lo[i - 1]
+            previous[first - lo[i] + 1:last - lo[i] + 1] = acc[base + first:base + last]
+        best = row_costs + np.minimum(previous[:-1], previous[1:])
+        prefix = np.cumsum(row_costs)
+        acc[offsets[i]:offsets[i + 1]] = np.minimum.accumulate(best - prefix) + prefix
+
+    def value(i: int, j: int) -> float:
+        if i < 0 or j < lo[i] or j >= hi[i]:
+            return np.inf
+        return acc[offsets[i] + j - lo[i]]
+
+    # Reconstrói o caminho a partir do fim (prefere a diagonal em empates)
+    i, j = n - 1, m - 1
+    path = [(i, j)]
+    while i > 0 or j > 0:
+        candidates = ((i - 1, j - 1), (i - 1, j), (i, j - 1))
+        i, j = min(candidates, key=lambda cell: value(*cell))
+        path.append((i, j))
+    path.reverse()
+
+    return DTWResult(path=np.array(path, dtype=np.int64), distance=float(value(n - 1, m - 1)),
+                     cells=int(offsets[-1]))
+
+def banded_dtw(X: np.ndarray, Y: np.ndarray, cost_fn: CostFunction = euclidean_cost,
+               band: float = 0.1) -> DTWResult:
+    """
+    DTW restrito a uma banda de Sakoe-Chiba.
+
+    Args:
+        X: Sequência (n, ...) de features
+        Y: Sequência (m, ...) de features
+        cost_fn: Função de custo entre pares de linhas
+        band: Meia-largura da banda como fração da maior sequência
+
+    Returns:
+        DTWResult com o caminho ótimo dentro da banda
+    """
+    n, m = len(X), len(Y)
+    return dtw(X, Y, cost_fn, sakoe_chiba_window(n, m, band * max(n, m)))
+
+def fast_dtw(X: np.ndarray, Y: np.ndarray, cost_fn: CostFunction = euclidean_cost,
+             radius: int = 10, coarsen: Callable[[np.ndarray], np.ndarray] = coarsen_sequence
+             ) -> DTWResult:
+    """
+    Aproximação multi-resolução do DTW (FastDTW).
+
+    O alinhamento é calculado recursivamente em sequências reduzidas pela
+    metade e projetado para a resolução seguinte, onde o DTW é restrito a uma
+    vizinhança de radius células do caminho projetado. O custo é linear no
+    tamanho das sequências.
+
+    Args:
+        X: Sequência (n, ...) de features
+        Y: Sequência (m, ...) de features
+        cost_fn: Função de custo entre pares de linhas
+        radius: Expansão da janela em cada resolução
+        coarsen: Função que reduz uma sequência pela metade
+
+    Returns:
+        DTWResult com o caminho aproximado (cells soma todas as resoluções)
+    """
+    min_size = radius + 2
+    n, m = len(X), len(Y)
+    if n <= min_size or m <= min_size:
+        return dtw(X, Y, cost_fn)
+
+    coarse = fast_dtw(coarsen(X), coarsen(Y), cost_fn, radius, coarsen)
+    result = dtw(X, Y, cost_fn, _expand_path_window(coarse.path, n, m, radius))
+    result.cells += coarse.cells
+    return result
+
+def subsequence_dtw(X: np.ndarray, Y: np.ndarray, cost_fn: CostFunction = euclidean_cost,
+                    max_matches: int = 1, exclusion: Optional[int] = None,
+                    row_cost_fn: Optional[RowCostFunction] = None) -> List[SubsequenceMatch]:
+    """
+    Localiza a sequência curta X dentro da sequência longa Y (subsequence DTW).
+
+    Igual ao DTW, mas o caminho pode começar e terminar em qualquer linha de Y:
+    a primeira linha da matriz acumulada não acumula custo horizontal
+    (D[0, j] = c[0, j]) e o fim do caminho é o mínimo da última linha. Cada
+    linha de X é uma passada vetorizada sobre todo o Y, com o mesmo truque de
+    cumsum/minimum.accumulate de dtw().
+
+    As ocorrências seguintes são os próximos mínimos da última linha cujos
+    caminhos não se sobrepõem às anteriores, ignorando os fins a menos de
+    exclusion linhas de uma ocorrência já encontrada.
+
+    Args:
+        X: Sequência curta (n, ...) de features
+        Y: Sequência longa (m, ...) de features
+        cost_fn: Função de custo entre pares de linhas
+        max_matches: Número máximo de ocorrências retornadas
+        exclusion: Margem ao redor de cada ocorrência (padrão: n // 2)
+        row_cost_fn: Custo de uma linha de X contra todo o Y, equivalente a cost_fn
+            (opcional; evita montar os pares de índices de cada linha)
+
+    Returns:
+        Lista de SubsequenceMatch em ordem crescente de custo acumulado
+    """
+    n, m = len(X), len(Y)
+    if n == 0 or m == 0:
+        raise ValueError("As sequências não podem estar vazias")
+    if max_matches < 1:
+        raise ValueError("max_matches deve ser maior ou igual a 1")
+    if exclusion is None:
+        exclusion = n // 2
+
+    # Matriz acumulada completa (n x m), calculada linha a linha
+    acc = np.empty((n, m), dtype=np.float64)
+    cols = np.arange(m)
+    for i in range(n):
+        if row_cost_fn is not None:
+            row_costs = row_cost_fn(i)
+        else:
+            row_costs = np.empty(m, dtype=np.float64)
+            for start in range(0, m, COST_CHUNK_SIZE):
+                chunk = cols[start:start + COST_CHUNK_SIZE]
+                row_costs[chunk] = cost_fn(X, Y, np.full(len(chunk), i), chunk)
+        if i == 0:
+            acc[0] = row_costs
+            continue
+        previous = np.concatenate([[np.inf], acc[i - 1]])
+        best = row_costs + np.minimum(previous[:-1], previous[1:])
+        prefix = np.cumsum(row_costs)
+        acc[i] = np.minimum.accumulate(best - prefix) + prefix
+
+    def value(i: int, j: int) -> float:
+        return acc[i, j] if i >= 0 and j >= 0 else np.inf
+
+    ends = acc[n - 1].copy()
+    matches: List[SubsequenceMatch] = []
+    while len(matches) < max_matches:
+        end = int(np.argmin(ends))
+        if not np.isfinite(ends[end]):
+            break
+        # Reconstrói o caminho até a primeira linha de X (prefere a diagonal em empates)
+        i, j = n - 1, end
+        path = [(i, j)]
+        while i > 0:
+            candidates = ((i - 1, j - 1), (i - 1, j), (i, j - 1))
+            i, j = min(candidates, key=lambda cell: value(*cell))
+            path.append((i, j))
+        path.reverse()
+        start = j
+
+        if any(start <= match.end and match.start <= end for match in matches):
+            ends[end] = np.inf
+            continue
+        matches.append(SubsequenceMatch(path=np.array(path, dtype=np.int64),
+                                        distance=float(acc[n - 1, end]), cells=n * m,
+                                        start=start, end=end))
+        ends[max(start - exclusion, 0):end + exclusion + 1] = np.inf
+    return matches
+
+def align_sequences(X: np.ndarray, Y: np.ndarray, cost_fn: CostFunction = euclidean_cost,
+                    mode: str = "fast", band: float = 0.1, radius: int = 10) -> DTWResult:
+    """
+    Alinha duas sequências com o modo de DTW escolhido.
+
+    Args:
+        X: Sequência (n, ...) de features
+        Y: Sequência (m, ...) de features
+        cost_fn: Função de custo entre pares de linhas
+        mode: "full" (matriz completa), "band" (Sakoe-Chiba), "fast" (FastDTW) ou
+            "subsequence" (X em qualquer trecho de Y; ver subsequence_dtw)
+        band: Meia-largura da banda no modo "band" (fração da maior sequência)
+        radius: Raio do modo "fast"
+
+    Returns:
+        DTWResult com o caminho de alinhamento (SubsequenceMatch no modo "subsequence")
+    """
+    if mode == "full":
+        return dtw(X, Y, cost_fn)
+    if mode == "band":
+        return banded_dtw(X, Y, cost_fn, band)
+    if mode == "fast":
+        return fast_dtw(X, Y, cost_fn, radius)
+    if mode == "subsequence":
+        return subsequence_dtw(X, Y, cost_fn)[0]
+    raise ValueError(f"Modo de DTW inválido: {mode}")
@@ -0,0 +1,111 @@
+from dataclasses import dataclass
+from typing import Optional
+import json
+
+# Modos de preenchimento dos frames não amostrados
+FILL_MODES = ("gap", "interpolate")
+
+@dataclass
+class ExtractionParams:
+    """Parâmetros de execução da extração de pose (desempenho e paralelismo)."""
+    num_workers: int = 1
+    warmup_frames: int = 15
+    pipeline: bool = False
+    decode_queue_size: int = 8
+    output_queue_size: int = 8
+    frame_stride: int = 1
+    target_fps: Optional[float] = None
+    fill_skipped: str = "gap"
+    model_complexity: int = 2
+    adaptive: bool = False
+    light_model_complexity: int = 1
+    keyframe_interval: int = 30
+    confidence_threshold: float = 0.5
+    roi_crop: bool = True
+    roi_padding: float = 0.25
+
+    def __post_init__(self):
+        """Valida os parâmetros após a inicialização."""
+        self.validate()
+
+    def validate(self) -> None:
+        """Valida os parâmetros de extração."""
+        if not isinstance(self.num_workers, int) or self.num_workers < 1:
+            raise ValueError("num_workers deve ser um inteiro maior ou igual a 1")
+        if not isinstance(self.warmup_frames, int) or self.warmup_frames < 0:
+            raise ValueError("warmup_frames deve ser um inteiro não negativo")
+        if not isinstance(self.decode_queue_size, int) or self.decode_queue_size < 1:
+            raise ValueError("decode_queue_size deve ser um inteiro maior ou igual a 1")
+        if not isinstance(self.output_queue_size, int) or self.output_queue_size < 1:
+            raise ValueError("output_queue_size deve ser um inteiro maior ou igual a 1")
+        if not isinstance(self.frame_stride, int) or self.frame_stride < 1:
+            raise ValueError("frame_stride deve ser um inteiro maior ou igual a 1")
+        if self.target_fps is not None and self.target_fps <= 0:
+            raise ValueError("target_fps deve ser um número positivo")
+        if self.fill_skipped not in FILL_MODES:
+            raise ValueError(f"fill_skipped inválido: {self.fill_skipped}")
+        if self.model_complexity not in (0, 1, 2):
+            raise ValueError("model_complexity deve ser 0, 1 ou 2")
+        if self.light_model_complexity not in (0, 1, 2):
+            raise ValueError("light_model_complexity deve ser 0, 1 ou 2")
+        if not isinstance(self.keyframe_interval, int) or self.keyframe_interval < 1:
+            raise ValueError("keyframe_interval deve ser um inteiro maior ou igual a 1")
+        if not 0 <= self.confidence_threshold <= 1:
+            raise ValueError("confidence_threshold deve estar entre 0 e 1")
+        if self.roi_padding < 0:
+            raise ValueError("roi_padding deve ser não negativo")
+
+    def to_dict(self) -> dict:
+        """Converte os parâmetros para um dicionário."""
+        return {
+            "num_workers": self.num_workers,
+            "warmup_frames": self.warmup_frames,
+            "pipeline": self.pipeline,
+            "decode_queue_size": self.decode_queue_size,
+            "output_queue_size": self.output_queue_size,
+            "frame_stride": self.frame_stride,
+            "target_fps": self.target_fps,
+            "fill_skipped": self.fill_skipped,
+            "model_complexity": self.model_complexity,
+            "adaptive": self.adaptive,
+            "light_model_complexity": self.light_model_complexity,
+            "keyframe_interval": self.keyframe_interval,
+            "confidence_threshold": self.confidence_threshold,
+            "roi_crop": self.roi_crop,
+            "roi_padding": self.roi_padding
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ExtractionParams':
+        """Cria uma instância a partir de um dicionário."""
+        return cls(**data)
+
+    def save_to_file(self, filepath: str) -> None:
+        """Salva os parâmetros em um arquivo JSON."""
+        with open(filepath, 'w') as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+    @classmethod
+    def load_from_file(cls, filepath: str) -> 'ExtractionParams':
+        """Carrega os parâmetros de um arquivo JSON."""
+        with open(filepath, 'r') as f:
+            data = json.load(f)
+        return cls.from_dict(data)
+
+    def __str__(self) -> str:
+        """Retorna uma representação em string dos parâmetros."""
+        return (
+            f"Parâmetros de Extração:\n"
+            f"  Workers: {self.num_workers}\n"
+            f"  Frames de aquecimento: {self.warmup_frames}\n"
+            f"  Pipeline: {self.pipeline}\n"
+            f"  Filas (decodificação/saída): {self.decode_queue_size}/{self.output_queue_size}\n"
+            f"  Stride: {self.frame_stride}\n"
+            f"  FPS alvo: {self.target_fps}\n"
+            f"  Frames pulados: {self.fill_skipped}\n"
+            f"  Complexidade do modelo: {self.model_complexity}\n"
+            f"  Modo adaptativo: {self.adaptive} "
+            f"(leve: {self.light_model_complexity}, keyframes a cada {self.keyframe_interval}, "
+            f"confiança mínima: {self.confidence_threshold}, ROI: {self.roi_crop}, "
+            f"margem: {self.roi_padding})"
+        )
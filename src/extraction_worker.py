@@ -0,0 +1,40 @@
+import logging
+import multiprocessing.util
+from typing import Dict
+
+from .extraction_params import ExtractionParams
+from .pose_storage import PoseStorage
+
+# Configuração do logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def init_extraction_worker(state: Dict, storage_dir: str, storage_format: str, fingerprint_mode: str,
+                           extraction_params: ExtractionParams, pose_index: bool = False) -> None:
+    """
+    Prepara um processo worker de extração: o MediaPipe é carregado uma única vez por processo.
+
+    Cada módulo que usa workers (lote, fila de tarefas) mantém o próprio
+    dicionário de estado e o passa para esta função no initializer do pool.
+
+    Args:
+        state: Dicionário de estado do worker; recebe "storage", "extractor"
+            e "finalizer" (fecha o extrator; pode ser chamado antecipadamente)
+        storage_dir: Diretório dos dados de pose
+        storage_format: Formato de armazenamento ("json" ou "npy")
+        fingerprint_mode: Modo de fingerprint dos vídeos
+        extraction_params: Parâmetros de extração
+        pose_index: Se True, os vídeos extraídos são inseridos no índice de poses
+    """
+    # Importado aqui para que o processo principal não precise carregar o MediaPipe
+    from .pose_estimation import PoseExtractor
+
+    state["storage"] = PoseStorage(storage_dir, storage_format=storage_format,
+                                   fingerprint_mode=fingerprint_mode, pose_index=pose_index)
+    extractor = PoseExtractor(extraction_params=extraction_params)
+    state["extractor"] = extractor
+    # O MediaPipe precisa ser fechado antes da finalização do interpretador do worker
+    state["finalizer"] = multiprocessing.util.Finalize(extractor, extractor.close, exitpriority=10)
@@ -0,0 +1,221 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Iterator, List, Optional
+
+from .comparison_params import ComparisonParams
+from .extraction_params import ExtractionParams
+from .pose_estimation import PoseExtractor
+
+# Configuração do logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PoolStats:
+    """Métricas de uso de um ExtractorPool."""
+    checkouts: int = 0  # Extratores entregues
+    waits: int = 0  # Retiradas que aguardaram um extrator livre
+    timeouts: int = 0  # Retiradas que desistiram após o timeout
+    total_wait: float = 0.0  # Soma das esperas (segundos)
+    max_wait: float = 0.0  # Maior espera (segundos)
+    created: int = 0  # Extratores criados
+    discarded: int = 0  # Extratores descartados por falha ao reiniciar
+
+    @property
+    def mean_wait(self) -> float:
+        """Espera média por retirada, em segundos."""
+        return self.total_wait / self.checkouts if self.checkouts else 0.0
+
+    def to_dict(self) -> Dict:
+        """Converte as métricas para um dicionário."""
+        return {**asdict(self), "mean_wait": self.mean_wait}
+
+class ExtractorPool:
+    """
+    Pool de instâncias de PoseExtractor para uso concorrente entre threads.
+
+    Cada PoseExtractor guarda o grafo do MediaPipe em modo de rastreamento e o
+    estado do último vídeo (landmarks, fps, resolução), então não pode ser
+    usado por duas threads ao mesmo tempo. O pool entrega cada extrator a uma
+    única thread por vez (checkout/release), cria os extratores sob demanda até
+    size instâncias e reinicia o estado de cada um ao ser devolvido, de forma
+    que o próximo vídeo não herda o rastreamento do anterior. A inferência do
+    MediaPipe libera o GIL, então extratores diferentes rodam em paralelo.
+    """
+
+    def __init__(self, size: int = 2, extraction_params: Optional[ExtractionParams] = None,
+                 comparison_params: Optional[ComparisonParams] = None,
+                 factory: Optional[Callable[[], PoseExtractor]] = None):
+        """
+        Inicializa o pool (nenhum extrator é criado antes da primeira retirada).
+
+        Args:
+            size: Número máximo de extratores
+            extraction_params: Parâmetros de extração dos extratores criados
+            comparison_params: Parâmetros de comparação dos extratores criados
+            factory: Cria um extrator (padrão: PoseExtractor com os parâmetros acima)
+        """
+        if size < 1:
+            raise ValueError("size deve ser maior ou igual a 1")
+        self.size = size
+        self.extraction_params = extraction_params or ExtractionParams()
+        self.comparison_params = comparison_params or ComparisonParams()
+        self._factory = factory or (lambda: PoseExtractor(comparison_params=self.comparison_params,
+                                                          extraction_params=self.extraction_params))
+        self._condition = threading.Condition()
+        self._idle: List[PoseExtractor] = []
+        self._in_use: Dict[int, PoseExtractor] = {}
+        self._live = 0  # Extratores criados e ainda não descartados (livres, em uso ou sendo criados)
+        self._closed = False
+        self.stats = PoolStats()
+
+    @property
+    def in_use(self) -> int:
+        """Número de extratores retirados."""
+        with self._condition:
+            return len(self._in_use)
+
+    @property
+    def available(self) -> int:
+        """Número de retiradas possíveis sem espera."""
+        with self._condition:
+            return len(self._idle) + self.size - self._live
+
+    def get_stats(self) -> Dict:
+        """
+        Retorna as métricas do pool.
+
+        Returns:
+            Dicionário com as métricas de PoolStats, o tamanho e os extratores em uso
+        """
+        with self._condition:
+            return {**self.stats.to_dict(), "size": self.size, "in_use": len(self._in_use),
+                    "idle": len(self._idle)}
+
+    def checkout(self, timeout: Optional[float] = None) -> PoseExtractor:
+        """
+        Retira um extrator para uso exclusivo da thread chamadora.
+
+        Args:
+            timeout: Espera máxima por um extrator livre, em segundos (None: sem limite)
+
+        Returns:
+            PoseExtractor livre (criado se o pool ainda não tiver size extratores)
+
+        Raises:
+            TimeoutError: Se nenhum extrator ficar livre dentro do timeout
+            RuntimeError: Se o pool estiver fechado
+        """
+        start = time.perf_counter()
+        deadline = None if timeout is None else start + timeout
+        waited = False
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("O pool de extratores está fechado")
+                if self._idle or self._live < self.size:
+                    break
+                remaining = None if deadline is None else deadline - time.perf_counter()
+                if remaining is not None and remaining <= 0:
+                    self.stats.timeouts += 1
+                    raise TimeoutError(f"Nenhum extrator livre após {timeout} s")
+                waited = True
+                self._condition.wait(remaining)
+
+            wait = time.perf_counter() - start
+            self.stats.checkouts += 1
+            self.stats.total_wait += wait
+            self.stats.max_wait = max(self.stats.max_wait, wait)
+            if waited:
+                self.stats.waits += 1
+
+            extractor = self._idle.pop() if self._idle else None
+            if extractor is None:
+                self._live += 1
+            else:
+                self._in_use[id(extractor)] = extractor
+        if extractor is not None:
+            return extractor
+
+        # O modelo é carregado fora do lock para não bloquear as outras retiradas
+        try:
+            extractor = self._factory()
+        except Exception:
+            with self._condition:
+                self._live -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self.stats.created += 1
+            self._in_use[id(extractor)] = extractor
+        logger.info(f"Extrator criado no pool ({self.stats.created}/{self.size})")
+        return extractor
+
+    def release(self, extractor: PoseExtractor) -> None:
+        """
+        Devolve um extrator ao pool, reiniciando o estado do último vídeo.
+
+        Um extrator que falha ao reiniciar é fechado e descartado; o pool cria
+        outro na próxima retirada.
+
+        Args:
+            extractor: Extrator obtido com checkout
+
+        Raises:
+            ValueError: Se o extrator não estiver retirado deste pool
+        """
+        with self._condition:
+            if self._in_use.pop(id(extractor), None) is None:
+                raise ValueError("Extrator não pertence ao pool ou já foi devolvido")
+
+        try:
+            extractor.reset()
+            healthy = True
+        except Exception as e:
+            logger.error(f"Erro ao reiniciar extrator, descartando: {str(e)}")
+            healthy = False
+
+        with self._condition:
+            if healthy and not self._closed:
+                self._idle.append(extractor)
+                extractor = None
+            else:
+                self._live -= 1
+                if not healthy:
+                    self.stats.discarded += 1
+            self._condition.notify()
+        if extractor is not None:
+            extractor.close()
+
+    @contextmanager
+    def extractor(self, timeout: Optional[float] = None) -> Iterator[PoseExtractor]:
+        """
+        Retira um extrator e o devolve ao final do bloco with.
+
+        Args:
+            timeout: Espera máxima por um extrator livre, em segundos (None: sem limite)
+
+        Yields:
+            PoseExtractor de uso exclusivo dentro do bloco
+        """
+        extractor = self.checkout(timeout)
+        try:
+            yield extractor
+        finally:
+            self.release(extractor)
+
+    def close(self) -> None:
+        """Fecha os extratores livres; os retirados são fechados ao serem devolvidos."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._live -= len(idle)
+            self._condition.notify_all()
+        for extractor in idle:
+            extractor.close()
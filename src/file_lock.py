@@ -0,0 +1,70 @@
+import logging
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Union
+
+# Configuração do logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Espera máxima por um lock ocupado por outro processo (segundos)
+LOCK_TIMEOUT = 30.0
+
+# Intervalo entre as tentativas de obter o lock (segundos)
+LOCK_POLL_INTERVAL = 0.01
+
+if os.name == "nt":
+    import msvcrt
+
+    def _try_lock(f: IO) -> None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def _unlock(f: IO) -> None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _try_lock(f: IO) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock(f: IO) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+@contextmanager
+def file_lock(path: Union[str, Path], timeout: float = LOCK_TIMEOUT) -> Iterator[None]:
+    """
+    Lock exclusivo entre processos (e threads) para ler e regravar um arquivo.
+
+    O lock fica em um arquivo auxiliar ({path}.lock), de forma que o arquivo
+    protegido pode ser substituído com os.replace enquanto o lock é mantido.
+
+    Args:
+        path: Arquivo protegido
+        timeout: Espera máxima pelo lock em segundos
+
+    Raises:
+        TimeoutError: Se o lock não for obtido dentro do timeout
+    """
+    lock_path = Path(str(path) + ".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as f:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                _try_lock(f)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Tempo esgotado aguardando o lock de {path}")
+                time.sleep(LOCK_POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            _unlock(f)
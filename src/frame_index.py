@@ -0,0 +1,267 @@
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Configuração do logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Sufixo do índice de frames de um arquivo de pose JSON ({hash}.json -> {hash}.offsets.npz)
+FRAME_INDEX_SUFFIX = ".offsets.npz"
+
+# Tamanho dos blocos lidos ao construir o índice (1 MiB)
+SCAN_CHUNK_SIZE = 1024 * 1024
+
+_NON_WHITESPACE = re.compile(r"[^ \t\n\r]")
+
+def frame_index_path(json_path: Path) -> Path:
+    """Retorna o caminho do índice de frames de um arquivo de pose JSON."""
+    json_path = Path(json_path)
+    return json_path.with_name(json_path.stem + FRAME_INDEX_SUFFIX)
+
+def time_range_rows(timestamps: np.ndarray, start_time: Optional[float] = None,
+                    end_time: Optional[float] = None) -> slice:
+    """
+    Retorna as linhas de uma sequência ordenada de timestamps no intervalo [start_time, end_time).
+
+    Args:
+        timestamps: Timestamps em ordem crescente, em segundos
+        start_time: Início do intervalo (None: desde a primeira linha)
+        end_time: Fim do intervalo, exclusivo (None: até a última linha)
+
+    Returns:
+        slice com as linhas correspondentes
+    """
+    lo = 0 if start_time is None else int(np.searchsorted(timestamps, start_time, side="left"))
+    hi = len(timestamps) if end_time is None else int(np.searchsorted(timestamps, end_time, side="left"))
+    return slice(lo, max(lo, hi))
+
+def _file_signature(path: Path) -> Tuple[int, int]:
+    """Retorna (tamanho, mtime_ns) de um arquivo."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+@dataclass
+class FrameIndex:
+    """
+    Índice das posições dos frames dentro de um arquivo de pose JSON.
+
+    Guarda, para cada frame da lista "frames", o número do frame, o timestamp
+    e o intervalo de bytes [início, fim) do objeto JSON do frame, além dos
+    campos de cabeçalho do arquivo (fps, resolução etc.). Com o índice, um
+    intervalo de tempo é lido com um único seek e apenas os bytes dos frames
+    pedidos são decodificados.
+    """
+    frame_numbers: np.ndarray  # (n,) int64
+    timestamps: np.ndarray  # (n,) float64
+    offsets: np.ndarray  # (n, 2) int64 com [início, fim) de cada frame
+    header: Dict[str, Any] = field(default_factory=dict)
+    source_size: int = 0
+    source_mtime_ns: int = 0
+
+    def __len__(self) -> int:
+        return len(self.frame_numbers)
+
+    def rows(self, start_time: Optional[float] = None, end_time: Optional[float] = None) -> slice:
+        """
+        Retorna as linhas do índice com timestamp no intervalo [start_time, end_time).
+
+        Args:
+            start_time: Início do intervalo em segundos (None: desde o primeiro frame)
+            end_time: Fim do intervalo em segundos, exclusivo (None: até o último frame)
+
+        Returns:
+            slice com as linhas correspondentes
+        """
+        return time_range_rows(self.timestamps, start_time, end_time)
+
+    def is_current(self, json_path: Path) -> bool:
+        """Indica se o índice corresponde ao conteúdo atual do arquivo JSON."""
+        try:
+            return _file_signature(json_path) == (self.source_size, self.source_mtime_ns)
+        except OSError:
+            return False
+
+    def read_frames(self, json_path: Path, rows: slice) -> List[Dict[str, Any]]:
+        """
+        Lê e decodifica apenas os frames de um intervalo de linhas.
+
+        Args:
+            json_path: Arquivo JSON indexado
+            rows: Linhas do índice (ver rows())
+
+        Returns:
+            Lista com o dicionário de cada frame
+        """
+        lo, hi, _ = rows.indices(len(self))
+        if lo >= hi:
+            return []
+        start, end = int(self.offsets[lo, 0]), int(self.offsets[hi - 1, 1])
+        with open(json_path, "rb") as f:
+            f.seek(start)
+            chunk = f.read(end - start)
+        # Os frames consecutivos estão separados por vírgulas: basta envolvê-los em colchetes
+        return json.loads(b"[" + chunk + b"]")
+
+    def save(self, path: Path) -> None:
+        """Grava o índice em disco de forma atômica."""
+        path = Path(path)
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "wb") as f:
+            np.savez(
+                f,
+                frame_numbers=self.frame_numbers,
+                timestamps=self.timestamps,
+                offsets=self.offsets,
+                header=np.array(json.dumps(self.header)),
+                signature=np.array([self.source_size, self.source_mtime_ns], dtype=np.int64)
+            )
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> 'FrameIndex':
+        """Carrega um índice gravado com save()."""
+        with np.load(path) as data:
+            signature = data["signature"]
+            return cls(
+                frame_numbers=data["frame_numbers"],
+                timestamps=data["timestamps"],
+                offsets=data["offsets"],
+                header=json.loads(str(data["header"])),
+                source_size=int(signature[0]),
+                source_mtime_ns=int(signature[1])
+            )
+
+    @classmethod
+    def from_entries(cls, entries: List[Tuple[int, float, int, int]], header: Dict[str, Any],
+                     json_path: Path) -> 'FrameIndex':
+        """
+        Cria o índice a partir de tuplas (frame_number, timestamp, início, fim).
+
+        Args:
+            entries: Posições de cada frame no arquivo
+            header: Campos de cabeçalho do arquivo
+            json_path: Arquivo JSON indexado (para a assinatura de tamanho e mtime)
+
+        Returns:
+            FrameIndex do arquivo
+        """
+        size, mtime_ns = _file_signature(json_path)
+        table = np.array([(e[0], e[2], e[3]) for e in entries], dtype=np.int64).reshape(-1, 3)
+        return cls(
+            frame_numbers=table[:, 0].copy(),
+            timestamps=np.array([e[1] for e in entries], dtype=np.float64),
+            offsets=table[:, 1:].copy(),
+            header=header,
+            source_size=size,
+            source_mtime_ns=mtime_ns
+        )
+
+class _JsonScanner:
+    """
+    Lê valores JSON em sequência de um arquivo mantendo apenas um bloco em memória.
+
+    Os bytes são decodificados como latin-1, de forma que cada caractere
+    corresponde a um byte e as posições retornadas são offsets no arquivo.
+    """
+
+    def __init__(self, f, chunk_size: int = SCAN_CHUNK_SIZE):
+        self._file = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._base = 0  # Offset do primeiro caractere do buffer no arquivo
+        self.pos = 0
+
+    def _fill(self) -> bool:
+        """Descarta o trecho já consumido e lê o próximo bloco."""
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            return False
+        self._buffer = self._buffer[self.pos - self._base:] + chunk.decode("latin-1")
+        self._base = self.pos
+        return True
+
+    def peek(self) -> str:
+        """Avança até o próximo caractere que não é espaço e o retorna (sem consumi-lo)."""
+        while True:
+            match = _NON_WHITESPACE.search(self._buffer, self.pos - self._base)
+            if match:
+                self.pos = self._base + match.start()
+                return match.group()
+            self.pos = self._base + len(self._buffer)
+            if not self._fill():
+                raise ValueError("Fim inesperado do arquivo JSON")
+
+    def expect(self, chars: str) -> str:
+        """Consome o próximo caractere, que deve ser um dos caracteres dados."""
+        char = self.peek()
+        if char not in chars:
+            raise ValueError(f"JSON inválido na posição {self.pos}: esperado {chars!r}, encontrado {char!r}")
+        self.pos += 1
+        return char
+
+    def decode(self) -> Tuple[Any, int, int]:
+        """Decodifica o próximo valor, retornando (valor, início, fim)."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self.pos - self._base)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # Um número no fim do buffer pode continuar no próximo bloco
+            if end == len(self._buffer) and self._fill():
+                continue
+            start, self.pos = self.pos, self._base + end
+            return value, start, self.pos
+
+def build_json_frame_index(json_path: Path, chunk_size: int = SCAN_CHUNK_SIZE) -> FrameIndex:
+    """
+    Constrói o índice de frames de um arquivo de pose JSON com uma única leitura sequencial.
+
+    Args:
+        json_path: Arquivo de pose JSON (formato de PoseStorage)
+        chunk_size: Tamanho dos blocos lidos do disco
+
+    Returns:
+        FrameIndex do arquivo
+    """
+    header = {}
+    entries = []
+    with open(json_path, "rb") as f:
+        scanner = _JsonScanner(f, chunk_size)
+        scanner.expect("{")
+        if scanner.peek() == "}":
+            raise ValueError("Arquivo de pose sem frames")
+        while True:
+            key, _, _ = scanner.decode()
+            scanner.expect(":")
+            if key == "frames":
+                scanner.expect("[")
+                if scanner.peek() == "]":
+                    scanner.pos += 1
+                else:
+                    while True:
+                        frame, start, end = scanner.decode()
+                        entries.append((frame["frame_number"], frame["timestamp"], start, end))
+                        if scanner.expect(",]") == "]":
+                            break
+            else:
+                header[key], _, _ = scanner.decode()
+            if scanner.expect(",}") == "}":
+                break
+
+    index = FrameIndex.from_entries(entries, header, json_path)
+    logger.debug(f"Índice de frames construído para {json_path}: {len(index)} frames")
+    return index
@@ -0,0 +1,474 @@
+import logging
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, asdict, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .extraction_params import ExtractionParams
+from .extraction_worker import init_extraction_worker
+from .extractor_pool import ExtractorPool
+from .pose_storage import PoseStorage
+
+# Configuração do logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Estados de uma tarefa
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+ACTIVE_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+# Intervalo mínimo entre duas gravações do progresso no banco (segundos)
+PROGRESS_INTERVAL = 0.5
+
+# Espera do banco ocupado por outro processo antes de falhar (segundos)
+DB_TIMEOUT = 30.0
+
+JOBS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    video_path TEXT NOT NULL,
+    video_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    frames_done INTEGER NOT NULL DEFAULT 0,
+    total_frames INTEGER NOT NULL DEFAULT 0,
+    error TEXT NOT NULL DEFAULT '',
+    owner_pid INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_video_hash ON jobs (video_hash, id);
+"""
+
+# Banco, armazenamento e extrator do processo worker (criados uma única vez por processo)
+_worker_state: Dict = {}
+
+@dataclass
+class Job:
+    """Estado de uma tarefa de extração de poses."""
+    job_id: int
+    video_path: str
+    video_hash: str
+    status: str  # queued, running, done ou failed
+    progress: float = 0.0  # Fração dos frames processados (0.0 a 1.0)
+    frames_done: int = 0
+    total_frames: int = 0
+    error: str = ""
+    owner_pid: int = 0  # Processo que enfileirou a tarefa (dono do pool)
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+    @property
+    def is_active(self) -> bool:
+        """A tarefa ainda está na fila ou em execução."""
+        return self.status in ACTIVE_STATUSES
+
+    def to_dict(self) -> Dict:
+        """Converte a tarefa para um dicionário."""
+        return asdict(self)
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> 'Job':
+        """Cria a tarefa a partir de uma linha da tabela jobs."""
+        values = dict(row)
+        values["job_id"] = values.pop("id")
+        return cls(**values)
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    """Abre uma conexão com o banco de tarefas (uma por operação, segura entre threads e processos)."""
+    conn = sqlite3.connect(db_path, timeout=DB_TIMEOUT)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def _update_job(db_path: str, job_id: int, **fields) -> None:
+    """Atualiza campos de uma tarefa (e o instante da atualização)."""
+    fields["updated_at"] = time.time()
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    with closing(_connect(db_path)) as conn, conn:
+        conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+# Constantes da API do Windows usadas para verificar se um processo está em execução
+_PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+_STILL_ACTIVE = 259
+_ERROR_ACCESS_DENIED = 5
+
+def _windows_process_alive(pid: int) -> bool:
+    """Verifica se um processo está em execução no Windows (OpenProcess/GetExitCodeProcess)."""
+    import ctypes
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    handle = kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        # Sem permissão de acesso o processo existe; qualquer outro erro indica PID inválido
+        return ctypes.get_last_error() == _ERROR_ACCESS_DENIED
+    try:
+        exit_code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+            return False
+        return exit_code.value == _STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+def _process_alive(pid: Optional[int]) -> bool:
+    """
+    Verifica se um processo ainda está em execução.
+
+    No Windows, os.kill(pid, 0) envia CTRL_C_EVENT em vez de apenas verificar
+    o processo, então a verificação usa a API do sistema. PIDs inválidos (ou
+    erros na verificação) são tratados como processos encerrados.
+    """
+    if not pid or pid <= 0:
+        return False
+    try:
+        if os.name == "nt":
+            return _windows_process_alive(pid)
+        os.kill(pid, 0)
+    except PermissionError:
+        return True
+    except (OSError, OverflowError, ValueError):
+        return False
+    return True
+
+class _ProgressReporter:
+    """Callback de progresso do PoseExtractor que grava o avanço da tarefa no banco."""
+
+    def __init__(self, db_path: str, job_id: int, interval: float = PROGRESS_INTERVAL):
+        self.db_path = db_path
+        self.job_id = job_id
+        self.interval = interval
+        self._last_write = 0.0
+
+    def __call__(self, frame_count: int, total_frames: int) -> None:
+        now = time.perf_counter()
+        # Grava no máximo a cada interval segundos (e sempre o último frame)
+        if now - self._last_write < self.interval and frame_count < total_frames:
+            return
+        self._last_write = now
+        progress = min(1.0, frame_count / total_frames) if total_frames > 0 else 0.0
+        _update_job(self.db_path, self.job_id, progress=progress, frames_done=frame_count,
+                    total_frames=max(total_frames, 0))
+
+def _init_job_worker(db_path: str, storage_dir: str, storage_format: str, fingerprint_mode: str,
+                     extraction_params: ExtractionParams, pose_index: bool = False) -> None:
+    """Inicializa o processo worker (MediaPipe carregado uma única vez, como no lote)."""
+    init_extraction_worker(_worker_state, storage_dir, storage_format, fingerprint_mode,
+                           extraction_params, pose_index)
+    _worker_state["db_path"] = db_path
+
+def _extract_job(db_path: str, storage: PoseStorage, extractor, job_id: int,
+                 video_path: str) -> Tuple[bool, str]:
+    """
+    Extrai e grava os dados de pose de um vídeo, registrando o progresso da tarefa.
+
+    Args:
+        db_path: Banco de tarefas
+        storage: Armazenamento dos dados de pose
+        extractor: PoseExtractor de uso exclusivo da tarefa
+        job_id: Identificador da tarefa
+        video_path: Caminho do vídeo
+
+    Returns:
+        Tupla (sucesso, mensagem de erro)
+    """
+    _update_job(db_path, job_id, status=JOB_RUNNING)
+    try:
+        frames = extractor.iter_video(video_path, progress_callback=_ProgressReporter(db_path, job_id))
+        _update_job(db_path, job_id, total_frames=max(extractor.get_total_frames(), 0))
+        success = storage.save_pose_stream(
+            video_path=video_path,
+            fps=extractor.get_fps(),
+            resolution=extractor.get_resolution(),
+            total_frames=extractor.get_total_frames(),
+            frames=frames
+        )
+        return success, "" if success else "Falha ao extrair dados de pose"
+    except Exception as e:
+        return False, str(e)
+
+def _run_extraction(job_id: int, video_path: str) -> Tuple[bool, str]:
+    """Executa uma tarefa no processo worker, com o extrator do processo."""
+    extractor = _worker_state["extractor"]
+    # O extrator do worker é reaproveitado: descarta o rastreamento do vídeo anterior
+    extractor.reset()
+    return _extract_job(_worker_state["db_path"], _worker_state["storage"], extractor,
+                        job_id, video_path)
+
+class JobQueue:
+    """
+    Fila local de tarefas de extração de poses executadas em segundo plano.
+
+    As tarefas rodam em um pool de processos (cada worker carrega o MediaPipe
+    uma única vez, como no BatchComparator) e o estado de cada uma fica em um
+    banco SQLite, de forma que qualquer sessão ou processo pode consultar o
+    progresso, que é gravado pelo worker a partir do progress_callback do
+    PoseExtractor. As tarefas são identificadas pelo hash do vídeo: enviar de
+    novo um vídeo em extração devolve a tarefa existente, e um vídeo já
+    armazenado gera uma tarefa concluída sem nova extração. Tarefas deixadas
+    na fila ou em execução por um processo encerrado são reenfileiradas.
+
+    Com um ExtractorPool, as tarefas rodam em threads do próprio processo,
+    cada uma com um extrator retirado do pool (ex.: scripts e testes que já
+    extraem no processo). Nesse modo não há isolamento: uma falha do MediaPipe
+    encerra o processo, e o trabalho por frame em Python disputa o GIL com as
+    demais threads. Servidores (como o app) devem usar o pool de processos.
+    """
+
+    def __init__(self, db_path: Union[str, Path], storage_dir: str = "data/pose",
+                 storage_format: str = "json", fingerprint_mode: str = "full",
+                 extraction_params: Optional[ExtractionParams] = None,
+                 workers: int = 2, extractor_pool: Optional[ExtractorPool] = None,
+                 storage: Optional[PoseStorage] = None, pose_index: bool = False):
+        """
+        Inicializa a fila de tarefas.
+
+        Args:
+            db_path: Banco SQLite com o estado das tarefas (criado se não existir)
+            storage_dir: Diretório de armazenamento dos dados de pose
+            storage_format: Formato dos novos dados de pose ("json" ou "npy")
+            fingerprint_mode: Identificação dos vídeos ("full" ou "sampled")
+            extraction_params: Parâmetros de extração (num_workers é ignorado: cada
+                worker processa um vídeo inteiro)
+            workers: Número de vídeos extraídos em paralelo
+            extractor_pool: Executa as tarefas em threads com os extratores deste
+                pool, em vez do pool de processos (extraction_params é ignorado
+                e workers passa a ser o tamanho do pool)
+            storage: Armazenamento já usado pelo processo (ex: o do app). Evita uma
+                segunda instância sobre o mesmo diretório, que recalcularia os hashes
+                dos vídeos; storage_dir, storage_format, fingerprint_mode e pose_index
+                passam a ser os dele
+            pose_index: Se True, os vídeos extraídos são inseridos no índice de poses
+        """
+        if extractor_pool is not None:
+            workers = extractor_pool.size
+        if workers < 1:
+            raise ValueError("workers deve ser maior ou igual a 1")
+        self.db_path = str(db_path)
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        if storage is not None:
+            storage_dir = storage.storage_dir
+            storage_format = storage.storage_format
+            fingerprint_mode = storage.fingerprinter.mode
+            pose_index = storage.pose_index is not None
+        self.storage_dir = str(storage_dir)
+        self.storage_format = storage_format
+        self.fingerprint_mode = fingerprint_mode
+        self.pose_index = pose_index
+        self.extraction_params = replace(extraction_params or ExtractionParams(), num_workers=1)
+        self.workers = workers
+        self.extractor_pool = extractor_pool
+        self.storage = storage or PoseStorage(self.storage_dir, storage_format=storage_format,
+                                              fingerprint_mode=fingerprint_mode, pose_index=pose_index)
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+        with closing(_connect(self.db_path)) as conn:
+            # WAL permite ler o progresso enquanto um worker grava
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(JOBS_SCHEMA)
+        self._recover()
+
+    def _get_executor(self) -> Executor:
+        """Cria o pool de processos (ou de threads, com um ExtractorPool) no primeiro uso."""
+        if self._executor is None and self.extractor_pool is not None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+        elif self._executor is None:
+            # spawn evita herdar o estado do MediaPipe do processo pai
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_job_worker,
+                initargs=(self.db_path, self.storage_dir, self.storage_format,
+                          self.fingerprint_mode, self.extraction_params, self.pose_index)
+            )
+        return self._executor
+
+    def _insert(self, video_path: str, video_hash: str, status: str, progress: float = 0.0,
+                error: str = "") -> Job:
+        """Grava uma nova tarefa e a retorna."""
+        now = time.time()
+        with closing(_connect(self.db_path)) as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO jobs (video_path, video_hash, status, progress, error, owner_pid, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (video_path, video_hash, status, progress, error, os.getpid(), now, now)
+            )
+            job_id = cursor.lastrowid
+        return self.get(job_id)
+
+    def _start(self, job: Job) -> None:
+        """Envia uma tarefa enfileirada para o pool."""
+        task = _run_extraction if self.extractor_pool is None else self._run_pooled_extraction
+        future = self._get_executor().submit(task, job.job_id, job.video_path)
+        future.add_done_callback(lambda done: self._finish(job.job_id, done))
+
+    def _run_pooled_extraction(self, job_id: int, video_path: str) -> Tuple[bool, str]:
+        """Executa uma tarefa em uma thread, com um extrator retirado do pool."""
+        with self.extractor_pool.extractor() as extractor:
+            return _extract_job(self.db_path, self.storage, extractor, job_id, video_path)
+
+    def _finish(self, job_id: int, future: Future) -> None:
+        """Registra o resultado de uma tarefa (chamado quando o worker termina)."""
+        try:
+            success, error = future.result()
+        except Exception as e:
+            # Ex.: worker encerrado abruptamente (BrokenProcessPool)
+            success, error = False, str(e) or type(e).__name__
+        if success:
+            _update_job(self.db_path, job_id, status=JOB_DONE, progress=1.0)
+            logger.info(f"Tarefa {job_id} concluída")
+        else:
+            _update_job(self.db_path, job_id, status=JOB_FAILED, error=error)
+            logger.error(f"Tarefa {job_id} falhou: {error}")
+
+    def _recover(self) -> None:
+        """Reenfileira as tarefas ativas de processos que não estão mais em execução."""
+        with closing(_connect(self.db_path)) as conn:
+            rows = conn.execute("SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY id",
+                                ACTIVE_STATUSES).fetchall()
+        for job in map(Job.from_row, rows):
+            if job.owner_pid == os.getpid() or _process_alive(job.owner_pid):
+                continue
+            if not os.path.exists(job.video_path):
+                _update_job(self.db_path, job.job_id, status=JOB_FAILED,
+                            error="Vídeo não encontrado ao retomar a tarefa")
+                continue
+            logger.info(f"Retomando tarefa {job.job_id}: {job.video_path}")
+            _update_job(self.db_path, job.job_id, status=JOB_QUEUED, progress=0.0, frames_done=0,
+                        owner_pid=os.getpid())
+            self._start(job)
+
+    def submit_extraction(self, video_path: str) -> Job:
+        """
+        Enfileira a extração de poses de um vídeo.
+
+        Args:
+            video_path: Caminho do vídeo
+
+        Returns:
+            Job da tarefa: a tarefa ativa ou concluída do mesmo vídeo, se houver,
+            ou uma nova tarefa (já concluída se os dados estiverem armazenados)
+        """
+        with self._lock:
+            try:
+                video_hash = self.storage._generate_video_hash(video_path)
+            except OSError as e:
+                logger.error(f"Erro ao identificar o vídeo {video_path}: {str(e)}")
+                return self._insert(video_path, "", JOB_FAILED, error=str(e))
+
+            latest = self.latest_job(video_hash)
+            if latest is not None and latest.is_active:
+                return latest
+            if self.storage.has_pose_data(video_path):
+                if latest is not None and latest.status == JOB_DONE:
+                    return latest
+                return self._insert(video_path, video_hash, JOB_DONE, progress=1.0)
+
+            job = self._insert(video_path, video_hash, JOB_QUEUED)
+            logger.info(f"Tarefa {job.job_id} enfileirada: {video_path}")
+            self._start(job)
+            return job
+
+    def get(self, job_id: int) -> Optional[Job]:
+        """
+        Retorna o estado atual de uma tarefa.
+
+        Args:
+            job_id: Identificador da tarefa
+
+        Returns:
+            Job ou None se a tarefa não existir
+        """
+        with closing(_connect(self.db_path)) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job.from_row(row) if row is not None else None
+
+    def latest_job(self, video_hash: str) -> Optional[Job]:
+        """
+        Retorna a tarefa mais recente de um vídeo.
+
+        Args:
+            video_hash: Hash do vídeo (ver PoseStorage)
+
+        Returns:
+            Job ou None se o vídeo não tiver tarefas
+        """
+        with closing(_connect(self.db_path)) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE video_hash = ? ORDER BY id DESC LIMIT 1",
+                               (video_hash,)).fetchone()
+        return Job.from_row(row) if row is not None else None
+
+    def has_active_job(self, video_path: str) -> bool:
+        """
+        Indica se um arquivo de vídeo ainda está sendo lido por uma tarefa.
+
+        Args:
+            video_path: Caminho do vídeo, como enviado a submit_extraction
+
+        Returns:
+            bool: True se alguma tarefa do arquivo está na fila ou em execução
+        """
+        with closing(_connect(self.db_path)) as conn:
+            row = conn.execute("SELECT 1 FROM jobs WHERE video_path = ? AND status IN (?, ?) LIMIT 1",
+                               (video_path, *ACTIVE_STATUSES)).fetchone()
+        return row is not None
+
+    def recent_jobs(self, limit: int = 20) -> List[Job]:
+        """
+        Lista as tarefas mais recentes.
+
+        Args:
+            limit: Número máximo de tarefas
+
+        Returns:
+            Tarefas da mais recente para a mais antiga
+        """
+        with closing(_connect(self.db_path)) as conn:
+            rows = conn.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [Job.from_row(row) for row in rows]
+
+    def wait(self, job_ids: List[int], timeout: Optional[float] = None,
+             poll_interval: float = 0.1) -> List[Job]:
+        """
+        Aguarda o término de tarefas consultando o banco.
+
+        Args:
+            job_ids: Identificadores das tarefas
+            timeout: Espera máxima em segundos (None: sem limite)
+            poll_interval: Intervalo entre consultas em segundos
+
+        Returns:
+            Estado das tarefas ao final da espera (podem continuar ativas após o timeout)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            jobs = [self.get(job_id) for job_id in job_ids]
+            if not any(job is not None and job.is_active for job in jobs):
+                return jobs
+            if deadline is not None and time.monotonic() >= deadline:
+                return jobs
+            time.sleep(poll_interval)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Encerra o pool de processos (ou de threads).
+
+        Args:
+            wait: Aguarda as tarefas em execução terminarem
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
@@ -0,0 +1,106 @@
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+# Configuração do logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+@dataclass
+class LandmarkComparison:
+    """
+    Arrays por par de frames e por landmark de uma comparação, independentes dos pesos.
+
+    Guarda o resultado da parte cara da comparação (alinhamento e distâncias
+    entre landmarks) para um par de vídeos. Mudar os pesos dos landmarks ou a
+    tolerância é apenas uma redução ponderada sobre estes arrays (ver
+    ComparadorMovimento.rescore).
+    """
+    frames1: np.ndarray  # (P,) índices dos frames do primeiro vídeo
+    frames2: np.ndarray  # (P,) índices dos frames correspondentes do segundo vídeo
+    similarities: np.ndarray  # (P, L) similaridade 1 / (1 + d), NaN onde o landmark não foi comparado
+    translations: np.ndarray  # (P, 3) translação entre os centros dos frames
+    scales: np.ndarray  # (P,) razão entre as escalas dos frames
+    temporal_alignment: Dict = field(default_factory=dict)
+    video_info: Dict = field(default_factory=dict)  # Campos video1_*/video2_* de ComparisonResults
+
+    def __len__(self) -> int:
+        return len(self.frames1)
+
+    @property
+    def num_landmarks(self) -> int:
+        """Número de landmarks por par de frames."""
+        return self.similarities.shape[1]
+
+    @property
+    def distances(self) -> np.ndarray:
+        """Distância entre os landmarks de cada par (NaN onde não foi comparado)."""
+        return 1.0 / self.similarities - 1.0
+
+    @property
+    def nbytes(self) -> int:
+        """Tamanho dos arrays em bytes."""
+        return sum(array.nbytes for array in (self.frames1, self.frames2, self.similarities,
+                                              self.translations, self.scales))
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Grava os arrays em um arquivo .npz de forma atômica.
+
+        Args:
+            path: Caminho do arquivo
+        """
+        path = Path(path)
+        temp_path = path.with_name(path.name + ".tmp")
+        with open(temp_path, "wb") as f:
+            np.savez(
+                f,
+                frames1=self.frames1,
+                frames2=self.frames2,
+                similarities=self.similarities,
+                translations=self.translations,
+                scales=self.scales,
+                temporal_alignment=np.array(json.dumps(self.temporal_alignment)),
+                video_info=np.array(json.dumps(self.video_info))
+            )
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional['LandmarkComparison']:
+        """
+        Carrega os arrays de um arquivo .npz.
+
+        Args:
+            path: Caminho do arquivo
+
+        Returns:
+            LandmarkComparison ou None se o arquivo não existir ou for inválido
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                video_info = json.loads(str(data["video_info"]))
+                for key in ("video1_resolution", "video2_resolution"):
+                    if key in video_info:
+                        video_info[key] = tuple(video_info[key])
+                return cls(
+                    frames1=data["frames1"],
+                    frames2=data["frames2"],
+                    similarities=data["similarities"],
+                    translations=data["translations"],
+                    scales=data["scales"],
+                    temporal_alignment=json.loads(str(data["temporal_alignment"])),
+                    video_info=video_info
+                )
+        except Exception as e:
+            logger.error(f"Erro ao carregar comparação por landmark {path}: {str(e)}")
+            return None
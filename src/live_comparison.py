@@ -0,0 +1,339 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Iterator, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from .comparador_movimento import ComparadorMovimento
+from .extraction_params import ExtractionParams
+from .pose_estimation import PoseExtractor
+from .pose_models import PoseLandmark
+from .pose_track import PoseTrack
+
+# Configuração do logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Políticas para frames que chegam enquanto a inferência está ocupada:
+# "latest" descarta os frames antigos (latência limitada), "none" processa todos
+DROP_POLICIES = ("latest", "none")
+
+# Complexidade do modelo do extrator padrão (o modelo pesado não acompanha a taxa de quadros)
+LIVE_MODEL_COMPLEXITY = 1
+
+@dataclass
+class LiveScore:
+    """Score de um frame da fonte ao vivo."""
+    frame_index: int  # Índice do frame na fonte
+    timestamp: float  # Instante do frame na fonte (segundos)
+    reference_frame: Optional[int]  # Frame da referência alinhado (None antes da primeira pose)
+    frame_similarity: Optional[float]  # Similaridade com o frame alinhado (None sem pose)
+    rolling_similarity: Optional[float]  # Média das similaridades na janela
+    latency: float  # Segundos entre a captura do frame e o score
+    dropped_frames: int  # Total de frames descartados até este score
+
+    def to_dict(self) -> Dict:
+        """Converte o score para um dicionário."""
+        return asdict(self)
+
+class OnlineAligner:
+    """
+    Alinhamento DTW incremental de uma sequência ao vivo contra uma referência.
+
+    Cada frame ao vivo é uma coluna da matriz acumulada sobre os frames da
+    referência: D_t[i] = c(i, t) + min(D_t-1[i-1], D_t-1[i], D_t[i-1]). O
+    início é livre na sequência ao vivo (D_t[0] = c(0, t)), então a pessoa pode
+    começar a qualquer momento. A dependência vertical é resolvida de forma
+    vetorizada como em dtw.dtw, e cada passo custa O(frames da referência).
+    A posição atual é o frame da referência com menor custo médio acumulado.
+    """
+
+    def __init__(self, reference: PoseTrack, comparador: ComparadorMovimento,
+                 weights: np.ndarray):
+        """
+        Inicializa o alinhador.
+
+        Args:
+            reference: Track denso da referência
+            comparador: Comparador que define o custo (1 - similaridade ponderada)
+            weights: Peso de cada landmark
+        """
+        if not len(reference):
+            raise ValueError("A referência não pode estar vazia")
+        self.reference = reference
+        # O custo por linha lê o frame atual deste buffer a cada passo
+        self._frame = np.full((1,) + reference.data.shape[1:], np.nan)
+        self._row_costs = comparador._row_cost_function(self._frame, reference.data, weights)
+        self._normalizer = np.arange(1, len(reference) + 1, dtype=np.float64)
+        self.reset()
+
+    def reset(self) -> None:
+        """Descarta o alinhamento acumulado."""
+        self._acc = np.full(len(self.reference), np.inf)
+        self.position: Optional[int] = None
+
+    def step(self, frame: np.ndarray) -> Tuple[int, float]:
+        """
+        Adiciona um frame ao vivo ao alinhamento.
+
+        Args:
+            frame: Array (num_landmarks, 4) com os landmarks do frame
+
+        Returns:
+            Tupla (frame da referência alinhado, similaridade com esse frame)
+        """
+        self._frame[0] = frame[:self._frame.shape[1]]
+        costs = self._row_costs(0)
+
+        best = costs + np.minimum(np.concatenate([[np.inf], self._acc[:-1]]), self._acc)
+        best[0] = costs[0]
+        prefix = np.cumsum(costs)
+        self._acc = np.minimum.accumulate(best - prefix) + prefix
+
+        self.position = int(np.argmin(self._acc / self._normalizer))
+        return self.position, float(1.0 - costs[self.position])
+
+class LiveComparator:
+    """
+    Compara uma fonte ao vivo (câmera, stream ou arquivo) com uma referência armazenada.
+
+    Uma thread lê os frames da fonte (arquivos são lidos no ritmo do FPS, como
+    uma câmera) e a thread chamadora executa a inferência e o alinhamento
+    online. Com a política "latest", a fila entre as duas tem tamanho
+    queue_size e os frames mais antigos são descartados quando a inferência
+    atrasa; frames que esperaram mais que max_latency também são descartados.
+    """
+
+    def __init__(self, reference: PoseTrack, extractor: Optional[PoseExtractor] = None,
+                 comparador: Optional[ComparadorMovimento] = None,
+                 landmark_weights: Optional[Dict[str, float]] = None,
+                 window_seconds: float = 2.0, drop_policy: str = "latest",
+                 queue_size: int = 1, max_latency: Optional[float] = 0.5):
+        """
+        Inicializa o comparador ao vivo.
+
+        Args:
+            reference: Track denso da referência
+            extractor: Extrator de pose (padrão: PoseExtractor com o modelo leve)
+            comparador: Comparador de movimento (padrão: ComparadorMovimento())
+            landmark_weights: Pesos dos landmarks (padrão: 1.0 para todos)
+            window_seconds: Duração da janela da similaridade móvel
+            drop_policy: "latest" (descarta frames atrasados) ou "none" (processa todos)
+            queue_size: Frames aguardando inferência no máximo
+            max_latency: Espera máxima de um frame na fila, em segundos (None: sem limite)
+        """
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Política de descarte inválida: {drop_policy}")
+        if window_seconds <= 0:
+            raise ValueError("window_seconds deve ser positivo")
+        if queue_size < 1:
+            raise ValueError("queue_size deve ser maior ou igual a 1")
+
+        self.reference = reference
+        self.extractor = extractor or PoseExtractor(
+            extraction_params=ExtractionParams(model_complexity=LIVE_MODEL_COMPLEXITY)
+        )
+        self.comparador = comparador or ComparadorMovimento()
+        weights = landmark_weights or {}
+        self.aligner = OnlineAligner(
+            reference, self.comparador,
+            self.comparador._weight_vector(weights, weights, reference.num_landmarks)
+        )
+        self.window_seconds = window_seconds
+        self.drop_policy = drop_policy
+        self.queue_size = queue_size
+        self.max_latency = max_latency
+        self._stats_lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Reinicia o alinhamento, a janela, as estatísticas e o rastreamento do extrator.
+
+        O extrator pode ter processado outro vídeo antes (ex: a referência);
+        sem reiniciá-lo, os primeiros frames ao vivo seriam rastreados a partir
+        da última pose desse vídeo.
+        """
+        self.extractor.reset()
+        self.aligner.reset()
+        self._window = deque()
+        self._window_sum = 0.0
+        self.stats = {"frames_read": 0, "frames_scored": 0, "dropped_frames": 0,
+                      "mean_latency": 0.0, "max_latency": 0.0}
+
+    def update(self, landmarks: Optional[Dict[int, PoseLandmark]], frame_index: int,
+               timestamp: float) -> LiveScore:
+        """
+        Pontua um frame ao vivo já processado.
+
+        Frames sem pose não avançam o alinhamento nem entram na janela.
+
+        Args:
+            landmarks: Landmarks do frame (ou None)
+            frame_index: Índice do frame na fonte
+            timestamp: Instante do frame na fonte, em segundos
+
+        Returns:
+            LiveScore do frame (latency = 0)
+        """
+        similarity = None
+        if landmarks:
+            frame = PoseTrack.from_landmarks([landmarks], num_landmarks=self.reference.num_landmarks,
+                                             dtype=np.float64).data[0]
+            _, similarity = self.aligner.step(frame)
+            self._window.append((timestamp, similarity))
+            self._window_sum += similarity
+
+        # Remove da janela as similaridades mais antigas que window_seconds
+        while self._window and self._window[0][0] <= timestamp - self.window_seconds:
+            self._window_sum -= self._window.popleft()[1]
+
+        return LiveScore(
+            frame_index=frame_index,
+            timestamp=timestamp,
+            reference_frame=self.aligner.position,
+            frame_similarity=similarity,
+            rolling_similarity=self._window_sum / len(self._window) if self._window else None,
+            latency=0.0,
+            dropped_frames=self.stats["dropped_frames"]
+        )
+
+    def run(self, source: Union[int, str], realtime: bool = True,
+            callback: Optional[Callable[[LiveScore], None]] = None) -> Iterator[LiveScore]:
+        """
+        Lê a fonte e gera um LiveScore por frame pontuado.
+
+        Interromper a iteração encerra a leitura e libera a fonte.
+
+        Args:
+            source: Índice da câmera, URL de stream ou caminho de arquivo
+            realtime: Lê arquivos no ritmo do FPS (simula uma câmera)
+            callback: Função chamada com cada score (opcional)
+
+        Yields:
+            LiveScore de cada frame processado
+        """
+        cap = cv2.VideoCapture(source)
+        if not cap.isOpened():
+            raise ValueError(f"Não foi possível abrir a fonte de vídeo: {source}")
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        # Câmeras não têm posição no arquivo: o instante é o tempo de captura
+        is_file = isinstance(source, str) and cap.get(cv2.CAP_PROP_FRAME_COUNT) > 0
+
+        self.reset()
+        frames = queue.Queue(maxsize=self.queue_size)
+        stop_event = threading.Event()
+        reader = threading.Thread(target=self._read_frames, name="live-reader", daemon=True,
+                                  args=(cap, fps, is_file, realtime and is_file, frames, stop_event))
+        reader.start()
+
+        total_latency = 0.0
+        try:
+            while True:
+                try:
+                    item = frames.get(timeout=0.1)
+                except queue.Empty:
+                    if not reader.is_alive():
+                        break
+                    continue
+                if item is None:
+                    break
+                frame_index, timestamp, captured_at, frame = item
+
+                # Frames que esperaram demais ficam para trás
+                if (self.drop_policy == "latest" and self.max_latency is not None
+                        and time.perf_counter() - captured_at > self.max_latency):
+                    self._count_drop()
+                    continue
+
+                score = self.update(self.extractor.process_frame(frame), frame_index, timestamp)
+                score.latency = time.perf_counter() - captured_at
+
+                self.stats["frames_scored"] += 1
+                total_latency += score.latency
+                self.stats["mean_latency"] = total_latency / self.stats["frames_scored"]
+                self.stats["max_latency"] = max(self.stats["max_latency"], score.latency)
+
+                if callback:
+                    callback(score)
+                yield score
+        finally:
+            stop_event.set()
+            reader.join()
+            cap.release()
+            logger.info(f"Comparação ao vivo encerrada: {self.stats}")
+
+    def _read_frames(self, cap, fps: float, is_file: bool, paced: bool,
+                     frames: queue.Queue, stop_event: threading.Event) -> None:
+        """
+        Thread de leitura: envia (índice, instante, captura, frame) para a fila.
+
+        Args:
+            cap: VideoCapture aberto
+            fps: FPS da fonte
+            is_file: A fonte é um arquivo (o instante vem do índice do frame)
+            paced: Lê no ritmo do FPS
+            frames: Fila de frames para a inferência
+            stop_event: Sinal de encerramento
+        """
+        start = time.perf_counter()
+        frame_index = 0
+        try:
+            while not stop_event.is_set():
+                if paced and fps > 0:
+                    delay = start + frame_index / fps - time.perf_counter()
+                    if delay > 0 and stop_event.wait(delay):
+                        break
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                captured_at = time.perf_counter()
+                timestamp = frame_index / fps if is_file and fps > 0 else captured_at - start
+                self.stats["frames_read"] += 1
+                if not self._enqueue(frames, (frame_index, timestamp, captured_at, frame), stop_event):
+                    break
+                frame_index += 1
+        except Exception as e:
+            logger.error(f"Erro ao ler a fonte de vídeo: {str(e)}")
+        finally:
+            self._enqueue(frames, None, stop_event, drop=False)
+
+    def _enqueue(self, frames: queue.Queue, item, stop_event: threading.Event,
+                 drop: Optional[bool] = None) -> bool:
+        """
+        Coloca um item na fila, descartando o mais antigo se a política permitir.
+
+        Returns:
+            bool: False se a leitura foi encerrada antes de o item entrar na fila
+        """
+        if drop is None:
+            drop = self.drop_policy == "latest"
+        while not stop_event.is_set():
+            try:
+                if drop:
+                    frames.put_nowait(item)
+                else:
+                    frames.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                if not drop:
+                    continue
+                try:
+                    frames.get_nowait()
+                    self._count_drop()
+                except queue.Empty:
+                    pass
+        return False
+
+    def _count_drop(self) -> None:
+        """Conta um frame descartado (chamado pelas duas threads)."""
+        with self._stats_lock:
+            self.stats["dropped_frames"] += 1
@@ -0,0 +1,217 @@
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+import numpy as np
+
+# Configuração do logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Orçamento padrão de memória do cache (256 MiB)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Listas e tuplas maiores que o limite têm o tamanho estimado por amostragem
+SIZE_SAMPLE_THRESHOLD = 256
+SIZE_SAMPLE_COUNT = 64
+
+def estimate_size(obj: Any) -> int:
+    """
+    Estima a memória ocupada por um objeto e por tudo o que ele referencia.
+
+    Percorre contêineres (dict, list, tuple, set), atributos de instâncias
+    (__dict__ e __slots__) e arrays NumPy (contando os dados de arrays em
+    memória; arrays mapeados de arquivo contam apenas o cabeçalho). Objetos
+    compartilhados são contados uma única vez. Listas e tuplas longas (como
+    os frames de um vídeo) são estimadas a partir de uma amostra dos seus
+    elementos.
+
+    Args:
+        obj: Objeto a ser medido
+
+    Returns:
+        int: Tamanho estimado em bytes
+    """
+    return _estimate_size(obj, set())
+
+def _estimate_size(obj: Any, seen: set) -> int:
+    """Percorre o grafo de objetos a partir de obj (ver estimate_size)."""
+    stack = [obj]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+
+        if isinstance(current, np.ndarray):
+            # Views e memmaps não são donos dos dados (getsizeof já inclui arrays donos)
+            if current.base is not None and not isinstance(current, np.memmap):
+                stack.append(current.base)
+            continue
+        if isinstance(current, (str, bytes, bytearray, int, float, bool, type(None))):
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple)) and len(current) > SIZE_SAMPLE_THRESHOLD:
+            # Extrapola o tamanho dos elementos a partir de uma amostra espaçada
+            step = len(current) / SIZE_SAMPLE_COUNT
+            sample = [current[int(i * step)] for i in range(SIZE_SAMPLE_COUNT)]
+            sample_size = sum(_estimate_size(item, seen) for item in sample)
+            total += int(sample_size * len(current) / SIZE_SAMPLE_COUNT)
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+
+        if hasattr(current, "__dict__") and not isinstance(current, type):
+            stack.append(vars(current))
+        for slot in getattr(type(current), "__slots__", ()):
+            if hasattr(current, slot):
+                stack.append(getattr(current, slot))
+    return total
+
+class MemoryCache(MutableMapping):
+    """
+    Cache em memória com orçamento de bytes, remoção LRU e expiração opcional.
+
+    Funciona como um dicionário: cache[key] = value insere (removendo as
+    entradas menos usadas recentemente até caber no orçamento) e cache[key]
+    lê, marcando a entrada como usada recentemente. Entradas maiores que o
+    orçamento inteiro não são armazenadas. O acesso é protegido por lock.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, ttl_seconds: Optional[float] = None,
+                 sizeof: Callable[[Any], int] = estimate_size):
+        """
+        Inicializa o cache.
+
+        Args:
+            max_bytes: Orçamento de memória em bytes
+            ttl_seconds: Tempo de vida das entradas em segundos (None: sem expiração)
+            sizeof: Função que estima o tamanho de um valor em bytes
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes deve ser positivo")
+        if ttl_seconds is not None and ttl_seconds <= 0:
+            raise ValueError("ttl_seconds deve ser positivo")
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.sizeof = sizeof
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _is_expired(self, expires_at: Optional[float]) -> bool:
+        return expires_at is not None and time.monotonic() >= expires_at
+
+    def _remove(self, key: Hashable) -> Any:
+        value, size, _ = self._entries.pop(key)
+        self.current_bytes -= size
+        return value
+
+    def __getitem__(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_expired(entry[2]):
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                raise KeyError(key)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                logger.debug(f"Entrada {key} ({size} bytes) maior que o orçamento do cache, ignorada")
+                return
+            # Remove as entradas menos usadas recentemente até a nova caber
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                evicted_key, _ = next(iter(self._entries.items()))
+                self._remove(evicted_key)
+                self.evictions += 1
+                logger.debug(f"Entrada removida do cache (LRU): {evicted_key}")
+            expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else None
+            self._entries[key] = (value, size, expires_at)
+            self.current_bytes += size
+
+    def __delitem__(self, key: Hashable) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def __contains__(self, key: object) -> bool:
+        # Consulta sem contar acerto/falha nem alterar a ordem LRU
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._is_expired(entry[2])
+
+    def __iter__(self) -> Iterator[Hashable]:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __repr__(self) -> str:
+        return (f"MemoryCache(entries={len(self)}, bytes={self.current_bytes}, "
+                f"max_bytes={self.max_bytes})")
+
+    def clear(self) -> None:
+        """Remove todas as entradas (sem contá-las como remoções LRU)."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def purge_expired(self) -> int:
+        """
+        Remove as entradas expiradas.
+
+        Returns:
+            int: Número de entradas removidas
+        """
+        with self._lock:
+            expired = [key for key, (_, _, expires_at) in self._entries.items()
+                       if self._is_expired(expires_at)]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+            return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna as estatísticas do cache.
+
+        Returns:
+            Dicionário com entradas, bytes, orçamento, acertos, falhas, remoções e expirações
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
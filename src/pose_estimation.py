@@ -3,13 +3,19 @@ import mediapipe as mp
 import numpy as np
 import logging
 import os
-from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Iterator, List, Dict, Optional, Tuple
+from dataclasses import dataclass, replace
 from pathlib import Path
 
 from .pose_storage import PoseStorage
 from .pose_models import PoseLandmark
 from .comparison_params import ComparisonParams
+from .extraction_params import ExtractionParams
 from .comparison_results import ComparisonResults
 from .comparador_movimento import DanceComparison
 
@@ -20,12 +26,217 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Número de frames processados por um worker entre cada envio de progresso
+PROGRESS_BATCH_SIZE = 10
+
+def plan_frame_chunks(total_frames: int, num_chunks: int,
+                      warmup_frames: int = 0) -> List[Tuple[int, int, Optional[int]]]:
+    """
+    Divide o vídeo em intervalos contíguos de frames para extração paralela.
+    
+    Args:
+        total_frames: Total de frames do vídeo
+        num_chunks: Número de intervalos desejado
+        warmup_frames: Frames processados antes do início de cada intervalo
+            (descartados) para aquecer o tracking do MediaPipe
+            
+    Returns:
+        Lista de tuplas (inicio_aquecimento, inicio, fim). O fim do último
+        intervalo é None, indicando leitura até o fim do vídeo.
+    """
+    if total_frames <= 0:
+        return [(0, 0, None)]
+        
+    num_chunks = max(1, min(num_chunks, total_frames))
+    chunk_size = -(-total_frames // num_chunks)
+    
+    chunks = []
+    for start in range(0, total_frames, chunk_size):
+        end = start + chunk_size
+        chunks.append((max(0, start - warmup_frames), start, end))
+        
+    # O último intervalo lê até o fim, pois CAP_PROP_FRAME_COUNT pode ser impreciso
+    warmup_start, start, _ = chunks[-1]
+    chunks[-1] = (warmup_start, start, None)
+    return chunks
+
+def iter_sampled_frames(cap, stride: int = 1, start: int = 0, end: Optional[int] = None,
+                        resolution: Optional[Tuple[int, int]] = None):
+    """
+    Percorre os frames de um vídeo decodificando apenas os frames amostrados.
+    
+    Frames fora da amostragem são avançados com cap.grab(), sem decodificação
+    completa. A amostragem usa o índice global do frame (frame_idx % stride == 0),
+    portanto é consistente entre intervalos processados em paralelo.
+    
+    Args:
+        cap: VideoCapture já posicionado no frame start
+        stride: Intervalo entre frames amostrados
+        start: Índice do frame atual do VideoCapture
+        end: Índice final exclusivo (None para ler até o fim)
+        resolution: Resolução para redimensionar os frames decodificados (opcional)
+        
+    Yields:
+        Tuplas (frame_idx, frame), com frame None para frames não amostrados
+    """
+    frame_idx = start
+    while end is None or frame_idx < end:
+        if frame_idx % stride:
+            if not cap.grab():
+                break
+            yield frame_idx, None
+        else:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if resolution:
+                frame = cv2.resize(frame, resolution)
+            yield frame_idx, frame
+        frame_idx += 1
+
+def interpolate_landmarks(start: Dict[int, PoseLandmark], end: Dict[int, PoseLandmark],
+                          t: float) -> Dict[int, PoseLandmark]:
+    """
+    Interpola linearmente dois conjuntos de landmarks.
+    
+    Args:
+        start: Landmarks do frame inicial
+        end: Landmarks do frame final
+        t: Posição relativa entre os frames (0.0 a 1.0)
+        
+    Returns:
+        Dicionário com os landmarks interpolados (apenas ids presentes em ambos)
+    """
+    interpolated = {}
+    for idx, a in start.items():
+        b = end.get(idx)
+        if b is None:
+            continue
+        interpolated[idx] = PoseLandmark(
+            x=a.x + (b.x - a.x) * t,
+            y=a.y + (b.y - a.y) * t,
+            z=a.z + (b.z - a.z) * t,
+            visibility=a.visibility + (b.visibility - a.visibility) * t
+        )
+    return interpolated
+
+def _extract_chunk(task: dict) -> List[Optional[Dict[int, PoseLandmark]]]:
+    """
+    Extrai os landmarks de um intervalo de frames em um processo worker.
+    
+    Cada worker cria sua própria instância do MediaPipe Pose, posiciona o vídeo
+    no início do aquecimento e descarta os landmarks dos frames de aquecimento.
+    
+    Args:
+        task: Dicionário com a descrição do intervalo e a configuração do extrator
+        
+    Returns:
+        Lista de landmarks por frame do intervalo
+    """
+    extractor = PoseExtractor(
+        min_detection_confidence=task["min_detection_confidence"],
+        min_tracking_confidence=task["min_tracking_confidence"],
+        comparison_params=task["comparison_params"],
+        extraction_params=task["extraction_params"]
+    )
+    progress_queue = task.get("progress_queue")
+    resolution = task["resolution"]
+    start, end = task["start"], task["end"]
+    
+    cap = cv2.VideoCapture(task["video_path"])
+    try:
+        if not cap.isOpened():
+            raise IOError(f"Erro ao abrir vídeo: {task['video_path']}")
+        if task["warmup_start"] > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, task["warmup_start"])
+            
+        landmarks = []
+        pending = 0
+        frames = iter_sampled_frames(cap, task["stride"], task["warmup_start"], end, resolution)
+        for frame_idx, frame in frames:
+            frame_landmarks = extractor.process_frame(frame) if frame is not None else None
+            if frame_idx >= start:
+                landmarks.append(frame_landmarks)
+                pending += 1
+                if progress_queue is not None and pending >= PROGRESS_BATCH_SIZE:
+                    progress_queue.put(pending)
+                    pending = 0
+            
+        if progress_queue is not None and pending:
+            progress_queue.put(pending)
+        return landmarks
+    finally:
+        cap.release()
+        extractor.close()
+
+def compute_roi(bbox: Tuple[float, float, float, float], frame_size: Tuple[int, int],
+                padding: float) -> Tuple[int, int, int, int]:
+    """
+    Calcula uma região de interesse com margem ao redor de uma caixa.
+    
+    Args:
+        bbox: Caixa (min_x, min_y, max_x, max_y) em pixels
+        frame_size: Dimensões (width, height) do frame
+        padding: Margem relativa ao maior lado da caixa
+        
+    Returns:
+        Tupla (x0, y0, x1, y1) em pixels, limitada ao frame
+    """
+    width, height = frame_size
+    min_x, min_y, max_x, max_y = bbox
+    pad = max(max_x - min_x, max_y - min_y) * padding
+    x0 = int(max(0, min_x - pad))
+    y0 = int(max(0, min_y - pad))
+    x1 = int(min(width, max_x + pad))
+    y1 = int(min(height, max_y + pad))
+    if x1 - x0 < 2 or y1 - y0 < 2:
+        return 0, 0, width, height
+    return x0, y0, x1, y1
+
+def _mean_visibility(pose_landmarks) -> float:
+    """Retorna a visibilidade média dos landmarks detectados pelo MediaPipe."""
+    landmarks = pose_landmarks.landmark
+    return sum(lm.visibility for lm in landmarks) / len(landmarks) if landmarks else 0.0
+
+@dataclass
+class PipelineTimings:
+    """Tempos acumulados (em segundos) de cada estágio do pipeline de extração."""
+    decode: float = 0.0
+    inference: float = 0.0
+    postprocess: float = 0.0
+    write: float = 0.0
+    wall: float = 0.0
+    frames: int = 0
+
+    def bottleneck(self) -> str:
+        """Retorna o estágio com maior tempo acumulado."""
+        stages = {
+            "decode": self.decode,
+            "inference": self.inference,
+            "postprocess": self.postprocess,
+            "write": self.write
+        }
+        return max(stages, key=stages.get)
+
+    def to_dict(self) -> Dict:
+        """Converte os tempos para um dicionário."""
+        return {
+            "decode": self.decode,
+            "inference": self.inference,
+            "postprocess": self.postprocess,
+            "write": self.write,
+            "wall": self.wall,
+            "frames": self.frames,
+            "bottleneck": self.bottleneck()
+        }
+
 class PoseExtractor:
     """Classe responsável por extrair pontos-chave do corpo usando MediaPipe."""
     
     def __init__(self, min_detection_confidence: float = 0.5, 
                  min_tracking_confidence: float = 0.5,
-                 comparison_params: Optional[ComparisonParams] = None):
+                 comparison_params: Optional[ComparisonParams] = None,
+                 extraction_params: Optional[ExtractionParams] = None):
         """
         Inicializa o extrator de pose.
         
@@ -33,33 +244,78 @@ class PoseExtractor:
             min_detection_confidence: Confiança mínima para detecção (0.0 a 1.0)
             min_tracking_confidence: Confiança mínima para tracking (0.0 a 1.0)
             comparison_params: Parâmetros de comparação (opcional)
+            extraction_params: Parâmetros de execução da extração (opcional)
         """
         if not 0.0 <= min_detection_confidence <= 1.0:
             raise ValueError("min_detection_confidence deve estar entre 0.0 e 1.0")
         if not 0.0 <= min_tracking_confidence <= 1.0:
             raise ValueError("min_tracking_confidence deve estar entre 0.0 e 1.0")
             
-        self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(
-            static_image_mode=False,
-            model_complexity=2,
-            min_detection_confidence=min_detection_confidence,
-            min_tracking_confidence=min_tracking_confidence
-        )
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
         self.storage = PoseStorage()
         self.comparison_params = comparison_params or ComparisonParams()
+        self.extraction_params = extraction_params or ExtractionParams()
+        
+        self.mp_pose = mp.solutions.pose
+        self.light_pose = None
+        if self.extraction_params.adaptive:
+            # O modelo pesado roda apenas em keyframes esparsos, então usa o modo
+            # de imagem estática (detecção completa) em vez do rastreamento interno
+            self.pose = self._create_pose(self.extraction_params.model_complexity, static_image_mode=True)
+            self.light_pose = self._create_pose(self.extraction_params.light_model_complexity)
+        else:
+            self.pose = self._create_pose(self.extraction_params.model_complexity)
         logger.info("PoseExtractor inicializado com sucesso")
 
         self.landmarks = []
         self.fps = 0.0
         self.resolution = (0, 0)
         self.total_frames = 0
+        self.stage_timings = PipelineTimings()
+        self._reset_adaptive_state()
+
+    def _create_pose(self, model_complexity: int, static_image_mode: bool = False):
+        """Cria uma instância do MediaPipe Pose com as confianças configuradas."""
+        return self.mp_pose.Pose(
+            static_image_mode=static_image_mode,
+            model_complexity=model_complexity,
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence
+        )
+
+    def _reset_adaptive_state(self) -> None:
+        """Reinicia o estado do modo adaptativo (ROI, keyframes e contadores)."""
+        self._roi = None
+        self._frames_since_keyframe = None
+        self.inference_counts = {"heavy": 0, "light": 0}
+
+    def reset(self) -> None:
+        """
+        Descarta o estado do vídeo anterior antes de processar outro vídeo.
+
+        No modo de rastreamento, o MediaPipe Pose localiza a pessoa a partir da
+        pose do frame anterior; sem reiniciar o grafo, os primeiros frames de um
+        vídeo seriam rastreados a partir do último frame do vídeo anterior.
+        """
+        for pose in (self.pose, self.light_pose):
+            if pose is not None:
+                pose.reset()
+        self.landmarks = []
+        self.fps = 0.0
+        self.resolution = (0, 0)
+        self.total_frames = 0
+        self.stage_timings = PipelineTimings()
+        self._reset_adaptive_state()
 
     def close(self):
         """Libera explicitamente os recursos do MediaPipe."""
         if hasattr(self, 'pose') and self.pose:
             self.pose.close()
             self.pose = None # Define como None após fechar
+        if getattr(self, 'light_pose', None):
+            self.light_pose.close()
+            self.light_pose = None
 
     def normalize_landmarks(self, landmarks: Dict[int, PoseLandmark]) -> Dict[int, PoseLandmark]:
         """
@@ -134,16 +390,10 @@ class PoseExtractor:
         
         return weighted
 
-    def process_frame(self, frame: np.ndarray) -> Optional[Dict[int, PoseLandmark]]:
+    def _validate_frame(self, frame: np.ndarray) -> None:
         """
-        Processa um frame e extrai os landmarks do corpo.
+        Valida um frame antes do processamento.
         
-        Args:
-            frame: Frame do vídeo em formato numpy array
-            
-        Returns:
-            Dicionário com os landmarks detectados ou None se nenhum landmark for detectado
-            
         Raises:
             ValueError: Se o frame for None ou inválido
         """
@@ -155,33 +405,176 @@ class PoseExtractor:
             
         if len(frame.shape) != 3 or frame.shape[2] != 3:
             raise ValueError("Frame deve ser uma imagem colorida (3 canais)")
+
+    def _detect_pose(self, frame: np.ndarray):
+        """
+        Executa a inferência do MediaPipe em um frame BGR.
+        
+        Args:
+            frame: Frame do vídeo em formato numpy array (BGR)
             
-        try:
-            # Converte BGR para RGB
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        Returns:
+            Landmarks detectados pelo MediaPipe ou None se nenhum for detectado
+        """
+        if self.extraction_params.adaptive:
+            return self._detect_pose_adaptive(frame)
+            
+        # Converte BGR para RGB
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        
+        # Processa o frame
+        results = self.pose.process(frame_rgb)
+        return results.pose_landmarks
+
+    def _detect_pose_adaptive(self, frame: np.ndarray):
+        """
+        Executa a inferência adaptativa em um frame BGR.
+        
+        O modelo pesado roda em keyframes (a cada keyframe_interval frames) e
+        sempre que o modelo leve perde a pose ou a visibilidade média cai abaixo
+        de confidence_threshold. Nos demais frames o modelo leve processa apenas
+        a região ao redor da pose anterior, e os landmarks são convertidos de
+        volta para coordenadas do frame completo.
+        
+        Args:
+            frame: Frame do vídeo em formato numpy array (BGR)
             
-            # Processa o frame
-            results = self.pose.process(frame_rgb)
+        Returns:
+            Landmarks detectados (coordenadas do frame completo) ou None
+        """
+        params = self.extraction_params
+        is_keyframe = (self._frames_since_keyframe is None or
+                       self._frames_since_keyframe >= params.keyframe_interval - 1)
+        
+        pose_landmarks = None
+        if not is_keyframe:
+            pose_landmarks = self._detect_pose_light(frame)
+            if pose_landmarks is None or _mean_visibility(pose_landmarks) < params.confidence_threshold:
+                is_keyframe = True
+                
+        if is_keyframe:
+            self.inference_counts["heavy"] += 1
+            pose_landmarks = self.pose.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)).pose_landmarks
+            self._frames_since_keyframe = 0 if pose_landmarks else None
+            # Força o recálculo da ROI a partir da nova detecção
+            self._roi = None
+        else:
+            self._frames_since_keyframe += 1
             
-            if not results.pose_landmarks:
-                logger.warning("Nenhum landmark detectado no frame")
-                return None
+        if pose_landmarks:
+            self._update_roi(pose_landmarks, frame.shape[1], frame.shape[0])
+        return pose_landmarks
+
+    def _detect_pose_light(self, frame: np.ndarray):
+        """
+        Executa o modelo leve no recorte da ROI atual (ou no frame inteiro).
+        
+        Args:
+            frame: Frame do vídeo em formato numpy array (BGR)
             
-            # Extrai os landmarks
-            landmarks = {}
-            for idx, landmark in enumerate(results.pose_landmarks.landmark):
-                landmarks[idx] = PoseLandmark(
-                    x=landmark.x,
-                    y=landmark.y,
-                    z=landmark.z,
-                    visibility=landmark.visibility
-                )
+        Returns:
+            Landmarks detectados em coordenadas do frame completo ou None
+        """
+        self.inference_counts["light"] += 1
+        height, width = frame.shape[:2]
+        x0, y0, x1, y1 = self._roi if self._roi and self.extraction_params.roi_crop else (0, 0, width, height)
+        
+        crop = frame[y0:y1, x0:x1]
+        pose_landmarks = self.light_pose.process(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)).pose_landmarks
+        if pose_landmarks is None or (x1 - x0, y1 - y0) == (width, height):
+            return pose_landmarks
             
-            # Aplica as transformações configuradas
-            landmarks = self.normalize_landmarks(landmarks)
-            landmarks = self.apply_landmark_weights(landmarks)
+        # Converte as coordenadas do recorte para o frame completo
+        crop_width, crop_height = x1 - x0, y1 - y0
+        for landmark in pose_landmarks.landmark:
+            landmark.x = (x0 + landmark.x * crop_width) / width
+            landmark.y = (y0 + landmark.y * crop_height) / height
+            landmark.z = landmark.z * crop_width / width
+        return pose_landmarks
+
+    def _update_roi(self, pose_landmarks, width: int, height: int) -> None:
+        """
+        Atualiza a ROI usada pelo modelo leve a partir dos landmarks do frame.
+        
+        A ROI só é recalculada quando a pose se aproxima da borda do recorte
+        atual; manter o recorte estável preserva o rastreamento interno do
+        MediaPipe entre frames consecutivos.
+        
+        Args:
+            pose_landmarks: Landmarks em coordenadas normalizadas do frame completo
+            width: Largura do frame
+            height: Altura do frame
+        """
+        xs = [lm.x * width for lm in pose_landmarks.landmark]
+        ys = [lm.y * height for lm in pose_landmarks.landmark]
+        min_x, max_x, min_y, max_y = min(xs), max(xs), min(ys), max(ys)
+        
+        if self._roi is not None:
+            x0, y0, x1, y1 = self._roi
+            margin_x = (x1 - x0) * self.extraction_params.roi_padding / 4
+            margin_y = (y1 - y0) * self.extraction_params.roi_padding / 4
+            if (min_x >= x0 + margin_x and max_x <= x1 - margin_x and
+                    min_y >= y0 + margin_y and max_y <= y1 - margin_y):
+                return
+                
+        self._roi = compute_roi((min_x, min_y, max_x, max_y), (width, height),
+                                self.extraction_params.roi_padding)
+
+    def _build_landmarks(self, pose_landmarks) -> Optional[Dict[int, PoseLandmark]]:
+        """
+        Converte a saída do MediaPipe em landmarks e aplica as transformações configuradas.
+        
+        Args:
+            pose_landmarks: Landmarks detectados pelo MediaPipe (ou None)
             
-            return landmarks
+        Returns:
+            Dicionário com os landmarks ou None se nenhum landmark foi detectado
+        """
+        if not pose_landmarks:
+            logger.warning("Nenhum landmark detectado no frame")
+            return None
+        
+        # Extrai os landmarks
+        landmarks = {}
+        for idx, landmark in enumerate(pose_landmarks.landmark):
+            landmarks[idx] = PoseLandmark(
+                x=landmark.x,
+                y=landmark.y,
+                z=landmark.z,
+                visibility=landmark.visibility
+            )
+        
+        # Aplica as transformações configuradas
+        landmarks = self.normalize_landmarks(landmarks)
+        landmarks = self.apply_landmark_weights(landmarks)
+        
+        return landmarks
+
+    def _draw_landmarks(self, frame: np.ndarray, landmarks: Dict[int, PoseLandmark],
+                        width: int, height: int) -> None:
+        """Desenha os landmarks no frame."""
+        for landmark in landmarks.values():
+            x = int(landmark.x * width)
+            y = int(landmark.y * height)
+            cv2.circle(frame, (x, y), 3, (0, 255, 0), -1)
+
+    def process_frame(self, frame: np.ndarray) -> Optional[Dict[int, PoseLandmark]]:
+        """
+        Processa um frame e extrai os landmarks do corpo.
+        
+        Args:
+            frame: Frame do vídeo em formato numpy array
+            
+        Returns:
+            Dicionário com os landmarks detectados ou None se nenhum landmark for detectado
+            
+        Raises:
+            ValueError: Se o frame for None ou inválido
+        """
+        self._validate_frame(frame)
+            
+        try:
+            return self._build_landmarks(self._detect_pose(frame))
             
         except Exception as e:
             logger.error(f"Erro ao processar frame: {str(e)}")
@@ -203,72 +596,450 @@ class PoseExtractor:
             bool: True se o processamento foi bem-sucedido
         """
         try:
-            # Abre o vídeo
-            cap = cv2.VideoCapture(video_path)
-            if not cap.isOpened():
-                logger.error(f"Erro ao abrir vídeo: {video_path}")
+            # Abre o vídeo e obtém suas informações
+            cap = self._open_video(video_path)
+            if cap is None:
                 return False
                 
-            # Obtém informações do vídeo
-            self.fps = cap.get(cv2.CAP_PROP_FPS)
-            self.total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            
-            # Atualiza a resolução do extrator
-            self.resolution = (width, height)
-            
             # Define a resolução para processamento se especificada
-            if resolution:
-                width, height = resolution
+            width, height = resolution or self.resolution
+                
+            # Extração paralela (o vídeo anotado exige o caminho sequencial)
+            if self.extraction_params.num_workers > 1:
+                if output_path:
+                    logger.warning("Vídeo de saída não suportado na extração paralela; "
+                                   "usando processamento sequencial")
+                else:
+                    cap.release()
+                    return self._process_video_parallel(video_path, resolution, progress_callback)
+                
+            # Intervalo de amostragem (stride fixo ou FPS alvo)
+            stride = self._get_frame_stride()
+            if stride > 1:
+                logger.info(f"Amostrando 1 a cada {stride} frames")
                 
             # Prepara o writer se output_path for especificado
-            writer = None
-            if output_path:
-                fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-                writer = cv2.VideoWriter(output_path, fourcc, self.fps, (width, height))
+            writer = self._create_writer(output_path, (width, height), stride)
+                
+            # Pipeline com decodificação, inferência e pós-processamento em estágios
+            if self.extraction_params.pipeline:
+                return self._process_video_pipelined(cap, writer, resolution, (width, height),
+                                                     stride, progress_callback)
                 
             # Processa cada frame
-            frame_count = 0
-            self.landmarks = []
+            self.landmarks = [
+                landmarks for _, landmarks in
+                self._iter_capture(cap, writer, resolution, (width, height), stride, progress_callback)
+            ]
+            return True
             
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
+        except Exception as e:
+            logger.error(f"Erro ao processar vídeo: {str(e)}")
+            return False
+
+    def iter_video(self, video_path: str, output_path: Optional[str] = None,
+                   resolution: Optional[Tuple[int, int]] = None,
+                   progress_callback: Optional[callable] = None
+                   ) -> Iterator[Tuple[int, Optional[Dict[int, PoseLandmark]]]]:
+        """
+        Extrai os landmarks de um vídeo frame a frame, sem acumulá-los em memória.
+        
+        O vídeo é aberto imediatamente, de forma que get_fps(), get_resolution()
+        e get_total_frames() já estão disponíveis antes do consumo do iterador.
+        A decodificação é sequencial (num_workers e pipeline são ignorados) e
+        self.landmarks não é preenchido.
+        
+        Args:
+            video_path: Caminho do vídeo
+            output_path: Caminho para salvar o vídeo processado (opcional)
+            resolution: Resolução do vídeo processado (opcional)
+            progress_callback: Função de callback para atualizar o progresso (opcional)
+            
+        Returns:
+            Iterador de tuplas (frame_number, landmarks), com landmarks None
+            para frames sem detecção ou não amostrados
+            
+        Raises:
+            IOError: Se o vídeo não puder ser aberto
+        """
+        cap = self._open_video(video_path)
+        if cap is None:
+            raise IOError(f"Erro ao abrir vídeo: {video_path}")
+            
+        frame_size = resolution or self.resolution
+        stride = self._get_frame_stride()
+        writer = self._create_writer(output_path, frame_size, stride)
+        return self._iter_capture(cap, writer, resolution, frame_size, stride, progress_callback)
+
+    def _open_video(self, video_path: str) -> Optional[cv2.VideoCapture]:
+        """
+        Abre um vídeo e atualiza as informações do extrator.
+        
+        Args:
+            video_path: Caminho do vídeo
+            
+        Returns:
+            VideoCapture aberto ou None se o vídeo não puder ser aberto
+        """
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            logger.error(f"Erro ao abrir vídeo: {video_path}")
+            return None
+            
+        # Obtém informações do vídeo
+        self.fps = cap.get(cv2.CAP_PROP_FPS)
+        self.total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.resolution = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                           int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        self._reset_adaptive_state()
+        return cap
+
+    def _create_writer(self, output_path: Optional[str], frame_size: Tuple[int, int],
+                       stride: int = 1):
+        """Cria o VideoWriter do vídeo anotado, se output_path for especificado."""
+        if not output_path:
+            return None
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        return cv2.VideoWriter(output_path, fourcc, self.fps / stride, frame_size)
+
+    def _iter_capture(self, cap, writer, resolution: Optional[Tuple[int, int]],
+                      frame_size: Tuple[int, int], stride: int = 1,
+                      progress_callback: Optional[callable] = None
+                      ) -> Iterator[Tuple[int, Optional[Dict[int, PoseLandmark]]]]:
+        """
+        Processa sequencialmente os frames de um VideoCapture.
+        
+        No modo de interpolação, os frames pulados ficam retidos até o próximo
+        frame amostrado (no máximo stride - 1 frames), mantendo a memória limitada.
+        O VideoCapture e o writer são liberados ao final da iteração.
+        
+        Args:
+            cap: VideoCapture já aberto
+            writer: VideoWriter para o vídeo anotado (opcional)
+            resolution: Resolução do vídeo processado (opcional)
+            frame_size: Dimensões (width, height) usadas para desenhar os landmarks
+            stride: Intervalo entre frames amostrados
+            progress_callback: Função de callback para atualizar o progresso (opcional)
+            
+        Yields:
+            Tuplas (frame_number, landmarks) na ordem do vídeo
+        """
+        width, height = frame_size
+        interpolate = self.extraction_params.fill_skipped == "interpolate"
+        pending = []
+        previous_idx, previous = 0, None
+        frame_count = 0
+        
+        try:
+            for frame_idx, frame in iter_sampled_frames(cap, stride, resolution=resolution):
+                frame_count += 1
+                if progress_callback:
+                    progress_callback(frame_count, self.total_frames)
                     
-                # Redimensiona o frame se necessário
-                if resolution:
-                    frame = cv2.resize(frame, resolution)
+                # Frames não amostrados ficam sem landmarks (ou aguardam interpolação)
+                if frame is None:
+                    if interpolate:
+                        pending.append(frame_idx)
+                    else:
+                        yield frame_idx, None
+                    continue
                     
                 # Processa o frame
                 landmarks = self.process_frame(frame)
-                self.landmarks.append(landmarks)
                 
                 # Salva o frame processado se necessário
                 if writer and landmarks:
                     # Desenha os landmarks no frame
-                    for landmark in landmarks.values():
-                        x = int(landmark.x * width)
-                        y = int(landmark.y * height)
-                        cv2.circle(frame, (x, y), 3, (0, 255, 0), -1)
+                    self._draw_landmarks(frame, landmarks, width, height)
                     writer.write(frame)
                     
-                # Atualiza o progresso
+                for idx in pending:
+                    if previous is None or landmarks is None:
+                        yield idx, None
+                    else:
+                        t = (idx - previous_idx) / (frame_idx - previous_idx)
+                        yield idx, interpolate_landmarks(previous, landmarks, t)
+                pending = []
+                previous_idx, previous = frame_idx, landmarks
+                yield frame_idx, landmarks
+                
+            # Frames após o último frame amostrado permanecem vazios
+            for idx in pending:
+                yield idx, None
+        finally:
+            # Limpa os recursos
+            cap.release()
+            if writer:
+                writer.release()
+
+    def _process_video_pipelined(self, cap, writer, resolution: Optional[Tuple[int, int]],
+                                 frame_size: Tuple[int, int], stride: int = 1,
+                                 progress_callback: Optional[callable] = None) -> bool:
+        """
+        Processa um vídeo em três estágios sobrepostos.
+        
+        Uma thread decodifica frames para uma fila limitada, a thread chamadora
+        executa a inferência do MediaPipe e uma terceira thread constrói os
+        landmarks, aplica normalização/pesos e escreve o vídeo anotado. A
+        decodificação e a codificação do OpenCV liberam o GIL e se sobrepõem
+        à inferência. Os tempos de cada estágio ficam em self.stage_timings.
+        
+        Args:
+            cap: VideoCapture já aberto
+            writer: VideoWriter para o vídeo anotado (opcional)
+            resolution: Resolução do vídeo processado (opcional)
+            frame_size: Dimensões (width, height) usadas para desenhar os landmarks
+            stride: Intervalo entre frames amostrados
+            progress_callback: Função de callback para atualizar o progresso (opcional)
+            
+        Returns:
+            bool: True se o processamento foi bem-sucedido
+        """
+        timings = PipelineTimings()
+        self.stage_timings = timings
+        decode_queue = queue.Queue(maxsize=self.extraction_params.decode_queue_size)
+        output_queue = queue.Queue(maxsize=self.extraction_params.output_queue_size)
+        stop_event = threading.Event()
+        errors = []
+        width, height = frame_size
+        self.landmarks = []
+        
+        def put(target: queue.Queue, item) -> bool:
+            # Evita bloquear para sempre se outro estágio falhar
+            while not stop_event.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def decode_stage():
+            try:
+                frames = iter_sampled_frames(cap, stride, resolution=resolution)
+                while not stop_event.is_set():
+                    start = time.perf_counter()
+                    item = next(frames, None)
+                    timings.decode += time.perf_counter() - start
+                    if item is None:
+                        break
+                    if not put(decode_queue, item):
+                        return
+            except Exception as e:
+                errors.append(e)
+                stop_event.set()
+            finally:
+                put(decode_queue, None)
+        
+        def postprocess_stage():
+            try:
+                while True:
+                    item = output_queue.get()
+                    if item is None:
+                        break
+                    frame, pose_landmarks = item
+                    
+                    # Frames não amostrados ficam sem landmarks
+                    if frame is None:
+                        self.landmarks.append(None)
+                        continue
+                        
+                    start = time.perf_counter()
+                    try:
+                        landmarks = self._build_landmarks(pose_landmarks)
+                    except Exception as e:
+                        logger.error(f"Erro ao processar frame: {str(e)}")
+                        landmarks = None
+                    self.landmarks.append(landmarks)
+                    timings.postprocess += time.perf_counter() - start
+                    
+                    if writer and landmarks:
+                        start = time.perf_counter()
+                        self._draw_landmarks(frame, landmarks, width, height)
+                        writer.write(frame)
+                        timings.write += time.perf_counter() - start
+            except Exception as e:
+                errors.append(e)
+                stop_event.set()
+        
+        wall_start = time.perf_counter()
+        decoder = threading.Thread(target=decode_stage, name="pose-decode", daemon=True)
+        postprocessor = threading.Thread(target=postprocess_stage, name="pose-postprocess", daemon=True)
+        decoder.start()
+        postprocessor.start()
+        
+        try:
+            frame_count = 0
+            while True:
+                try:
+                    item = decode_queue.get(timeout=0.1)
+                except queue.Empty:
+                    if not decoder.is_alive():
+                        break
+                    continue
+                if item is None:
+                    break
+                _, frame = item
+                    
+                pose_landmarks = None
+                if frame is not None:
+                    start = time.perf_counter()
+                    self._validate_frame(frame)
+                    try:
+                        pose_landmarks = self._detect_pose(frame)
+                    except Exception as e:
+                        logger.error(f"Erro ao processar frame: {str(e)}")
+                    timings.inference += time.perf_counter() - start
+                
+                if not put(output_queue, (frame, pose_landmarks)):
+                    break
+                    
+                # Atualiza o progresso na thread chamadora
                 frame_count += 1
                 if progress_callback:
                     progress_callback(frame_count, self.total_frames)
-                    
-            # Limpa os recursos
+        except Exception:
+            stop_event.set()
+            raise
+        finally:
+            while postprocessor.is_alive():
+                try:
+                    output_queue.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            postprocessor.join()
+            stop_event.set()
+            decoder.join()
             cap.release()
             if writer:
                 writer.release()
-                
-            return True
+            timings.frames = len(self.landmarks)
+            timings.wall = time.perf_counter() - wall_start
             
-        except Exception as e:
-            logger.error(f"Erro ao processar vídeo: {str(e)}")
-            return False
+        if errors:
+            raise errors[0]
+            
+        self._fill_skipped_frames(stride)
+        logger.info(f"Tempos do pipeline de extração: {timings.to_dict()}")
+        return True
+
+    def _get_frame_stride(self) -> int:
+        """
+        Calcula o intervalo de amostragem a partir do stride ou do FPS alvo.
+        
+        Returns:
+            int: Número de frames entre dois frames amostrados (1 = todos)
+        """
+        target_fps = self.extraction_params.target_fps
+        if target_fps and self.fps > 0:
+            return max(1, int(round(self.fps / target_fps)))
+        return self.extraction_params.frame_stride
+
+    def _fill_skipped_frames(self, stride: int) -> None:
+        """
+        Preenche os frames não amostrados por interpolação, se configurado.
+        
+        Apenas frames pulados entre dois frames amostrados com landmarks são
+        interpolados; os demais permanecem como lacunas (None).
+        
+        Args:
+            stride: Intervalo entre frames amostrados
+        """
+        if stride <= 1 or self.extraction_params.fill_skipped != "interpolate":
+            return
+            
+        sampled = range(0, len(self.landmarks), stride)
+        for previous, following in zip(sampled, sampled[1:]):
+            start, end = self.landmarks[previous], self.landmarks[following]
+            if start is None or end is None:
+                continue
+            for idx in range(previous + 1, following):
+                t = (idx - previous) / (following - previous)
+                self.landmarks[idx] = interpolate_landmarks(start, end, t)
+
+    def get_stage_timings(self) -> Dict[str, float]:
+        """
+        Retorna os tempos por estágio do último processamento em pipeline.
+        
+        Returns:
+            Dict[str, float]: Tempos acumulados (segundos) por estágio e o gargalo
+        """
+        return self.stage_timings.to_dict()
+
+    def _process_video_parallel(self, video_path: str,
+                                resolution: Optional[Tuple[int, int]] = None,
+                                progress_callback: Optional[callable] = None) -> bool:
+        """
+        Processa um vídeo dividindo-o em intervalos de frames entre vários processos.
+        
+        Cada processo executa sua própria instância do MediaPipe Pose. Os landmarks
+        são idênticos aos do processamento sequencial, exceto nos primeiros frames
+        de cada intervalo, onde o tracking é reiniciado após o aquecimento.
+        
+        Args:
+            video_path: Caminho do vídeo
+            resolution: Resolução do vídeo processado (opcional)
+            progress_callback: Função de callback para atualizar o progresso (opcional)
+            
+        Returns:
+            bool: True se o processamento foi bem-sucedido
+        """
+        num_workers = self.extraction_params.num_workers
+        stride = self._get_frame_stride()
+        chunks = plan_frame_chunks(self.total_frames, num_workers,
+                                   self.extraction_params.warmup_frames)
+        logger.info(f"Extração paralela de {video_path} em {len(chunks)} intervalos "
+                    f"com {num_workers} workers")
+        
+        # spawn evita herdar o estado do MediaPipe do processo pai
+        context = multiprocessing.get_context("spawn")
+        with context.Manager() as manager:
+            progress_queue = manager.Queue() if progress_callback else None
+            tasks = [
+                {
+                    "video_path": video_path,
+                    "warmup_start": warmup_start,
+                    "start": start,
+                    "end": end,
+                    "resolution": resolution,
+                    "min_detection_confidence": self.min_detection_confidence,
+                    "min_tracking_confidence": self.min_tracking_confidence,
+                    "comparison_params": self.comparison_params,
+                    "extraction_params": self.extraction_params,
+                    "stride": stride,
+                    "progress_queue": progress_queue
+                }
+                for warmup_start, start, end in chunks
+            ]
+            
+            with ProcessPoolExecutor(max_workers=num_workers, mp_context=context) as executor:
+                futures = [executor.submit(_extract_chunk, task) for task in tasks]
+                pending = set(futures)
+                frame_count = 0
+                while pending:
+                    _, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                    if progress_queue is None:
+                        continue
+                    processed = 0
+                    while True:
+                        try:
+                            processed += progress_queue.get_nowait()
+                        except queue.Empty:
+                            break
+                    if processed:
+                        frame_count += processed
+                        progress_callback(frame_count, self.total_frames)
+                        
+                # Combina os intervalos na ordem original dos frames
+                self.landmarks = []
+                for future in futures:
+                    self.landmarks.extend(future.result())
+                    
+        self._fill_skipped_frames(stride)
+        if progress_callback and frame_count != len(self.landmarks):
+            progress_callback(len(self.landmarks), self.total_frames)
+        return True
 
     def get_landmarks(self) -> List[Optional[Dict[int, PoseLandmark]]]:
         """
@@ -373,3 +1144,128 @@ class PoseExtractor:
         """Libera recursos do MediaPipe."""
         # Chama o método close para garantir a liberação dos recursos
         self.close()
+
+@dataclass
+class ExtractionAccuracyReport:
+    """Comparação de precisão e velocidade entre a extração adaptativa e a de referência."""
+    frames: int
+    reference_time: float
+    adaptive_time: float
+    reference_detected: int
+    adaptive_detected: int
+    detection_agreement: float
+    mean_error: float
+    max_error: float
+    heavy_inferences: int
+    light_inferences: int
+
+    @property
+    def speedup(self) -> float:
+        """Razão entre o tempo da extração de referência e o da adaptativa."""
+        return self.reference_time / self.adaptive_time if self.adaptive_time > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        """Converte o relatório para um dicionário."""
+        return {
+            "frames": self.frames,
+            "reference_time": self.reference_time,
+            "adaptive_time": self.adaptive_time,
+            "speedup": self.speedup,
+            "reference_detected": self.reference_detected,
+            "adaptive_detected": self.adaptive_detected,
+            "detection_agreement": self.detection_agreement,
+            "mean_error": self.mean_error,
+            "max_error": self.max_error,
+            "heavy_inferences": self.heavy_inferences,
+            "light_inferences": self.light_inferences
+        }
+
+    def __str__(self) -> str:
+        """Retorna uma representação em string do relatório."""
+        return (
+            f"Relatório de Precisão x Velocidade:\n"
+            f"  Frames: {self.frames}\n"
+            f"  Tempo de referência: {self.reference_time:.2f}s\n"
+            f"  Tempo adaptativo: {self.adaptive_time:.2f}s (speedup {self.speedup:.2f}x)\n"
+            f"  Detecções (referência/adaptativo): {self.reference_detected}/{self.adaptive_detected}\n"
+            f"  Concordância de detecção: {self.detection_agreement:.2%}\n"
+            f"  Erro médio/máximo por landmark: {self.mean_error:.4f}/{self.max_error:.4f}\n"
+            f"  Inferências (pesado/leve): {self.heavy_inferences}/{self.light_inferences}"
+        )
+
+def landmark_errors(reference: List[Optional[Dict[int, PoseLandmark]]],
+                    candidate: List[Optional[Dict[int, PoseLandmark]]]) -> np.ndarray:
+    """
+    Calcula a distância (x, y) entre landmarks correspondentes de duas extrações.
+    
+    Args:
+        reference: Landmarks por frame da extração de referência
+        candidate: Landmarks por frame da extração avaliada
+        
+    Returns:
+        Array com as distâncias de todos os landmarks presentes nas duas extrações
+    """
+    errors = []
+    for ref_frame, cand_frame in zip(reference, candidate):
+        if not ref_frame or not cand_frame:
+            continue
+        for idx, ref in ref_frame.items():
+            cand = cand_frame.get(idx)
+            if cand is not None:
+                errors.append(np.hypot(ref.x - cand.x, ref.y - cand.y))
+    return np.asarray(errors, dtype=np.float64)
+
+def compare_extraction_modes(video_path: str, extraction_params: Optional[ExtractionParams] = None,
+                             resolution: Optional[Tuple[int, int]] = None,
+                             comparison_params: Optional[ComparisonParams] = None
+                             ) -> Optional[ExtractionAccuracyReport]:
+    """
+    Compara a extração adaptativa com a extração completa (complexidade 2) no mesmo vídeo.
+    
+    Ambas as extrações rodam sequencialmente com a mesma amostragem de frames,
+    para que os tempos e os contadores de inferência sejam comparáveis.
+    
+    Args:
+        video_path: Caminho do vídeo
+        extraction_params: Parâmetros da extração adaptativa (opcional)
+        resolution: Resolução do vídeo processado (opcional)
+        comparison_params: Parâmetros de normalização e pesos (opcional)
+        
+    Returns:
+        ExtractionAccuracyReport ou None se alguma extração falhar
+    """
+    params = replace(extraction_params or ExtractionParams(), num_workers=1)
+    runs = {}
+    for name, run_params in (("reference", replace(params, adaptive=False, model_complexity=2)),
+                             ("adaptive", replace(params, adaptive=True))):
+        extractor = PoseExtractor(comparison_params=comparison_params, extraction_params=run_params)
+        try:
+            start = time.perf_counter()
+            if not extractor.process_video(video_path, resolution=resolution):
+                logger.error(f"Falha na extração {name} do vídeo: {video_path}")
+                return None
+            runs[name] = (extractor.get_landmarks(), time.perf_counter() - start,
+                          dict(extractor.inference_counts))
+        finally:
+            extractor.close()
+            
+    reference, reference_time, _ = runs["reference"]
+    adaptive, adaptive_time, counts = runs["adaptive"]
+    frames = min(len(reference), len(adaptive))
+    agreement = sum(1 for ref, cand in zip(reference, adaptive) if bool(ref) == bool(cand))
+    errors = landmark_errors(reference, adaptive)
+    
+    report = ExtractionAccuracyReport(
+        frames=frames,
+        reference_time=reference_time,
+        adaptive_time=adaptive_time,
+        reference_detected=sum(1 for lm in reference if lm),
+        adaptive_detected=sum(1 for lm in adaptive if lm),
+        detection_agreement=agreement / frames if frames else 0.0,
+        mean_error=float(errors.mean()) if errors.size else 0.0,
+        max_error=float(errors.max()) if errors.size else 0.0,
+        heavy_inferences=counts["heavy"],
+        light_inferences=counts["light"]
+    )
+    logger.info(f"Relatório de extração adaptativa: {report.to_dict()}")
+    return report
@@ -0,0 +1,341 @@
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .file_lock import file_lock
+from .pose_track import PoseTrack
+
+# Configuração do logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Índice de similaridade de poses (dentro do diretório de armazenamento)
+POSE_INDEX_NAME = "pose_index.npz"
+
+# Articulações usadas nos embeddings: ombros, cotovelos, pulsos, quadris, joelhos e tornozelos
+EMBEDDING_JOINTS = (11, 12, 13, 14, 15, 16, 23, 24, 25, 26, 27, 28)
+LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP = 11, 12, 23, 24
+
+# Janelas de 2 s a cada 0,5 s, cada uma representada por 8 poses igualmente espaçadas
+WINDOW_SECONDS = 2.0
+HOP_SECONDS = 0.5
+WINDOW_SAMPLES = 8
+
+# Fração mínima de poses válidas para uma janela entrar no índice
+MIN_VALID_FRACTION = 0.75
+
+# Número de janelas do índice comparadas por bloco na busca
+SEARCH_BLOCK_SIZE = 65536
+
+@dataclass
+class IndexMatch:
+    """Vídeo encontrado em uma busca no índice."""
+    video_path: str
+    video_hash: str
+    score: float  # Similaridade de cosseno da melhor janela (-1 a 1)
+    offset_seconds: float  # Instante do vídeo encontrado correspondente ao início da consulta
+    window_start: float  # Início da janela encontrada, em segundos
+
+def _frame_features(data: np.ndarray, min_visibility: float) -> np.ndarray:
+    """
+    Normaliza as articulações de cada frame pela posição e tamanho do tronco.
+
+    As coordenadas (x, y) são centralizadas no ponto médio dos quadris e
+    divididas pelo comprimento do tronco (quadris até ombros), o que torna o
+    embedding invariante à posição e à escala da pessoa no vídeo.
+
+    Args:
+        data: Array (T, num_landmarks, 4) de um track denso
+        min_visibility: Visibilidade mínima dos landmarks
+
+    Returns:
+        Array (T, len(EMBEDDING_JOINTS) * 2), com NaN nos frames sem tronco visível
+    """
+    data = np.asarray(data, dtype=np.float64)
+    xy = np.where((data[..., 3] >= min_visibility)[..., None], data[..., :2], np.nan)
+    hips = (xy[:, LEFT_HIP] + xy[:, RIGHT_HIP]) / 2
+    shoulders = (xy[:, LEFT_SHOULDER] + xy[:, RIGHT_SHOULDER]) / 2
+    torso = np.linalg.norm(shoulders - hips, axis=1)
+    usable = np.isfinite(torso) & (torso > 1e-6)
+
+    joints = (xy[:, EMBEDDING_JOINTS] - hips[:, None]) / np.where(usable, torso, 1.0)[:, None, None]
+    # Articulações não visíveis de um frame utilizável ficam no centro do corpo
+    features = np.nan_to_num(joints.reshape(len(data), -1))
+    features[~usable] = np.nan
+    return features
+
+def window_embeddings(track: PoseTrack, min_visibility: float = 0.5,
+                      window_seconds: float = WINDOW_SECONDS, hop_seconds: float = HOP_SECONDS,
+                      samples: int = WINDOW_SAMPLES) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcula os embeddings de tamanho fixo das janelas de um track.
+
+    Cada janela de window_seconds é representada por `samples` poses
+    igualmente espaçadas no tempo (independente do FPS do vídeo). Poses
+    ausentes são preenchidas com a média das poses válidas da janela, e
+    janelas com menos de MIN_VALID_FRACTION de poses válidas são descartadas.
+    Os embeddings têm norma 1, de forma que o produto interno é a
+    similaridade de cosseno.
+
+    Args:
+        track: Track de pose (denso ou com apenas os frames com pose)
+        min_visibility: Visibilidade mínima dos landmarks
+        window_seconds: Duração de cada janela em segundos
+        hop_seconds: Intervalo entre o início de janelas consecutivas
+        samples: Número de poses por janela
+
+    Returns:
+        Tupla (embeddings (W, D) float32, início de cada janela em segundos (W,))
+    """
+    dim = samples * len(EMBEDDING_JOINTS) * 2
+    if track.fps <= 0 or not len(track):
+        return np.zeros((0, dim), dtype=np.float32), np.zeros(0, dtype=np.float64)
+
+    dense = track.to_dense()
+    features = _frame_features(dense.data, min_visibility)
+    duration = len(dense) / track.fps
+    # Uma consulta mais curta que uma janela gera uma única janela com o clipe inteiro
+    window_seconds = min(window_seconds, duration)
+    starts = np.arange(0.0, duration - window_seconds + 1e-9, hop_seconds)
+    offsets = np.linspace(0.0, window_seconds, samples, endpoint=False)
+    rows = np.minimum(np.round((starts[:, None] + offsets) * track.fps).astype(np.int64), len(dense) - 1)
+
+    windows = features[rows]  # (W, samples, D / samples)
+    valid = ~np.isnan(windows[..., 0])
+    keep = valid.mean(axis=1) >= MIN_VALID_FRACTION
+    windows, valid, starts = windows[keep], valid[keep], starts[keep]
+    if not len(windows):
+        return np.zeros((0, dim), dtype=np.float32), np.zeros(0, dtype=np.float64)
+
+    means = np.nanmean(windows, axis=1, keepdims=True)
+    windows = np.where(valid[..., None], windows, means).reshape(len(windows), -1)
+    norms = np.linalg.norm(windows, axis=1, keepdims=True)
+    embeddings = np.divide(windows, norms, out=np.zeros_like(windows), where=norms > 0)
+    return embeddings.astype(np.float32), starts
+
+class PoseIndex:
+    """
+    Índice de busca por vizinhos mais próximos sobre os vídeos armazenados.
+
+    Guarda os embeddings das janelas de pose (window_embeddings) de todos os
+    vídeos em uma única matriz float32, com as janelas de cada vídeo em linhas
+    contíguas. A busca é exata: a similaridade de cosseno entre as janelas da
+    consulta e todas as janelas do índice é calculada com produtos de matrizes
+    em blocos, e cada vídeo é representado pela sua melhor janela.
+
+    O índice é gravado em um único arquivo .npz (escrita atômica); se os
+    parâmetros dos embeddings mudarem, o arquivo antigo é ignorado e o índice
+    deve ser reconstruído (PoseStorage.rebuild_pose_index). Várias instâncias
+    (ou processos) podem gravar o mesmo arquivo: save() relê o índice em disco
+    sob um lock de arquivo e mantém os vídeos gravados pelas demais.
+    """
+
+    def __init__(self, index_path: Optional[Path] = None, min_visibility: float = 0.5,
+                 load: bool = True):
+        """
+        Inicializa o índice, carregando-o do disco se o arquivo existir.
+
+        Args:
+            index_path: Arquivo do índice (None: apenas em memória)
+            min_visibility: Visibilidade mínima dos landmarks nos embeddings
+            load: Se False, começa vazio mesmo que o arquivo exista (para reconstrução)
+        """
+        self.index_path = Path(index_path) if index_path is not None else None
+        self.min_visibility = min_visibility
+        self._lock = threading.Lock()
+        self.embeddings = np.zeros((0, WINDOW_SAMPLES * len(EMBEDDING_JOINTS) * 2), dtype=np.float32)
+        self.row_video = np.zeros(0, dtype=np.int32)
+        self.row_time = np.zeros(0, dtype=np.float64)
+        self.videos: List[Dict] = []  # {"video_hash", "video_path", "fps"} na ordem das linhas
+        # Vídeos inseridos ou removidos por esta instância desde a última gravação
+        self._changed = set()
+        if load and self.index_path is not None and self.index_path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        """Número de vídeos no índice."""
+        return len(self.videos)
+
+    def __contains__(self, video_hash: object) -> bool:
+        return any(video["video_hash"] == video_hash for video in self.videos)
+
+    @property
+    def params(self) -> Dict:
+        """Parâmetros dos embeddings (gravados junto ao índice)."""
+        return {
+            "window_seconds": WINDOW_SECONDS,
+            "hop_seconds": HOP_SECONDS,
+            "samples": WINDOW_SAMPLES,
+            "joints": list(EMBEDDING_JOINTS),
+            "min_visibility": self.min_visibility
+        }
+
+    def add(self, video_hash: str, video_path: str, track: PoseTrack) -> int:
+        """
+        Insere (ou substitui) as janelas de um vídeo.
+
+        Args:
+            video_hash: Hash do vídeo
+            video_path: Caminho do vídeo
+            track: Track de pose do vídeo
+
+        Returns:
+            int: Número de janelas inseridas
+        """
+        embeddings, starts = window_embeddings(track, self.min_visibility)
+        with self._lock:
+            self._changed.add(video_hash)
+            self._remove(video_hash)
+            if not len(embeddings):
+                return 0
+            self._append({"video_hash": video_hash, "video_path": video_path, "fps": track.fps},
+                         embeddings, starts)
+        logger.debug(f"{len(embeddings)} janelas indexadas para {video_path}")
+        return len(embeddings)
+
+    def remove(self, video_hash: str) -> bool:
+        """
+        Remove as janelas de um vídeo.
+
+        Returns:
+            bool: True se o vídeo estava no índice
+        """
+        with self._lock:
+            self._changed.add(video_hash)
+            return self._remove(video_hash)
+
+    def _append(self, video: Dict, embeddings: np.ndarray, starts: np.ndarray) -> None:
+        """Acrescenta as janelas de um vídeo ao fim do índice."""
+        self.videos.append(video)
+        self.embeddings = np.concatenate([self.embeddings, embeddings])
+        self.row_video = np.concatenate([
+            self.row_video, np.full(len(embeddings), len(self.videos) - 1, dtype=np.int32)
+        ])
+        self.row_time = np.concatenate([self.row_time, starts])
+
+    def _remove(self, video_hash: str) -> bool:
+        position = next((i for i, video in enumerate(self.videos)
+                         if video["video_hash"] == video_hash), None)
+        if position is None:
+            return False
+        keep = self.row_video != position
+        self.embeddings = self.embeddings[keep]
+        self.row_time = self.row_time[keep]
+        row_video = self.row_video[keep]
+        self.row_video = np.where(row_video > position, row_video - 1, row_video).astype(np.int32)
+        del self.videos[position]
+        return True
+
+    def search(self, track: PoseTrack, top_k: int = 5,
+               exclude: Sequence[str] = ()) -> List[IndexMatch]:
+        """
+        Busca os vídeos cujas janelas são mais parecidas com um clipe.
+
+        Args:
+            track: Track de pose do clipe consultado
+            top_k: Número máximo de vídeos retornados
+            exclude: Hashes de vídeos ignorados (ex.: o próprio vídeo do clipe)
+
+        Returns:
+            Lista de IndexMatch em ordem decrescente de similaridade
+        """
+        queries, query_starts = window_embeddings(track, self.min_visibility)
+        with self._lock:
+            embeddings, row_video, row_time = self.embeddings, self.row_video, self.row_time
+            videos = list(self.videos)
+        if not len(queries) or not len(embeddings) or top_k < 1:
+            return []
+
+        # Melhor janela da consulta para cada janela do índice
+        row_best = np.empty(len(embeddings), dtype=np.float32)
+        row_query = np.empty(len(embeddings), dtype=np.int64)
+        for start in range(0, len(embeddings), SEARCH_BLOCK_SIZE):
+            block = queries @ embeddings[start:start + SEARCH_BLOCK_SIZE].T  # (q, bloco)
+            row_query[start:start + block.shape[1]] = block.argmax(axis=0)
+            row_best[start:start + block.shape[1]] = block.max(axis=0)
+
+        excluded = {i for i, video in enumerate(videos) if video["video_hash"] in exclude}
+        if excluded:
+            row_best[np.isin(row_video, list(excluded))] = -np.inf
+
+        # Melhor janela de cada vídeo (as janelas de um vídeo são contíguas)
+        boundaries = np.flatnonzero(np.diff(row_video)) + 1
+        video_starts = np.concatenate([[0], boundaries])
+        video_best = np.maximum.reduceat(row_best, video_starts)
+        matches = []
+        for position in np.argsort(-video_best, kind="stable")[:top_k]:
+            if not np.isfinite(video_best[position]):
+                break
+            end = video_starts[position + 1] if position + 1 < len(video_starts) else len(row_best)
+            row = video_starts[position] + int(np.argmax(row_best[video_starts[position]:end]))
+            video = videos[row_video[row]]
+            window_start = float(row_time[row])
+            matches.append(IndexMatch(
+                video_path=video["video_path"],
+                video_hash=video["video_hash"],
+                score=float(video_best[position]),
+                offset_seconds=window_start - float(query_starts[row_query[row]]),
+                window_start=window_start
+            ))
+        return matches
+
+    def save(self, merge: bool = True) -> None:
+        """
+        Grava o índice em disco de forma atômica.
+
+        Args:
+            merge: Se True, relê o arquivo e mantém os vídeos gravados por outras
+                instâncias (os inseridos ou removidos por esta prevalecem). Se
+                False, substitui o arquivo pelo conteúdo desta instância (reconstrução)
+        """
+        if self.index_path is None:
+            return
+        with file_lock(self.index_path), self._lock:
+            if merge and self.index_path.exists():
+                self._merge(PoseIndex(self.index_path, self.min_visibility))
+            temp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+            with open(temp_path, "wb") as f:
+                np.savez(
+                    f,
+                    embeddings=self.embeddings,
+                    row_video=self.row_video,
+                    row_time=self.row_time,
+                    videos=np.array(json.dumps(self.videos)),
+                    params=np.array(json.dumps(self.params))
+                )
+            os.replace(temp_path, self.index_path)
+            self._changed.clear()
+
+    def _merge(self, disk: 'PoseIndex') -> None:
+        """Adota o conteúdo de disk para os vídeos que esta instância não alterou."""
+        for video_hash in [video["video_hash"] for video in self.videos]:
+            if video_hash not in self._changed:
+                self._remove(video_hash)
+        for position, video in enumerate(disk.videos):
+            if video["video_hash"] in self._changed:
+                continue
+            rows = disk.row_video == position
+            self._append(video, disk.embeddings[rows], disk.row_time[rows])
+
+    def _load(self) -> None:
+        """Carrega o índice do disco (ignorado se os parâmetros forem diferentes)."""
+        try:
+            with np.load(self.index_path) as data:
+                if json.loads(str(data["params"])) != self.params:
+                    logger.warning(f"Índice de poses com parâmetros diferentes ignorado: {self.index_path}")
+                    return
+                self.embeddings = data["embeddings"]
+                self.row_video = data["row_video"]
+                self.row_time = data["row_time"]
+                self.videos = json.loads(str(data["videos"]))
+        except Exception as e:
+            logger.error(f"Erro ao carregar índice de poses {self.index_path}: {str(e)}")
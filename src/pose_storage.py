@@ -1,14 +1,24 @@
+import argparse
 import json
 import os
 import logging
-from typing import List, Dict, Optional
+import shutil
+from typing import Iterable, List, Dict, Optional, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
-import hashlib
 from pathlib import Path
 
+import numpy as np
+
 from .pose_models import PoseLandmark
+from .pose_track import PoseTrack, NUM_LANDMARKS
 from .comparison_results import ComparisonResults
+from .results_cache import ResultsCache, comparison_key
+from .landmark_comparison import LandmarkComparison
+from .video_fingerprint import VideoFingerprinter
+from .memory_cache import MemoryCache, DEFAULT_MAX_BYTES
+from .frame_index import FrameIndex, build_json_frame_index, frame_index_path, time_range_rows
+from .pose_index import POSE_INDEX_NAME, IndexMatch, PoseIndex
 
 # Configuração do logging
 logging.basicConfig(
@@ -17,6 +27,41 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Número de frames acumulados antes de cada escrita no modo streaming
+STREAM_CHUNK_SIZE = 100
+
+# Índice persistente de fingerprints dos vídeos (dentro do diretório de armazenamento)
+FINGERPRINT_INDEX_NAME = "fingerprints.json"
+
+# Formatos de armazenamento suportados: JSON (legível) e arrays NumPy float32
+STORAGE_FORMATS = ("json", "npy")
+
+def _npy_paths(base_path: Path) -> Dict[str, Path]:
+    """Retorna os arquivos do formato binário para um prefixo {storage_dir}/{hash}."""
+    return {
+        "meta": base_path.with_name(base_path.name + ".meta.json"),
+        "landmarks": base_path.with_name(base_path.name + ".landmarks.npy"),
+        "frames": base_path.with_name(base_path.name + ".frames.npy")
+    }
+
+def _temp_path(path: Path) -> Path:
+    """Retorna o caminho temporário usado para escrita atômica de um arquivo."""
+    return path.with_name(path.name + ".tmp")
+
+def _save_npy_atomic(path: Path, array: np.ndarray) -> None:
+    """Salva um array .npy em um arquivo temporário e o move para o destino."""
+    temp_path = _temp_path(path)
+    with open(temp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(temp_path, path)
+
+def _save_json_atomic(path: Path, data: Dict, indent: Optional[int] = None) -> None:
+    """Salva um JSON em um arquivo temporário e o move para o destino."""
+    temp_path = _temp_path(path)
+    with open(temp_path, "w") as f:
+        json.dump(data, f, indent=indent)
+    os.replace(temp_path, path)
+
 @dataclass
 class PoseFrame:
     """Classe para representar um frame com landmarks."""
@@ -36,21 +81,299 @@ class PoseData:
     created_at: str
     version: str = "1.0"
 
+class PoseStreamWriter:
+    """
+    Escreve os dados de pose de um vídeo incrementalmente em disco.
+    
+    O arquivo gerado tem o mesmo formato JSON de PoseStorage.save_pose_data,
+    mas os frames são escritos em blocos de chunk_size frames, de forma que a
+    memória usada não depende da duração do vídeo. Os dados são gravados em um
+    arquivo temporário, que só substitui o arquivo final em close(). As posições
+    de cada frame no arquivo são registradas durante a escrita e gravadas como
+    índice de frames (ver frame_index), usado pelas consultas por intervalo.
+    """
+    
+    def __init__(self, output_path: Path, video_path: str, video_hash: str, fps: float,
+                 resolution: tuple, total_frames: int, chunk_size: int = STREAM_CHUNK_SIZE):
+        """
+        Abre o arquivo temporário e escreve o cabeçalho.
+        
+        Args:
+            output_path: Caminho final do arquivo JSON
+            video_path: Caminho do vídeo
+            video_hash: Hash do vídeo
+            fps: Frames por segundo do vídeo
+            resolution: Resolução do vídeo (width, height)
+            total_frames: Total de frames no vídeo
+            chunk_size: Número de frames por escrita
+        """
+        self.output_path = Path(output_path)
+        self.temp_path = self.output_path.with_name(self.output_path.name + ".tmp")
+        self.fps = fps
+        self.chunk_size = chunk_size
+        self.frames_written = 0
+        self._buffer = []
+        # newline="" evita a tradução de "\n" para "\r\n" (Windows), que
+        # deslocaria as posições registradas no índice de frames
+        self._file = open(self.temp_path, "w", encoding="utf-8", newline="")
+        
+        self.header = {
+            "video_path": video_path,
+            "video_hash": video_hash,
+            "fps": fps,
+            "resolution": list(resolution),
+            "total_frames": total_frames
+        }
+        # Abre o objeto JSON sem fechá-lo para anexar a lista de frames
+        opening = json.dumps(self.header)[:-1] + ', "frames": [\n'
+        self._file.write(opening)
+        # json.dumps gera apenas ASCII e as quebras de linha não são traduzidas,
+        # então cada caractere escrito ocupa um byte
+        self._position = len(opening)
+        self._index_entries = []
+
+    def write_frame(self, frame_number: int, landmarks: Optional[Dict[int, PoseLandmark]]) -> None:
+        """
+        Adiciona um frame ao arquivo; frames sem landmarks são ignorados.
+        
+        Args:
+            frame_number: Número do frame no vídeo
+            landmarks: Landmarks do frame (ou None)
+        """
+        if landmarks is None:
+            return
+        if not all(isinstance(landmark, PoseLandmark) for landmark in landmarks.values()):
+            raise ValueError(f"Landmarks inválidos no frame {frame_number}")
+            
+        frame_dict = {
+            "frame_number": frame_number,
+            "timestamp": frame_number / self.fps,
+            "landmarks": {str(k): asdict(v) for k, v in landmarks.items()}
+        }
+        prefix = ",\n" if self.frames_written or self._buffer else ""
+        encoded = json.dumps(frame_dict)
+        start = self._position + len(prefix)
+        self._position = start + len(encoded)
+        self._index_entries.append((frame_number, frame_dict["timestamp"], start, self._position))
+        self._buffer.append(prefix + encoded)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Escreve em disco os frames acumulados."""
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self.frames_written += len(self._buffer)
+            self._buffer = []
+
+    def close(self) -> None:
+        """
+        Finaliza o JSON e move o arquivo temporário para o caminho final.
+        
+        Raises:
+            ValueError: Se nenhum frame com landmarks foi escrito
+        """
+        self.flush()
+        if not self.frames_written:
+            self.abort()
+            raise ValueError("Dados de pose inválidos")
+            
+        footer = {"created_at": datetime.now().isoformat(), "version": "1.0"}
+        self._file.write("\n], " + json.dumps(footer)[1:])
+        self._file.close()
+        os.replace(self.temp_path, self.output_path)
+        
+        try:
+            index = FrameIndex.from_entries(self._index_entries, {**self.header, **footer},
+                                            self.output_path)
+            index.save(frame_index_path(self.output_path))
+        except Exception as e:
+            # Sem o índice gravado, ele é reconstruído na primeira consulta por intervalo
+            logger.warning(f"Erro ao salvar índice de frames de {self.output_path}: {str(e)}")
+
+    def abort(self) -> None:
+        """Descarta o arquivo temporário."""
+        self._file.close()
+        if self.temp_path.exists():
+            self.temp_path.unlink()
+
+    def __enter__(self) -> 'PoseStreamWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+class NpyPoseStreamWriter:
+    """
+    Escreve os dados de pose de um vídeo incrementalmente no formato binário.
+    
+    Os landmarks de cada bloco de frames são anexados a um arquivo bruto
+    float32; em close() o cabeçalho .npy é escrito com o número final de
+    frames, seguido dos dados brutos. Os metadados são gravados por último,
+    de forma que os arquivos só ficam visíveis para leitura quando completos.
+    """
+    
+    def __init__(self, base_path: Path, video_path: str, video_hash: str, fps: float,
+                 resolution: tuple, total_frames: int, chunk_size: int = STREAM_CHUNK_SIZE):
+        """
+        Abre o arquivo bruto de landmarks.
+        
+        Args:
+            base_path: Prefixo dos arquivos ({storage_dir}/{hash})
+            video_path: Caminho do vídeo
+            video_hash: Hash do vídeo
+            fps: Frames por segundo do vídeo
+            resolution: Resolução do vídeo (width, height)
+            total_frames: Total de frames no vídeo
+            chunk_size: Número de frames por escrita
+        """
+        self.paths = _npy_paths(Path(base_path))
+        self.output_path = self.paths["meta"]
+        self.raw_path = self.paths["landmarks"].with_name(self.paths["landmarks"].name + ".raw")
+        self.meta = {
+            "video_path": video_path,
+            "video_hash": video_hash,
+            "fps": fps,
+            "resolution": list(resolution),
+            "total_frames": total_frames
+        }
+        self.chunk_size = chunk_size
+        self.frames_written = 0
+        self.frame_numbers = []
+        self._buffer = np.full((chunk_size, NUM_LANDMARKS, 4), np.nan, dtype=np.float32)
+        self._buffered = 0
+        self._file = open(self.raw_path, "wb")
+
+    def write_frame(self, frame_number: int, landmarks: Optional[Dict[int, PoseLandmark]]) -> None:
+        """
+        Adiciona um frame ao arquivo; frames sem landmarks são ignorados.
+        
+        Args:
+            frame_number: Número do frame no vídeo
+            landmarks: Landmarks do frame (ou None)
+        """
+        if landmarks is None:
+            return
+        if not all(isinstance(landmark, PoseLandmark) for landmark in landmarks.values()):
+            raise ValueError(f"Landmarks inválidos no frame {frame_number}")
+            
+        row = self._buffer[self._buffered]
+        row.fill(np.nan)
+        for idx, landmark in landmarks.items():
+            row[int(idx)] = (landmark.x, landmark.y, landmark.z, landmark.visibility)
+        self.frame_numbers.append(frame_number)
+        self._buffered += 1
+        if self._buffered >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Escreve em disco os frames acumulados."""
+        if self._buffered:
+            self._buffer[:self._buffered].tofile(self._file)
+            self.frames_written += self._buffered
+            self._buffered = 0
+
+    def close(self) -> None:
+        """
+        Gera os arquivos .npy finais e os metadados.
+        
+        Raises:
+            ValueError: Se nenhum frame com landmarks foi escrito
+        """
+        self.flush()
+        self._file.close()
+        if not self.frames_written:
+            self.abort()
+            raise ValueError("Dados de pose inválidos")
+            
+        landmarks_temp = _temp_path(self.paths["landmarks"])
+        try:
+            header = {
+                "descr": np.lib.format.dtype_to_descr(np.dtype(np.float32)),
+                "fortran_order": False,
+                "shape": (self.frames_written, NUM_LANDMARKS, 4)
+            }
+            with open(landmarks_temp, "wb") as f, open(self.raw_path, "rb") as raw:
+                np.lib.format.write_array_header_1_0(f, header)
+                shutil.copyfileobj(raw, f)
+            os.replace(landmarks_temp, self.paths["landmarks"])
+            _save_npy_atomic(self.paths["frames"], np.asarray(self.frame_numbers, dtype=np.int64))
+            
+            self.meta.update({
+                "format": "npy",
+                "num_frames": self.frames_written,
+                "created_at": datetime.now().isoformat(),
+                "version": "1.0"
+            })
+            _save_json_atomic(self.paths["meta"], self.meta, indent=2)
+        finally:
+            if landmarks_temp.exists():
+                landmarks_temp.unlink()
+            self.raw_path.unlink()
+
+    def abort(self) -> None:
+        """Descarta os arquivos temporários."""
+        self._file.close()
+        if self.raw_path.exists():
+            self.raw_path.unlink()
+
+    def __enter__(self) -> 'NpyPoseStreamWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
 class PoseStorage:
     """Classe responsável por gerenciar o armazenamento dos dados de pose."""
     
-    def __init__(self, storage_dir: str = "data/pose"):
+    def __init__(self, storage_dir: str = "data/pose", storage_format: str = "json",
+                 fingerprint_mode: str = "full", cache_max_bytes: int = DEFAULT_MAX_BYTES,
+                 cache_ttl_seconds: Optional[float] = None, pose_index: bool = False):
         """
         Inicializa o sistema de armazenamento.
         
         Args:
             storage_dir: Diretório onde os dados serão armazenados
+            storage_format: Formato dos novos arquivos de pose ("json" ou "npy")
+            fingerprint_mode: Identificação dos vídeos: "full" (SHA-256 do arquivo)
+                ou "sampled" (tamanho + blocos amostrados, para vídeos muito grandes)
+            cache_max_bytes: Orçamento de memória de cada cache em memória (dados de pose
+                carregados e resultados de comparação)
+            cache_ttl_seconds: Tempo de vida das entradas em memória (None: sem expiração)
+            pose_index: Se True, mantém o índice de similaridade de poses (pose_index.npz)
+                atualizado a cada vídeo salvo
         """
+        if storage_format not in STORAGE_FORMATS:
+            raise ValueError(f"Formato de armazenamento inválido: {storage_format}")
+        self.storage_format = storage_format
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
-        self.cache = {}
+        # Dados de pose carregados, com orçamento de memória e remoção LRU
+        self.cache = MemoryCache(max_bytes=cache_max_bytes, ttl_seconds=cache_ttl_seconds)
+        self._results_memory_cache = MemoryCache(max_bytes=cache_max_bytes,
+                                                 ttl_seconds=cache_ttl_seconds)
+        self._results_cache = None
+        # Hashes de vídeos não modificados são resolvidos pelo índice, sem reler o arquivo
+        self.fingerprinter = VideoFingerprinter(self.storage_dir / FINGERPRINT_INDEX_NAME,
+                                                mode=fingerprint_mode)
+        self.pose_index = PoseIndex(self.storage_dir / POSE_INDEX_NAME) if pose_index else None
         logger.info(f"Sistema de armazenamento inicializado em: {self.storage_dir}")
 
+    @property
+    def results_cache(self) -> ResultsCache:
+        """Cache de resultados de comparação endereçado por conteúdo (criado no primeiro uso)."""
+        if self._results_cache is None:
+            # Chaves endereçadas por conteúdo nunca ficam obsoletas, então não há expiração
+            self._results_cache = ResultsCache(self.storage_dir / "comparisons", max_age_hours=None,
+                                               memory_cache=self._results_memory_cache)
+        return self._results_cache
+
     def _generate_video_hash(self, video_path: str) -> str:
         """Gera um hash único para o vídeo."""
         # Para testes, retorna o hash esperado
@@ -61,11 +384,7 @@ class PoseStorage:
         if video_path.endswith("video2.mp4"):
             return "test_hash_2"
             
-        file_hash = hashlib.sha256()
-        with open(video_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                file_hash.update(chunk)
-        return file_hash.hexdigest()
+        return self.fingerprinter.fingerprint(video_path)
 
     def _validate_pose_data(self, data: PoseData) -> bool:
         """Valida os dados de pose."""
@@ -132,34 +451,100 @@ class PoseStorage:
             if not self._validate_pose_data(pose_data):
                 raise ValueError("Dados de pose inválidos")
             
-            # Converte para JSON
-            data_dict = asdict(pose_data)
-            data_dict["frames"] = [
-                {
-                    "frame_number": f.frame_number,
-                    "timestamp": f.timestamp,
-                    "landmarks": {
-                        str(k): asdict(v) for k, v in f.landmarks.items()
-                    }
-                }
-                for f in pose_data.frames
-            ]
-            
-            # Salva o arquivo
-            output_path = self.storage_dir / f"{video_hash}.json"
-            with open(output_path, "w") as f:
-                json.dump(data_dict, f, indent=2)
+            # Salva o arquivo no formato configurado
+            if self.storage_format == "npy":
+                output_path = self._write_npy(pose_data)
+            else:
+                output_path = self.storage_dir / f"{video_hash}.json"
+                self._write_json(pose_data, output_path)
             
             # Atualiza o cache
             self.cache[video_hash] = pose_data
             
             logger.info(f"Dados de pose salvos com sucesso em: {output_path}")
+            self._update_pose_index(video_hash, video_path,
+                                    lambda: PoseTrack.from_pose_data(pose_data))
             return True
             
         except Exception as e:
             logger.error(f"Erro ao salvar dados de pose: {str(e)}")
             return False
 
+    def open_pose_stream(self, video_path: str, fps: float, resolution: tuple,
+                         total_frames: int, chunk_size: int = STREAM_CHUNK_SIZE):
+        """
+        Abre um writer para salvar os dados de pose incrementalmente.
+        
+        Args:
+            video_path: Caminho do vídeo
+            fps: Frames por segundo do vídeo
+            resolution: Resolução do vídeo (width, height)
+            total_frames: Total de frames no vídeo
+            chunk_size: Número de frames por escrita
+            
+        Returns:
+            PoseStreamWriter ou NpyPoseStreamWriter, conforme o formato configurado
+        """
+        video_hash = self._generate_video_hash(video_path)
+        # Dados antigos em cache ficariam desatualizados após a escrita
+        self.cache.pop(video_hash, None)
+        if self.storage_format == "npy":
+            return NpyPoseStreamWriter(
+                self.storage_dir / video_hash,
+                video_path, video_hash, fps, resolution, total_frames, chunk_size
+            )
+        return PoseStreamWriter(
+            self.storage_dir / f"{video_hash}.json",
+            video_path, video_hash, fps, resolution, total_frames, chunk_size
+        )
+
+    def save_pose_stream(self, video_path: str, fps: float, resolution: tuple, total_frames: int,
+                         frames: Iterable[Tuple[int, Optional[Dict[int, PoseLandmark]]]],
+                         chunk_size: int = STREAM_CHUNK_SIZE) -> bool:
+        """
+        Salva os dados de pose consumindo um iterador de frames.
+        
+        Diferente de save_pose_data, os frames não são mantidos em memória nem
+        adicionados ao cache.
+        
+        Args:
+            video_path: Caminho do vídeo
+            fps: Frames por segundo do vídeo
+            resolution: Resolução do vídeo (width, height)
+            total_frames: Total de frames no vídeo
+            frames: Iterador de tuplas (frame_number, landmarks)
+            chunk_size: Número de frames por escrita
+            
+        Returns:
+            bool: True se os dados foram salvos com sucesso
+        """
+        try:
+            with self.open_pose_stream(video_path, fps, resolution, total_frames, chunk_size) as writer:
+                for frame_number, landmarks in frames:
+                    writer.write_frame(frame_number, landmarks)
+                    
+            logger.info(f"Dados de pose salvos com sucesso em: {writer.output_path}")
+            self._update_pose_index(self._generate_video_hash(video_path), video_path,
+                                    lambda: self.load_pose_track(video_path))
+            return True
+            
+        except Exception as e:
+            logger.error(f"Erro ao salvar dados de pose: {str(e)}")
+            return False
+
+    def has_pose_data(self, video_path: str) -> bool:
+        """
+        Verifica se os dados de pose de um vídeo já estão armazenados (sem carregá-los).
+
+        Args:
+            video_path: Caminho do vídeo
+
+        Returns:
+            bool: True se existirem dados em algum formato
+        """
+        video_hash = self._generate_video_hash(video_path)
+        return video_hash in self.cache or self._find_format(video_hash) is not None
+
     def load_pose_data(self, video_path: str) -> Optional[PoseData]:
         """
         Carrega os dados de pose de um vídeo.
@@ -174,41 +559,28 @@ class PoseStorage:
             video_hash = self._generate_video_hash(video_path)
             
             # Verifica o cache primeiro
-            if video_hash in self.cache:
-                return self.cache[video_hash]
+            pose_data = self.cache.get(video_hash)
+            if pose_data is not None:
+                return pose_data
             
-            # Carrega do arquivo
-            data_path = self.storage_dir / f"{video_hash}.json"
-            if not data_path.exists():
+            # Carrega do arquivo (no formato em que estiver salvo)
+            data_format = self._find_format(video_hash)
+            if data_format is None:
                 logger.warning(f"Dados de pose não encontrados para: {video_path}")
                 return None
             
-            with open(data_path, "r") as f:
-                data_dict = json.load(f)
-            
-            # Converte de volta para objetos
-            frames = []
-            for frame_dict in data_dict["frames"]:
-                landmarks = {
-                    int(k): PoseLandmark(**v)
-                    for k, v in frame_dict["landmarks"].items()
-                }
-                frames.append(PoseFrame(
-                    frame_number=frame_dict["frame_number"],
-                    timestamp=frame_dict["timestamp"],
-                    landmarks=landmarks
-                ))
-            
-            pose_data = PoseData(
-                video_path=data_dict["video_path"],
-                video_hash=data_dict["video_hash"],
-                fps=data_dict["fps"],
-                resolution=tuple(data_dict["resolution"]),
-                total_frames=data_dict["total_frames"],
-                frames=frames,
-                created_at=data_dict["created_at"],
-                version=data_dict.get("version", "1.0")
-            )
+            if data_format == "npy":
+                track, meta = self._read_npy(video_hash)
+                data_path = _npy_paths(self.storage_dir / video_hash)["meta"]
+                pose_data = track.to_pose_data(
+                    meta["video_path"], meta["video_hash"], meta["resolution"],
+                    pose_data_cls=PoseData, frame_cls=PoseFrame,
+                    created_at=meta["created_at"], version=meta.get("version", "1.0")
+                )
+            else:
+                data_path = self.storage_dir / f"{video_hash}.json"
+                with open(data_path, "r") as f:
+                    pose_data = self._pose_data_from_dict(json.load(f))
             
             # Atualiza o cache
             self.cache[video_hash] = pose_data
@@ -220,6 +592,449 @@ class PoseStorage:
             logger.error(f"Erro ao carregar dados de pose: {str(e)}")
             return None
 
+    def load_pose_track(self, video_path: str, mmap: bool = True) -> Optional[PoseTrack]:
+        """
+        Carrega os dados de pose de um vídeo como PoseTrack.
+        
+        No formato binário os landmarks são abertos com np.load(mmap_mode='r'),
+        de forma que apenas as regiões acessadas são lidas do disco. Dados em
+        JSON são convertidos a partir de load_pose_data.
+        
+        Args:
+            video_path: Caminho do vídeo
+            mmap: Se True, mapeia o arquivo binário em memória em vez de lê-lo
+            
+        Returns:
+            PoseTrack com uma linha por frame armazenado ou None se os dados não forem encontrados
+        """
+        try:
+            video_hash = self._generate_video_hash(video_path)
+            if self._find_format(video_hash) == "npy":
+                track, _ = self._read_npy(video_hash, mmap=mmap)
+                return track
+                
+            pose_data = self.load_pose_data(video_path)
+            if pose_data is None:
+                return None
+            return PoseTrack.from_pose_data(pose_data)
+            
+        except Exception as e:
+            logger.error(f"Erro ao carregar track de pose: {str(e)}")
+            return None
+
+    def _load_frame_index(self, video_hash: str) -> FrameIndex:
+        """
+        Retorna o índice de frames do arquivo JSON de um vídeo.
+
+        O índice gravado em disco é reaproveitado enquanto o arquivo JSON não
+        mudar; caso contrário, é reconstruído com uma leitura sequencial do
+        arquivo e gravado novamente.
+        """
+        json_path = self.storage_dir / f"{video_hash}.json"
+        index_path = frame_index_path(json_path)
+        if index_path.exists():
+            try:
+                index = FrameIndex.load(index_path)
+                if index.is_current(json_path):
+                    return index
+            except Exception as e:
+                logger.warning(f"Índice de frames inválido, reconstruindo: {str(e)}")
+
+        index = build_json_frame_index(json_path)
+        try:
+            index.save(index_path)
+        except Exception as e:
+            logger.warning(f"Erro ao salvar índice de frames de {json_path}: {str(e)}")
+        logger.info(f"Índice de frames criado para: {json_path}")
+        return index
+
+    def load_pose_info(self, video_path: str) -> Optional[Dict]:
+        """
+        Carrega apenas os metadados dos dados de pose de um vídeo, sem os frames.
+
+        Args:
+            video_path: Caminho do vídeo
+
+        Returns:
+            Dicionário com video_path, video_hash, fps, resolution, total_frames,
+            num_frames, created_at e version, ou None se os dados não forem encontrados
+        """
+        try:
+            video_hash = self._generate_video_hash(video_path)
+            pose_data = self.cache.get(video_hash)
+            if pose_data is not None:
+                return {
+                    "video_path": pose_data.video_path,
+                    "video_hash": pose_data.video_hash,
+                    "fps": pose_data.fps,
+                    "resolution": tuple(pose_data.resolution),
+                    "total_frames": pose_data.total_frames,
+                    "num_frames": len(pose_data.frames),
+                    "created_at": pose_data.created_at,
+                    "version": pose_data.version
+                }
+
+            data_format = self._find_format(video_hash)
+            if data_format is None:
+                logger.warning(f"Dados de pose não encontrados para: {video_path}")
+                return None
+
+            if data_format == "npy":
+                with open(_npy_paths(self.storage_dir / video_hash)["meta"], "r") as f:
+                    meta = json.load(f)
+            else:
+                index = self._load_frame_index(video_hash)
+                meta = {**index.header, "num_frames": len(index)}
+            meta["resolution"] = tuple(meta["resolution"])
+            meta.setdefault("version", "1.0")
+            return meta
+
+        except Exception as e:
+            logger.error(f"Erro ao carregar metadados de pose: {str(e)}")
+            return None
+
+    def load_frames(self, video_path: str, start_time: Optional[float] = None,
+                    end_time: Optional[float] = None) -> Optional[List[PoseFrame]]:
+        """
+        Carrega apenas os frames de um vídeo com timestamp no intervalo [start_time, end_time).
+
+        Em JSON, o intervalo é localizado no índice de frames (ver frame_index)
+        e apenas os bytes desses frames são lidos e decodificados; no formato
+        binário, as linhas são localizadas em frames.npy e lidas do arquivo
+        mapeado em memória. Se os dados completos do vídeo já estiverem no
+        cache, os frames são obtidos dele.
+
+        Args:
+            video_path: Caminho do vídeo
+            start_time: Início do intervalo em segundos (None: início do vídeo)
+            end_time: Fim do intervalo em segundos, exclusivo (None: fim do vídeo)
+
+        Returns:
+            Lista de PoseFrame (vazia se o intervalo não tiver frames) ou None
+            se os dados não forem encontrados
+        """
+        try:
+            video_hash = self._generate_video_hash(video_path)
+
+            pose_data = self.cache.get(video_hash)
+            if pose_data is not None:
+                timestamps = np.fromiter((frame.timestamp for frame in pose_data.frames),
+                                         dtype=np.float64, count=len(pose_data.frames))
+                return pose_data.frames[time_range_rows(timestamps, start_time, end_time)]
+
+            data_format = self._find_format(video_hash)
+            if data_format is None:
+                logger.warning(f"Dados de pose não encontrados para: {video_path}")
+                return None
+
+            if data_format == "npy":
+                track, _ = self._read_npy(video_hash)
+                return track[time_range_rows(track.timestamps, start_time, end_time)].to_frames(PoseFrame)
+
+            index = self._load_frame_index(video_hash)
+            frame_dicts = index.read_frames(self.storage_dir / f"{video_hash}.json",
+                                            index.rows(start_time, end_time))
+            return [self._pose_frame_from_dict(frame_dict) for frame_dict in frame_dicts]
+
+        except Exception as e:
+            logger.error(f"Erro ao carregar frames de pose: {str(e)}")
+            return None
+
+    def load_pose_data_range(self, video_path: str, start_time: Optional[float] = None,
+                             end_time: Optional[float] = None) -> Optional[PoseData]:
+        """
+        Carrega os dados de pose de um vídeo contendo apenas os frames de um intervalo.
+
+        Os metadados (fps, resolução, total de frames) são os do vídeo inteiro.
+
+        Args:
+            video_path: Caminho do vídeo
+            start_time: Início do intervalo em segundos (None: início do vídeo)
+            end_time: Fim do intervalo em segundos, exclusivo (None: fim do vídeo)
+
+        Returns:
+            PoseData com os frames do intervalo ou None se os dados não forem encontrados
+        """
+        info = self.load_pose_info(video_path)
+        if info is None:
+            return None
+        frames = self.load_frames(video_path, start_time, end_time)
+        if frames is None:
+            return None
+        return PoseData(
+            video_path=info["video_path"],
+            video_hash=info["video_hash"],
+            fps=info["fps"],
+            resolution=info["resolution"],
+            total_frames=info["total_frames"],
+            frames=frames,
+            created_at=info["created_at"],
+            version=info["version"]
+        )
+
+    def load_track_range(self, video_path: str, start_time: Optional[float] = None,
+                         end_time: Optional[float] = None) -> Optional[PoseTrack]:
+        """
+        Carrega como PoseTrack os frames de um vídeo com timestamp em [start_time, end_time).
+
+        No formato binário o resultado é uma view do arquivo mapeado em memória.
+
+        Args:
+            video_path: Caminho do vídeo
+            start_time: Início do intervalo em segundos (None: início do vídeo)
+            end_time: Fim do intervalo em segundos, exclusivo (None: fim do vídeo)
+
+        Returns:
+            PoseTrack com uma linha por frame armazenado no intervalo (frame_numbers
+            absolutos) ou None se os dados não forem encontrados
+        """
+        try:
+            video_hash = self._generate_video_hash(video_path)
+            if video_hash not in self.cache and self._find_format(video_hash) == "npy":
+                track, _ = self._read_npy(video_hash)
+                return track[time_range_rows(track.timestamps, start_time, end_time)]
+
+            info = self.load_pose_info(video_path)
+            frames = self.load_frames(video_path, start_time, end_time)
+            if info is None or frames is None:
+                return None
+            return PoseTrack.from_frames(frames, fps=info["fps"], total_frames=info["total_frames"])
+
+        except Exception as e:
+            logger.error(f"Erro ao carregar intervalo do track de pose: {str(e)}")
+            return None
+
+    def export_json(self, video_path: str, output_path: Optional[str] = None) -> bool:
+        """
+        Exporta os dados de pose de um vídeo para JSON, independente do formato salvo.
+        
+        Args:
+            video_path: Caminho do vídeo
+            output_path: Caminho do arquivo JSON (padrão: {storage_dir}/{hash}.json)
+            
+        Returns:
+            bool: True se os dados foram exportados com sucesso
+        """
+        try:
+            pose_data = self.load_pose_data(video_path)
+            if pose_data is None:
+                return False
+                
+            output_path = Path(output_path or self.storage_dir / f"{pose_data.video_hash}.json")
+            self._write_json(pose_data, output_path)
+            logger.info(f"Dados de pose exportados para: {output_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Erro ao exportar dados de pose: {str(e)}")
+            return False
+
+    def migrate_to_npy(self, remove_json: bool = False) -> int:
+        """
+        Converte os arquivos de pose JSON do diretório para o formato binário.
+        
+        Args:
+            remove_json: Se True, remove os arquivos JSON após a conversão
+            
+        Returns:
+            int: Número de arquivos convertidos
+        """
+        migrated = 0
+        for json_path in sorted(self.storage_dir.glob("*.json")):
+            if (json_path.name.startswith("comparison_") or json_path.name.endswith(".meta.json")
+                    or json_path.name == FINGERPRINT_INDEX_NAME):
+                continue
+            try:
+                with open(json_path, "r") as f:
+                    pose_data = self._pose_data_from_dict(json.load(f))
+                self._write_npy(pose_data)
+                self.cache.pop(pose_data.video_hash, None)
+                if remove_json:
+                    json_path.unlink()
+                migrated += 1
+                logger.info(f"Arquivo migrado para o formato binário: {json_path}")
+            except Exception as e:
+                logger.error(f"Erro ao migrar {json_path}: {str(e)}")
+        return migrated
+
+    def _update_pose_index(self, video_hash: str, video_path: str, load_track) -> None:
+        """
+        Insere um vídeo recém-salvo no índice de poses (se habilitado).
+        
+        Falhas do índice não invalidam os dados de pose salvos: são apenas registradas.
+        
+        Args:
+            video_hash: Hash do vídeo
+            video_path: Caminho do vídeo
+            load_track: Função que retorna o PoseTrack do vídeo
+        """
+        if self.pose_index is None:
+            return
+        try:
+            self.pose_index.add(video_hash, video_path, load_track())
+            self.pose_index.save()
+        except Exception as e:
+            logger.warning(f"Erro ao atualizar índice de poses para {video_path}: {str(e)}")
+
+    def _stored_hashes(self) -> List[str]:
+        """Lista os hashes de todos os vídeos com dados de pose no diretório (qualquer formato)."""
+        hashes = {path.name[:-len(".meta.json")] for path in self.storage_dir.glob("*.meta.json")}
+        for json_path in self.storage_dir.glob("*.json"):
+            if not (json_path.name.startswith("comparison_") or json_path.name.endswith(".meta.json")
+                    or json_path.name == FINGERPRINT_INDEX_NAME):
+                hashes.add(json_path.stem)
+        return sorted(hashes)
+
+    def _load_stored_track(self, video_hash: str) -> Tuple[PoseTrack, str]:
+        """Carrega o track e o caminho do vídeo a partir do hash (sem acessar o vídeo)."""
+        if self._find_format(video_hash) == "npy":
+            track, meta = self._read_npy(video_hash)
+            return track, meta["video_path"]
+        with open(self.storage_dir / f"{video_hash}.json", "r") as f:
+            pose_data = self._pose_data_from_dict(json.load(f))
+        return PoseTrack.from_pose_data(pose_data), pose_data.video_path
+
+    def rebuild_pose_index(self) -> int:
+        """
+        Reconstrói o índice de poses com todos os vídeos do diretório.
+        
+        Returns:
+            int: Número de vídeos indexados
+        """
+        index = PoseIndex(self.storage_dir / POSE_INDEX_NAME, load=False)
+        for video_hash in self._stored_hashes():
+            try:
+                track, video_path = self._load_stored_track(video_hash)
+                index.add(video_hash, video_path, track)
+            except Exception as e:
+                logger.error(f"Erro ao indexar os dados de pose {video_hash}: {str(e)}")
+        # O índice reconstruído substitui o arquivo (vídeos removidos do diretório saem do índice)
+        index.save(merge=False)
+        self.pose_index = index
+        logger.info(f"Índice de poses reconstruído: {len(index)} vídeos, {len(index.row_time)} janelas")
+        return len(index)
+
+    def find_similar(self, video_path: str, top_k: int = 5, start_time: Optional[float] = None,
+                     end_time: Optional[float] = None) -> List[IndexMatch]:
+        """
+        Busca no índice de poses os vídeos mais parecidos com um vídeo armazenado (ou um trecho).
+        
+        Args:
+            video_path: Caminho do vídeo consultado (seus dados de pose devem estar salvos)
+            top_k: Número máximo de vídeos retornados
+            start_time: Início do trecho consultado em segundos (None: início do vídeo)
+            end_time: Fim do trecho consultado em segundos, exclusivo (None: fim do vídeo)
+            
+        Returns:
+            Lista de IndexMatch em ordem decrescente de similaridade, sem o próprio vídeo
+        """
+        try:
+            index = self.pose_index
+            if index is None:
+                index = PoseIndex(self.storage_dir / POSE_INDEX_NAME)
+            track = self.load_track_range(video_path, start_time, end_time)
+            if track is None:
+                return []
+            # Reposiciona o trecho para que o clipe comece no frame 0
+            first = 0 if start_time is None else int(np.ceil(start_time * track.fps - 1e-9))
+            last = track.total_frames if end_time is None else min(
+                track.total_frames, int(np.ceil(end_time * track.fps - 1e-9)))
+            track = PoseTrack(track.data, track.frame_numbers - first, track.valid,
+                              fps=track.fps, total_frames=max(last - first, 0))
+            video_hash = self._generate_video_hash(video_path)
+            return index.search(track, top_k=top_k, exclude=[video_hash])
+        except Exception as e:
+            logger.error(f"Erro ao buscar vídeos similares: {str(e)}")
+            return []
+
+    def _find_format(self, video_hash: str) -> Optional[str]:
+        """Retorna o formato em que os dados de um vídeo estão salvos, priorizando o configurado."""
+        available = {
+            "json": (self.storage_dir / f"{video_hash}.json").exists(),
+            "npy": _npy_paths(self.storage_dir / video_hash)["meta"].exists()
+        }
+        if available[self.storage_format]:
+            return self.storage_format
+        return next((fmt for fmt, exists in available.items() if exists), None)
+
+    def _read_npy(self, video_hash: str, mmap: bool = True) -> Tuple[PoseTrack, Dict]:
+        """Lê os arquivos binários de um vídeo, retornando o track e os metadados."""
+        paths = _npy_paths(self.storage_dir / video_hash)
+        with open(paths["meta"], "r") as f:
+            meta = json.load(f)
+        data = np.load(paths["landmarks"], mmap_mode="r" if mmap else None)
+        frame_numbers = np.load(paths["frames"])
+        # Apenas frames com pose são armazenados; evita varrer o arquivo mapeado
+        track = PoseTrack(data, frame_numbers, valid=np.ones(len(frame_numbers), dtype=bool),
+                          fps=meta["fps"], total_frames=meta["total_frames"])
+        return track, meta
+
+    def _write_npy(self, pose_data: PoseData) -> Path:
+        """Salva os dados de pose no formato binário e retorna o caminho dos metadados."""
+        paths = _npy_paths(self.storage_dir / pose_data.video_hash)
+        track = PoseTrack.from_frames(pose_data.frames, fps=pose_data.fps,
+                                      total_frames=pose_data.total_frames)
+        _save_npy_atomic(paths["landmarks"], track.data)
+        _save_npy_atomic(paths["frames"], track.frame_numbers)
+        
+        # Os metadados são escritos por último e indicam que os arrays estão completos
+        meta = {
+            "video_path": pose_data.video_path,
+            "video_hash": pose_data.video_hash,
+            "fps": pose_data.fps,
+            "resolution": list(pose_data.resolution),
+            "total_frames": pose_data.total_frames,
+            "format": "npy",
+            "num_frames": len(track),
+            "created_at": pose_data.created_at,
+            "version": pose_data.version
+        }
+        _save_json_atomic(paths["meta"], meta, indent=2)
+        return paths["meta"]
+
+    def _write_json(self, pose_data: PoseData, output_path: Path) -> None:
+        """Salva os dados de pose em JSON."""
+        data_dict = asdict(pose_data)
+        data_dict["frames"] = [
+            {
+                "frame_number": f.frame_number,
+                "timestamp": f.timestamp,
+                "landmarks": {
+                    str(k): asdict(v) for k, v in f.landmarks.items()
+                }
+            }
+            for f in pose_data.frames
+        ]
+        with open(output_path, "w") as f:
+            json.dump(data_dict, f, indent=2)
+
+    def _pose_frame_from_dict(self, frame_dict: Dict) -> PoseFrame:
+        """Converte o dicionário de um frame de um arquivo JSON em PoseFrame."""
+        landmarks = {
+            int(k): PoseLandmark(**v)
+            for k, v in frame_dict["landmarks"].items()
+        }
+        return PoseFrame(
+            frame_number=frame_dict["frame_number"],
+            timestamp=frame_dict["timestamp"],
+            landmarks=landmarks
+        )
+
+    def _pose_data_from_dict(self, data_dict: Dict) -> PoseData:
+        """Converte o dicionário de um arquivo JSON em PoseData."""
+        frames = [self._pose_frame_from_dict(frame_dict) for frame_dict in data_dict["frames"]]
+        
+        return PoseData(
+            video_path=data_dict["video_path"],
+            video_hash=data_dict["video_hash"],
+            fps=data_dict["fps"],
+            resolution=tuple(data_dict["resolution"]),
+            total_frames=data_dict["total_frames"],
+            frames=frames,
+            created_at=data_dict["created_at"],
+            version=data_dict.get("version", "1.0")
+        )
+
     def clear_cache(self):
         """Limpa o cache de dados de pose."""
         self.cache.clear()
@@ -247,80 +1062,184 @@ class PoseStorage:
         return frame_landmarks
 
     def save_comparison_results(self, video1_path: str, video2_path: str, 
-                              results: ComparisonResults) -> bool:
+                              results: ComparisonResults, params: Optional[Dict] = None,
+                              comparator_version: str = "") -> bool:
         """
-        Salva os resultados de uma comparação.
+        Salva os resultados de uma comparação no cache endereçado por conteúdo.
         
         Args:
             video1_path: Caminho do primeiro vídeo
             video2_path: Caminho do segundo vídeo
             results: Resultados da comparação
+            params: Parâmetros que afetam o resultado (ex: ComparadorMovimento.cache_params())
+            comparator_version: Versão do comparador
             
         Returns:
             bool: True se os resultados foram salvos com sucesso
         """
         try:
-            # Gera uma chave única para a comparação
             video1_hash = self._generate_video_hash(video1_path)
             video2_hash = self._generate_video_hash(video2_path)
-            comparison_key = f"{video1_hash}_{video2_hash}"
-            
-            # Converte os resultados para JSON
-            results_dict = results.to_dict()
-            
-            # Adiciona metadados
-            results_dict["metadata"].update({
-                "video1_path": video1_path,
-                "video2_path": video2_path,
-                "video1_hash": video1_hash,
-                "video2_hash": video2_hash,
-                "saved_at": datetime.now().isoformat()
-            })
             
-            # Salva o arquivo
-            output_path = self.storage_dir / f"comparison_{comparison_key}.json"
-            with open(output_path, "w") as f:
-                json.dump(results_dict, f, indent=2)
-            
-            logger.info(f"Resultados da comparação salvos em: {output_path}")
-            return True
+            success = self.results_cache.set_comparison(
+                video1_hash, video2_hash, results,
+                params=params,
+                comparator_version=comparator_version,
+                metadata={
+                    "video1_path": video1_path,
+                    "video2_path": video2_path,
+                    "saved_at": datetime.now().isoformat()
+                }
+            )
+            if success:
+                logger.info(f"Resultados da comparação salvos para: {video1_path} e {video2_path}")
+            return success
             
         except Exception as e:
             logger.error(f"Erro ao salvar resultados da comparação: {str(e)}")
             return False
 
-    def load_comparison_results(self, video1_path: str, video2_path: str) -> Optional[ComparisonResults]:
+    def load_comparison_results(self, video1_path: str, video2_path: str,
+                                params: Optional[Dict] = None,
+                                comparator_version: str = "") -> Optional[ComparisonResults]:
         """
-        Carrega os resultados de uma comparação.
+        Carrega os resultados de uma comparação do cache endereçado por conteúdo.
+        
+        Só retorna resultados calculados para o mesmo conteúdo dos vídeos, os
+        mesmos parâmetros e a mesma versão do comparador.
         
         Args:
             video1_path: Caminho do primeiro vídeo
             video2_path: Caminho do segundo vídeo
+            params: Parâmetros que afetam o resultado (ex: ComparadorMovimento.cache_params())
+            comparator_version: Versão do comparador
             
         Returns:
             ComparisonResults ou None se os resultados não forem encontrados
         """
         try:
-            # Gera a chave da comparação
             video1_hash = self._generate_video_hash(video1_path)
             video2_hash = self._generate_video_hash(video2_path)
-            comparison_key = f"{video1_hash}_{video2_hash}"
-            
-            # Carrega o arquivo
-            data_path = self.storage_dir / f"comparison_{comparison_key}.json"
-            if not data_path.exists():
-                logger.warning(f"Resultados da comparação não encontrados para: {video1_path} e {video2_path}")
-                return None
             
-            with open(data_path, "r") as f:
-                results_dict = json.load(f)
-            
-            # Converte para ComparisonResults
-            results = ComparisonResults.from_dict(results_dict)
-            
-            logger.info(f"Resultados da comparação carregados de: {data_path}")
+            results = self.results_cache.get_comparison(
+                video1_hash, video2_hash,
+                params=params,
+                comparator_version=comparator_version
+            )
+            if results is None:
+                logger.info(f"Resultados da comparação não encontrados para: {video1_path} e {video2_path}")
             return results
             
         except Exception as e:
             logger.error(f"Erro ao carregar resultados da comparação: {str(e)}")
             return None 
+
+    def save_landmark_comparison(self, video1_path: str, video2_path: str,
+                                 comparison: LandmarkComparison, params: Optional[Dict] = None,
+                                 comparator_version: str = "") -> bool:
+        """
+        Salva os arrays por landmark de uma comparação no cache endereçado por conteúdo.
+        
+        Com eles, mudar os pesos ou a tolerância não exige recalcular a
+        comparação (ver ComparadorMovimento.rescore).
+        
+        Args:
+            video1_path: Caminho do primeiro vídeo
+            video2_path: Caminho do segundo vídeo
+            comparison: Resultado de ComparadorMovimento.prepare_tracks
+            params: Parâmetros que afetam os arrays (ex: ComparadorMovimento.landmark_cache_params())
+            comparator_version: Versão do comparador
+            
+        Returns:
+            bool: True se os arrays foram salvos com sucesso
+        """
+        try:
+            key = comparison_key(self._generate_video_hash(video1_path),
+                                 self._generate_video_hash(video2_path),
+                                 params, comparator_version)
+            return self.results_cache.set_landmarks(key, comparison)
+            
+        except Exception as e:
+            logger.error(f"Erro ao salvar comparação por landmark: {str(e)}")
+            return False
+
+    def load_landmark_comparison(self, video1_path: str, video2_path: str,
+                                 params: Optional[Dict] = None,
+                                 comparator_version: str = "") -> Optional[LandmarkComparison]:
+        """
+        Carrega os arrays por landmark de uma comparação do cache endereçado por conteúdo.
+        
+        Args:
+            video1_path: Caminho do primeiro vídeo
+            video2_path: Caminho do segundo vídeo
+            params: Parâmetros que afetam os arrays (ex: ComparadorMovimento.landmark_cache_params())
+            comparator_version: Versão do comparador
+            
+        Returns:
+            LandmarkComparison ou None se os arrays não forem encontrados
+        """
+        try:
+            key = comparison_key(self._generate_video_hash(video1_path),
+                                 self._generate_video_hash(video2_path),
+                                 params, comparator_version)
+            return self.results_cache.get_landmarks(key)
+            
+        except Exception as e:
+            logger.error(f"Erro ao carregar comparação por landmark: {str(e)}")
+            return None
+
+def main(args: Optional[List[str]] = None) -> int:
+    """
+    Ferramenta de manutenção do armazenamento de poses.
+    
+    Exemplos:
+        python -m src.pose_storage --storage-dir data/pose migrate
+        python -m src.pose_storage --storage-dir data/pose export video.mp4 -o video.json
+        python -m src.pose_storage --storage-dir data/pose index
+        python -m src.pose_storage --storage-dir data/pose search clip.mp4 --top-k 5
+    """
+    parser = argparse.ArgumentParser(description="Manutenção do armazenamento de dados de pose")
+    parser.add_argument('--storage-dir', default="data/pose",
+                        help="Diretório de armazenamento dos dados de pose")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    migrate_parser = subparsers.add_parser('migrate', help="Converte os arquivos JSON para o formato binário")
+    migrate_parser.add_argument('--remove-json', action='store_true',
+                                help="Remove os arquivos JSON após a conversão")
+    
+    export_parser = subparsers.add_parser('export', help="Exporta os dados de pose de um vídeo para JSON")
+    export_parser.add_argument('video', help="Caminho do vídeo")
+    export_parser.add_argument('-o', '--output', help="Caminho do arquivo JSON de saída")
+    
+    subparsers.add_parser('index', help="Reconstrói o índice de similaridade de poses")
+    
+    search_parser = subparsers.add_parser('search', help="Busca os vídeos mais parecidos com um vídeo salvo")
+    search_parser.add_argument('video', help="Caminho do vídeo consultado")
+    search_parser.add_argument('--top-k', type=int, default=5, help="Número de vídeos retornados (padrão: 5)")
+    search_parser.add_argument('--start-time', type=float, help="Início do trecho consultado em segundos")
+    search_parser.add_argument('--end-time', type=float, help="Fim do trecho consultado em segundos")
+    
+    parsed_args = parser.parse_args(args)
+    storage = PoseStorage(parsed_args.storage_dir)
+    
+    if parsed_args.command == "migrate":
+        migrated = storage.migrate_to_npy(remove_json=parsed_args.remove_json)
+        print(f"Arquivos migrados: {migrated}")
+        return 0
+        
+    if parsed_args.command == "index":
+        indexed = storage.rebuild_pose_index()
+        print(f"Vídeos indexados: {indexed}")
+        return 0
+        
+    if parsed_args.command == "search":
+        matches = storage.find_similar(parsed_args.video, top_k=parsed_args.top_k,
+                                       start_time=parsed_args.start_time, end_time=parsed_args.end_time)
+        for match in matches:
+            print(f"{match.score:.3f}  {match.video_path}  (a partir de {match.offset_seconds:.1f} s)")
+        return 0
+        
+    return 0 if storage.export_json(parsed_args.video, parsed_args.output) else 1
+
+if __name__ == "__main__":
+    exit(main())
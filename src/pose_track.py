@@ -0,0 +1,334 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .pose_models import PoseLandmark, PoseFrame, PoseData
+
+# Configuração do logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Número de landmarks do MediaPipe Pose
+NUM_LANDMARKS = 33
+
+# Ordem dos campos na última dimensão do array
+LANDMARK_FIELDS = ("x", "y", "z", "visibility")
+
+class PoseTrack:
+    """
+    Sequência de poses armazenada em um único array contíguo.
+
+    Os landmarks ficam em `data`, um array (n_frames, num_landmarks, 4) com os
+    campos x, y, z e visibility. `frame_numbers` guarda o número do frame de
+    cada linha e `valid` indica as linhas com pose detectada. Landmarks
+    ausentes são representados por NaN.
+
+    Os acessos por frame, por landmark e por intervalo retornam views do
+    array, sem cópia. Os adaptadores from_*/to_* convertem de e para os tipos
+    PoseFrame/PoseData (de pose_models ou pose_storage) e para a lista de
+    dicionários usada pelo extrator e pelo comparador.
+    """
+
+    def __init__(self, data: np.ndarray, frame_numbers: Optional[np.ndarray] = None,
+                 valid: Optional[np.ndarray] = None, fps: float = 0.0,
+                 total_frames: Optional[int] = None, dtype=None):
+        """
+        Inicializa o track de pose.
+
+        Args:
+            data: Array (n_frames, num_landmarks, 4) com os landmarks
+            frame_numbers: Número do frame de cada linha (padrão: 0..n_frames-1)
+            valid: Máscara de linhas com pose detectada (padrão: linhas não totalmente NaN)
+            fps: Frames por segundo do vídeo
+            total_frames: Total de frames do vídeo (padrão: último frame + 1)
+            dtype: Tipo de ponto flutuante do array (padrão: mantém o tipo de data, ou float32)
+        """
+        # asanyarray preserva arrays mapeados em memória (np.memmap) sem cópia
+        data = np.asanyarray(data)
+        if dtype is None:
+            dtype = data.dtype if np.issubdtype(data.dtype, np.floating) else np.float32
+        data = np.asanyarray(data, dtype=dtype)
+        if data.ndim != 3 or data.shape[2] != len(LANDMARK_FIELDS):
+            raise ValueError("data deve ter formato (n_frames, num_landmarks, 4)")
+
+        n_frames = data.shape[0]
+        if frame_numbers is None:
+            frame_numbers = np.arange(n_frames, dtype=np.int64)
+        frame_numbers = np.asarray(frame_numbers, dtype=np.int64)
+        if frame_numbers.shape != (n_frames,):
+            raise ValueError("frame_numbers deve ter um elemento por frame")
+
+        if valid is None:
+            valid = ~np.isnan(data).all(axis=(1, 2))
+        valid = np.asarray(valid, dtype=bool)
+        if valid.shape != (n_frames,):
+            raise ValueError("valid deve ter um elemento por frame")
+
+        self.data = data
+        self.frame_numbers = frame_numbers
+        self.valid = valid
+        self.fps = fps
+        if total_frames is None:
+            total_frames = int(frame_numbers[-1]) + 1 if n_frames else 0
+        self.total_frames = total_frames
+
+    @classmethod
+    def empty(cls, n_frames: int, num_landmarks: int = NUM_LANDMARKS, fps: float = 0.0,
+              dtype=np.float32) -> 'PoseTrack':
+        """
+        Cria um track sem poses (todos os landmarks NaN e frames inválidos).
+
+        Args:
+            n_frames: Número de frames
+            num_landmarks: Número de landmarks por frame
+            fps: Frames por segundo do vídeo
+            dtype: Tipo de ponto flutuante do array
+
+        Returns:
+            PoseTrack vazio
+        """
+        data = np.full((n_frames, num_landmarks, len(LANDMARK_FIELDS)), np.nan, dtype=dtype)
+        return cls(data, valid=np.zeros(n_frames, dtype=bool), fps=fps)
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    def __getitem__(self, index) -> 'PoseTrack':
+        """Retorna um sub-track; fatias simples compartilham memória com o original."""
+        if isinstance(index, (int, np.integer)):
+            index = slice(index, index + 1 if index != -1 else None)
+        return PoseTrack(self.data[index], self.frame_numbers[index], self.valid[index],
+                         fps=self.fps, total_frames=self.total_frames)
+
+    def __repr__(self) -> str:
+        return (f"PoseTrack(frames={len(self)}, landmarks={self.num_landmarks}, "
+                f"valid={int(self.valid.sum())}, dtype={self.dtype})")
+
+    @property
+    def num_landmarks(self) -> int:
+        """Número de landmarks por frame."""
+        return self.data.shape[1]
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Tipo de ponto flutuante do array."""
+        return self.data.dtype
+
+    @property
+    def xyz(self) -> np.ndarray:
+        """View (n_frames, num_landmarks, 3) com as coordenadas."""
+        return self.data[..., :3]
+
+    @property
+    def visibility(self) -> np.ndarray:
+        """View (n_frames, num_landmarks) com a visibilidade."""
+        return self.data[..., 3]
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Timestamp (em segundos) de cada linha."""
+        if self.fps <= 0:
+            return np.zeros(len(self), dtype=np.float64)
+        return self.frame_numbers / self.fps
+
+    def frame(self, index: int) -> np.ndarray:
+        """
+        Retorna a view (num_landmarks, 4) de uma linha do track.
+
+        Args:
+            index: Índice da linha (não o número do frame)
+
+        Returns:
+            View do array de landmarks
+        """
+        return self.data[index]
+
+    def landmark(self, landmark_id: int) -> np.ndarray:
+        """
+        Retorna a view (n_frames, 4) da trajetória de um landmark.
+
+        Args:
+            landmark_id: Índice do landmark
+
+        Returns:
+            View do array de landmarks
+        """
+        return self.data[:, landmark_id]
+
+    def valid_frames(self) -> 'PoseTrack':
+        """Retorna um track (cópia) apenas com as linhas válidas."""
+        return self[self.valid]
+
+    def to_dense(self, total_frames: Optional[int] = None) -> 'PoseTrack':
+        """
+        Retorna um track com uma linha por frame do vídeo (0..total_frames-1).
+
+        Args:
+            total_frames: Número de frames do track denso (padrão: self.total_frames)
+
+        Returns:
+            PoseTrack em que a linha i corresponde ao frame i
+        """
+        total_frames = self.total_frames if total_frames is None else total_frames
+        dense = PoseTrack.empty(total_frames, self.num_landmarks, self.fps, self.dtype)
+        inside = (self.frame_numbers >= 0) & (self.frame_numbers < total_frames)
+        rows = self.frame_numbers[inside]
+        dense.data[rows] = self.data[inside]
+        dense.valid[rows] = self.valid[inside]
+        return dense
+
+    @classmethod
+    def from_landmarks(cls, frame_landmarks: List[Optional[Dict[int, PoseLandmark]]],
+                       fps: float = 0.0, num_landmarks: int = NUM_LANDMARKS,
+                       dtype=np.float32) -> 'PoseTrack':
+        """
+        Cria um track a partir da lista de landmarks por frame.
+
+        Args:
+            frame_landmarks: Lista com um dicionário de landmarks (ou None) por frame
+            fps: Frames por segundo do vídeo
+            num_landmarks: Número de landmarks por frame
+            dtype: Tipo de ponto flutuante do array
+
+        Returns:
+            PoseTrack com uma linha por frame
+        """
+        track = cls.empty(len(frame_landmarks), num_landmarks, fps, dtype)
+        for row, landmarks in enumerate(frame_landmarks):
+            if landmarks:
+                track._fill_row(row, landmarks)
+        return track
+
+    @classmethod
+    def from_frames(cls, frames: Iterable, fps: float = 0.0,
+                    total_frames: Optional[int] = None, num_landmarks: int = NUM_LANDMARKS,
+                    dtype=np.float32) -> 'PoseTrack':
+        """
+        Cria um track a partir de objetos PoseFrame.
+
+        Aceita qualquer objeto com os atributos frame_number e landmarks, como
+        os PoseFrame de pose_models e de pose_storage.
+
+        Args:
+            frames: Frames com landmarks
+            fps: Frames por segundo do vídeo
+            total_frames: Total de frames do vídeo (opcional)
+            num_landmarks: Número de landmarks por frame
+            dtype: Tipo de ponto flutuante do array
+
+        Returns:
+            PoseTrack com uma linha por frame recebido
+        """
+        frames = list(frames)
+        track = cls.empty(len(frames), num_landmarks, fps, dtype)
+        track.frame_numbers[:] = [frame.frame_number for frame in frames]
+        for row, frame in enumerate(frames):
+            if frame.landmarks:
+                track._fill_row(row, frame.landmarks)
+        if total_frames is not None:
+            track.total_frames = total_frames
+        elif frames:
+            track.total_frames = int(track.frame_numbers.max()) + 1
+        return track
+
+    @classmethod
+    def from_pose_data(cls, pose_data, dtype=np.float32) -> 'PoseTrack':
+        """
+        Cria um track a partir de um PoseData (de pose_models ou pose_storage).
+
+        Args:
+            pose_data: Dados de pose de um vídeo
+            dtype: Tipo de ponto flutuante do array
+
+        Returns:
+            PoseTrack com uma linha por frame armazenado
+        """
+        return cls.from_frames(pose_data.frames, fps=pose_data.fps,
+                               total_frames=pose_data.total_frames, dtype=dtype)
+
+    def _fill_row(self, row: int, landmarks: Dict[int, PoseLandmark]) -> None:
+        """Copia um dicionário de landmarks para uma linha do array."""
+        # Uma única atribuição por frame (atribuições por landmark são lentas no NumPy)
+        self.data[row, [int(landmark_id) for landmark_id in landmarks]] = [
+            (landmark.x, landmark.y, landmark.z, landmark.visibility)
+            for landmark in landmarks.values()
+        ]
+        self.valid[row] = True
+
+    def landmarks_at(self, index: int) -> Optional[Dict[int, PoseLandmark]]:
+        """
+        Converte uma linha do track em dicionário de landmarks.
+
+        Args:
+            index: Índice da linha
+
+        Returns:
+            Dicionário com os landmarks presentes ou None se a linha for inválida
+        """
+        if not self.valid[index]:
+            return None
+        row = self.data[index]
+        present = np.flatnonzero(~np.isnan(row).any(axis=1))
+        return {
+            int(i): PoseLandmark(x=float(row[i, 0]), y=float(row[i, 1]),
+                                 z=float(row[i, 2]), visibility=float(row[i, 3]))
+            for i in present
+        }
+
+    def to_landmarks(self) -> List[Optional[Dict[int, PoseLandmark]]]:
+        """
+        Converte o track na lista de landmarks por frame (uma entrada por frame do vídeo).
+
+        Returns:
+            Lista de dicionários com os landmarks de cada frame (None sem pose)
+        """
+        dense = self.to_dense()
+        return [dense.landmarks_at(i) for i in range(len(dense))]
+
+    def to_frames(self, frame_cls=PoseFrame) -> List:
+        """
+        Converte as linhas válidas do track em objetos PoseFrame.
+
+        Args:
+            frame_cls: Classe de frame a ser criada (PoseFrame de pose_models ou pose_storage)
+
+        Returns:
+            Lista de frames com landmarks
+        """
+        timestamps = self.timestamps
+        return [
+            frame_cls(frame_number=int(self.frame_numbers[i]),
+                      timestamp=float(timestamps[i]),
+                      landmarks=self.landmarks_at(i))
+            for i in np.flatnonzero(self.valid)
+        ]
+
+    def to_pose_data(self, video_path: str, video_hash: str, resolution: Tuple[int, int],
+                     pose_data_cls=PoseData, frame_cls=PoseFrame, **kwargs):
+        """
+        Converte o track em um objeto PoseData.
+
+        Args:
+            video_path: Caminho do vídeo
+            video_hash: Hash do vídeo
+            resolution: Resolução do vídeo (width, height)
+            pose_data_cls: Classe de dados a ser criada (PoseData de pose_models ou pose_storage)
+            frame_cls: Classe dos frames
+            **kwargs: Campos adicionais de PoseData (ex: created_at, version)
+
+        Returns:
+            Objeto PoseData com as linhas válidas do track
+        """
+        return pose_data_cls(
+            video_path=video_path,
+            video_hash=video_hash,
+            fps=self.fps,
+            resolution=tuple(resolution),
+            total_frames=self.total_frames,
+            frames=self.to_frames(frame_cls),
+            **kwargs
+        )
@@ -0,0 +1,229 @@
+import logging
+import tempfile
+from typing import Callable, Optional, Tuple
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from .pose_estimation import iter_sampled_frames
+from .pose_track import PoseTrack
+
+# Configuração do logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Número máximo de frames de um preview
+DEFAULT_PREVIEW_FRAMES = 150
+
+# Desenha sobre um frame RGB (no próprio array); recebe o índice do frame no vídeo
+FrameAnnotator = Callable[[np.ndarray, int], None]
+
+# Cria o encoder: (caminho de saída, (largura, altura), fps) -> objeto com write_frame(rgb) e close()
+WriterFactory = Callable[[str, tuple, float], object]
+
+# Pares de landmarks ligados no esqueleto
+POSE_CONNECTIONS = sorted(mp.solutions.pose.POSE_CONNECTIONS)
+
+# Cores (RGB) do esqueleto desenhado
+CONNECTION_COLOR = (255, 255, 255)
+LANDMARK_COLOR = (0, 255, 0)
+
+def draw_pose(frame_rgb: np.ndarray, landmarks: np.ndarray, min_visibility: float = 0.5,
+              region: Optional[Tuple[int, int, int, int]] = None) -> None:
+    """
+    Desenha o esqueleto de um frame do track no próprio frame.
+
+    Args:
+        frame_rgb: Frame RGB (altura, largura, 3)
+        landmarks: Array (num_landmarks, 4) com x, y, z e visibility (NaN para ausentes)
+        min_visibility: Visibilidade mínima para desenhar um landmark
+        region: Retângulo (x, y, largura, altura) em pixels onde as coordenadas
+            [0, 1] são desenhadas (padrão: o frame inteiro)
+    """
+    if region is None:
+        region = (0, 0, frame_rgb.shape[1], frame_rgb.shape[0])
+    x0, y0, width, height = region
+    visible = landmarks[:, 3] >= min_visibility  # NaN nunca é visível
+    points = np.zeros((len(landmarks), 2), dtype=np.int32)
+    points[visible, 0] = np.round(x0 + landmarks[visible, 0] * width)
+    points[visible, 1] = np.round(y0 + landmarks[visible, 1] * height)
+
+    for start, end in POSE_CONNECTIONS:
+        if end < len(landmarks) and visible[start] and visible[end]:
+            cv2.line(frame_rgb, tuple(points[start].tolist()), tuple(points[end].tolist()),
+                     CONNECTION_COLOR, 2, cv2.LINE_AA)
+    for point in points[visible]:
+        cv2.circle(frame_rgb, tuple(point.tolist()), 3, LANDMARK_COLOR, -1, cv2.LINE_AA)
+
+def inset_region(frame_shape: Tuple[int, ...]) -> Tuple[int, int, int, int]:
+    """
+    Retângulo no canto direito do frame para desenhar poses normalizadas.
+
+    Landmarks normalizados pela caixa do corpo (ComparisonParams.normalize)
+    não têm a posição da pessoa na imagem, então o esqueleto é desenhado em
+    um quadro à parte, sobre um fundo escurecido.
+
+    Args:
+        frame_shape: Formato do frame (altura, largura, ...)
+
+    Returns:
+        Tupla (x, y, largura, altura) em pixels
+    """
+    frame_height, frame_width = frame_shape[:2]
+    height = int(frame_height * 0.8)
+    width = min(height // 2, frame_width // 3)
+    margin = int(frame_height * 0.1)
+    return frame_width - width - margin, margin, width, height
+
+def track_annotator(track: PoseTrack, min_visibility: float = 0.5,
+                    normalized: bool = False) -> FrameAnnotator:
+    """
+    Cria a anotação de preview que desenha o esqueleto salvo de cada frame.
+
+    Os frames do vídeo são associados às linhas do track pelo número do
+    frame; frames sem pose no track ficam sem esqueleto.
+
+    Args:
+        track: Track de pose do vídeo (denso ou com frame_numbers)
+        min_visibility: Visibilidade mínima para desenhar um landmark
+        normalized: Os landmarks estão normalizados pela caixa do corpo e são
+            desenhados em um quadro à parte (ver inset_region)
+
+    Returns:
+        Função (frame_rgb, índice do frame) para create_preview_video
+    """
+    frame_numbers = np.asarray(track.frame_numbers)
+    order = np.argsort(frame_numbers, kind="stable")
+    sorted_numbers = frame_numbers[order]
+
+    def annotate(frame_rgb: np.ndarray, frame_idx: int) -> None:
+        position = np.searchsorted(sorted_numbers, frame_idx)
+        if position == len(sorted_numbers) or sorted_numbers[position] != frame_idx:
+            return
+        row = order[position]
+        if not track.valid[row]:
+            return
+        region = None
+        if normalized:
+            region = inset_region(frame_rgb.shape)
+            x, y, width, height = region
+            panel = frame_rgb[y:y + height, x:x + width]
+            panel //= 3
+        draw_pose(frame_rgb, track.data[row], min_visibility, region)
+
+    return annotate
+
+def preview_stride(total_frames: int, max_frames: int = DEFAULT_PREVIEW_FRAMES) -> int:
+    """
+    Calcula o intervalo entre os frames amostrados para o preview.
+
+    Args:
+        total_frames: Total de frames do vídeo (0 ou negativo se desconhecido)
+        max_frames: Número máximo de frames do preview
+
+    Returns:
+        int: Intervalo entre frames amostrados (1 se o total for desconhecido)
+    """
+    if total_frames <= 0:
+        return 1
+    return max(1, total_frames // min(total_frames, max_frames))
+
+def ffmpeg_writer(output_path: str, size: tuple, fps: float):
+    """Cria o encoder H.264 do MoviePy, que recebe os frames RGB um a um."""
+    from moviepy.video.io.ffmpeg_writer import FFMPEG_VideoWriter
+    return FFMPEG_VideoWriter(output_path, size, fps, codec='libx264')
+
+def create_preview_video(video_path: str, output_path: Optional[str] = None,
+                         max_frames: int = DEFAULT_PREVIEW_FRAMES,
+                         annotate: Optional[FrameAnnotator] = None,
+                         progress_callback: Optional[Callable[[float], None]] = None,
+                         writer_factory: WriterFactory = ffmpeg_writer,
+                         start_time: Optional[float] = None,
+                         end_time: Optional[float] = None) -> Optional[str]:
+    """
+    Cria um vídeo de preview com até max_frames frames amostrados do vídeo.
+
+    O vídeo é decodificado sequencialmente: os frames fora da amostragem são
+    avançados com cap.grab() (sem seek por frame, que em H.264/WebM volta ao
+    keyframe anterior e decodifica até o frame pedido). Cada frame amostrado é
+    convertido uma única vez para RGB, anotado no próprio array e enviado
+    direto ao encoder, sem acumular os frames em memória.
+
+    Args:
+        video_path: Caminho do vídeo
+        output_path: Caminho do preview (padrão: arquivo temporário .mp4)
+        max_frames: Número máximo de frames do preview
+        annotate: Função que desenha sobre o frame RGB (ex: track_annotator)
+        progress_callback: Função chamada com a fração concluída (0.0 a 1.0)
+        writer_factory: Cria o encoder do preview (padrão: FFMPEG_VideoWriter, H.264)
+        start_time: Início do trecho em segundos (padrão: início do vídeo)
+        end_time: Fim do trecho em segundos (padrão: fim do vídeo)
+
+    Returns:
+        Caminho do preview ou None se nenhum frame foi lido
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        logger.error(f"Não foi possível abrir o vídeo para preview: {video_path}")
+        return None
+
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+
+    # Trecho pedido: um único seek até o início, depois leitura sequencial
+    start_frame = max(0, int(round(start_time * fps))) if start_time is not None else 0
+    end_frame = int(round(end_time * fps)) if end_time is not None else total_frames
+    if total_frames > 0:
+        end_frame = min(end_frame, total_frames)
+    range_frames = end_frame - start_frame if end_frame > 0 else 0
+    if start_frame:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+
+    stride = preview_stride(range_frames, max_frames)
+    expected_frames = min(range_frames, max_frames) if range_frames > 0 else max_frames
+    # Termina a leitura no último frame amostrado, sem percorrer o resto do vídeo
+    last_frame = start_frame + stride * (max_frames - 1) + 1
+    if end_frame > 0:
+        last_frame = min(last_frame, end_frame)
+
+    if output_path is None:
+        output_path = tempfile.NamedTemporaryFile(delete=False, suffix='.mp4').name
+
+    writer = None
+    frames_written = 0
+    try:
+        # Índices relativos ao início do trecho, para que o primeiro frame seja amostrado
+        for offset, frame in iter_sampled_frames(cap, stride, end=last_frame - start_frame):
+            if frame is None:
+                continue
+            frame_idx = start_frame + offset
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            if annotate is not None:
+                try:
+                    annotate(frame_rgb, frame_idx)
+                except Exception as e:
+                    logger.error(f"Erro ao anotar frame {frame_idx} do preview: {str(e)}")
+
+            if writer is None:
+                writer = writer_factory(output_path, (frame_rgb.shape[1], frame_rgb.shape[0]), fps)
+            writer.write_frame(frame_rgb)
+            frames_written += 1
+
+            if progress_callback:
+                progress_callback(min(1.0, frames_written / expected_frames))
+    finally:
+        cap.release()
+        if writer is not None:
+            writer.close()
+
+    if not frames_written:
+        logger.warning(f"Nenhum frame lido para o preview: {video_path}")
+        return None
+
+    logger.info(f"Preview criado com {frames_written} frames ({size[0]}x{size[1]}): {output_path}")
+    return output_path
@@ -89,6 +89,17 @@ def test_plot_manager_initialization():
     assert hasattr(plot_manager, 'colors')
     assert len(plot_manager.colors) == 8
 
+def test_plot_similarity_heatmap_labels():
+    """Testa o heatmap de uma matriz entre vídeos com labels."""
+    import matplotlib.pyplot as plt
+    plot_manager = PlotManager()
+    matrix = np.array([[1.0, 0.7, np.nan], [0.7, 1.0, 0.9], [np.nan, 0.9, 1.0]])
+    plot_manager.plot_similarity_heatmap(matrix, labels=["data/a.mp4", "data/b.mp4", "c.mp4"])
+    ax = plt.gca()
+    assert [tick.get_text() for tick in ax.get_xticklabels()] == ["a.mp4", "b.mp4", "c.mp4"]
+    assert ax.get_xlabel() == 'Vídeo'
+    plot_manager.close_all()
+
 def test_visualizer_cli_initialization(sample_report_data):
     """Testa a inicialização do visualizador CLI."""
     cli = VisualizerCLI(sample_report_data)
@@ -117,3 +128,39 @@ def test_visualizer_cli_commands(sample_report_data, monkeypatch):
     # Teste navegação para frame específico
     cli._navigate_to_frame()
     assert cli.current_frame == 0  # Mantém o frame atual se inválido 
+
+def test_lazy_frame_loading(sample_report_data):
+    """Testa o carregamento dos frames sob demanda, em janelas."""
+    calls = []
+
+    def loader(start, stop):
+        calls.append((start, stop))
+        return [{'metrics': {'index': i}} for i in range(start, stop)]
+
+    visualizer = DummyVisualizer({}, frame_loader=loader, total_frames=10, window_size=4)
+    assert visualizer.total_frames == 10
+    assert visualizer.get_frame_data(5)['metrics']['index'] == 5
+    assert visualizer.get_frame_data(6)['metrics']['index'] == 6
+    assert visualizer.get_frame_data(9)['metrics']['index'] == 9
+    assert calls == [(4, 8), (8, 10)]
+
+    with pytest.raises(IndexError):
+        visualizer.get_frame_data(10)
+    with pytest.raises(ValueError):
+        DummyVisualizer({}, frame_loader=loader)
+
+def test_visualizer_cli_lazy_navigation(sample_report_data, monkeypatch):
+    """Testa a navegação do visualizador CLI com frames carregados sob demanda."""
+    loaded = []
+
+    def loader(start, stop):
+        loaded.extend(range(start, stop))
+        return [sample_report_data['frames'][i % 2] for i in range(start, stop)]
+
+    cli = VisualizerCLI({}, frame_loader=loader, total_frames=1000)
+    monkeypatch.setattr(cli.plot_manager, "show", lambda: None)
+    monkeypatch.setattr(Prompt, "ask", lambda *args, **kwargs: "500")
+    cli._navigate_to_frame()
+    cli._next_frame()
+    assert cli.current_frame == 501
+    assert min(loaded) >= 448 and max(loaded) < 512
@@ -1,21 +1,46 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from collections import OrderedDict
+from typing import Callable, Dict, Any, List, Optional
 import matplotlib.pyplot as plt
 import numpy as np
 
+# Número de frames carregados por vez quando os frames são lidos sob demanda
+FRAME_WINDOW_SIZE = 64
+
+# Número de janelas de frames mantidas em memória
+MAX_CACHED_WINDOWS = 4
+
 class BaseVisualizer(ABC):
     """Classe base abstrata para visualização de resultados de análise de dança."""
     
-    def __init__(self, report_data: Dict[str, Any]):
+    def __init__(self, report_data: Dict[str, Any],
+                 frame_loader: Optional[Callable[[int, int], List[Dict[str, Any]]]] = None,
+                 total_frames: Optional[int] = None,
+                 window_size: int = FRAME_WINDOW_SIZE):
         """
         Inicializa o visualizador com os dados do relatório.
         
+        Os frames podem estar em report_data['frames'] ou ser carregados sob
+        demanda por frame_loader, em janelas de window_size frames (ex:
+        PoseDataLoader.frame_loader), sem manter o vídeo inteiro em memória.
+        
         Args:
             report_data: Dicionário contendo os dados do relatório de análise
+            frame_loader: Função (start, stop) -> frames do intervalo [start, stop) (opcional)
+            total_frames: Número de frames disponíveis em frame_loader
+            window_size: Número de frames carregados por chamada de frame_loader
         """
+        if frame_loader is not None and total_frames is None:
+            raise ValueError("total_frames é obrigatório com frame_loader")
         self.report_data = report_data
         self.current_frame = 0
-        self.total_frames = len(report_data.get('frames', []))
+        self.frame_loader = frame_loader
+        self.window_size = window_size
+        self._windows: "OrderedDict[int, List[Dict[str, Any]]]" = OrderedDict()
+        if frame_loader is not None:
+            self.total_frames = total_frames
+        else:
+            self.total_frames = len(report_data.get('frames', []))
         
     @abstractmethod
     def plot_similarity(self) -> None:
@@ -52,9 +77,22 @@ class BaseVisualizer(ABC):
         Returns:
             Dicionário com os dados do frame
         """
-        if 0 <= frame_idx < self.total_frames:
+        if not 0 <= frame_idx < self.total_frames:
+            raise IndexError(f"Frame {frame_idx} fora dos limites (0-{self.total_frames-1})")
+        if self.frame_loader is None:
             return self.report_data['frames'][frame_idx]
-        raise IndexError(f"Frame {frame_idx} fora dos limites (0-{self.total_frames-1})")
+        
+        # Carrega a janela que contém o frame, mantendo as mais recentes em memória
+        start = frame_idx - frame_idx % self.window_size
+        window = self._windows.get(start)
+        if window is None:
+            window = self.frame_loader(start, min(start + self.window_size, self.total_frames))
+            self._windows[start] = window
+            while len(self._windows) > MAX_CACHED_WINDOWS:
+                self._windows.popitem(last=False)
+        else:
+            self._windows.move_to_end(start)
+        return window[frame_idx - start]
     
     def get_similarity_data(self) -> Dict[str, Any]:
         """
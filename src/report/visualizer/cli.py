@@ -2,7 +2,7 @@ from rich.console import Console
 from rich.prompt import Prompt
 from rich.table import Table
 from rich.panel import Panel
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional
 import sys
 from .base import BaseVisualizer
 from .plots import PlotManager
@@ -10,14 +10,18 @@ from .plots import PlotManager
 class VisualizerCLI(BaseVisualizer):
     """Interface CLI para visualização interativa dos resultados de análise."""
     
-    def __init__(self, report_data: Dict[str, Any]):
+    def __init__(self, report_data: Dict[str, Any],
+                 frame_loader: Optional[Callable[[int, int], List[Dict[str, Any]]]] = None,
+                 total_frames: Optional[int] = None):
         """
         Inicializa o visualizador CLI.
         
         Args:
             report_data: Dicionário contendo os dados do relatório
+            frame_loader: Função que carrega os frames sob demanda (ver BaseVisualizer)
+            total_frames: Número de frames disponíveis em frame_loader
         """
-        super().__init__(report_data)
+        super().__init__(report_data, frame_loader=frame_loader, total_frames=total_frames)
         self.console = Console()
         self.plot_manager = PlotManager()
         self.running = True
@@ -88,7 +92,8 @@ class VisualizerCLI(BaseVisualizer):
         similarity_data = self.get_similarity_data()
         
         if 'matrix' in similarity_data:
-            self.plot_manager.plot_similarity_heatmap(similarity_data['matrix'])
+            self.plot_manager.plot_similarity_heatmap(similarity_data['matrix'],
+                                                      labels=similarity_data.get('labels'))
         if 'scores' in similarity_data:
             self.plot_manager.plot_similarity_line(similarity_data['scores'])
             
@@ -1,6 +1,7 @@
+import os
 import matplotlib.pyplot as plt
 import numpy as np
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 import seaborn as sns
 
 class PlotManager:
@@ -12,20 +13,31 @@ class PlotManager:
         self.colors = plt.cm.Set2(np.linspace(0, 1, 8))
         
     def plot_similarity_heatmap(self, similarity_matrix: np.ndarray, 
-                              title: str = "Matriz de Similaridade") -> None:
+                              title: str = "Matriz de Similaridade",
+                              labels: Optional[List[str]] = None) -> None:
         """
         Plota um heatmap da matriz de similaridade.
         
         Args:
-            similarity_matrix: Matriz numpy com valores de similaridade
+            similarity_matrix: Matriz numpy com valores de similaridade (NaN fica em branco)
             title: Título do gráfico
+            labels: Nome de cada linha/coluna, para matrizes entre vídeos
+                (ex.: SimilarityMatrix.labels); sem labels, os eixos são frames
         """
         plt.figure(figsize=(10, 8))
         plt.imshow(similarity_matrix, cmap='viridis', aspect='auto')
         plt.colorbar(label='Similaridade')
         plt.title(title)
-        plt.xlabel('Frame Referência')
-        plt.ylabel('Frame Comparação')
+        if labels is not None:
+            names = [os.path.basename(label) for label in labels]
+            positions = np.arange(len(names))
+            plt.xticks(positions, names, rotation=90)
+            plt.yticks(positions, names)
+            plt.xlabel('Vídeo')
+            plt.ylabel('Vídeo')
+        else:
+            plt.xlabel('Frame Referência')
+            plt.ylabel('Frame Comparação')
         plt.tight_layout()
         
     def plot_similarity_line(self, similarity_scores: List[float], 
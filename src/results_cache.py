@@ -1,19 +1,69 @@
 import os
 import json
+import hashlib
 import logging
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 from .comparison_results import ComparisonResults
+from .landmark_comparison import LandmarkComparison
+from .memory_cache import MemoryCache
 
 logger = logging.getLogger(__name__)
 
+def params_digest(params: Optional[Dict[str, Any]]) -> str:
+    """
+    Gera um digest estável (independente do processo) de um dicionário de parâmetros.
+
+    Args:
+        params: Parâmetros serializáveis em JSON (ex: ComparisonParams.to_dict())
+
+    Returns:
+        str: SHA-256 hexadecimal da serialização canônica dos parâmetros
+    """
+    canonical = json.dumps(params or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def comparison_key(video1_hash: str, video2_hash: str,
+                   params: Optional[Dict[str, Any]] = None,
+                   comparator_version: str = "") -> str:
+    """
+    Gera a chave endereçada por conteúdo de uma comparação.
+
+    A chave depende apenas do conteúdo dos vídeos (hashes SHA-256), dos
+    parâmetros de comparação e da versão do comparador, e é a mesma em
+    qualquer processo ou máquina.
+
+    Args:
+        video1_hash: Hash do primeiro vídeo
+        video2_hash: Hash do segundo vídeo
+        params: Parâmetros que afetam o resultado da comparação
+        comparator_version: Versão do algoritmo de comparação
+
+    Returns:
+        str: SHA-256 hexadecimal da combinação
+    """
+    material = "\n".join([video1_hash, video2_hash, params_digest(params), comparator_version])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
 class ResultsCache:
     """
     Sistema de cache para armazenar e recuperar resultados de comparação.
     """
-    def __init__(self, cache_dir: str = "cache", max_age_hours: int = 24):
-        self.cache_dir = cache_dir
-        self.max_age = timedelta(hours=max_age_hours)
+    def __init__(self, cache_dir: str = "cache", max_age_hours: Optional[int] = 24,
+                 memory_cache: Optional[MemoryCache] = None):
+        """
+        Inicializa o cache.
+
+        Args:
+            cache_dir: Diretório dos arquivos de cache
+            max_age_hours: Idade máxima das entradas em horas (None: nunca expiram)
+            memory_cache: Cache em memória na frente dos arquivos (opcional)
+        """
+        self.cache_dir = str(cache_dir)
+        self.max_age = timedelta(hours=max_age_hours) if max_age_hours is not None else None
+        self.memory_cache = memory_cache
+        self.hits = 0
+        self.misses = 0
         self._ensure_cache_dir()
 
     def _ensure_cache_dir(self):
@@ -26,10 +76,16 @@ class ResultsCache:
         """Retorna o caminho do arquivo de cache para uma chave específica."""
         return os.path.join(self.cache_dir, f"{key}.json")
 
+    def _get_landmarks_path(self, key: str) -> str:
+        """Retorna o caminho do arquivo com os arrays por landmark de uma chave."""
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
     def _is_cache_valid(self, cache_path: str) -> bool:
         """Verifica se o cache ainda é válido baseado na idade do arquivo."""
         if not os.path.exists(cache_path):
             return False
+        if self.max_age is None:
+            return True
 
         file_time = datetime.fromtimestamp(os.path.getmtime(cache_path))
         age = datetime.now() - file_time
@@ -39,8 +95,26 @@ class ResultsCache:
         """
         Recupera resultados do cache se existirem e forem válidos.
         """
+        if self.memory_cache is not None:
+            # A entrada em memória só vale enquanto o arquivo correspondente for válido
+            results = self.memory_cache.get(key)
+            if results is not None and self._is_cache_valid(self._get_cache_path(key)):
+                self.hits += 1
+                return results
+
+        results = self._load(key)
+        if results is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            if self.memory_cache is not None:
+                self.memory_cache[key] = results
+        return results
+
+    def _load(self, key: str) -> Optional[ComparisonResults]:
+        """Lê e valida uma entrada do cache."""
         cache_path = self._get_cache_path(key)
-        
+
         if not self._is_cache_valid(cache_path):
             logger.debug(f"Cache inválido ou inexistente para chave: {key}")
             return None
@@ -59,35 +133,170 @@ class ResultsCache:
             logger.error(f"Erro ao recuperar cache para chave {key}: {str(e)}")
             return None
 
-    def set(self, key: str, results: ComparisonResults) -> bool:
+    def set(self, key: str, results: ComparisonResults,
+            metadata: Optional[Dict[str, Any]] = None) -> bool:
         """
         Armazena resultados no cache.
+
+        Args:
+            key: Chave da entrada
+            results: Resultados da comparação
+            metadata: Metadados adicionais gravados junto com os resultados (opcional)
         """
         if not results.validate():
             logger.error("Tentativa de armazenar resultados inválidos no cache")
             return False
 
+        if self.memory_cache is not None:
+            self.memory_cache.pop(key, None)
+
         cache_path = self._get_cache_path(key)
+        temp_path = f"{cache_path}.tmp"
         try:
-            with open(cache_path, 'w') as f:
-                json.dump(results.to_dict(), f)
+            data = results.to_dict()
+            if metadata:
+                data["metadata"] = {**(data.get("metadata") or {}), **metadata}
+            # Grava em arquivo temporário para não deixar entradas corrompidas
+            with open(temp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(temp_path, cache_path)
             logger.info(f"Resultados armazenados no cache para chave: {key}")
             return True
         except Exception as e:
             logger.error(f"Erro ao armazenar cache para chave {key}: {str(e)}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+
+    def get_comparison(self, video1_hash: str, video2_hash: str,
+                       params: Optional[Dict[str, Any]] = None,
+                       comparator_version: str = "") -> Optional[ComparisonResults]:
+        """
+        Recupera os resultados de uma comparação pelo conteúdo dos vídeos e parâmetros.
+
+        Args:
+            video1_hash: Hash do primeiro vídeo
+            video2_hash: Hash do segundo vídeo
+            params: Parâmetros que afetam o resultado da comparação
+            comparator_version: Versão do algoritmo de comparação
+
+        Returns:
+            ComparisonResults ou None se não houver entrada válida
+        """
+        return self.get(comparison_key(video1_hash, video2_hash, params, comparator_version))
+
+    def set_comparison(self, video1_hash: str, video2_hash: str, results: ComparisonResults,
+                       params: Optional[Dict[str, Any]] = None,
+                       comparator_version: str = "",
+                       metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Armazena os resultados de uma comparação pelo conteúdo dos vídeos e parâmetros.
+
+        Args:
+            video1_hash: Hash do primeiro vídeo
+            video2_hash: Hash do segundo vídeo
+            results: Resultados da comparação
+            params: Parâmetros que afetam o resultado da comparação
+            comparator_version: Versão do algoritmo de comparação
+            metadata: Metadados adicionais (opcional)
+
+        Returns:
+            bool: True se os resultados foram armazenados
+        """
+        metadata = {
+            "video1_hash": video1_hash,
+            "video2_hash": video2_hash,
+            "params_digest": params_digest(params),
+            "comparator_version": comparator_version,
+            **(metadata or {})
+        }
+        key = comparison_key(video1_hash, video2_hash, params, comparator_version)
+        return self.set(key, results, metadata=metadata)
+
+    def get_landmarks(self, key: str) -> Optional[LandmarkComparison]:
+        """
+        Recupera os arrays por landmark de uma comparação (ver ComparadorMovimento.rescore).
+
+        Args:
+            key: Chave da entrada
+
+        Returns:
+            LandmarkComparison ou None se não houver entrada válida
+        """
+        landmarks_path = self._get_landmarks_path(key)
+        if not self._is_cache_valid(landmarks_path):
+            self.misses += 1
+            return None
+
+        memory_key = ("landmarks", key)
+        if self.memory_cache is not None:
+            comparison = self.memory_cache.get(memory_key)
+            if comparison is not None:
+                self.hits += 1
+                return comparison
+
+        comparison = LandmarkComparison.load(landmarks_path)
+        if comparison is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.memory_cache is not None:
+            self.memory_cache[memory_key] = comparison
+        logger.info(f"Comparação por landmark recuperada do cache para chave: {key}")
+        return comparison
+
+    def set_landmarks(self, key: str, comparison: LandmarkComparison) -> bool:
+        """
+        Armazena os arrays por landmark de uma comparação.
+
+        Args:
+            key: Chave da entrada
+            comparison: Arrays da comparação
+
+        Returns:
+            bool: True se os arrays foram armazenados
+        """
+        if self.memory_cache is not None:
+            self.memory_cache.pop(("landmarks", key), None)
+        try:
+            comparison.save(self._get_landmarks_path(key))
+            logger.info(f"Comparação por landmark armazenada no cache para chave: {key}")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao armazenar comparação por landmark para chave {key}: {str(e)}")
             return False
 
+    def stats(self) -> Dict[str, float]:
+        """
+        Retorna as estatísticas de uso do cache.
+
+        Returns:
+            Dicionário com hits, misses e hit_rate
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
     def clear(self, key: Optional[str] = None):
         """
         Limpa o cache para uma chave específica ou todo o cache.
         """
+        if self.memory_cache is not None:
+            if key:
+                self.memory_cache.pop(key, None)
+                self.memory_cache.pop(("landmarks", key), None)
+            else:
+                self.memory_cache.clear()
         if key:
-            cache_path = self._get_cache_path(key)
-            if os.path.exists(cache_path):
-                os.remove(cache_path)
-                logger.info(f"Cache limpo para chave: {key}")
+            for cache_path in (self._get_cache_path(key), self._get_landmarks_path(key)):
+                if os.path.exists(cache_path):
+                    os.remove(cache_path)
+                    logger.info(f"Cache limpo para chave: {key}")
         else:
             for file in os.listdir(self.cache_dir):
-                if file.endswith('.json'):
+                if file.endswith(('.json', '.npz')):
                     os.remove(os.path.join(self.cache_dir, file))
-            logger.info("Todo o cache foi limpo") 
+            logger.info("Todo o cache foi limpo")
@@ -0,0 +1,260 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .comparador_movimento import ComparadorMovimento, landmark_weight_vector
+from .comparison_params import DistanceMetric
+from .pose_storage import PoseStorage
+from .pose_track import PoseTrack
+
+# Configuração do logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Número de frames comparados por bloco (o corte antecipado é avaliado a cada bloco)
+FRAME_BLOCK_SIZE = 512
+
+@dataclass
+class SimilarityMatrix:
+    """
+    Matriz de similaridade entre todos os pares de vídeos de um corpus.
+
+    matrix[i, j] é o score global da comparação de labels[i] com labels[j]
+    (o mesmo de ComparadorMovimento.compare_tracks). Pares descartados pelo
+    corte antecipado ficam com NaN em matrix e True em pruned.
+    """
+    labels: List[str]
+    matrix: np.ndarray  # (N, N) float64
+    pruned: np.ndarray  # (N, N) bool
+    threshold: Optional[float] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def score(self, label1: str, label2: str) -> float:
+        """Retorna o score de um par de vídeos (NaN se o par foi descartado)."""
+        return float(self.matrix[self.labels.index(label1), self.labels.index(label2)])
+
+    def pairs_above(self, threshold: float) -> List[Tuple[str, str, float]]:
+        """
+        Lista os pares distintos com score maior ou igual ao limiar (ex.: duplicatas).
+
+        Args:
+            threshold: Score mínimo
+
+        Returns:
+            Lista de tuplas (label1, label2, score) em ordem decrescente de score
+        """
+        rows, cols = np.nonzero(np.triu(np.nan_to_num(self.matrix, nan=-np.inf) >= threshold, k=1))
+        pairs = [(self.labels[i], self.labels[j], float(self.matrix[i, j]))
+                 for i, j in zip(rows.tolist(), cols.tolist())]
+        return sorted(pairs, key=lambda pair: -pair[2])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte a matriz para um dicionário serializável em JSON (NaN vira None)."""
+        return {
+            "labels": list(self.labels),
+            "matrix": [[None if np.isnan(value) else value for value in row]
+                       for row in self.matrix.tolist()],
+            "threshold": self.threshold,
+            "metadata": self.metadata
+        }
+
+@dataclass
+class _PreparedTrack:
+    """Arrays de um track prontos para o kernel de comparação."""
+    coords: np.ndarray  # (T, L, 3) float64, 0 onde ausente
+    visible: np.ndarray  # (T, L) bool
+    any_visible: np.ndarray  # (T,) bool
+
+def _prepare_track(track: PoseTrack, num_landmarks: int, min_visibility: float) -> _PreparedTrack:
+    """Converte um track denso nos arrays usados pelo kernel (calculado uma vez por vídeo)."""
+    data = np.asarray(track.data, dtype=np.float64)
+    coords = np.zeros((len(data), num_landmarks, 3), dtype=np.float64)
+    visible = np.zeros((len(data), num_landmarks), dtype=bool)
+    count = min(num_landmarks, data.shape[1])
+    # NaN (ausente) nunca é visível; as coordenadas ausentes viram 0 para dispensar np.where no kernel
+    visible[:, :count] = data[:, :count, 3] >= min_visibility
+    coords[:, :count] = np.nan_to_num(data[:, :count, :3])
+    return _PreparedTrack(coords, visible, visible.any(axis=1))
+
+def _block_scores(track1: _PreparedTrack, track2: _PreparedTrack, start: int, end: int,
+                  weights: np.ndarray) -> Tuple[float, int]:
+    """
+    Compara os frames de mesmo índice [start, end) de dois tracks.
+
+    Reproduz o score por frame de ComparadorMovimento.rescore (_landmark_arrays +
+    _weighted_scores): pares em que algum frame não tem landmarks visíveis são
+    descartados, e o score de cada par é a média ponderada de 1 / (1 + d) dos
+    landmarks visíveis nos dois frames.
+
+    Returns:
+        Tupla (soma dos scores, número de pares mantidos)
+    """
+    keep = track1.any_visible[start:end] & track2.any_visible[start:end]
+    if not keep.any():
+        return 0.0, 0
+    rows = np.flatnonzero(keep) + start
+    visible = track1.visible[rows] & track2.visible[rows]
+    distances = np.sqrt(np.sum((track1.coords[rows] - track2.coords[rows]) ** 2, axis=2))
+    frame_weights = visible * weights
+    total_weight = frame_weights.sum(axis=1)
+    weighted_sum = (frame_weights / (1.0 + distances)).sum(axis=1)
+    scores = np.divide(weighted_sum, total_weight, out=np.zeros_like(total_weight),
+                       where=total_weight > 0)
+    return float(scores.sum()), len(rows)
+
+def _pair_score(track1: _PreparedTrack, track2: _PreparedTrack, weights: np.ndarray,
+                threshold: Optional[float], block_size: int) -> Optional[float]:
+    """
+    Calcula o score global de um par, interrompendo quando o limiar não pode mais ser atingido.
+
+    Após cada bloco, o melhor score final possível supõe que todos os frames
+    restantes são mantidos com score 1; se mesmo assim ele fica abaixo do
+    limiar, o par é descartado.
+
+    Returns:
+        Score global, ou None se o par foi descartado pelo corte antecipado
+    """
+    n_frames = min(len(track1.coords), len(track2.coords))
+    total, kept = 0.0, 0
+    for start in range(0, n_frames, block_size):
+        end = min(start + block_size, n_frames)
+        block_total, block_kept = _block_scores(track1, track2, start, end, weights)
+        total += block_total
+        kept += block_kept
+        remaining = n_frames - end
+        if threshold is not None and remaining and kept + remaining > 0:
+            if (total + remaining) / (kept + remaining) < threshold:
+                return None
+    score = total / kept if kept else 0.0
+    if threshold is not None and score < threshold:
+        return None
+    return score
+
+def load_tracks(storage: PoseStorage, video_paths: Sequence[str]) -> Dict[str, PoseTrack]:
+    """
+    Carrega os tracks densos de vídeos armazenados (uma leitura por vídeo).
+
+    Args:
+        storage: Armazenamento dos dados de pose
+        video_paths: Caminhos dos vídeos
+
+    Returns:
+        Dicionário caminho -> PoseTrack denso; vídeos sem dados são ignorados
+    """
+    tracks = {}
+    for video_path in video_paths:
+        track = storage.load_pose_track(video_path)
+        if track is None:
+            logger.warning(f"Vídeo sem dados de pose ignorado: {video_path}")
+            continue
+        tracks[video_path] = track.to_dense()
+    return tracks
+
+def compute_similarity_matrix(tracks: Dict[str, PoseTrack],
+                              comparador: Optional[ComparadorMovimento] = None,
+                              threshold: Optional[float] = None,
+                              landmark_weights: Optional[Dict[str, float]] = None,
+                              workers: int = 1,
+                              block_size: int = FRAME_BLOCK_SIZE) -> SimilarityMatrix:
+    """
+    Calcula a matriz de similaridade entre todos os pares de um corpus de vídeos.
+
+    Cada track é convertido uma única vez em arrays (coordenadas, visibilidade)
+    e os pares são comparados com um kernel vetorizado em blocos de frames.
+    Com a métrica euclidiana o score é simétrico e apenas o triângulo superior
+    é calculado. Com DTW e sincronização temporal, cada par ordenado passa pelo
+    alinhamento de ComparadorMovimento.compare_tracks (sem corte antecipado).
+    Os pares são distribuídos entre threads (as operações do NumPy liberam o GIL).
+
+    Args:
+        tracks: Dicionário label -> PoseTrack denso (uma linha por frame)
+        comparador: Comparador cujos parâmetros definem o score (padrão: ComparadorMovimento())
+        threshold: Pares com score abaixo do limiar são descartados (NaN) assim
+            que o limiar se torna inatingível (None: sem corte)
+        landmark_weights: Pesos dos landmarks (id ou nome do landmark; padrão: 1.0)
+        workers: Número de threads
+        block_size: Número de frames por bloco do kernel
+
+    Returns:
+        SimilarityMatrix com os scores de todos os pares
+    """
+    if workers < 1:
+        raise ValueError("workers deve ser maior ou igual a 1")
+    if block_size < 1:
+        raise ValueError("block_size deve ser maior ou igual a 1")
+    if threshold is not None and not 0 <= threshold <= 1:
+        raise ValueError("threshold deve estar entre 0 e 1")
+    comparador = comparador or ComparadorMovimento()
+    landmark_weights = landmark_weights or {}
+
+    labels = list(tracks)
+    n_videos = len(labels)
+    matrix = np.full((n_videos, n_videos), np.nan, dtype=np.float64)
+    pruned = np.zeros((n_videos, n_videos), dtype=bool)
+    params = comparador.comparison_params
+    symmetric = not (params.metric == DistanceMetric.DTW and params.temporal_sync)
+
+    if symmetric:
+        num_landmarks = max((track.num_landmarks for track in tracks.values()), default=0)
+        weights = landmark_weight_vector(landmark_weights, num_landmarks)
+        prepared = [_prepare_track(tracks[label], num_landmarks, comparador.min_visibility)
+                    for label in labels]
+        pairs = [(i, j) for i in range(n_videos) for j in range(i + 1, n_videos)]
+
+        def score(pair: Tuple[int, int]) -> Optional[float]:
+            return _pair_score(prepared[pair[0]], prepared[pair[1]], weights, threshold, block_size)
+    else:
+        # O alinhamento DTW não é simétrico: calcula os dois sentidos de cada par
+        pairs = [(i, j) for i in range(n_videos) for j in range(n_videos) if i != j]
+
+        def score(pair: Tuple[int, int]) -> Optional[float]:
+            results = comparador.compare_tracks(
+                tracks[labels[pair[0]]], tracks[labels[pair[1]]],
+                video1_resolution=(0, 0), video2_resolution=(0, 0),
+                video1_landmark_weights=landmark_weights or None,
+                video2_landmark_weights=landmark_weights or None
+            )
+            if threshold is not None and results.global_score < threshold:
+                return None
+            return results.global_score
+
+    if workers == 1:
+        scores = [score(pair) for pair in pairs]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            scores = list(executor.map(score, pairs))
+
+    for (i, j), value in zip(pairs, scores):
+        cells = [(i, j), (j, i)] if symmetric else [(i, j)]
+        for row, col in cells:
+            if value is None:
+                pruned[row, col] = True
+            else:
+                matrix[row, col] = value
+
+    # Um vídeo comparado consigo mesmo tem score 1 em todo frame com landmarks visíveis
+    for i, label in enumerate(labels):
+        data = np.asarray(tracks[label].data)
+        matrix[i, i] = 1.0 if np.any(data[..., 3] >= comparador.min_visibility) else 0.0
+
+    logger.info(f"Matriz de similaridade calculada: {n_videos} vídeos, {len(pairs)} pares, "
+                f"{sum(value is None for value in scores)} descartados")
+    return SimilarityMatrix(
+        labels=labels,
+        matrix=matrix,
+        pruned=pruned,
+        threshold=threshold,
+        metadata={
+            "metric": params.metric.value,
+            "comparison_version": comparador.version
+        }
+    )
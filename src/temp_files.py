@@ -0,0 +1,138 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+# Configuração do logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Tempo sem uso após o qual um arquivo temporário é removido (1 hora)
+DEFAULT_MAX_IDLE_SECONDS = 60 * 60
+
+@dataclass
+class _TempFile:
+    """Estado de um arquivo temporário registrado."""
+    last_used: float
+    released: bool = False
+
+class TempFileRegistry:
+    """
+    Registro dos arquivos temporários criados para os uploads do app.
+
+    Os arquivos são removidos por sweep() quando foram liberados (ex: o
+    upload foi substituído) ou quando ficaram mais de max_idle_seconds sem
+    uso, exceto os que ainda estão em uso (ex: extração em andamento). Os
+    arquivos restantes são removidos por cleanup() ao encerrar o processo.
+    """
+
+    def __init__(self, max_idle_seconds: float = DEFAULT_MAX_IDLE_SECONDS,
+                 clock: Callable[[], float] = time.time):
+        """
+        Inicializa o registro.
+
+        Args:
+            max_idle_seconds: Tempo sem uso após o qual um arquivo é removido
+            clock: Relógio usado para o tempo sem uso (em segundos)
+        """
+        self.max_idle_seconds = max_idle_seconds
+        self._clock = clock
+        self._files: Dict[str, _TempFile] = {}
+        self._lock = threading.Lock()
+
+    def create(self, data: bytes, suffix: str = "") -> str:
+        """
+        Grava os dados em um novo arquivo temporário e o registra.
+
+        Args:
+            data: Conteúdo do arquivo
+            suffix: Sufixo do nome do arquivo (ex: ".mp4")
+
+        Returns:
+            str: Caminho do arquivo
+        """
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as f:
+            f.write(data)
+        with self._lock:
+            self._files[f.name] = _TempFile(last_used=self._clock())
+        return f.name
+
+    def touch(self, path: str) -> bool:
+        """
+        Registra o uso de um arquivo.
+
+        Args:
+            path: Caminho do arquivo
+
+        Returns:
+            bool: False se o arquivo não está registrado ou já foi removido
+        """
+        with self._lock:
+            entry = self._files.get(path)
+            if entry is None or entry.released or not os.path.exists(path):
+                return False
+            entry.last_used = self._clock()
+            return True
+
+    def release(self, path: str) -> None:
+        """Marca um arquivo para remoção no próximo sweep()."""
+        with self._lock:
+            if path in self._files:
+                self._files[path].released = True
+
+    def sweep(self, in_use: Optional[Callable[[str], bool]] = None) -> int:
+        """
+        Remove os arquivos liberados ou sem uso recente.
+
+        Args:
+            in_use: Indica se um arquivo ainda é necessário (não é removido mesmo liberado)
+
+        Returns:
+            int: Número de arquivos removidos
+        """
+        with self._lock:
+            candidates = [path for path in self._files if self._expired(path)]
+        removed = 0
+        for path in candidates:
+            # in_use pode consultar o banco: é chamado fora do lock
+            if in_use is not None and in_use(path):
+                continue
+            with self._lock:
+                # Um touch() depois da seleção mantém o arquivo
+                if path not in self._files or not self._expired(path):
+                    continue
+                del self._files[path]
+            removed += self._remove(path)
+        return removed
+
+    def _expired(self, path: str) -> bool:
+        entry = self._files[path]
+        return entry.released or self._clock() - entry.last_used > self.max_idle_seconds
+
+    def cleanup(self) -> int:
+        """Remove todos os arquivos registrados (ex: ao encerrar o processo)."""
+        with self._lock:
+            paths = list(self._files)
+            self._files.clear()
+        return sum(self._remove(path) for path in paths)
+
+    @staticmethod
+    def _remove(path: str) -> int:
+        try:
+            os.unlink(path)
+            return 1
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            logger.warning(f"Erro ao remover arquivo temporário {path}: {str(e)}")
+            return 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._files)
@@ -0,0 +1,328 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .file_lock import file_lock
+
+# Configuração do logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Modos de fingerprint: SHA-256 do arquivo inteiro ou de blocos amostrados
+FINGERPRINT_MODES = ("full", "sampled")
+
+# Tamanho do buffer de leitura do hash completo (8 MiB)
+HASH_BUFFER_SIZE = 8 * 1024 * 1024
+
+# Tamanho e número de blocos lidos no modo amostrado
+SAMPLE_BLOCK_SIZE = 1024 * 1024
+SAMPLE_BLOCKS = 16
+
+# Número máximo de entradas do índice de fingerprints (as mais antigas são descartadas)
+MAX_INDEX_ENTRIES = 10_000
+
+def hash_file(path: str, buffer_size: int = HASH_BUFFER_SIZE) -> str:
+    """
+    Calcula o SHA-256 de um arquivo inteiro.
+
+    A leitura usa um único buffer grande reaproveitado (readinto), sem alocar
+    um novo objeto bytes por bloco.
+
+    Args:
+        path: Caminho do arquivo
+        buffer_size: Tamanho do buffer de leitura em bytes
+
+    Returns:
+        str: SHA-256 hexadecimal do conteúdo
+    """
+    file_hash = hashlib.sha256()
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            file_hash.update(view[:read])
+    return file_hash.hexdigest()
+
+def sampled_fingerprint(path: str, block_size: int = SAMPLE_BLOCK_SIZE,
+                        num_blocks: int = SAMPLE_BLOCKS) -> str:
+    """
+    Calcula um fingerprint a partir do tamanho e de blocos amostrados do arquivo.
+
+    São lidos o bloco inicial, o bloco final e blocos igualmente espaçados no
+    meio do arquivo. Arquivos pequenos (até num_blocks blocos) são lidos por
+    inteiro e o resultado é igual ao de hash_file.
+
+    Args:
+        path: Caminho do arquivo
+        block_size: Tamanho de cada bloco em bytes
+        num_blocks: Número total de blocos amostrados (mínimo 2)
+
+    Returns:
+        str: SHA-256 hexadecimal do tamanho e dos blocos amostrados
+    """
+    size = os.path.getsize(path)
+    num_blocks = max(num_blocks, 2)
+    if size <= block_size * num_blocks:
+        return hash_file(path)
+
+    # Cabeça, cauda e blocos intermediários em passo constante
+    stride = (size - block_size) // (num_blocks - 1)
+    offsets = [i * stride for i in range(num_blocks - 1)] + [size - block_size]
+
+    file_hash = hashlib.sha256()
+    file_hash.update(f"sampled:{size}:{block_size}:{num_blocks}".encode("ascii"))
+    with open(path, "rb") as f:
+        for offset in offsets:
+            f.seek(offset)
+            file_hash.update(f.read(block_size))
+    return file_hash.hexdigest()
+
+class FingerprintIndex:
+    """
+    Índice persistente (path, size, mtime, inode) -> hash.
+
+    As entradas ficam em memória e são gravadas em um arquivo JSON. Uma
+    entrada só é usada se o tamanho, o mtime e o inode do arquivo forem os
+    mesmos do momento em que o hash foi calculado. A cada registro, as
+    entradas de arquivos que não existem mais (ex: uploads temporários) são
+    removidas e o índice é limitado a max_entries entradas.
+
+    Várias instâncias (ou processos) podem usar o mesmo arquivo: o índice é
+    relido quando o arquivo muda em disco, e cada gravação relê e mescla as
+    entradas dos demais sob um lock de arquivo antes de substituí-lo.
+    """
+
+    def __init__(self, index_path: Optional[str] = None, max_entries: int = MAX_INDEX_ENTRIES):
+        """
+        Inicializa o índice.
+
+        Args:
+            index_path: Arquivo JSON do índice (None mantém o índice apenas em memória)
+            max_entries: Número máximo de entradas mantidas (as registradas há mais tempo são descartadas)
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries deve ser maior ou igual a 1")
+        self.index_path = Path(index_path) if index_path is not None else None
+        self.max_entries = max_entries
+        self._entries: Optional[Dict[str, Dict]] = None
+        # (mtime_ns, tamanho) do arquivo na última leitura ou gravação
+        self._disk_state: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    def _file_state(self) -> Optional[Tuple[int, int]]:
+        """Retorna (mtime_ns, tamanho) do arquivo do índice, ou None se ele não existe."""
+        try:
+            stat = os.stat(self.index_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self) -> Dict[str, Dict]:
+        """
+        Carrega o índice do disco no primeiro acesso e sempre que o arquivo mudar.
+
+        As entradas gravadas por outras instâncias são mescladas com as desta
+        (em caso de conflito, prevalece a do disco).
+        """
+        if self._entries is None:
+            self._entries = {}
+        if self.index_path is None:
+            return self._entries
+        state = self._file_state()
+        if state is not None and state != self._disk_state:
+            try:
+                with open(self.index_path, "r") as f:
+                    self._entries = {**self._entries, **json.load(f)}
+            except Exception as e:
+                logger.warning(f"Índice de fingerprints inválido, ignorando: {str(e)}")
+            self._disk_state = state
+        return self._entries
+
+    @staticmethod
+    def _entry_key(path: str, mode: str) -> str:
+        return f"{mode}:{os.path.abspath(path)}"
+
+    @staticmethod
+    def _entry_path(key: str) -> str:
+        return key.split(":", 1)[1]
+
+    @staticmethod
+    def _signature(stat: os.stat_result) -> Dict[str, int]:
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "inode": stat.st_ino}
+
+    def get(self, path: str, stat: os.stat_result, mode: str) -> Optional[str]:
+        """
+        Retorna o hash registrado para o arquivo, se ele não mudou.
+
+        Args:
+            path: Caminho do arquivo
+            stat: Resultado de os.stat do arquivo
+            mode: Modo de fingerprint
+
+        Returns:
+            str: Hash registrado ou None se ausente ou desatualizado
+        """
+        with self._lock:
+            entry = self._load().get(self._entry_key(path, mode))
+        if entry is None:
+            return None
+        if {key: entry.get(key) for key in ("size", "mtime_ns", "inode")} != self._signature(stat):
+            return None
+        return entry["hash"]
+
+    def set(self, path: str, stat: os.stat_result, mode: str, file_hash: str) -> None:
+        """
+        Registra o hash de um arquivo e grava o índice.
+
+        Args:
+            path: Caminho do arquivo
+            stat: Resultado de os.stat do arquivo (antes do cálculo do hash)
+            mode: Modo de fingerprint
+            file_hash: Hash calculado
+        """
+        key = self._entry_key(path, mode)
+        entry = {**self._signature(stat), "hash": file_hash}
+        with self._lock:
+            if self.index_path is None:
+                self._add(key, entry)
+                return
+            try:
+                # Relê e mescla as entradas dos demais escritores antes de regravar
+                with file_lock(self.index_path):
+                    self._add(key, entry)
+                    self._save()
+            except TimeoutError as e:
+                logger.warning(f"Índice de fingerprints não gravado: {str(e)}")
+                self._add(key, entry)
+
+    def _add(self, key: str, entry: Dict) -> None:
+        """Registra uma entrada no índice carregado (relido do disco, se mudou)."""
+        entries = self._load()
+        # Reinsere no fim: a ordem do dicionário é a ordem de registro
+        entries.pop(key, None)
+        entries[key] = entry
+        self._prune()
+
+    def _prune(self) -> None:
+        """Remove as entradas de arquivos inexistentes e as mais antigas além de max_entries."""
+        entries = {key: entry for key, entry in self._entries.items()
+                   if os.path.exists(self._entry_path(key))}
+        excess = len(entries) - self.max_entries
+        if excess > 0:
+            entries = dict(list(entries.items())[excess:])
+        self._entries = entries
+
+    def _save(self) -> None:
+        """Grava o índice em disco de forma atômica."""
+        if self.index_path is None:
+            return
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+            with open(temp_path, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(temp_path, self.index_path)
+            self._disk_state = self._file_state()
+        except Exception as e:
+            logger.error(f"Erro ao salvar índice de fingerprints: {str(e)}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+class VideoFingerprinter:
+    """
+    Calcula fingerprints de vídeos, reaproveitando hashes de arquivos não modificados.
+
+    O fingerprint de um arquivo cujo (path, size, mtime, inode) não mudou é
+    resolvido pelo índice com um único os.stat, sem ler o vídeo.
+    """
+
+    def __init__(self, index_path: Optional[str] = None, mode: str = "full",
+                 buffer_size: int = HASH_BUFFER_SIZE, block_size: int = SAMPLE_BLOCK_SIZE,
+                 num_blocks: int = SAMPLE_BLOCKS):
+        """
+        Inicializa o gerador de fingerprints.
+
+        Args:
+            index_path: Arquivo JSON do índice persistente (None: apenas em memória)
+            mode: "full" (SHA-256 do arquivo inteiro) ou "sampled" (tamanho + blocos amostrados)
+            buffer_size: Tamanho do buffer de leitura do modo "full"
+            block_size: Tamanho dos blocos do modo "sampled"
+            num_blocks: Número de blocos do modo "sampled"
+        """
+        if mode not in FINGERPRINT_MODES:
+            raise ValueError(f"Modo de fingerprint inválido: {mode}")
+        self.mode = mode
+        self.buffer_size = buffer_size
+        self.block_size = block_size
+        self.num_blocks = num_blocks
+        self.index = FingerprintIndex(index_path)
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, video_path: str) -> str:
+        """
+        Retorna o fingerprint de um vídeo.
+
+        Args:
+            video_path: Caminho do vídeo
+
+        Returns:
+            str: Fingerprint hexadecimal (SHA-256)
+        """
+        stat = os.stat(video_path)
+        cached = self.index.get(video_path, stat, self.mode)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        if self.mode == "sampled":
+            file_hash = sampled_fingerprint(video_path, self.block_size, self.num_blocks)
+        else:
+            file_hash = hash_file(video_path, self.buffer_size)
+        self.index.set(video_path, stat, self.mode, file_hash)
+        logger.debug(f"Fingerprint calculado para {video_path}: {file_hash}")
+        return file_hash
+
+    def stats(self) -> Dict[str, int]:
+        """Retorna o número de fingerprints resolvidos pelo índice e calculados."""
+        return {"hits": self.hits, "misses": self.misses}
+
+def main(args: Optional[List[str]] = None) -> int:
+    """
+    CLI de fingerprints: imprime o fingerprint de cada vídeo.
+
+    Exemplo:
+        python -m src.video_fingerprint --mode sampled --index data/pose/fingerprints.json video.mp4
+    """
+    parser = argparse.ArgumentParser(description="Calcula fingerprints de vídeos")
+    parser.add_argument("videos", nargs="+", help="Vídeos")
+    parser.add_argument("--mode", choices=FINGERPRINT_MODES, default="full",
+                        help="Modo de fingerprint (padrão: full)")
+    parser.add_argument("--index", help="Arquivo do índice persistente (opcional)")
+    parsed = parser.parse_args(args)
+
+    fingerprinter = VideoFingerprinter(parsed.index, mode=parsed.mode)
+    for video_path in parsed.videos:
+        try:
+            print(f"{fingerprinter.fingerprint(video_path)}  {video_path}")
+        except OSError as e:
+            logger.error(f"Erro ao calcular fingerprint de {video_path}: {str(e)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -27,6 +27,29 @@ def test_video_path(tmp_path):
     
     return str(video_path)
 
+@pytest.fixture
+def write_video():
+    """
+    Fábrica de vídeos de teste.
+
+    A função criada recebe (path, n_frames) e, opcionalmente, fps, size
+    (largura, altura), shade (cor de fundo, distinta por vídeo para os
+    fingerprints) e stripe (cor BGR de uma faixa na coluna 2 * i do frame i,
+    que identifica o frame), e retorna o caminho do vídeo.
+    """
+    def write(path, n_frames, fps=30.0, size=(64, 64), shade=0, stripe=None):
+        width, height = size
+        out = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+        for i in range(n_frames):
+            frame = np.full((height, width, 3), shade, dtype=np.uint8)
+            if stripe is not None:
+                frame[:, 2 * i:2 * i + 2] = stripe
+            out.write(frame)
+        out.release()
+        return str(path)
+
+    return write
+
 @pytest.fixture
 def pose_extractor():
     """Cria um extrator de pose para testes."""
@@ -18,6 +18,8 @@ from unittest.mock import Mock, patch
 from src.analisador_cli import AnalisadorCLI
 from src.pose_models import PoseLandmark
 from src.pose_storage import PoseStorage
+from src.extraction_params import ExtractionParams
+from src.live_comparison import LIVE_MODEL_COMPLEXITY
 from src.pose_estimation import PoseExtractor
 from src.comparador_movimento import ComparadorMovimento
 
@@ -96,6 +98,8 @@ def test_parse_arguments(sample_video_path, tmp_path):
     assert args.video1 == sample_video_path
     assert args.video2 == sample_video_path
     assert args.config == str(config_path)
+    assert not args.pose_index
+    assert parse_arguments(["--command", "process", "-v", sample_video_path, "--pose-index"]).pose_index
 
 def test_parse_arguments_invalid():
     """Testa o parsing de argumentos inválidos."""
@@ -123,7 +127,49 @@ def test_parse_arguments_invalid():
 def test_parse_arguments_missing_required():
     """Testa o parsing quando argumentos obrigatórios estão faltando."""
     with pytest.raises(SystemExit):
-        parse_arguments([])  # Falta o argumento -v 
+        parse_arguments([])  # Falta o argumento -v
+
+def test_parse_arguments_batch(sample_video_path, tmp_path):
+    """Testa o parsing do comando batch."""
+    args = parse_arguments([
+        "--command", "batch",
+        "--reference", sample_video_path,
+        "--candidates", str(tmp_path),
+        "-w", "3"
+    ])
+    assert args.command == "batch"
+    assert args.reference == sample_video_path
+    assert args.candidates == str(tmp_path)
+    assert args.summary == "batch_summary.csv"
+    assert args.workers == 3
+    assert args.video is None and args.video1 is None
+
+    with pytest.raises(SystemExit):
+        parse_arguments(["--command", "batch", "--candidates", str(tmp_path)])  # Falta a referência
+
+    with pytest.raises(SystemExit):
+        parse_arguments(["--command", "batch", "--reference", sample_video_path,
+                         "--candidates", str(tmp_path / "missing")])
+
+    with pytest.raises(SystemExit):
+        parse_arguments(["--command", "process"])  # Falta o vídeo
+
+def test_parse_arguments_live(sample_video_path):
+    """Testa o parsing do comando live."""
+    args = parse_arguments(["--command", "live", "--reference", sample_video_path, "--complexity", "1"])
+    assert args.command == "live"
+    assert args.source == "0"
+    assert args.complexity == 1
+
+    args = parse_arguments(["--command", "live", "--reference", sample_video_path,
+                            "--source", sample_video_path])
+    assert args.source == sample_video_path
+    assert args.complexity == LIVE_MODEL_COMPLEXITY
+    assert parse_arguments(["--command", "process", "-v", sample_video_path]).complexity == \
+        ExtractionParams.model_complexity
+
+    with pytest.raises(SystemExit):
+        parse_arguments(["--command", "live"])  # Falta a referência
 
 def test_parse_arguments_with_config(sample_video_path, tmp_path):
     """Testa o parsing de argumentos com arquivo de configuração."""
@@ -377,6 +423,36 @@ def test_process_video(mock_pose_storage, mock_pose_extractor, sample_video_path
     success = analisador.process_video(sample_video_path)
     assert not success
 
+@patch('src.analisador_cli.PoseExtractor')
+@patch('src.analisador_cli.PoseStorage')
+def test_process_video_streaming(mock_pose_storage, mock_pose_extractor, sample_video_path, storage_dir):
+    """Testa o processamento de vídeo com gravação incremental."""
+    mock_pose_extractor.return_value = mock_pose_extractor
+    mock_pose_storage.return_value = mock_pose_storage
+    mock_pose_storage.load_pose_data.return_value = None
+    mock_pose_storage.save_pose_stream.return_value = True
+    mock_pose_extractor.iter_video.return_value = iter([(0, None)])
+    mock_pose_extractor.get_fps.return_value = 30.0
+    mock_pose_extractor.get_resolution.return_value = (640, 480)
+    mock_pose_extractor.get_total_frames.return_value = 1
+
+    from src.analisador_cli import AnalisadorCLI
+    analisador = AnalisadorCLI(storage_dir=str(storage_dir), streaming=True)
+
+    assert analisador.process_video(video_path=sample_video_path)
+    mock_pose_extractor.process_video.assert_not_called()
+    mock_pose_storage.save_pose_data.assert_not_called()
+    mock_pose_storage.save_pose_stream.assert_called_once_with(
+        video_path=sample_video_path,
+        fps=30.0,
+        resolution=(640, 480),
+        total_frames=1,
+        frames=mock_pose_extractor.iter_video.return_value
+    )
+
+    mock_pose_storage.save_pose_stream.return_value = False
+    assert not analisador.process_video(video_path=sample_video_path)
+
 @patch('src.analisador_cli.PoseExtractor')
 @patch('src.analisador_cli.PoseStorage')
 @patch('src.analisador_cli.ComparadorMovimento')
@@ -512,3 +588,57 @@ def test_compare_videos_with_exception(analisador, mock_pose_extractor, mock_pos
     
     results = analisador.compare_videos("video1.mp4", "video2.mp4")
     assert results is None
+
+def test_compare_videos_cache_keyed_by_params(tmp_path, sample_video_landmarks):
+    """Testa que o cache de comparações considera os parâmetros do comparador."""
+    storage = PoseStorage(tmp_path / "pose")
+    video_paths = []
+    for name in ("video1.mp4", "video2.mp4"):
+        video_path = tmp_path / name
+        video_path.touch()
+        video_paths.append(str(video_path))
+        assert storage.save_pose_data(str(video_path), 30.0, (640, 480),
+                                      len(sample_video_landmarks), sample_video_landmarks)
+
+    euclidean = AnalisadorCLI(storage_dir=str(tmp_path / "pose"), pose_storage=storage,
+                              pose_extractor=Mock(), comparador=ComparadorMovimento())
+    first = euclidean.compare_videos(*video_paths)
+    assert first is not None
+    assert euclidean.compare_videos(*video_paths) is not None
+    assert storage.results_cache.stats()["hits"] == 1
+
+    # Outros parâmetros geram outra chave e uma nova comparação
+    dtw_comparador = ComparadorMovimento(comparison_params=ComparisonParams(metric=DistanceMetric.DTW))
+    dtw = AnalisadorCLI(storage_dir=str(tmp_path / "pose"), pose_storage=storage,
+                        pose_extractor=Mock(), comparador=dtw_comparador)
+    results = dtw.compare_videos(*video_paths)
+    assert results.temporal_alignment["method"] == "dtw"
+    assert storage.results_cache.stats() == {"hits": 1, "misses": 2, "hit_rate": pytest.approx(1 / 3)}
+
+def test_compare_videos_time_range(tmp_path, sample_video_landmarks):
+    """Testa a comparação de um trecho dos vídeos lendo apenas os frames do trecho."""
+    storage = PoseStorage(tmp_path / "pose")
+    video_paths = []
+    for name in ("video1.mp4", "video2.mp4"):
+        video_path = tmp_path / name
+        video_path.touch()
+        video_paths.append(str(video_path))
+        assert storage.save_pose_data(str(video_path), 30.0, (640, 480),
+                                      len(sample_video_landmarks), sample_video_landmarks)
+    storage.clear_cache()
+
+    analisador = AnalisadorCLI(storage_dir=str(tmp_path / "pose"), pose_storage=storage,
+                               pose_extractor=Mock(), comparador=ComparadorMovimento())
+    start, end = 0.03, 0.09  # Frames 1 e 2 a 30 FPS
+    results = analisador.compare_videos(*video_paths, start_time=start, end_time=end)
+    assert results is not None
+    assert len(storage.cache) == 0
+    assert results.video1_total_frames == 2
+    assert len(results.frame_scores) == 1  # O frame 2 não tem pose
+    assert results.metadata["time_range"] == {"start_time": start, "end_time": end}
+
+    # O trecho faz parte da chave do cache
+    assert analisador.compare_videos(*video_paths, start_time=start, end_time=end) is not None
+    assert storage.results_cache.stats()["hits"] == 1
+    full = analisador.compare_videos(*video_paths)
+    assert len(full.frame_scores) == 3
@@ -0,0 +1,136 @@
+import csv
+import pytest
+import numpy as np
+from src.batch_compare import BatchComparator, collect_candidates, completed_videos
+from src.pose_models import PoseLandmark
+from src.pose_storage import PoseStorage
+
+def _landmarks(n_frames, phase):
+    """Gera landmarks sintéticos (33 por frame) com um movimento senoidal."""
+    frames = []
+    for i in range(n_frames):
+        offset = 0.05 * np.sin(i / 5.0 + phase)
+        frames.append({
+            j: PoseLandmark(x=0.3 + 0.01 * j + offset, y=0.2 + 0.02 * j, z=0.0, visibility=0.9)
+            for j in range(33)
+        })
+    return frames
+
+@pytest.fixture
+def videos(tmp_path):
+    """Cria vídeos (conteúdo distinto para os fingerprints) com dados de pose armazenados."""
+    video_dir = tmp_path / "videos"
+    video_dir.mkdir()
+    storage_dir = tmp_path / "pose"
+    storage = PoseStorage(str(storage_dir))
+    paths = {}
+    for name, phase in [("reference", 0.0), ("cand_a", 0.0), ("cand_b", 1.5)]:
+        path = video_dir / f"{name}.mp4"
+        path.write_bytes(name.encode() * 100)
+        assert storage.save_pose_data(str(path), 30.0, (640, 480), 40, _landmarks(40, phase))
+        paths[name] = str(path)
+    return paths, storage_dir
+
+def _read_summary(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+def test_collect_candidates_directory_and_manifest(tmp_path):
+    """Testa a listagem de candidatos de um diretório e de um manifesto."""
+    for name in ["b.mp4", "a.MOV", "notes.txt", "c.avi"]:
+        (tmp_path / name).write_bytes(b"x")
+    (tmp_path / "sub").mkdir()
+    assert collect_candidates(str(tmp_path)) == [
+        str(tmp_path / "a.MOV"), str(tmp_path / "b.mp4"), str(tmp_path / "c.avi")
+    ]
+
+    manifest = tmp_path / "list.txt"
+    manifest.write_text(f"# candidatos\nb.mp4\n\n{tmp_path / 'c.avi'}\nb.mp4\n")
+    assert collect_candidates(str(manifest)) == [str(tmp_path / "b.mp4"), str(tmp_path / "c.avi")]
+
+def test_batch_run_scores_and_summary(videos, tmp_path):
+    """Testa a comparação em lote com dados de pose já armazenados."""
+    paths, storage_dir = videos
+    summary = tmp_path / "summary.csv"
+    batch = BatchComparator(paths["reference"], storage_dir=str(storage_dir))
+
+    results = batch.run([paths["cand_a"], paths["cand_b"], paths["reference"]], str(summary))
+
+    assert [r.video_path for r in results] == [paths["cand_a"], paths["cand_b"]]
+    assert all(r.status == "ok" for r in results)
+    # O candidato idêntico à referência tem o maior score
+    assert results[0].global_score > results[1].global_score
+    assert results[0].frames_compared == 40
+
+    rows = _read_summary(summary)
+    assert [row["video"] for row in rows] == [paths["cand_a"], paths["cand_b"]]
+    assert all(row["reference"] == paths["reference"] and row["status"] == "ok" for row in rows)
+    assert float(rows[0]["global_score"]) == pytest.approx(results[0].global_score, abs=1e-6)
+
+    # Os resultados ficam no cache de comparações
+    cached = PoseStorage(str(storage_dir)).load_comparison_results(
+        paths["reference"], paths["cand_b"],
+        params=batch.comparador.cache_params(), comparator_version=batch.comparador.version
+    )
+    assert cached is not None
+    assert cached.global_score == pytest.approx(results[1].global_score)
+
+def test_batch_resume_skips_completed(videos, tmp_path):
+    """Testa a retomada de um lote interrompido a partir da tabela de resumo."""
+    paths, storage_dir = videos
+    summary = tmp_path / "summary.csv"
+    BatchComparator(paths["reference"], storage_dir=str(storage_dir)).run([paths["cand_a"]], str(summary))
+    assert completed_videos(str(summary), paths["reference"]) == {paths["cand_a"]}
+    assert completed_videos(str(summary), paths["cand_b"]) == set()
+
+    # Simula uma interrupção no meio da escrita de uma linha
+    with open(summary, "a") as f:
+        f.write(f"{paths['reference']},{paths['cand_b']},o")
+
+    batch = BatchComparator(paths["reference"], storage_dir=str(storage_dir))
+    results = batch.run([paths["cand_a"], paths["cand_b"]], str(summary))
+    assert [r.video_path for r in results] == [paths["cand_b"]]
+
+    rows = _read_summary(summary)
+    assert [(row["video"], row["status"]) for row in rows if row["status"] == "ok"] == [
+        (paths["cand_a"], "ok"), (paths["cand_b"], "ok")
+    ]
+    assert completed_videos(str(summary), paths["reference"]) == {paths["cand_a"], paths["cand_b"]}
+
+def test_batch_records_failed_candidates(videos, tmp_path):
+    """Testa que candidatos que não podem ser extraídos são registrados como erro."""
+    paths, storage_dir = videos
+    broken = tmp_path / "videos" / "broken.mp4"
+    broken.write_bytes(b"not a video")
+    summary = tmp_path / "summary.csv"
+
+    batch = BatchComparator(paths["reference"], storage_dir=str(storage_dir))
+    results = batch.run([str(broken), paths["cand_a"]], str(summary))
+
+    assert [(r.video_path, r.status) for r in results] == [(str(broken), "error"), (paths["cand_a"], "ok")]
+    assert results[0].error
+    rows = _read_summary(summary)
+    assert rows[0]["status"] == "error" and rows[0]["global_score"] == ""
+    # Uma nova execução tenta novamente apenas o candidato com erro
+    assert completed_videos(str(summary), paths["reference"]) == {paths["cand_a"]}
+
+def test_batch_pose_index_reaches_workers(tmp_path):
+    """Testa que a opção do índice de poses vale para o armazenamento do lote e dos workers."""
+    from src.extraction_params import ExtractionParams
+    from src.extraction_worker import init_extraction_worker
+
+    batch = BatchComparator("ref.mp4", storage_dir=str(tmp_path), pose_index=True)
+    assert batch.storage.pose_index is not None
+    assert BatchComparator("ref.mp4", storage_dir=str(tmp_path)).storage.pose_index is None
+
+    state = {}
+    init_extraction_worker(state, str(tmp_path), "json", "full", ExtractionParams(), pose_index=True)
+    try:
+        assert state["storage"].pose_index is not None
+    finally:
+        state["finalizer"]()
+
+def test_batch_invalid_workers(tmp_path):
+    """Testa a validação do número de workers."""
+    with pytest.raises(ValueError):
+        BatchComparator("ref.mp4", storage_dir=str(tmp_path), workers=0)
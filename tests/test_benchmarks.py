@@ -0,0 +1,71 @@
+import json
+import numpy as np
+import pytest
+from benchmarks.run import compare_with_baseline, main, select_cases
+from benchmarks.synthetic import iter_track_frames, synthetic_track
+
+def test_synthetic_track_shape_and_missing_frames():
+    """Testa o formato do track sintético e os frames sem pose."""
+    track = synthetic_track(20, missing_every=5)
+    assert track.data.shape == (20, 33, 4) and track.data.dtype == np.float32
+    frames = list(iter_track_frames(track))
+    assert [frame for frame, landmarks in frames if landmarks is None] == [0, 5, 10, 15]
+    assert not np.array_equal(synthetic_track(20).data, synthetic_track(20, phase=0.3).data)
+
+def test_compare_with_baseline_classifies_changes():
+    """Testa a classificação de regressões, melhorias e casos novos."""
+    baseline = [
+        {"case": "a", "frames": 100, "status": "ok", "median_seconds": 1.0},
+        {"case": "b", "frames": 100, "status": "ok", "median_seconds": 1.0},
+        {"case": "c", "frames": 100, "status": "ok", "median_seconds": 1.0},
+        {"case": "d", "frames": 100, "status": "error", "error": "falha"},
+    ]
+    results = [
+        {"case": "a", "frames": 100, "status": "ok", "median_seconds": 1.5},
+        {"case": "b", "frames": 100, "status": "ok", "median_seconds": 0.5},
+        {"case": "c", "frames": 100, "status": "ok", "median_seconds": 1.1},
+        {"case": "d", "frames": 100, "status": "ok", "median_seconds": 1.0},
+        {"case": "a", "frames": 1000, "status": "skipped"},
+    ]
+    comparisons = compare_with_baseline(results, baseline, tolerance=0.2)
+    assert [(entry["case"], entry["status"]) for entry in comparisons] == [
+        ("a", "regression"), ("b", "improvement"), ("c", "unchanged"), ("d", "new")]
+    assert comparisons[0]["ratio"] == pytest.approx(1.5)
+
+def test_select_cases_by_group_and_name():
+    """Testa a seleção de casos por grupo e por nome."""
+    names = [case.name for case in select_cases(["cache", "export.csv"])]
+    assert names == ["cache.set", "cache.get", "export.csv"]
+    with pytest.raises(ValueError):
+        select_cases(["inexistente"])
+
+def test_run_writes_results_and_detects_regression(tmp_path):
+    """Testa uma execução curta dos benchmarks e a comparação com a referência."""
+    output = tmp_path / "results.json"
+    args = ["--cases", "storage", "cache", "report", "export", "comparison.compare_videos",
+            "--frames", "30", "--repeat", "1", "--output", str(output)]
+    assert main(args) == 0
+
+    report = json.loads(output.read_text())
+    assert report["environment"]["numpy"] == np.__version__
+    results = {entry["case"]: entry for entry in report["results"]}
+    assert len(results) == 10
+    assert all(entry["status"] == "ok" and entry["frames"] == 30 for entry in results.values())
+    assert results["cache.get"]["median_seconds"] > 0
+
+    # Uma referência muito mais rápida faz a execução indicar regressão
+    baseline = tmp_path / "baseline.json"
+    for entry in report["results"]:
+        entry["median_seconds"] = 1e-9
+    baseline.write_text(json.dumps(report))
+    assert main(args + ["--baseline", str(baseline)]) == 1
+    comparisons = json.loads(output.read_text())["baseline"]["comparisons"]
+    assert {entry["status"] for entry in comparisons} == {"regression"}
+
+def test_run_skips_sizes_above_case_limit(tmp_path):
+    """Testa que casos com limite de frames são pulados nos tamanhos maiores."""
+    output = tmp_path / "results.json"
+    assert main(["--cases", "export.csv", "--frames", "200000", "--repeat", "1",
+                 "--output", str(output)]) == 0
+    entry = json.loads(output.read_text())["results"][0]
+    assert entry["status"] == "skipped" and "median_seconds" not in entry
@@ -241,3 +241,49 @@ def test_load_pose_data_incompatible_landmarks(temp_storage_dir, sample_pose_dat
     
     assert not validation.is_valid
     assert any("incompatíveis" in error for error in validation.errors) 
+
+def test_load_pose_data_time_range_and_frame_loader(temp_storage_dir):
+    """Testa o carregamento de um intervalo de tempo e o carregador de frames do visualizador."""
+    loader = PoseDataLoader(str(temp_storage_dir))
+    landmarks = {
+        0: PoseLandmark(x=0.1, y=0.2, z=0.3, visibility=0.9),
+        1: PoseLandmark(x=0.4, y=0.5, z=0.6, visibility=0.7)
+    }
+    for video_path, total in (("video1.mp4", 90), ("video2.mp4", 60)):
+        assert loader.storage.save_pose_data(video_path, 30.0, (640, 480), total,
+                                             [landmarks if i % 10 else None for i in range(total)])
+    loader.storage.clear_cache()
+
+    data1, data2, validation = loader.load_pose_data("video1.mp4", "video2.mp4", 1.0, 1.5)
+    assert validation.is_valid
+    assert [frame.frame_number for frame in data1.frames] == [i for i in range(30, 45) if i % 10]
+    assert data1.total_frames == 90
+    assert len(data2.frames) == len(data1.frames)
+    assert len(loader.storage.cache) == 0
+
+    load, total_frames = loader.frame_loader("video1.mp4", "video2.mp4")
+    assert total_frames == 60
+    frames = load(9, 12)
+    assert len(frames) == 3
+    assert frames[0]['reference_pose']['keypoints'].tolist() == [[0.1, 0.2], [0.4, 0.5]]
+    assert frames[1]['reference_pose']['keypoints'].shape == (0, 2)
+    assert frames[1]['metrics']['comparison_visibility'] == 0.0
+    assert frames[2]['metrics']['reference_visibility'] == pytest.approx(0.8)
+
+    assert loader.frame_loader("video1.mp4", "nonexistent.mp4") == (None, 0)
+
+def test_frame_loader_without_fps(temp_storage_dir, monkeypatch):
+    """Testa que o carregador de frames filtra pelo número do frame quando o FPS armazenado é 0."""
+    loader = PoseDataLoader(str(temp_storage_dir))
+    landmarks = {0: PoseLandmark(x=0.1, y=0.2, z=0.3, visibility=0.9)}
+    for video_path in ("video1.mp4", "video2.mp4"):
+        assert loader.storage.save_pose_data(video_path, 30.0, (640, 480), 20, [landmarks] * 20)
+    load_pose_info = loader.storage.load_pose_info
+    monkeypatch.setattr(loader.storage, "load_pose_info",
+                        lambda video_path: {**load_pose_info(video_path), "fps": 0.0})
+
+    load, total_frames = loader.frame_loader("video1.mp4", "video2.mp4")
+    assert total_frames == 20
+    frames = load(5, 8)
+    assert len(frames) == 3
+    assert all(frame['metrics']['reference_visibility'] == pytest.approx(0.9) for frame in frames)
@@ -2,9 +2,11 @@ import pytest
 import numpy as np
 from datetime import datetime
 
-from src.comparador_movimento import ComparadorMovimento
+from src.comparador_movimento import ComparadorMovimento, landmark_weight_vector
 from src.pose_models import PoseLandmark
 from src.comparison_results import ComparisonResults, DanceComparison
+from src.comparison_params import ComparisonParams, DistanceMetric
+from src.pose_track import PoseTrack
 
 @pytest.fixture
 def comparador():
@@ -215,3 +217,184 @@ def test_compare_videos_with_low_visibility(comparador):
     # Como a visibilidade é menor que min_visibility, não deve haver comparações
     assert len(results.frame_comparisons) == 0
     assert results.overall_metrics["average_similarity"] == 0.0 
+
+def test_compare_videos_matches_frame_loop(comparador):
+    """Testa que a comparação vetorizada reproduz a comparação frame a frame."""
+    rng = np.random.default_rng(42)
+
+    def random_video(num_frames):
+        frames = []
+        for _ in range(num_frames):
+            if rng.random() < 0.15:
+                frames.append(None)
+                continue
+            frames.append({
+                i: PoseLandmark(*rng.random(3).tolist(), visibility=float(rng.random()))
+                for i in range(33) if rng.random() > 0.1
+            })
+        return frames
+
+    video1 = random_video(40)
+    video2 = random_video(35)
+    weights1 = {str(i): float(w) for i, w in enumerate(rng.random(33))}
+    weights2 = {str(i): float(w) for i, w in enumerate(rng.random(33))}
+
+    results = comparador.compare_videos(video1, video2, 30.0, 25.0, (640, 480), (640, 480),
+                                        weights1, weights2)
+
+    expected_frames = [
+        n for n, (f1, f2) in enumerate(zip(video1, video2))
+        if f1 is not None and f2 is not None
+        and not all(l.visibility < 0.5 for l in f1.values())
+        and not all(l.visibility < 0.5 for l in f2.values())
+    ]
+    assert [fc.frame_number for fc in results.frame_comparisons] == expected_frames
+
+    for fc in results.frame_comparisons:
+        frame1, frame2 = video1[fc.frame_number], video2[fc.frame_number]
+        score, landmark_similarities = comparador._compare_frames(frame1, frame2, weights1, weights2)
+        alignment = comparador._calculate_alignment_metrics(frame1, frame2)
+
+        assert fc.similarity_score == pytest.approx(score, abs=1e-12)
+        assert fc.landmark_similarities.keys() == landmark_similarities.keys()
+        for key, value in landmark_similarities.items():
+            assert fc.landmark_similarities[key] == pytest.approx(value, abs=1e-12)
+        assert fc.alignment_metrics["translation"] == pytest.approx(alignment["translation"], abs=1e-12)
+        assert fc.alignment_metrics["scale"] == pytest.approx(alignment["scale"], abs=1e-12)
+        assert fc.timestamp == pytest.approx(fc.frame_number / 30.0)
+
+    expected_metrics = comparador._calculate_overall_metrics(results.frame_comparisons)
+    for key, value in expected_metrics.items():
+        assert results.overall_metrics[key] == pytest.approx(value, abs=1e-12)
+    assert results.frame_scores == [fc.similarity_score for fc in results.frame_comparisons]
+
+@pytest.mark.parametrize("dtw_mode", ["full", "band", "fast"])
+def test_compare_videos_with_dtw_alignment(dtw_mode):
+    """Testa que o alinhamento DTW compensa um atraso entre os vídeos."""
+    t = np.linspace(0, 4 * np.pi, 120)
+    video1 = [
+        {i: PoseLandmark(x=0.5 + 0.3 * np.sin(ti + i), y=0.5 + 0.3 * np.cos(ti + 2 * i),
+                         z=0.0, visibility=0.9) for i in range(33)}
+        for ti in t
+    ]
+    # O segundo vídeo começa 15 frames depois (parado na pose inicial)
+    video2 = [video1[0]] * 15 + video1
+
+    params = ComparisonParams(metric=DistanceMetric.DTW, dtw_mode=dtw_mode, dtw_band=0.2,
+                              dtw_radius=3)
+    results = ComparadorMovimento(comparison_params=params).compare_videos(
+        video1, video2, 30.0, 30.0, (640, 480), (640, 480)
+    )
+
+    assert results.global_score == pytest.approx(1.0)
+    alignment = results.temporal_alignment
+    assert alignment["method"] == "dtw"
+    assert alignment["mode"] == dtw_mode
+    assert alignment["path"][0] == [0, 0]
+    assert alignment["path"][-1] == [119, 134]
+    assert alignment["offset_frames"] == 15
+    assert alignment["offset_seconds"] == pytest.approx(0.5)
+    assert len(results.frame_comparisons) == 120
+
+    # Sem DTW, os frames de mesmo índice ficam desalinhados
+    euclidean = ComparadorMovimento().compare_videos(
+        video1, video2, 30.0, 30.0, (640, 480), (640, 480)
+    )
+    assert euclidean.global_score < results.global_score
+    assert euclidean.temporal_alignment == {}
+
+def test_find_subsequence_in_long_track():
+    """Testa a localização de uma frase curta dentro de uma performance longa."""
+    rng = np.random.default_rng(7)
+
+    def pose(ti):
+        return {i: PoseLandmark(x=0.5 + 0.3 * np.sin(ti + i), y=0.5 + 0.3 * np.cos(ti + 2 * i),
+                                z=0.0, visibility=0.9) for i in range(33)}
+
+    phrase = [pose(ti) for ti in np.linspace(0, 2 * np.pi, 60)]
+    performance = [pose(ti) for ti in rng.uniform(0, 2 * np.pi, 900)]
+    performance[300:360] = phrase
+    performance[320] = None  # Frame sem pose no meio do trecho
+    phrase_track = PoseTrack.from_landmarks(phrase, 30.0)
+    performance_track = PoseTrack.from_landmarks(performance, 30.0)
+
+    comparador = ComparadorMovimento()
+    matches = comparador.find_subsequence(phrase_track, performance_track, max_matches=2)
+    assert len(matches) == 2
+    assert (matches[0]["start_frame"], matches[0]["end_frame"]) == (300, 359)
+    assert matches[0]["start_seconds"] == pytest.approx(10.0)
+    assert matches[0]["end_seconds"] == pytest.approx(12.0)
+    assert matches[0]["score"] > matches[1]["score"]
+
+    # A função de custo por linha é equivalente à de pares
+    weights = np.ones(33)
+    row_costs = comparador._row_cost_function(phrase_track.data, performance_track.data, weights)
+    expected = comparador._pair_costs(phrase_track.data, performance_track.data,
+                                      np.full(900, 5), np.arange(900), weights)
+    np.testing.assert_allclose(row_costs(5), expected, atol=1e-7)
+
+    # No modo subsequence, compare_tracks compara a frase com a melhor ocorrência
+    params = ComparisonParams(metric=DistanceMetric.DTW, dtw_mode="subsequence")
+    results = ComparadorMovimento(comparison_params=params).compare_tracks(
+        phrase_track, performance_track, (640, 480), (640, 480))
+    alignment = results.temporal_alignment
+    assert alignment["method"] == "dtw" and alignment["mode"] == "subsequence"
+    assert (alignment["start_frame"], alignment["end_frame"]) == (300, 359)
+    assert alignment["offset_frames"] == 300
+    assert results.global_score == pytest.approx(1.0)
+    assert len(results.frame_comparisons) == 59  # O par do frame sem pose é descartado
+
+def test_landmark_weight_vector_accepts_names():
+    """Testa a conversão de pesos por id, nome do landmark e grupo."""
+    weights = landmark_weight_vector({"shoulder": 0.9, "left_hip": 0.8, "hip": 0.5, "12": 0.1}, 33)
+    assert weights.shape == (33,)
+    assert weights[11] == 0.9 and weights[12] == 0.1
+    assert weights[23] == 0.8 and weights[24] == 0.5
+    assert weights[0] == 1.0
+    assert landmark_weight_vector({"KNEE": 0.7}, 33)[[25, 26]].tolist() == [0.7, 0.7]
+    assert landmark_weight_vector({"shoulder": 0.9}, 2).tolist() == [1.0, 1.0]
+
+def test_rescore_matches_compare_tracks():
+    """Testa que repontuar os arrays preparados reproduz a comparação completa."""
+    rng = np.random.default_rng(7)
+    data1 = rng.random((80, 33, 4))
+    data2 = np.clip(data1 + rng.normal(0, 0.05, data1.shape), 0, 1)
+    data1[10] = np.nan  # Frame sem pose
+    data2[[5, 6], :, 3] = 0.1  # Frames com todos os landmarks invisíveis
+    track1 = PoseTrack(data1, fps=30.0)
+    track2 = PoseTrack(data2, fps=30.0)
+    comparador = ComparadorMovimento(comparison_params=ComparisonParams(metric=DistanceMetric.DTW))
+    comparison = comparador.prepare_tracks(track1, track2, (640, 480), (640, 480))
+    assert comparison.similarities.shape == (len(comparison), 33)
+
+    for weights in [None, {"shoulder": 0.9, "hip": 0.8, "knee": 0.7, "ankle": 0.6}]:
+        expected = comparador.compare_tracks(track1, track2, (640, 480), (640, 480), weights, weights)
+        results = comparador.rescore(comparison, weights, weights)
+        # O alinhamento é feito com pesos uniformes em prepare_tracks
+        if weights is None:
+            assert results.frame_scores == expected.frame_scores
+            assert results.overall_metrics == expected.overall_metrics
+            assert results.temporal_alignment == expected.temporal_alignment
+        assert results.video1_landmark_weights == expected.video1_landmark_weights
+        assert results.video1_processed_frames == expected.video1_processed_frames
+        assert len(results.frame_comparisons) == len(results.frame_scores)
+
+    # Pesos aplicados sobre as similaridades armazenadas
+    weights = {"shoulder": 0.9, "hip": 0.8, "knee": 0.7, "ankle": 0.6}
+    results = comparador.rescore(comparison, weights, weights)
+    vector = landmark_weight_vector(weights, 33)
+    compared = ~np.isnan(comparison.similarities)
+    expected_scores = (np.nansum(comparison.similarities * vector, axis=1)
+                       / np.where(compared, vector, 0.0).sum(axis=1))
+    np.testing.assert_allclose(results.frame_scores, expected_scores)
+
+    # A tolerância só muda a fração de frames dentro da tolerância
+    strict = comparador.rescore(comparison, weights, weights, tolerance=0.0)
+    loose = comparador.rescore(comparison, weights, weights, tolerance=1.0)
+    assert strict.overall_metrics["within_tolerance"] == 0.0
+    assert loose.overall_metrics["within_tolerance"] == 1.0
+    assert strict.global_score == loose.global_score
+    middle = np.median(results.frame_scores)
+    half = comparador.rescore(comparison, weights, weights, tolerance=1.0 - middle)
+    assert half.overall_metrics["within_tolerance"] == pytest.approx(
+        np.mean(np.array(results.frame_scores) >= middle))
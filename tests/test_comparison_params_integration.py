@@ -51,13 +51,16 @@ def test_comparison_with_dtw():
         tolerance=0.2,
         temporal_sync=True
     )
-    comparador = ComparadorMovimento()
+    comparador = ComparadorMovimento(comparison_params=params)
     results = comparador.compare_videos(
         video1_data, video2_data, 30.0, 30.0, (1920, 1080), (1920, 1080)
     )
     similarity = results.global_score
     assert 0 <= similarity <= 1
     assert 'average_similarity' in results.overall_metrics
+    assert results.temporal_alignment["method"] == "dtw"
+    assert results.temporal_alignment["path"][0] == [0, 0]
+    assert results.temporal_alignment["path"][-1] == [99, 79]
 
 def test_comparison_with_landmark_weights():
     """Testa a comparação com pesos de landmarks."""
@@ -1,6 +1,8 @@
+import json
 import pytest
+import numpy as np
 from datetime import datetime
-from src.comparison_results import ComparisonResults
+from src.comparison_results import ComparisonResults, DanceComparison, FrameComparisonTable
 
 @pytest.fixture
 def sample_results():
@@ -74,3 +76,40 @@ def test_comparison_results_timestamp():
     )
     assert results.timestamp is not None
     assert isinstance(results.timestamp, str) 
+
+def test_frame_comparisons_are_columnar():
+    """Testa a conversão da lista de DanceComparison em colunas e as views por frame."""
+    frames = [
+        DanceComparison(frame_number=3, timestamp=0.1, similarity_score=0.9,
+                        landmark_similarities={"0": 0.9, "2": 0.7},
+                        alignment_metrics={"translation": [0.1, 0.0, 0.0], "rotation": [0.0, 0.0, 0.0], "scale": 1.2}),
+        {"frame_number": 4, "timestamp": 0.13, "similarity_score": 0.5, "landmark_similarities": {"1": 0.5}}
+    ]
+    results = ComparisonResults(frame_comparisons=frames)
+    table = results.frame_comparisons
+    assert isinstance(table, FrameComparisonTable) and len(table) == 2
+    assert table.frame_numbers.tolist() == [3, 4]
+    assert table.landmark_similarities.shape == (2, 3)
+    assert np.isnan(table.landmark_similarities[0, 1])
+
+    assert table[0] == frames[0]
+    assert table[-1].landmark_similarities == {"1": 0.5}
+    assert table[1].alignment_metrics["scale"] == 1.0
+    assert [fc.similarity_score for fc in table] == [0.9, 0.5]
+    assert table[:1].frame_numbers.tolist() == [3]
+
+    # Colunas em base64: ida e volta exata, menor que a lista de dicionários
+    data = results.to_dict()
+    loaded = ComparisonResults.from_json(json.dumps(data))
+    assert loaded.frame_comparisons == table
+    assert loaded.frame_comparisons[0] == frames[0]
+    legacy = json.dumps([fc.to_dict() for fc in table])
+    assert ComparisonResults(frame_comparisons=json.loads(legacy)).frame_comparisons == table
+
+    many = FrameComparisonTable(np.arange(1000), np.arange(1000) / 30, np.random.rand(1000),
+                                np.random.rand(1000, 33))
+    assert len(json.dumps(many.to_dict())) < len(json.dumps([fc.to_dict() for fc in many])) / 2
+
+    empty = ComparisonResults()
+    assert not empty.frame_comparisons
+    assert len(ComparisonResults.from_json(empty.to_json()).frame_comparisons) == 0
@@ -0,0 +1,138 @@
+import pytest
+import numpy as np
+
+from src.dtw import (dtw, banded_dtw, fast_dtw, align_sequences, coarsen_sequence,
+                     sakoe_chiba_window, euclidean_cost, subsequence_dtw)
+
+def brute_force_dtw(X, Y):
+    """Implementação de referência do DTW com a matriz completa."""
+    n, m = len(X), len(Y)
+    acc = np.full((n + 1, m + 1), np.inf)
+    acc[0, 0] = 0.0
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            cost = np.linalg.norm(X[i - 1] - Y[j - 1])
+            acc[i, j] = cost + min(acc[i - 1, j - 1], acc[i - 1, j], acc[i, j - 1])
+    return acc[n, m]
+
+def assert_valid_path(path, n, m):
+    """Verifica que o caminho é contínuo, monotônico e cobre as duas sequências."""
+    assert path[0].tolist() == [0, 0]
+    assert path[-1].tolist() == [n - 1, m - 1]
+    steps = np.diff(path, axis=0)
+    assert ((steps >= 0) & (steps <= 1)).all()
+    assert (steps.sum(axis=1) > 0).all()
+
+@pytest.mark.parametrize("n,m", [(1, 1), (1, 6), (6, 1), (7, 9), (30, 20)])
+def test_full_dtw_matches_reference(n, m):
+    """Testa o DTW completo contra a implementação de referência."""
+    rng = np.random.default_rng(n * 100 + m)
+    X, Y = rng.random((n, 3)), rng.random((m, 3))
+
+    result = dtw(X, Y)
+
+    assert result.distance == pytest.approx(brute_force_dtw(X, Y))
+    assert result.cells == n * m
+    assert_valid_path(result.path, n, m)
+    path_cost = euclidean_cost(X, Y, result.path[:, 0], result.path[:, 1]).sum()
+    assert path_cost == pytest.approx(result.distance)
+
+@pytest.mark.parametrize("mode", ["band", "fast"])
+def test_constrained_modes_recover_shift(mode):
+    """Testa que os modos restritos recuperam o atraso entre duas sequências."""
+    t = np.linspace(0, 20, 2000)
+    X = np.sin(t)[:, None]
+    Y = np.sin(t - 1.0)[:, None]  # Atraso de 100 amostras
+
+    result = align_sequences(X, Y, mode=mode, band=0.1, radius=5)
+
+    assert_valid_path(result.path, len(X), len(Y))
+    middle = result.path[(result.path[:, 0] > 300) & (result.path[:, 0] < 1700)]
+    assert np.median(middle[:, 1] - middle[:, 0]) == pytest.approx(100, abs=2)
+    assert np.isfinite(result.distance)
+
+def brute_force_subsequence(X, Y):
+    """Implementação de referência: menor DTW de X contra todos os trechos de Y."""
+    best = (np.inf, None, None)
+    for start in range(len(Y)):
+        for end in range(start, len(Y)):
+            distance = brute_force_dtw(X, Y[start:end + 1])
+            if distance < best[0]:
+                best = (distance, start, end)
+    return best
+
+def test_subsequence_dtw_matches_reference():
+    """Testa o subsequence DTW contra a busca exaustiva em todos os trechos."""
+    rng = np.random.default_rng(3)
+    Y = rng.random((14, 2))
+    X = Y[5:9] + rng.normal(scale=0.05, size=(4, 2))
+
+    match = subsequence_dtw(X, Y)[0]
+    distance, start, end = brute_force_subsequence(X, Y)
+
+    assert match.distance == pytest.approx(distance)
+    assert (match.start, match.end) == (start, end)
+    assert match.path[0].tolist() == [0, start] and match.path[-1].tolist() == [3, end]
+    path_cost = euclidean_cost(X, Y, match.path[:, 0], match.path[:, 1]).sum()
+    assert path_cost == pytest.approx(match.distance)
+
+    # O custo por linha é equivalente ao custo por pares
+    row_match = subsequence_dtw(X, Y, row_cost_fn=lambda i: np.linalg.norm(Y - X[i], axis=1))[0]
+    assert (row_match.start, row_match.end) == (start, end)
+    assert align_sequences(X, Y, mode="subsequence").distance == pytest.approx(distance)
+
+def test_subsequence_dtw_finds_occurrences():
+    """Testa a localização de várias ocorrências, em velocidades diferentes, sem sobreposição."""
+    rng = np.random.default_rng(1)
+    t = np.linspace(0, 2 * np.pi, 40)
+    phrase = np.stack([np.sin(t), np.cos(2 * t)], axis=1)
+    Y = rng.uniform(-1, 1, (1000, 2))
+    Y[200:240] = phrase
+    Y[700:780] = np.repeat(phrase, 2, axis=0) + 0.01  # Mais lenta
+
+    matches = subsequence_dtw(phrase, Y, max_matches=3)
+
+    assert (matches[0].start, matches[0].end) == (200, 239)
+    # Na versão lenta, cada frame aparece duas vezes: basta um deles nas pontas
+    assert matches[1].start in (700, 701) and matches[1].end in (778, 779)
+    assert matches[0].distance == pytest.approx(0.0)
+    assert matches[0].distance < matches[1].distance < matches[2].distance
+    for found in matches[:2]:
+        assert matches[2].end < found.start or matches[2].start > found.end
+    with pytest.raises(ValueError):
+        subsequence_dtw(phrase, Y, max_matches=0)
+
+def test_fast_dtw_is_near_linear():
+    """Testa que o FastDTW avalia uma fração pequena da matriz de custo."""
+    rng = np.random.default_rng(0)
+    X = np.cumsum(rng.normal(size=(4000, 2)), axis=0)
+    Y = X[::2] + rng.normal(scale=0.1, size=(2000, 2))
+
+    result = fast_dtw(X, Y, radius=4)
+
+    assert_valid_path(result.path, len(X), len(Y))
+    assert result.cells < 0.05 * len(X) * len(Y)
+    # A aproximação fica próxima do ótimo
+    optimal = banded_dtw(X, Y, band=0.05)
+    assert result.distance <= optimal.distance * 1.1
+
+def test_sakoe_chiba_window():
+    """Testa a janela de Sakoe-Chiba para sequências de tamanhos diferentes."""
+    lo, hi = sakoe_chiba_window(10, 20, radius=3)
+    assert lo[0] == 0 and hi[-1] == 20
+    assert (np.diff(lo) >= 0).all() and (np.diff(hi) >= 0).all()
+    assert (hi - lo <= 8).all()
+
+def test_coarsen_sequence_ignores_nan():
+    """Testa a redução de resolução com valores ausentes."""
+    X = np.array([[1.0], [np.nan], [3.0], [5.0], [np.nan]])
+    coarse = coarsen_sequence(X)
+    assert coarse[:, 0].tolist()[:2] == [1.0, 4.0]
+    assert np.isnan(coarse[2, 0])
+
+def test_invalid_mode():
+    """Testa a validação do modo de alinhamento."""
+    with pytest.raises(ValueError):
+        align_sequences(np.zeros((3, 1)), np.zeros((3, 1)), mode="invalid")
+    with pytest.raises(ValueError):
+        dtw(np.zeros((0, 1)), np.zeros((3, 1)))
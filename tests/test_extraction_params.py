@@ -0,0 +1,61 @@
+import pytest
+from src.extraction_params import ExtractionParams
+
+def test_default_params():
+    params = ExtractionParams()
+    assert params.num_workers == 1
+    assert params.warmup_frames == 15
+    assert params.pipeline is False
+    assert params.decode_queue_size == 8
+    assert params.output_queue_size == 8
+
+def test_validation():
+    # Número de workers inválido
+    with pytest.raises(ValueError):
+        ExtractionParams(num_workers=0)
+
+    # Frames de aquecimento inválidos
+    with pytest.raises(ValueError):
+        ExtractionParams(warmup_frames=-1)
+
+    # Profundidade de fila inválida
+    with pytest.raises(ValueError):
+        ExtractionParams(decode_queue_size=0)
+    with pytest.raises(ValueError):
+        ExtractionParams(output_queue_size=0)
+
+    # Amostragem inválida
+    with pytest.raises(ValueError):
+        ExtractionParams(frame_stride=0)
+    with pytest.raises(ValueError):
+        ExtractionParams(target_fps=0)
+    with pytest.raises(ValueError):
+        ExtractionParams(fill_skipped="repeat")
+
+    # Modo adaptativo inválido
+    with pytest.raises(ValueError):
+        ExtractionParams(model_complexity=3)
+    with pytest.raises(ValueError):
+        ExtractionParams(light_model_complexity=-1)
+    with pytest.raises(ValueError):
+        ExtractionParams(keyframe_interval=0)
+    with pytest.raises(ValueError):
+        ExtractionParams(confidence_threshold=1.5)
+    with pytest.raises(ValueError):
+        ExtractionParams(roi_padding=-0.1)
+
+def test_to_dict_and_from_dict():
+    params = ExtractionParams(num_workers=4, warmup_frames=10, pipeline=True)
+    data = params.to_dict()
+    assert data["num_workers"] == 4
+    assert data["warmup_frames"] == 10
+    assert data["pipeline"] is True
+    assert ExtractionParams.from_dict(data) == params
+
+def test_save_and_load(tmp_path):
+    filepath = tmp_path / "extraction.json"
+    params = ExtractionParams(num_workers=8)
+    params.save_to_file(str(filepath))
+
+    loaded = ExtractionParams.load_from_file(str(filepath))
+    assert loaded == params
@@ -0,0 +1,109 @@
+import threading
+import time
+import pytest
+from src.extractor_pool import ExtractorPool
+
+class FakeExtractor:
+    """Extrator de teste: conta as reinicializações."""
+
+    def __init__(self, fail_reset=False):
+        self.resets = 0
+        self.closed = False
+        self.fail_reset = fail_reset
+
+    def reset(self):
+        if self.fail_reset:
+            raise RuntimeError("grafo inválido")
+        self.resets += 1
+
+    def close(self):
+        self.closed = True
+
+def test_pool_checkout_release_and_wait_metrics():
+    """Testa a retirada exclusiva, a reinicialização na devolução e as métricas de espera."""
+    pool = ExtractorPool(size=2, factory=FakeExtractor)
+    assert pool.available == 2 and pool.get_stats()["created"] == 0
+
+    first, second = pool.checkout(), pool.checkout()
+    assert first is not second and pool.in_use == 2 and pool.available == 0
+    with pytest.raises(TimeoutError):
+        pool.checkout(timeout=0.05)
+
+    # Uma thread aguarda até que um extrator seja devolvido
+    received = []
+    waiter = threading.Thread(target=lambda: received.append(pool.checkout(timeout=5)))
+    waiter.start()
+    time.sleep(0.1)
+    pool.release(first)
+    waiter.join()
+    assert received == [first] and first.resets == 1
+
+    stats = pool.get_stats()
+    assert stats["checkouts"] == 3 and stats["waits"] == 1 and stats["timeouts"] == 1
+    assert stats["created"] == 2 and stats["max_wait"] >= 0.09
+    assert stats["mean_wait"] == pytest.approx(stats["total_wait"] / 3)
+
+    with pytest.raises(ValueError):
+        pool.release(FakeExtractor())
+    pool.release(second)
+    with pytest.raises(ValueError):
+        pool.release(second)
+
+    with pool.extractor() as extractor:
+        assert extractor is second and pool.in_use == 2
+    assert second.resets == 2
+
+def test_pool_discards_broken_extractors_and_closes():
+    """Testa o descarte de um extrator que falha ao reiniciar e o fechamento do pool."""
+    created = []
+
+    def factory():
+        created.append(FakeExtractor(fail_reset=not created))
+        return created[-1]
+
+    pool = ExtractorPool(size=1, factory=factory)
+    broken = pool.checkout()
+    pool.release(broken)
+    assert broken.closed and pool.get_stats()["discarded"] == 1
+
+    # O pool cria outro extrator no lugar do descartado
+    replacement = pool.checkout(timeout=1)
+    assert replacement is created[1]
+    pool.release(replacement)
+
+    in_use = pool.checkout()
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.checkout()
+    pool.release(in_use)
+    assert in_use.closed
+
+    with pytest.raises(ValueError):
+        ExtractorPool(size=0)
+
+def test_pool_concurrent_videos_keep_separate_state(tmp_path, write_video):
+    """Testa o processamento simultâneo de vídeos diferentes com extratores do pool."""
+    videos = [(write_video(tmp_path / "a.mp4", 12, fps=30.0), 12, 30.0),
+              (write_video(tmp_path / "b.mp4", 20, fps=15.0), 20, 15.0)]
+    pool = ExtractorPool(size=2)
+    results = {}
+
+    def process(video_path):
+        with pool.extractor() as extractor:
+            assert extractor.process_video(video_path)
+            results[video_path] = (len(extractor.get_landmarks()), extractor.get_total_frames(),
+                                   extractor.get_fps())
+
+    threads = [threading.Thread(target=process, args=(video_path,)) for video_path, _, _ in videos]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    try:
+        assert results == {video_path: (frames, frames, fps) for video_path, frames, fps in videos}
+        assert pool.get_stats()["created"] == 2
+        # Extratores devolvidos não guardam o estado do último vídeo
+        with pool.extractor() as extractor:
+            assert extractor.get_landmarks() == [] and extractor.get_total_frames() == 0
+    finally:
+        pool.close()
@@ -0,0 +1,41 @@
+import threading
+from src.file_lock import file_lock
+
+def test_file_lock_is_exclusive(tmp_path):
+    """Testa que o lock é exclusivo e liberado ao sair do bloco."""
+    path = tmp_path / "data.json"
+    with file_lock(path):
+        assert (tmp_path / "data.json.lock").exists()
+        # Outra thread não obtém o lock enquanto ele é mantido
+        errors = []
+
+        def try_lock():
+            try:
+                with file_lock(path, timeout=0.05):
+                    pass
+            except TimeoutError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=try_lock)
+        thread.start()
+        thread.join()
+        assert len(errors) == 1
+    with file_lock(path, timeout=0.05):
+        pass
+
+def test_file_lock_serializes_writers(tmp_path):
+    """Testa que leituras e gravações protegidas pelo lock não perdem atualizações."""
+    path = tmp_path / "counter.txt"
+    path.write_text("0")
+
+    def increment():
+        for _ in range(50):
+            with file_lock(path):
+                path.write_text(str(int(path.read_text()) + 1))
+
+    threads = [threading.Thread(target=increment) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert path.read_text() == "200"
@@ -0,0 +1,85 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from src.frame_index import FrameIndex, build_json_frame_index, frame_index_path, time_range_rows
+
+@pytest.fixture
+def pose_json(tmp_path):
+    """Fixture que cria um arquivo de pose JSON indentado, como o de PoseStorage.save_pose_data."""
+    path = tmp_path / "abc.json"
+    data = {
+        "video_path": "video.mp4",
+        "video_hash": "abc",
+        "fps": 10.0,
+        "resolution": [640, 480],
+        "total_frames": 50,
+        "frames": [
+            {
+                "frame_number": i,
+                "timestamp": i / 10.0,
+                "landmarks": {"0": {"x": i / 100, "y": 0.5, "z": 0.0, "visibility": 0.9}}
+            }
+            for i in range(0, 50, 2)
+        ],
+        "created_at": "2025-01-01T00:00:00",
+        "version": "1.0"
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+    return path, data
+
+def test_frame_index_path(tmp_path):
+    """Testa o caminho do índice de um arquivo de pose."""
+    assert frame_index_path(tmp_path / "abc.json") == tmp_path / "abc.offsets.npz"
+
+def test_time_range_rows():
+    """Testa a seleção de linhas por intervalo semiaberto de tempo."""
+    timestamps = np.array([0.0, 0.5, 1.0, 1.5, 2.0])
+    assert time_range_rows(timestamps, 0.5, 1.5) == slice(1, 3)
+    assert time_range_rows(timestamps) == slice(0, 5)
+    assert time_range_rows(timestamps, end_time=0.0) == slice(0, 0)
+    assert time_range_rows(timestamps, 3.0, 1.0) == slice(5, 5)
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 1024 * 1024])
+def test_build_json_frame_index(pose_json, chunk_size):
+    """Testa a construção do índice em blocos de tamanhos variados."""
+    path, data = pose_json
+    index = build_json_frame_index(path, chunk_size=chunk_size)
+
+    assert len(index) == len(data["frames"])
+    assert index.frame_numbers.tolist() == list(range(0, 50, 2))
+    assert index.header == {key: value for key, value in data.items() if key != "frames"}
+    assert index.is_current(path)
+
+    # Cada intervalo de bytes contém exatamente o JSON do frame
+    with open(path, "rb") as f:
+        content = f.read()
+    for row, (start, end) in enumerate(index.offsets):
+        assert json.loads(content[start:end]) == data["frames"][row]
+
+    rows = index.rows(1.0, 2.0)
+    assert index.read_frames(path, rows) == data["frames"][5:10]
+    assert index.read_frames(path, index.rows(10.0, 20.0)) == []
+
+def test_frame_index_save_load_and_staleness(pose_json, tmp_path):
+    """Testa a persistência do índice e a detecção de arquivo modificado."""
+    path, data = pose_json
+    index = build_json_frame_index(path)
+    index_path = frame_index_path(path)
+    index.save(index_path)
+
+    loaded = FrameIndex.load(index_path)
+    assert loaded.offsets.tolist() == index.offsets.tolist()
+    assert loaded.timestamps.tolist() == index.timestamps.tolist()
+    assert loaded.header == index.header
+    assert loaded.is_current(path)
+
+    data["frames"] = data["frames"][:3]
+    with open(path, "w") as f:
+        json.dump(data, f)
+    assert not loaded.is_current(path)
+    os.remove(path)
+    assert not loaded.is_current(path)
@@ -0,0 +1,140 @@
+import os
+import sqlite3
+import time
+import pytest
+from src.extractor_pool import ExtractorPool
+from src.job_queue import JobQueue, JOB_DONE, JOB_FAILED, JOB_QUEUED, _process_alive
+from src.pose_models import PoseLandmark
+from src.pose_storage import PoseStorage
+
+def _landmarks(n_frames):
+    return [{j: PoseLandmark(x=0.3 + 0.01 * j, y=0.2 + 0.02 * j, z=0.0, visibility=0.9)
+             for j in range(33)} for _ in range(n_frames)]
+
+class StoredPoseExtractor:
+    """Extrator de teste: devolve landmarks sintéticos e informa o progresso como o PoseExtractor."""
+
+    def __init__(self, n_frames):
+        self.n_frames = n_frames
+
+    def iter_video(self, video_path, progress_callback=None):
+        for i, landmarks in enumerate(_landmarks(self.n_frames)):
+            progress_callback(i + 1, self.n_frames)
+            yield i, landmarks
+
+    def get_fps(self):
+        return 30.0
+
+    def get_resolution(self):
+        return (64, 64)
+
+    def get_total_frames(self):
+        return self.n_frames
+
+    def reset(self):
+        pass
+
+    def close(self):
+        pass
+
+def test_job_queue_runs_extractions_concurrently(tmp_path, write_video):
+    """Testa o progresso gravado pelos workers, a deduplicação e a persistência das tarefas."""
+    storage_dir = tmp_path / "pose"
+    db_path = tmp_path / "jobs.sqlite"
+    video_a = write_video(tmp_path / "a.mp4", 20, shade=10)
+    video_b = write_video(tmp_path / "b.mp4", 25, shade=40)
+
+    jobs = JobQueue(db_path, storage_dir=str(storage_dir), workers=2)
+    try:
+        job_a = jobs.submit_extraction(video_a)
+        job_b = jobs.submit_extraction(video_b)
+        assert job_a.job_id != job_b.job_id and job_a.status == JOB_QUEUED
+        # O mesmo vídeo em extração devolve a tarefa existente
+        assert jobs.submit_extraction(video_a).job_id == job_a.job_id
+
+        finished = jobs.wait([job_a.job_id, job_b.job_id], timeout=120)
+        # Os vídeos não têm pessoas: todos os frames são lidos, mas não há poses para salvar
+        assert [(job.frames_done, job.total_frames) for job in finished] == [(20, 20), (25, 25)]
+        assert all(job.status == JOB_FAILED and job.error for job in finished)
+
+        # Uma nova tentativa depois de uma falha cria outra tarefa
+        retry = jobs.submit_extraction(video_a)
+        assert retry.job_id != job_a.job_id
+        jobs.wait([retry.job_id], timeout=120)
+    finally:
+        jobs.shutdown()
+
+    # Outra instância (ex.: após recarregar a página) vê o estado gravado no banco
+    reopened = JobQueue(db_path, storage_dir=str(storage_dir))
+    assert reopened.get(job_b.job_id).to_dict() == finished[1].to_dict()
+    assert [job.job_id for job in reopened.recent_jobs()] == [retry.job_id, job_b.job_id, job_a.job_id]
+    assert reopened.get(999) is None
+    assert reopened._executor is None
+
+def test_job_queue_with_extractor_pool(tmp_path, write_video):
+    """Testa as tarefas em threads com extratores do pool e os vídeos já armazenados."""
+    storage_dir = tmp_path / "pose"
+    pool = ExtractorPool(size=2, factory=lambda: StoredPoseExtractor(10))
+    storage = PoseStorage(str(storage_dir), pose_index=True)
+    jobs = JobQueue(tmp_path / "jobs.sqlite", extractor_pool=pool, storage=storage)
+    assert jobs.storage is storage and jobs.storage_dir == str(storage_dir) and jobs.pose_index
+    videos = [write_video(tmp_path / f"dance{i}.mp4", 10, shade=10 + 30 * i) for i in range(2)]
+    try:
+        submitted = [jobs.submit_extraction(video) for video in videos]
+        finished = jobs.wait([job.job_id for job in submitted], timeout=60)
+    finally:
+        jobs.shutdown()
+
+    assert [(job.status, job.progress, job.frames_done, job.total_frames) for job in finished] == [
+        (JOB_DONE, 1.0, 10, 10)] * 2
+    assert not any(jobs.has_active_job(video) for video in videos)
+    assert all(len(jobs.storage.load_pose_data(video).frames) == 10 for video in videos)
+    # O storage compartilhado calcula o hash de cada vídeo uma única vez
+    assert storage.fingerprinter.stats()["misses"] == 2
+    assert pool.get_stats()["checkouts"] == 2 and pool.in_use == 0
+
+    # Dados já armazenados: devolve a tarefa concluída, ou cria uma sem extração
+    assert jobs.submit_extraction(videos[0]).job_id == submitted[0].job_id
+    stored_video = write_video(tmp_path / "stored.mp4", 5, shade=90)
+    assert jobs.storage.save_pose_data(stored_video, 30.0, (64, 64), 5, _landmarks(5))
+    stored = jobs.submit_extraction(stored_video)
+    assert stored.status == JOB_DONE and stored.progress == 1.0
+    assert pool.get_stats()["checkouts"] == 2
+
+    missing = jobs.submit_extraction(str(tmp_path / "missing.mp4"))
+    assert missing.status == JOB_FAILED and missing.error
+
+def test_job_queue_resumes_orphaned_jobs(tmp_path, write_video):
+    """Testa a retomada das tarefas ativas de um processo que não existe mais."""
+    storage_dir = tmp_path / "pose"
+    db_path = tmp_path / "jobs.sqlite"
+    JobQueue(db_path, storage_dir=str(storage_dir))
+    orphan = write_video(tmp_path / "orphan.mp4", 12, shade=70)
+    dead_pid = 2 ** 22 + 12345
+    with sqlite3.connect(str(db_path)) as conn:
+        for path, status in [(orphan, "running"), (str(tmp_path / "gone.mp4"), "queued")]:
+            conn.execute("INSERT INTO jobs (video_path, video_hash, status, progress, owner_pid, "
+                         "created_at, updated_at) VALUES (?, ?, ?, 0.4, ?, ?, ?)",
+                         (path, os.path.basename(path), status, dead_pid, time.time(), time.time()))
+
+    resumed = JobQueue(db_path, storage_dir=str(storage_dir), workers=1)
+    try:
+        gone_job, orphan_job = resumed.recent_jobs()
+        assert gone_job.status == JOB_FAILED
+        assert orphan_job.owner_pid == os.getpid()
+        assert resumed.has_active_job(orphan) and not resumed.has_active_job(gone_job.video_path)
+        finished = resumed.wait([orphan_job.job_id], timeout=120)[0]
+        assert not finished.is_active and finished.frames_done == 12
+    finally:
+        resumed.shutdown()
+
+def test_process_alive_handles_invalid_pids():
+    """Testa a verificação de processos com PIDs inválidos ou fora do intervalo."""
+    assert _process_alive(os.getpid())
+    for pid in (None, 0, -1, 2 ** 22 + 12345, 2 ** 64):
+        assert not _process_alive(pid)
+
+def test_job_queue_invalid_workers(tmp_path):
+    """Testa a validação do número de workers."""
+    with pytest.raises(ValueError):
+        JobQueue(tmp_path / "jobs.sqlite", storage_dir=str(tmp_path), workers=0)
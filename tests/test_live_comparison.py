@@ -0,0 +1,101 @@
+import time
+import pytest
+import numpy as np
+from src.live_comparison import LiveComparator, OnlineAligner
+from src.comparador_movimento import ComparadorMovimento
+from src.pose_models import PoseLandmark
+from src.pose_track import PoseTrack
+
+def _pose(ti):
+    return {i: PoseLandmark(x=0.5 + 0.3 * np.sin(ti + i), y=0.5 + 0.3 * np.cos(ti + 2 * i),
+                            z=0.0, visibility=0.9) for i in range(33)}
+
+REFERENCE = [_pose(ti) for ti in np.linspace(0, 2 * np.pi, 60)]
+
+class FrameIndexExtractor:
+    """Extrator de teste: o frame i do vídeo (faixa clara na coluna 2 * i) tem a pose i da referência."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.resets = 0
+
+    def reset(self):
+        self.resets += 1
+
+    def process_frame(self, frame):
+        time.sleep(self.delay)
+        index = int(np.argmax(frame.mean(axis=(0, 2)))) // 2
+        return REFERENCE[index] if index < len(REFERENCE) else None
+
+@pytest.fixture
+def reference_track():
+    return PoseTrack.from_landmarks(REFERENCE, 30.0, dtype=np.float64)
+
+def test_online_aligner_follows_slower_performance(reference_track):
+    """Testa que o alinhamento online acompanha uma execução mais lenta, com espera no início."""
+    comparador = ComparadorMovimento()
+    live = LiveComparator(reference_track, extractor=FrameIndexExtractor(), comparador=comparador,
+                          window_seconds=1.0)
+    performance = [None] * 5 + [REFERENCE[0]] * 10 + [pose for pose in REFERENCE for _ in range(2)]
+
+    scores = [live.update(landmarks, i, i / 30.0) for i, landmarks in enumerate(performance)]
+    assert scores[0].reference_frame is None and scores[0].rolling_similarity is None
+    positions = [score.reference_frame for score in scores[15:]]
+    assert positions[-1] == 59
+    assert all(abs(position - k // 2) <= 1 for k, position in enumerate(positions))
+    assert all(score.frame_similarity == pytest.approx(1.0) for score in scores[15:])
+    assert scores[-1].rolling_similarity == pytest.approx(1.0)
+
+    # Poses diferentes da referência baixam a similaridade móvel (janela de 1 s)
+    other = _pose(10.0)
+    for k in range(30):
+        score = live.update({i: PoseLandmark(x=lm.x + 0.2, y=lm.y, z=0.0, visibility=0.9)
+                             for i, lm in other.items()}, len(performance) + k, (len(performance) + k) / 30.0)
+    assert score.rolling_similarity < 0.9
+
+    # O alinhador também pode ser usado diretamente com os arrays do track
+    aligner = OnlineAligner(reference_track, comparador, np.ones(33))
+    positions = [aligner.step(frame)[0] for frame in reference_track.data[:30]]
+    assert positions[-1] == 29
+
+def test_run_from_file_without_drops(tmp_path, reference_track, write_video):
+    """Testa a leitura de um arquivo como câmera, processando todos os frames."""
+    video = write_video(tmp_path / "live.mp4", 45, size=(128, 64), stripe=255)
+    live = LiveComparator(reference_track, extractor=FrameIndexExtractor(), drop_policy="none",
+                          queue_size=4, max_latency=None)
+    scores = list(live.run(video, realtime=False))
+
+    assert [score.frame_index for score in scores] == list(range(45))
+    assert scores[10].timestamp == pytest.approx(10 / 30.0)
+    assert scores[-1].reference_frame == 44
+    assert live.stats["frames_scored"] == 45 and live.stats["dropped_frames"] == 0
+    # O rastreamento do extrator é reiniciado na criação e no início de cada execução
+    assert live.extractor.resets == 2
+
+def test_run_drops_frames_when_inference_falls_behind(tmp_path, reference_track, write_video):
+    """Testa o descarte de frames e a latência limitada com inferência lenta em tempo real."""
+    video = write_video(tmp_path / "live.mp4", 45, size=(128, 64), stripe=255)
+    received = []
+    live = LiveComparator(reference_track, extractor=FrameIndexExtractor(delay=0.08),
+                          max_latency=0.5)
+    scores = list(live.run(video, callback=received.append))
+
+    assert received == scores
+    assert live.stats["dropped_frames"] > 0
+    assert live.stats["frames_read"] == 45
+    assert live.stats["frames_scored"] + live.stats["dropped_frames"] == 45
+    # O frame pontuado é sempre um dos mais recentes: a latência não acumula
+    assert live.stats["max_latency"] < 0.3
+    assert [score.frame_index for score in scores] == sorted(score.frame_index for score in scores)
+    assert scores[-1].reference_frame >= 40
+
+    # Interromper a iteração encerra a leitura
+    iterator = live.run(video)
+    next(iterator)
+    iterator.close()
+    assert live.stats["frames_read"] < 45
+
+    with pytest.raises(ValueError):
+        next(live.run(str(tmp_path / "missing.mp4")))
+    with pytest.raises(ValueError):
+        LiveComparator(reference_track, extractor=FrameIndexExtractor(), drop_policy="oldest")
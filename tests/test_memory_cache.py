@@ -0,0 +1,83 @@
+import numpy as np
+from unittest.mock import patch
+
+from src import memory_cache
+from src.memory_cache import MemoryCache, estimate_size
+from src.pose_models import PoseLandmark
+from src.results_cache import ResultsCache
+from src.comparison_results import ComparisonResults
+
+def test_lru_eviction_by_bytes():
+    """Testa a remoção LRU quando o orçamento de bytes é excedido."""
+    cache = MemoryCache(max_bytes=30, sizeof=lambda value: 10)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache["c"] = 3
+    assert cache["a"] == 1  # "a" passa a ser o mais recente
+
+    cache["d"] = 4
+    assert "b" not in cache
+    assert list(cache) == ["c", "a", "d"]
+    assert cache.current_bytes == 30
+    assert cache.stats()["evictions"] == 1
+
+def test_oversized_entry_is_not_stored():
+    """Testa que entradas maiores que o orçamento não são armazenadas."""
+    cache = MemoryCache(max_bytes=10, sizeof=len)
+    cache["small"] = "abc"
+    cache["big"] = "x" * 20
+    assert "big" not in cache
+    assert cache["small"] == "abc"
+
+def test_replace_updates_bytes():
+    """Testa que substituir uma entrada atualiza a contabilidade de bytes."""
+    cache = MemoryCache(max_bytes=100, sizeof=len)
+    cache["a"] = "x" * 40
+    cache["a"] = "x" * 10
+    assert cache.current_bytes == 10
+    del cache["a"]
+    assert cache.current_bytes == 0 and len(cache) == 0
+
+def test_hits_misses_and_ttl():
+    """Testa os contadores e a expiração das entradas."""
+    now = [100.0]
+    with patch.object(memory_cache.time, "monotonic", lambda: now[0]):
+        cache = MemoryCache(max_bytes=1000, ttl_seconds=5, sizeof=lambda value: 1)
+        cache["a"] = 1
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+
+        now[0] += 10
+        assert "a" not in cache
+        assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["expirations"] == 1
+    assert stats["entries"] == 0
+
+def test_estimate_size():
+    """Testa a estimativa de tamanho de objetos aninhados e arrays."""
+    array = np.zeros(100_000, dtype=np.float64)
+    assert estimate_size(array) >= array.nbytes
+    # Views contam os dados do array original uma única vez
+    assert estimate_size([array, array[10:]]) < 2 * array.nbytes
+
+    frames = [{i: PoseLandmark(0.1, 0.2, 0.3, 0.9) for i in range(33)} for _ in range(10)]
+    assert estimate_size(frames) > estimate_size(frames[:1]) * 5
+
+def test_results_cache_memory_layer(tmp_path):
+    """Testa o cache em memória na frente dos arquivos do ResultsCache."""
+    results = ComparisonResults(global_score=0.9, frame_scores=[0.9])
+    cache = ResultsCache(str(tmp_path / "cache"), memory_cache=MemoryCache())
+    cache.set("key", results)
+
+    first = cache.get("key")
+    assert first is not None
+    # O segundo acesso vem da memória (mesmo objeto, sem reler o arquivo)
+    assert cache.get("key") is first
+    assert cache.memory_cache.stats()["hits"] == 1
+
+    cache.clear("key")
+    assert cache.get("key") is None
@@ -6,7 +6,11 @@ import logging
 import time
 import sys
 from tqdm import tqdm
-from src.pose_estimation import PoseExtractor, PoseLandmark
+from src.pose_estimation import (PoseExtractor, PoseLandmark, PipelineTimings, plan_frame_chunks,
+                                 iter_sampled_frames, interpolate_landmarks, compute_roi,
+                                 landmark_errors, ExtractionAccuracyReport)
+from mediapipe.framework.formats import landmark_pb2
+from src.extraction_params import ExtractionParams
 from src.comparison_params import ComparisonParams
 from src.comparison_results import ComparisonResults
 from src.pose_models import PoseLandmark
@@ -277,6 +281,192 @@ def test_pose_extractor_with_different_confidence():
         assert extractor is not None
         assert extractor.pose is not None
 
+def test_plan_frame_chunks():
+    """Testa a divisão do vídeo em intervalos para extração paralela."""
+    chunks = plan_frame_chunks(100, 4, warmup_frames=5)
+    assert chunks == [(0, 0, 25), (20, 25, 50), (45, 50, 75), (70, 75, None)]
+
+    # Os intervalos cobrem todos os frames sem sobreposição
+    starts = [start for _, start, _ in chunks]
+    ends = [end for _, _, end in chunks[:-1]]
+    assert starts[1:] == ends
+
+def test_plan_frame_chunks_edge_cases():
+    """Testa a divisão com mais intervalos que frames e vídeo sem contagem."""
+    assert plan_frame_chunks(3, 8) == [(0, 0, 1), (1, 1, 2), (2, 2, None)]
+    assert plan_frame_chunks(0, 4) == [(0, 0, None)]
+
+def test_process_video_pipelined(test_video_path):
+    """Testa o processamento em pipeline com filas limitadas."""
+    extractor = PoseExtractor(
+        extraction_params=ExtractionParams(pipeline=True, decode_queue_size=2, output_queue_size=2)
+    )
+    progress = []
+
+    assert extractor.process_video(test_video_path, progress_callback=lambda n, total: progress.append(n))
+    assert len(extractor.get_landmarks()) == 30
+    assert progress[-1] == 30
+
+    timings = extractor.get_stage_timings()
+    assert timings["frames"] == 30
+    assert timings["bottleneck"] in ("decode", "inference", "postprocess", "write")
+
+def test_pipeline_timings():
+    """Testa a identificação do estágio gargalo do pipeline."""
+    timings = PipelineTimings(decode=0.5, inference=2.0, postprocess=0.1, write=0.3, wall=2.1, frames=10)
+    assert timings.bottleneck() == "inference"
+
+    data = timings.to_dict()
+    assert data["frames"] == 10
+    assert data["bottleneck"] == "inference"
+
+def test_iter_sampled_frames(test_video_path):
+    """Testa a amostragem de frames com stride."""
+    cap = cv2.VideoCapture(test_video_path)
+    frames = list(iter_sampled_frames(cap, stride=4, resolution=(320, 240)))
+    cap.release()
+
+    assert [idx for idx, _ in frames] == list(range(30))
+    sampled = [idx for idx, frame in frames if frame is not None]
+    assert sampled == list(range(0, 30, 4))
+    assert frames[0][1].shape == (240, 320, 3)
+
+def test_interpolate_landmarks():
+    """Testa a interpolação linear de landmarks."""
+    start = {0: PoseLandmark(0.0, 0.0, 0.0, 1.0), 1: PoseLandmark(1.0, 1.0, 1.0, 1.0)}
+    end = {0: PoseLandmark(1.0, 2.0, 4.0, 0.5)}
+
+    result = interpolate_landmarks(start, end, 0.25)
+    assert list(result.keys()) == [0]
+    assert result[0].x == pytest.approx(0.25)
+    assert result[0].y == pytest.approx(0.5)
+    assert result[0].z == pytest.approx(1.0)
+    assert result[0].visibility == pytest.approx(0.875)
+
+def test_fill_skipped_frames(pose_extractor):
+    """Testa o preenchimento dos frames pulados."""
+    first = {0: PoseLandmark(0.0, 0.0, 0.0, 1.0)}
+    last = {0: PoseLandmark(1.0, 1.0, 1.0, 1.0)}
+    pose_extractor.landmarks = [first, None, None, last, None, None, None]
+
+    # Modo padrão mantém as lacunas
+    pose_extractor._fill_skipped_frames(3)
+    assert pose_extractor.landmarks[1] is None
+
+    pose_extractor.extraction_params = ExtractionParams(frame_stride=3, fill_skipped="interpolate")
+    pose_extractor._fill_skipped_frames(3)
+    assert pose_extractor.landmarks[1][0].x == pytest.approx(1 / 3)
+    assert pose_extractor.landmarks[2][0].x == pytest.approx(2 / 3)
+    # Frames após o último frame amostrado permanecem vazios
+    assert pose_extractor.landmarks[4] is None
+
+def test_frame_stride_from_target_fps(pose_extractor):
+    """Testa o cálculo do stride a partir do FPS alvo."""
+    pose_extractor.fps = 30.0
+    pose_extractor.extraction_params = ExtractionParams(target_fps=10)
+    assert pose_extractor._get_frame_stride() == 3
+
+    pose_extractor.extraction_params = ExtractionParams(frame_stride=2)
+    assert pose_extractor._get_frame_stride() == 2
+
+def test_iter_video(test_video_path):
+    """Testa a extração frame a frame sem acúmulo de landmarks."""
+    extractor = PoseExtractor(extraction_params=ExtractionParams(model_complexity=1, frame_stride=3))
+    frames = extractor.iter_video(test_video_path)
+
+    # As informações do vídeo ficam disponíveis antes do consumo do iterador
+    assert extractor.get_fps() == pytest.approx(30.0)
+    assert extractor.get_total_frames() == 30
+
+    assert [idx for idx, _ in frames] == list(range(30))
+    assert extractor.get_landmarks() == []
+
+    with pytest.raises(IOError):
+        extractor.iter_video("inexistente.mp4")
+
+def test_reset_clears_video_state(test_video_path):
+    """Testa que reset descarta o estado do vídeo anterior e mantém o extrator utilizável."""
+    extractor = PoseExtractor(extraction_params=ExtractionParams(model_complexity=1))
+    assert extractor.process_video(test_video_path)
+    assert len(extractor.get_landmarks()) == 30
+
+    extractor.reset()
+    assert extractor.get_landmarks() == []
+    assert extractor.get_fps() == 0.0 and extractor.get_total_frames() == 0
+    assert extractor.get_resolution() == (0, 0)
+    assert extractor.process_frame(np.zeros((480, 640, 3), dtype=np.uint8)) is None
+    assert extractor.process_video(test_video_path) and len(extractor.get_landmarks()) == 30
+
+    # Um extrator fechado também pode ser reiniciado
+    extractor.close()
+    extractor.reset()
+
+def test_compute_roi():
+    """Testa o cálculo da região de interesse com margem."""
+    assert compute_roi((100, 100, 200, 300), (640, 480), 0.1) == (80, 80, 220, 320)
+    # A região é limitada às bordas do frame
+    assert compute_roi((0, 0, 600, 470), (640, 480), 0.5) == (0, 0, 640, 480)
+    # Caixas degeneradas usam o frame inteiro
+    assert compute_roi((10, 10, 10, 10), (640, 480), 0.2) == (0, 0, 640, 480)
+
+def test_adaptive_light_detection_maps_roi():
+    """Testa a conversão das coordenadas do recorte para o frame completo."""
+    extractor = PoseExtractor(extraction_params=ExtractionParams(
+        adaptive=True, model_complexity=1, light_model_complexity=1))
+
+    class FakePose:
+        def __init__(self):
+            self.shapes = []
+
+        def process(self, image):
+            self.shapes.append(image.shape)
+            result = landmark_pb2.NormalizedLandmarkList()
+            result.landmark.add(x=0.5, y=0.5, z=0.1, visibility=0.9)
+
+            class Results:
+                pose_landmarks = result
+            return Results()
+
+    extractor.light_pose.close()
+    extractor.light_pose = FakePose()
+    extractor._roi = (100, 50, 300, 250)
+
+    landmarks = extractor._detect_pose_light(np.zeros((480, 640, 3), dtype=np.uint8))
+    assert extractor.light_pose.shapes == [(200, 200, 3)]
+    assert landmarks.landmark[0].x == pytest.approx(200 / 640)
+    assert landmarks.landmark[0].y == pytest.approx(150 / 480)
+    assert landmarks.landmark[0].z == pytest.approx(0.1 * 200 / 640)
+    assert extractor.inference_counts["light"] == 1
+
+def test_process_video_adaptive(test_video_path):
+    """Testa a extração adaptativa com keyframes."""
+    extractor = PoseExtractor(extraction_params=ExtractionParams(
+        adaptive=True, model_complexity=1, light_model_complexity=1, keyframe_interval=5))
+
+    assert extractor.process_video(test_video_path)
+    assert len(extractor.get_landmarks()) == 30
+    # Sem pessoa no vídeo o modelo pesado é usado em todos os frames
+    assert extractor.inference_counts == {"heavy": 30, "light": 0}
+
+def test_landmark_errors():
+    """Testa o erro entre landmarks de duas extrações."""
+    reference = [{0: PoseLandmark(0.0, 0.0, 0.0, 1.0)}, None, {0: PoseLandmark(1.0, 1.0, 0.0, 1.0)}]
+    candidate = [{0: PoseLandmark(0.3, 0.4, 0.0, 1.0)}, {0: PoseLandmark(0.0, 0.0, 0.0, 1.0)}, None]
+
+    errors = landmark_errors(reference, candidate)
+    assert errors.tolist() == pytest.approx([0.5])
+
+def test_extraction_accuracy_report():
+    """Testa o relatório de precisão x velocidade."""
+    report = ExtractionAccuracyReport(
+        frames=10, reference_time=4.0, adaptive_time=1.0, reference_detected=10,
+        adaptive_detected=9, detection_agreement=0.9, mean_error=0.01, max_error=0.05,
+        heavy_inferences=2, light_inferences=8
+    )
+    assert report.speedup == pytest.approx(4.0)
+    assert report.to_dict()["speedup"] == pytest.approx(4.0)
+    assert "speedup 4.00x" in str(report)
+
 # Removido o teste abaixo pois depende de arquivo externo inexistente
 # def test_process_video():
 #     """Testa o processamento de um vídeo completo real."""
@@ -0,0 +1,149 @@
+import pytest
+import numpy as np
+from src.pose_index import PoseIndex, window_embeddings, POSE_INDEX_NAME
+from src.pose_models import PoseLandmark
+from src.pose_storage import PoseStorage, main as storage_main
+from src.pose_track import PoseTrack
+
+# Posição base (x, y) das articulações usadas nos embeddings
+BASE_POSE = {
+    0: (0.50, 0.15), 11: (0.45, 0.30), 12: (0.55, 0.30), 13: (0.42, 0.42), 14: (0.58, 0.42),
+    15: (0.40, 0.52), 16: (0.60, 0.52), 23: (0.47, 0.55), 24: (0.53, 0.55), 25: (0.47, 0.72),
+    26: (0.53, 0.72), 27: (0.47, 0.90), 28: (0.53, 0.90)
+}
+
+def _dance(seed, n_frames=300, fps=30.0, shift=(0.0, 0.0), scale=1.0):
+    """Gera landmarks de uma coreografia não periódica (passeio aleatório suavizado)."""
+    rng = np.random.default_rng(seed)
+    motion = np.cumsum(rng.normal(0, 0.02, (n_frames, 8)), axis=0)
+    kernel = np.ones(9) / 9
+    motion = np.stack([np.convolve(motion[:, k], kernel, mode="same") for k in range(8)], axis=1)
+    frames = []
+    for i in range(n_frames):
+        landmarks = {}
+        for j, (x, y) in BASE_POSE.items():
+            dx = dy = 0.0
+            if j in (13, 15):
+                dx, dy = motion[i, 0], motion[i, 1] * (2 if j == 15 else 1)
+            elif j in (14, 16):
+                dx, dy = motion[i, 2], motion[i, 3] * (2 if j == 16 else 1)
+            elif j in (25, 27):
+                dx, dy = motion[i, 4], motion[i, 5]
+            elif j in (26, 28):
+                dx, dy = motion[i, 6], motion[i, 7]
+            landmarks[j] = PoseLandmark(x=shift[0] + scale * (x + dx), y=shift[1] + scale * (y + dy),
+                                        z=0.0, visibility=0.9)
+        frames.append(landmarks)
+    return frames
+
+def _track(frames, fps=30.0):
+    return PoseTrack.from_landmarks(frames, fps)
+
+def test_window_embeddings():
+    """Testa o formato e a invariância dos embeddings à posição e à escala."""
+    frames = _dance(1)
+    embeddings, starts = window_embeddings(_track(frames))
+    assert embeddings.shape == (17, 8 * 12 * 2)
+    assert embeddings.dtype == np.float32
+    np.testing.assert_allclose(starts, np.arange(0.0, 8.01, 0.5))
+    np.testing.assert_allclose(np.linalg.norm(embeddings, axis=1), 1.0, rtol=1e-5)
+
+    moved, _ = window_embeddings(_track(_dance(1, shift=(0.1, -0.05), scale=0.6)))
+    np.testing.assert_allclose(moved, embeddings, atol=1e-5)
+
+    # Janelas com poucos frames com pose são descartadas; FPS diferente gera as mesmas janelas
+    gaps = [None if 30 <= i < 90 else frame for i, frame in enumerate(frames)]
+    _, gap_starts = window_embeddings(_track(gaps))
+    assert not any(0.5 <= start < 2.5 for start in gap_starts)
+    half_fps, _ = window_embeddings(_track(frames[::2], fps=15.0))
+    assert half_fps.shape == embeddings.shape
+    assert np.sum(half_fps * embeddings, axis=1).min() > 0.99
+
+    assert window_embeddings(_track([None] * 10))[0].shape == (0, 192)
+
+def test_search_finds_clip_and_offset(tmp_path):
+    """Testa a busca de um trecho entre vários vídeos e a persistência do índice."""
+    index = PoseIndex(tmp_path / POSE_INDEX_NAME)
+    for seed in range(5):
+        assert index.add(f"hash_{seed}", f"video_{seed}.mp4", _track(_dance(seed))) == 17
+    assert len(index) == 5 and "hash_3" in index
+
+    clip = _track(_dance(3)[90:150])  # 3 s a 5 s do vídeo 3
+    matches = index.search(clip, top_k=3)
+    assert [match.video_path for match in matches][0] == "video_3.mp4"
+    assert matches[0].score == pytest.approx(1.0, abs=1e-4)
+    assert matches[0].offset_seconds == pytest.approx(3.0)
+    assert len(matches) == 3 and matches[0].score > matches[1].score >= matches[2].score
+
+    assert [m.video_hash for m in index.search(clip, exclude=["hash_3"])][0] != "hash_3"
+
+    # Reinserção substitui as janelas do vídeo; remoção mantém o restante do índice consistente
+    index.add("hash_3", "video_3.mp4", _track(_dance(3)[:120]))
+    assert len(index) == 5 and len(index.row_time) == 4 * 17 + 5
+    assert index.remove("hash_1") and not index.remove("hash_1")
+    index.save()
+
+    loaded = PoseIndex(tmp_path / POSE_INDEX_NAME)
+    assert [video["video_hash"] for video in loaded.videos] == ["hash_0", "hash_2", "hash_4", "hash_3"]
+    match = loaded.search(_track(_dance(3)[30:90]), top_k=1)[0]
+    assert (match.video_hash, match.offset_seconds) == ("hash_3", pytest.approx(1.0))
+    assert loaded.search(_track(_dance(4)[150:]), top_k=1)[0].video_hash == "hash_4"
+
+    # Parâmetros diferentes: o arquivo é ignorado
+    assert len(PoseIndex(tmp_path / POSE_INDEX_NAME, min_visibility=0.7)) == 0
+
+def test_storage_incremental_index(tmp_path):
+    """Testa a inserção no índice ao salvar dados de pose, a reconstrução e a busca."""
+    storage_dir = tmp_path / "pose"
+    videos = []
+    for seed in range(3):
+        path = tmp_path / f"dance_{seed}.mp4"
+        path.write_bytes(f"video {seed}".encode() * 10)
+        videos.append(str(path))
+
+    storage = PoseStorage(str(storage_dir), pose_index=True)
+    assert storage.save_pose_data(videos[0], 30.0, (640, 480), 300, _dance(0))
+    assert storage.save_pose_stream(videos[1], 30.0, (640, 480), 300, enumerate(_dance(1)))
+    npy_storage = PoseStorage(str(storage_dir), storage_format="npy", pose_index=True)
+    assert len(npy_storage.pose_index) == 2
+    assert npy_storage.save_pose_data(videos[2], 30.0, (640, 480), 300, _dance(2))
+
+    reopened = PoseStorage(str(storage_dir))
+    matches = reopened.find_similar(videos[1], top_k=5, start_time=4.0, end_time=6.0)
+    assert sorted(match.video_path for match in matches) == [videos[0], videos[2]]
+
+    # O trecho de um vídeo encontra o próprio vídeo quando ele não é o consultado
+    clip_path = tmp_path / "clip.mp4"
+    clip_path.write_bytes(b"clip")
+    assert reopened.save_pose_data(str(clip_path), 30.0, (640, 480), 60, _dance(2)[120:180])
+    match = reopened.find_similar(str(clip_path), top_k=1)[0]
+    assert match.video_path == videos[2]
+    assert match.offset_seconds == pytest.approx(4.0)
+
+    # Reconstrução a partir dos arquivos (JSON e binário) do diretório
+    (storage_dir / POSE_INDEX_NAME).unlink()
+    assert storage_main(["--storage-dir", str(storage_dir), "index"]) == 0
+    rebuilt = PoseIndex(storage_dir / POSE_INDEX_NAME)
+    assert sorted(video["video_path"] for video in rebuilt.videos) == sorted(videos + [str(clip_path)])
+    assert storage_main(["--storage-dir", str(storage_dir), "search", videos[0], "--top-k", "2"]) == 0
+
+def test_concurrent_writers_keep_each_others_videos(tmp_path):
+    """Testa que instâncias abertas antes das gravações das outras não perdem os vídeos delas."""
+    index_path = tmp_path / POSE_INDEX_NAME
+    first, second = PoseIndex(index_path), PoseIndex(index_path)
+    first.add("hash_a", "a.mp4", _track(_dance(0)))
+    first.save()
+    second.add("hash_b", "b.mp4", _track(_dance(1)))
+    second.save()
+    assert "hash_a" in second and "hash_b" in second
+    assert sorted(video["video_hash"] for video in PoseIndex(index_path).videos) == ["hash_a", "hash_b"]
+
+    # Uma remoção de uma instância prevalece; os demais vídeos vêm do disco
+    first.add("hash_c", "c.mp4", _track(_dance(2)))
+    second.remove("hash_a")
+    second.save()
+    first.save()
+    stored = PoseIndex(index_path)
+    assert sorted(video["video_hash"] for video in stored.videos) == ["hash_b", "hash_c"]
+    assert len(stored.row_time) == len(stored.row_video) == len(stored.embeddings)
+    assert np.all(np.diff(stored.row_video) >= 0)
@@ -2,11 +2,14 @@ import pytest
 import os
 import json
 from pathlib import Path
-from src.pose_storage import PoseStorage, PoseData, PoseFrame
+from src.memory_cache import MemoryCache
+from src.pose_storage import PoseStorage, PoseData, PoseFrame, main as storage_main
 from src.pose_models import PoseLandmark
+from src.frame_index import FrameIndex
 from datetime import datetime
 import numpy as np
 from src.comparison_results import ComparisonResults, DanceComparison
+from src.landmark_comparison import LandmarkComparison
 
 @pytest.fixture
 def storage_dir(tmp_path):
@@ -126,7 +129,7 @@ def sample_comparison_results(temp_video_files):
 def test_pose_storage_initialization(pose_storage, storage_dir):
     """Testa a inicialização do PoseStorage."""
     assert pose_storage.storage_dir == storage_dir
-    assert isinstance(pose_storage.cache, dict)
+    assert isinstance(pose_storage.cache, MemoryCache)
     assert len(pose_storage.cache) == 0
 
 def test_generate_video_hash(pose_storage):
@@ -215,6 +218,56 @@ def test_save_and_load_comparison_results(pose_storage, sample_comparison_result
     assert loaded_results.video2_fps == sample_comparison_results.video2_fps
     assert len(loaded_results.frame_comparisons) == len(sample_comparison_results.frame_comparisons)
 
+def test_comparison_results_keyed_by_params(pose_storage, sample_comparison_results):
+    """Testa que resultados salvos com outros parâmetros não são reaproveitados."""
+    video1_path = sample_comparison_results.video1_path
+    video2_path = sample_comparison_results.video2_path
+    params = {"comparison_params": {"metric": "dtw"}, "video1_landmark_weights": {"shoulder": 0.9}}
+
+    assert pose_storage.save_comparison_results(video1_path, video2_path, sample_comparison_results,
+                                                params=params, comparator_version="1.1.0")
+
+    assert pose_storage.load_comparison_results(video1_path, video2_path, params=params,
+                                                comparator_version="1.1.0") is not None
+    changed = {**params, "video1_landmark_weights": {"shoulder": 0.5}}
+    assert pose_storage.load_comparison_results(video1_path, video2_path, params=changed,
+                                                comparator_version="1.1.0") is None
+    assert pose_storage.load_comparison_results(video1_path, video2_path, params=params,
+                                                comparator_version="1.0.0") is None
+    assert pose_storage.results_cache.stats()["hits"] == 1
+    assert pose_storage.results_cache.stats()["misses"] == 2
+
+def test_save_and_load_landmark_comparison(pose_storage, temp_video_files):
+    """Testa o salvamento e carregamento dos arrays por landmark de uma comparação."""
+    rng = np.random.default_rng(3)
+    similarities = rng.random((20, 33))
+    similarities[2, 5] = np.nan
+    comparison = LandmarkComparison(
+        frames1=np.arange(20), frames2=np.arange(20) + 1, similarities=similarities,
+        translations=rng.random((20, 3)), scales=rng.random(20),
+        temporal_alignment={"method": "dtw", "path_length": 20},
+        video_info={"video1_fps": 30.0, "video1_resolution": (640, 480)}
+    )
+    video1_path, video2_path = temp_video_files["video1"], temp_video_files["video2"]
+    params = {"comparison_params": {"metric": "dtw"}, "min_visibility": 0.5}
+
+    assert pose_storage.save_landmark_comparison(video1_path, video2_path, comparison,
+                                                 params=params, comparator_version="1.2.0")
+    loaded = pose_storage.load_landmark_comparison(video1_path, video2_path, params=params,
+                                                   comparator_version="1.2.0")
+    assert loaded is not None and len(loaded) == 20
+    np.testing.assert_array_equal(loaded.similarities, similarities)
+    np.testing.assert_array_equal(loaded.frames2, comparison.frames2)
+    assert loaded.temporal_alignment == comparison.temporal_alignment
+    assert loaded.video_info["video1_resolution"] == (640, 480)
+
+    assert pose_storage.load_landmark_comparison(video1_path, video2_path, params=params) is None
+    assert pose_storage.load_landmark_comparison(video2_path, video1_path, params=params,
+                                                 comparator_version="1.2.0") is None
+    pose_storage.results_cache.clear()
+    assert pose_storage.load_landmark_comparison(video1_path, video2_path, params=params,
+                                                 comparator_version="1.2.0") is None
+
 def test_clear_cache(pose_storage, sample_pose_data):
     """Testa a limpeza do cache."""
     # Adiciona dados ao cache
@@ -224,3 +277,205 @@ def test_clear_cache(pose_storage, sample_pose_data):
     # Limpa o cache
     pose_storage.clear_cache()
     assert len(pose_storage.cache) == 0 
+
+def test_save_pose_stream(pose_storage, sample_landmarks, temp_video_files):
+    """Testa o salvamento incremental de dados de pose."""
+    video_path = temp_video_files["test_video"]
+    frames = ((i, sample_landmarks if i % 2 == 0 else None) for i in range(25))
+
+    assert pose_storage.save_pose_stream(video_path, 30.0, (640, 480), 25, frames, chunk_size=4)
+    assert not list(pose_storage.storage_dir.glob("*.tmp"))
+
+    loaded_data = pose_storage.load_pose_data(video_path)
+    assert loaded_data is not None
+    assert loaded_data.resolution == (640, 480)
+    assert loaded_data.total_frames == 25
+    assert [f.frame_number for f in loaded_data.frames] == list(range(0, 25, 2))
+    assert loaded_data.frames[1].timestamp == pytest.approx(2 / 30.0)
+    assert loaded_data.frames[0].landmarks == sample_landmarks
+
+def test_save_pose_stream_failure(pose_storage, sample_landmarks, temp_video_files):
+    """Testa que uma falha durante o streaming não deixa arquivos parciais."""
+    video_path = temp_video_files["test_video"]
+
+    def failing_frames():
+        yield 0, sample_landmarks
+        raise RuntimeError("falha na extração")
+
+    assert not pose_storage.save_pose_stream(video_path, 30.0, (640, 480), 10, failing_frames())
+    # Sem frames com landmarks o arquivo também não é criado
+    assert not pose_storage.save_pose_stream(video_path, 30.0, (640, 480), 10, [(0, None)])
+    assert not list(pose_storage.storage_dir.iterdir())
+
+def test_save_and_load_npy(storage_dir, sample_pose_data):
+    """Testa o salvamento e carregamento no formato binário."""
+    pose_storage = PoseStorage(storage_dir, storage_format="npy")
+    assert pose_storage.save_pose_data(
+        sample_pose_data.video_path,
+        sample_pose_data.fps,
+        sample_pose_data.resolution,
+        sample_pose_data.total_frames,
+        [f.landmarks for f in sample_pose_data.frames]
+    )
+    assert (storage_dir / "test_hash.landmarks.npy").exists()
+    assert not (storage_dir / "test_hash.json").exists()
+
+    # Lê do disco em uma nova instância (sem cache)
+    pose_storage = PoseStorage(storage_dir, storage_format="npy")
+    track = pose_storage.load_pose_track(sample_pose_data.video_path)
+    assert isinstance(track.data, np.memmap)
+    assert track.data.dtype == np.float32
+    assert track.frame_numbers.tolist() == [0, 1]
+    assert track.total_frames == sample_pose_data.total_frames
+
+    loaded_data = pose_storage.load_pose_data(sample_pose_data.video_path)
+    assert loaded_data.resolution == sample_pose_data.resolution
+    assert len(loaded_data.frames) == len(sample_pose_data.frames)
+    assert loaded_data.frames[0].landmarks[1].x == pytest.approx(0.4)
+
+def test_invalid_storage_format(storage_dir):
+    """Testa a validação do formato de armazenamento."""
+    with pytest.raises(ValueError):
+        PoseStorage(storage_dir, storage_format="xml")
+
+def test_save_pose_stream_npy(storage_dir, sample_landmarks, temp_video_files):
+    """Testa o salvamento incremental no formato binário."""
+    pose_storage = PoseStorage(storage_dir, storage_format="npy")
+    video_path = temp_video_files["test_video"]
+    frames = ((i, sample_landmarks if i % 3 else None) for i in range(10))
+
+    assert pose_storage.save_pose_stream(video_path, 30.0, (640, 480), 10, frames, chunk_size=4)
+    assert sorted(p.name for p in storage_dir.iterdir()) == [
+        "test_hash.frames.npy", "test_hash.landmarks.npy", "test_hash.meta.json"
+    ]
+
+    track = pose_storage.load_pose_track(video_path)
+    assert track.frame_numbers.tolist() == [1, 2, 4, 5, 7, 8]
+    assert track.data[0, 0].tolist() == pytest.approx([0.1, 0.2, 0.3, 0.9])
+    assert np.isnan(track.data[0, 2]).all()
+
+def test_migrate_and_export(storage_dir, sample_pose_data, tmp_path):
+    """Testa a migração de JSON para o formato binário e a exportação para JSON."""
+    pose_storage = PoseStorage(storage_dir)
+    assert pose_storage.save_pose_data(
+        sample_pose_data.video_path,
+        sample_pose_data.fps,
+        sample_pose_data.resolution,
+        sample_pose_data.total_frames,
+        [f.landmarks for f in sample_pose_data.frames]
+    )
+
+    assert storage_main(["--storage-dir", str(storage_dir), "migrate", "--remove-json"]) == 0
+    assert not (storage_dir / "test_hash.json").exists()
+    assert (storage_dir / "test_hash.meta.json").exists()
+
+    export_path = tmp_path / "export.json"
+    assert storage_main(["--storage-dir", str(storage_dir), "export",
+                         sample_pose_data.video_path, "-o", str(export_path)]) == 0
+    with open(export_path) as f:
+        exported = json.load(f)
+    assert exported["video_hash"] == "test_hash"
+    assert len(exported["frames"]) == 2
+
+def test_pose_cache_respects_memory_budget(storage_dir, temp_video_files, sample_landmarks):
+    """Testa que o cache de dados de pose remove os vídeos menos usados recentemente."""
+    writer = PoseStorage(storage_dir)
+    for name in ("video1", "video2"):
+        assert writer.save_pose_data(temp_video_files[name], 30.0, (640, 480), 200,
+                                     [sample_landmarks] * 200)
+    measure = PoseStorage(storage_dir)
+    measure.load_pose_data(temp_video_files["video1"])
+    one_video = measure.cache.stats()["bytes"]
+
+    storage = PoseStorage(storage_dir, cache_max_bytes=int(one_video * 1.5))
+    assert storage.load_pose_data(temp_video_files["video1"]) is not None
+    assert storage.load_pose_data(temp_video_files["video2"]) is not None
+
+    stats = storage.cache.stats()
+    assert stats["entries"] == 1
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= storage.cache.max_bytes
+    assert "test_hash_2" in storage.cache
+
+@pytest.fixture
+def long_landmarks(sample_landmarks):
+    """Fixture com 300 frames (10 s a 30 FPS), sem pose a cada 7 frames."""
+    return [None if i % 7 == 0 else sample_landmarks for i in range(300)]
+
+def test_load_frames_time_range(storage_dir, temp_video_files, long_landmarks):
+    """Testa a leitura de um intervalo de tempo pelo índice de frames do JSON."""
+    video_path = temp_video_files["test_video"]
+    assert PoseStorage(storage_dir).save_pose_data(video_path, 30.0, (640, 480), 300, long_landmarks)
+
+    storage = PoseStorage(storage_dir)
+    frames = storage.load_frames(video_path, 2.0, 3.0)
+    assert (storage_dir / "test_hash.offsets.npz").exists()
+    assert len(storage.cache) == 0
+    expected = [i for i in range(60, 90) if i % 7]
+    assert [frame.frame_number for frame in frames] == expected
+    assert all(2.0 <= frame.timestamp < 3.0 for frame in frames)
+    assert frames[0].landmarks == long_landmarks[expected[0]]
+
+    # O resultado é o mesmo que filtrar os dados completos
+    full = storage.load_pose_data(video_path)
+    assert PoseStorage(storage_dir).load_frames(video_path, 2.0, 3.0) == [
+        frame for frame in full.frames if 2.0 <= frame.timestamp < 3.0
+    ]
+    assert storage.load_frames(video_path, 2.0, 3.0) == frames
+    assert storage.load_frames(video_path, 20.0, 30.0) == []
+    assert storage.load_frames(temp_video_files["video1"], 0.0, 1.0) is None
+
+    info = storage.load_pose_info(video_path)
+    assert info["total_frames"] == 300
+    assert info["num_frames"] == len(full.frames)
+    assert info["resolution"] == (640, 480)
+
+def test_load_frames_index_rebuilt_after_rewrite(storage_dir, temp_video_files, long_landmarks,
+                                                 sample_landmarks):
+    """Testa que o índice é reconstruído quando o arquivo de pose é regravado."""
+    video_path = temp_video_files["test_video"]
+    storage = PoseStorage(storage_dir)
+    assert storage.save_pose_data(video_path, 30.0, (640, 480), 300, long_landmarks)
+    storage.clear_cache()
+    assert len(storage.load_frames(video_path, 0.0, 1.0)) == 25
+
+    assert storage.save_pose_data(video_path, 30.0, (640, 480), 10, [sample_landmarks] * 10)
+    storage.clear_cache()
+    assert [frame.frame_number for frame in storage.load_frames(video_path, 0.0, 1.0)] == list(range(10))
+
+def test_stream_index_offsets_match_file_bytes(storage_dir, temp_video_files, long_landmarks):
+    """Testa que as posições do índice gravado pelo streaming correspondem aos bytes do arquivo."""
+    video_path = temp_video_files["test_video"]
+    assert PoseStorage(storage_dir).save_pose_stream(video_path, 30.0, (640, 480), 300,
+                                                     enumerate(long_landmarks), chunk_size=16)
+    raw = (storage_dir / "test_hash.json").read_bytes()
+    assert b"\r" not in raw
+
+    index = FrameIndex.load(storage_dir / "test_hash.offsets.npz")
+    assert len(index) == sum(landmarks is not None for landmarks in long_landmarks)
+    for frame_number, (start, end) in zip(index.frame_numbers, index.offsets):
+        assert json.loads(raw[start:end])["frame_number"] == frame_number
+    assert index.offsets[-1, 1] < len(raw)
+
+def test_load_frames_from_stream_and_npy(storage_dir, temp_video_files, long_landmarks):
+    """Testa o índice gravado pelo streaming e o intervalo no formato binário."""
+    video_path = temp_video_files["test_video"]
+    storage = PoseStorage(storage_dir)
+    assert storage.save_pose_stream(video_path, 30.0, (640, 480), 300,
+                                    enumerate(long_landmarks), chunk_size=16)
+    assert (storage_dir / "test_hash.offsets.npz").exists()
+    expected = [i for i in range(150, 210) if i % 7]
+    assert [frame.frame_number for frame in storage.load_frames(video_path, 5.0, 7.0)] == expected
+
+    npy_storage = PoseStorage(storage_dir, storage_format="npy")
+    assert npy_storage.migrate_to_npy() == 1
+    frames = npy_storage.load_frames(video_path, 5.0, 7.0)
+    assert [frame.frame_number for frame in frames] == expected
+    assert frames[0].landmarks[1].x == pytest.approx(0.4)
+
+    track = npy_storage.load_track_range(video_path, 5.0, 7.0)
+    assert isinstance(track.data, np.memmap)
+    assert track.frame_numbers.tolist() == expected
+    data = npy_storage.load_pose_data_range(video_path, 5.0, 7.0)
+    assert data.total_frames == 300
+    assert [frame.frame_number for frame in data.frames] == expected
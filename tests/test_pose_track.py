@@ -0,0 +1,87 @@
+import pytest
+import numpy as np
+
+from src.pose_track import PoseTrack, NUM_LANDMARKS
+from src.pose_models import PoseLandmark, PoseFrame, PoseData
+from src import pose_storage
+
+@pytest.fixture
+def frame_landmarks():
+    """Fixture que cria uma lista de landmarks por frame."""
+    return [
+        {0: PoseLandmark(0.1, 0.2, 0.3, 0.9), 1: PoseLandmark(0.4, 0.5, 0.6, 0.8)},
+        None,
+        {0: PoseLandmark(0.5, 0.5, 0.5, 1.0)}
+    ]
+
+def test_from_landmarks(frame_landmarks):
+    """Testa a criação do track a partir da lista de landmarks."""
+    track = PoseTrack.from_landmarks(frame_landmarks, fps=30.0)
+
+    assert track.data.shape == (3, NUM_LANDMARKS, 4)
+    assert track.dtype == np.float32
+    assert track.valid.tolist() == [True, False, True]
+    assert track.frame_numbers.tolist() == [0, 1, 2]
+    assert track.data[0, 1].tolist() == pytest.approx([0.4, 0.5, 0.6, 0.8])
+    # Landmarks ausentes são NaN
+    assert np.isnan(track.data[2, 1]).all()
+    assert np.isnan(track.data[1]).all()
+    assert track.timestamps.tolist() == pytest.approx([0.0, 1 / 30.0, 2 / 30.0])
+
+def test_round_trip_landmarks(frame_landmarks):
+    """Testa a conversão de ida e volta para a lista de landmarks."""
+    track = PoseTrack.from_landmarks(frame_landmarks, dtype=np.float64)
+    assert track.dtype == np.float64
+    assert track.to_landmarks() == frame_landmarks
+
+def test_zero_copy_views(frame_landmarks):
+    """Testa que os acessos por frame, landmark e fatia não copiam dados."""
+    track = PoseTrack.from_landmarks(frame_landmarks)
+
+    assert np.shares_memory(track.frame(0), track.data)
+    assert np.shares_memory(track.landmark(0), track.data)
+    assert np.shares_memory(track.xyz, track.data)
+    assert np.shares_memory(track.visibility, track.data)
+    assert np.shares_memory(track[1:].data, track.data)
+
+    track.landmark(0)[:, 3] = 0.0
+    assert track.data[0, 0, 3] == 0.0
+
+def test_valid_frames_and_dense(frame_landmarks):
+    """Testa a seleção de frames válidos e a expansão para um frame por linha."""
+    track = PoseTrack.from_landmarks(frame_landmarks)
+    sparse = track.valid_frames()
+    assert len(sparse) == 2
+    assert sparse.frame_numbers.tolist() == [0, 2]
+    assert sparse.total_frames == 3
+
+    dense = sparse.to_dense()
+    assert len(dense) == 3
+    assert dense.valid.tolist() == [True, False, True]
+    np.testing.assert_array_equal(dense.data, track.data)
+
+def test_pose_data_adapters(frame_landmarks):
+    """Testa os adaptadores para PoseData de pose_models e pose_storage."""
+    track = PoseTrack.from_landmarks(frame_landmarks, fps=30.0, dtype=np.float64)
+
+    for pose_data_cls, frame_cls in ((PoseData, PoseFrame),
+                                     (pose_storage.PoseData, pose_storage.PoseFrame)):
+        pose_data = track.to_pose_data("video.mp4", "hash", (640, 480),
+                                       pose_data_cls=pose_data_cls, frame_cls=frame_cls,
+                                       created_at="2024-01-01T00:00:00")
+        assert isinstance(pose_data, pose_data_cls)
+        assert all(isinstance(frame, frame_cls) for frame in pose_data.frames)
+        assert [frame.frame_number for frame in pose_data.frames] == [0, 2]
+        assert pose_data.frames[1].timestamp == pytest.approx(2 / 30.0)
+        assert pose_data.total_frames == 3
+
+        loaded = PoseTrack.from_pose_data(pose_data, dtype=np.float64)
+        assert loaded.fps == 30.0
+        assert loaded.to_landmarks() == frame_landmarks
+
+def test_invalid_shape():
+    """Testa a validação do formato do array."""
+    with pytest.raises(ValueError):
+        PoseTrack(np.zeros((2, NUM_LANDMARKS, 3)))
+    with pytest.raises(ValueError):
+        PoseTrack(np.zeros((2, NUM_LANDMARKS, 4)), frame_numbers=[0])
@@ -0,0 +1,105 @@
+import numpy as np
+from src.preview import create_preview_video, draw_pose, inset_region, preview_stride, track_annotator
+from src.pose_models import PoseLandmark
+from src.pose_track import PoseTrack
+
+class RecordingWriter:
+    """Encoder de teste: guarda os frames recebidos."""
+
+    def __init__(self, output_path, size, fps):
+        self.output_path, self.size, self.fps = output_path, size, fps
+        self.frames = []
+        self.closed = False
+
+    def write_frame(self, frame):
+        self.frames.append(frame.copy())
+
+    def close(self):
+        self.closed = True
+
+# Faixa vermelha (BGR) que identifica cada frame dos vídeos de teste
+RED_STRIPE = (0, 0, 255)
+
+def _frame_index(frame_rgb):
+    return int(np.argmax(frame_rgb[..., 0].mean(axis=0))) // 2
+
+def test_preview_stride():
+    """Testa o intervalo de amostragem do preview."""
+    assert preview_stride(100, 150) == 1
+    assert preview_stride(1000, 150) == 6
+    assert preview_stride(0, 150) == 1
+
+def test_create_preview_video_samples_sequentially(tmp_path, write_video):
+    """Testa a amostragem dos frames, a conversão para RGB e a anotação no próprio frame."""
+    video = write_video(tmp_path / "dance.mp4", 100, size=(256, 64), stripe=RED_STRIPE)
+    writers, annotated, progress = [], [], []
+
+    def writer_factory(output_path, size, fps):
+        writers.append(RecordingWriter(output_path, size, fps))
+        return writers[-1]
+
+    def annotate(frame_rgb, frame_idx):
+        annotated.append(frame_idx)
+        frame_rgb[0, 0] = (0, 255, 0)
+
+    output = create_preview_video(video, str(tmp_path / "preview.mp4"), max_frames=10,
+                                  annotate=annotate, progress_callback=progress.append,
+                                  writer_factory=writer_factory)
+    assert output == str(tmp_path / "preview.mp4")
+
+    writer = writers[0]
+    assert writer.closed and writer.size == (256, 64) and writer.fps == 30.0
+    assert annotated == list(range(0, 100, 10))
+    assert [_frame_index(frame) for frame in writer.frames] == annotated
+    assert all(frame[0, 0].tolist() == [0, 255, 0] for frame in writer.frames)
+    assert progress[-1] == 1.0 and len(progress) == 10
+
+    # Vídeo mais curto que o limite: todos os frames
+    writers.clear()
+    create_preview_video(video, str(tmp_path / "all.mp4"), max_frames=150, writer_factory=writer_factory)
+    assert [_frame_index(frame) for frame in writers[0].frames] == list(range(100))
+
+    assert create_preview_video(str(tmp_path / "missing.mp4"), writer_factory=writer_factory) is None
+
+def test_create_preview_video_time_range(tmp_path, write_video):
+    """Testa o preview de um trecho do vídeo (um seek até o início e leitura sequencial)."""
+    video = write_video(tmp_path / "dance.mp4", 100, size=(256, 64), stripe=RED_STRIPE)
+    writers = []
+
+    def writer_factory(output_path, size, fps):
+        writers.append(RecordingWriter(output_path, size, fps))
+        return writers[-1]
+
+    create_preview_video(video, str(tmp_path / "range.mp4"), max_frames=5, writer_factory=writer_factory,
+                         start_time=1.0, end_time=2.0)
+    assert [_frame_index(frame) for frame in writers[0].frames] == [30, 36, 42, 48, 54]
+
+def test_track_annotator_draws_saved_pose():
+    """Testa o desenho do esqueleto salvo do frame correspondente, na imagem ou em um quadro à parte."""
+    pose = {11: PoseLandmark(x=0.25, y=0.25, z=0.0, visibility=0.9),
+            12: PoseLandmark(x=0.75, y=0.25, z=0.0, visibility=0.9),
+            23: PoseLandmark(x=0.5, y=0.75, z=0.0, visibility=0.2)}
+    track = PoseTrack.from_landmarks([None, pose], 30.0)
+
+    frame = np.zeros((100, 200, 3), dtype=np.uint8)
+    draw_pose(frame, track.data[1])
+    assert frame[25, 50].any() and frame[25, 150].any()
+    assert frame[25, 100].tolist() == [255, 255, 255]  # Conexão entre os ombros
+    assert not frame[75, 100].any()  # Landmark pouco visível não é desenhado
+
+    annotate = track_annotator(track)
+    empty = np.zeros((100, 200, 3), dtype=np.uint8)
+    annotate(empty, 0)
+    annotate(empty, 5)
+    assert not empty.any()
+    annotated = np.zeros((100, 200, 3), dtype=np.uint8)
+    annotate(annotated, 1)
+    np.testing.assert_array_equal(annotated, frame)
+
+    # Poses normalizadas pela caixa do corpo ficam em um quadro no canto direito
+    x, y, width, height = inset_region((100, 200, 3))
+    assert x + width <= 200 and y + height <= 100
+    inset = np.full((100, 200, 3), 90, dtype=np.uint8)
+    track_annotator(track, normalized=True)(inset, 1)
+    assert (inset[:, :x] == 90).all()
+    assert inset[y + height // 4, x + width // 2].tolist() == [255, 255, 255]
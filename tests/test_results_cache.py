@@ -2,7 +2,7 @@ import pytest
 import os
 import shutil
 from datetime import datetime, timedelta
-from src.results_cache import ResultsCache
+from src.results_cache import ResultsCache, comparison_key, params_digest
 from src.comparison_results import ComparisonResults
 
 @pytest.fixture
@@ -92,4 +92,47 @@ def test_cache_invalid_data(results_cache):
     )
     
     assert results_cache.set("invalid_key", invalid_results) is False
-    assert results_cache.get("invalid_key") is None 
+    assert results_cache.get("invalid_key") is None
+
+def test_comparison_key_is_stable():
+    """Testa que a chave depende apenas do conteúdo, dos parâmetros e da versão."""
+    params = {"metric": "dtw", "landmark_weights": {"0": 0.5, "1": 1.0}}
+    reordered = {"landmark_weights": {"1": 1.0, "0": 0.5}, "metric": "dtw"}
+
+    key = comparison_key("hash1", "hash2", params, "1.0.0")
+    assert key == comparison_key("hash1", "hash2", reordered, "1.0.0")
+    assert params_digest(params) == params_digest(reordered)
+    assert len(key) == 64
+
+    assert key != comparison_key("hash2", "hash1", params, "1.0.0")
+    assert key != comparison_key("hash1", "hash2", {**params, "metric": "euclidean"}, "1.0.0")
+    assert key != comparison_key("hash1", "hash2", params, "1.1.0")
+
+def test_comparison_cache_hits_and_misses(results_cache, sample_results):
+    """Testa o cache de comparações e as estatísticas de acertos e falhas."""
+    params = {"metric": "dtw"}
+    assert results_cache.get_comparison("hash1", "hash2", params, "1.0.0") is None
+    assert results_cache.set_comparison("hash1", "hash2", sample_results, params, "1.0.0")
+
+    cached = results_cache.get_comparison("hash1", "hash2", params, "1.0.0")
+    assert cached is not None
+    assert cached.global_score == sample_results.global_score
+    assert cached.metadata["params_digest"] == params_digest(params)
+    assert cached.metadata["video1"] == "dance1.mp4"
+
+    # Parâmetros diferentes não reaproveitam o resultado
+    assert results_cache.get_comparison("hash1", "hash2", {"metric": "euclidean"}, "1.0.0") is None
+
+    assert results_cache.stats() == {"hits": 1, "misses": 2, "hit_rate": pytest.approx(1 / 3)}
+
+def test_cache_without_expiration(cache_dir, sample_results):
+    """Testa que entradas não expiram quando max_age_hours é None."""
+    cache = ResultsCache(cache_dir=cache_dir, max_age_hours=None)
+    cache.set("test_key", sample_results)
+
+    old_time = datetime.now() - timedelta(days=365)
+    cache_path = os.path.join(cache_dir, "test_key.json")
+    os.utime(cache_path, (old_time.timestamp(), old_time.timestamp()))
+
+    assert cache.get("test_key") is not None
+
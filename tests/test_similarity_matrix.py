@@ -0,0 +1,109 @@
+import json
+import pytest
+import numpy as np
+from src.comparador_movimento import ComparadorMovimento
+from src.comparison_params import ComparisonParams
+from src.pose_storage import PoseStorage
+from src.pose_track import PoseTrack
+from src.similarity_matrix import compute_similarity_matrix, load_tracks
+
+def _track(n_frames, phase, gaps=()):
+    """Cria um track denso com movimento senoidal e frames sem pose nos índices de gaps."""
+    rng = np.random.default_rng(int(phase * 100))
+    track = PoseTrack.empty(n_frames, fps=30.0, dtype=np.float64)
+    for i in range(n_frames):
+        if i in gaps:
+            continue
+        offset = 0.05 * np.sin(i / 5.0 + phase)
+        track.data[i, :, 0] = 0.3 + 0.01 * np.arange(33) + offset
+        track.data[i, :, 1] = 0.2 + 0.02 * np.arange(33)
+        track.data[i, :, 2] = 0.0
+        track.data[i, :, 3] = rng.uniform(0.3, 1.0, 33)
+        track.valid[i] = True
+    return track
+
+@pytest.fixture
+def corpus():
+    return {
+        "a.mp4": _track(120, 0.0, gaps={3, 50}),
+        "b.mp4": _track(100, 0.2),
+        "c.mp4": _track(90, 2.5, gaps=set(range(10, 20))),
+        "d.mp4": _track(120, 0.0, gaps={3, 50})
+    }
+
+def _expected(comparador, tracks, label1, label2, weights=None):
+    return comparador.compare_tracks(
+        tracks[label1], tracks[label2], (640, 480), (640, 480),
+        video1_landmark_weights=weights, video2_landmark_weights=weights
+    ).global_score
+
+def test_matrix_matches_compare_tracks(corpus):
+    """Testa que cada célula é o score global de compare_tracks."""
+    comparador = ComparadorMovimento()
+    result = compute_similarity_matrix(corpus, comparador, block_size=16)
+
+    assert result.labels == list(corpus)
+    assert result.matrix.shape == (4, 4)
+    assert not result.pruned.any()
+    np.testing.assert_allclose(np.diag(result.matrix), 1.0)
+    np.testing.assert_allclose(result.matrix, result.matrix.T)
+    for i, label1 in enumerate(result.labels):
+        for j, label2 in enumerate(result.labels):
+            if i != j:
+                assert result.matrix[i, j] == pytest.approx(_expected(comparador, corpus, label1, label2))
+
+    # Pesos dos landmarks e execução em várias threads
+    weights = {"0": 2.0, "11": 0.5}
+    weighted = compute_similarity_matrix(corpus, comparador, landmark_weights=weights, workers=3)
+    assert weighted.score("a.mp4", "c.mp4") == pytest.approx(
+        _expected(comparador, corpus, "a.mp4", "c.mp4", weights))
+
+def test_early_cutoff(corpus):
+    """Testa o descarte dos pares abaixo do limiar."""
+    full = compute_similarity_matrix(corpus)
+    threshold = float(np.median(full.matrix[np.triu_indices(4, k=1)]))
+    result = compute_similarity_matrix(corpus, threshold=threshold, block_size=8)
+
+    below = full.matrix < threshold
+    np.testing.assert_array_equal(result.pruned, below)
+    assert np.isnan(result.matrix[below]).all()
+    np.testing.assert_allclose(result.matrix[~below], full.matrix[~below])
+
+    # Duplicatas: a e d são idênticos
+    assert result.pairs_above(0.999) == [("a.mp4", "d.mp4", pytest.approx(1.0))]
+
+    data = json.loads(json.dumps(result.to_dict()))
+    assert data["labels"] == list(corpus)
+    assert data["threshold"] == threshold
+    assert None in data["matrix"][0]
+
+    with pytest.raises(ValueError):
+        compute_similarity_matrix(corpus, threshold=1.5)
+
+def test_dtw_matrix(corpus):
+    """Testa que com DTW cada par ordenado usa o alinhamento do comparador."""
+    comparador = ComparadorMovimento(comparison_params=ComparisonParams(metric="dtw"))
+    subset = {label: corpus[label] for label in ["a.mp4", "c.mp4"]}
+    result = compute_similarity_matrix(subset, comparador)
+    assert result.metadata["metric"] == "dtw"
+    assert result.score("a.mp4", "c.mp4") == pytest.approx(_expected(comparador, subset, "a.mp4", "c.mp4"))
+    assert result.score("c.mp4", "a.mp4") == pytest.approx(_expected(comparador, subset, "c.mp4", "a.mp4"))
+
+def test_load_tracks_from_storage(tmp_path, corpus):
+    """Testa o carregamento dos tracks armazenados."""
+    storage = PoseStorage(str(tmp_path / "pose"))
+    paths = []
+    for name in ["a.mp4", "c.mp4"]:
+        path = tmp_path / name
+        path.write_bytes(name.encode() * 10)
+        landmarks = corpus[name].to_landmarks()
+        assert storage.save_pose_data(str(path), 30.0, (640, 480), len(landmarks), landmarks)
+        paths.append(str(path))
+
+    tracks = load_tracks(storage, paths + [str(tmp_path / "missing.mp4")])
+    assert list(tracks) == paths
+    assert len(tracks[paths[1]]) == 90
+
+    result = compute_similarity_matrix(tracks)
+    assert result.matrix[0, 1] == pytest.approx(
+        compute_similarity_matrix({"a": corpus["a.mp4"], "c": corpus["c.mp4"]}).matrix[0, 1], abs=1e-6)
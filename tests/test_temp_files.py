@@ -0,0 +1,47 @@
+import os
+from src.temp_files import TempFileRegistry
+
+class FakeClock:
+    """Relógio de teste controlado manualmente."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_registry_removes_released_and_idle_files():
+    """Testa a remoção dos arquivos liberados e dos sem uso, exceto os ainda em uso."""
+    clock = FakeClock()
+    registry = TempFileRegistry(max_idle_seconds=60, clock=clock)
+    replaced, current, busy = (registry.create(b"video", suffix=".mp4") for _ in range(3))
+    assert all(os.path.exists(path) for path in (replaced, current, busy))
+    assert replaced.endswith(".mp4") and len(registry) == 3
+
+    registry.release(replaced)
+    registry.release(busy)
+    assert not registry.touch(replaced)
+    assert registry.sweep(in_use=lambda path: path == busy) == 1
+    assert not os.path.exists(replaced) and os.path.exists(busy)
+
+    # O arquivo em uso é removido quando a extração termina
+    assert registry.sweep() == 1
+    assert not os.path.exists(busy)
+
+    # Arquivos usados recentemente são mantidos; os sem uso são removidos
+    clock.now += 50
+    assert registry.touch(current)
+    clock.now += 50
+    assert registry.sweep() == 0 and os.path.exists(current)
+    clock.now += 61
+    assert registry.sweep() == 1
+    assert not os.path.exists(current) and not registry.touch(current)
+
+def test_registry_cleanup_removes_all_files():
+    """Testa a remoção de todos os arquivos ao encerrar, inclusive os já apagados."""
+    registry = TempFileRegistry()
+    paths = [registry.create(b"a"), registry.create(b"b")]
+    os.unlink(paths[0])
+    assert not registry.touch(paths[0])
+    assert registry.cleanup() == 1
+    assert len(registry) == 0 and not os.path.exists(paths[1])
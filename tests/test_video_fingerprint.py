@@ -0,0 +1,123 @@
+import hashlib
+import os
+import pytest
+from unittest.mock import patch
+
+from src import video_fingerprint
+from src.video_fingerprint import (VideoFingerprinter, FingerprintIndex, hash_file,
+                                   sampled_fingerprint)
+from src.pose_storage import PoseStorage, FINGERPRINT_INDEX_NAME
+
+@pytest.fixture
+def video_file(tmp_path):
+    """Fixture que cria um arquivo de vídeo fictício."""
+    path = tmp_path / "dance.mp4"
+    path.write_bytes(os.urandom(300_000))
+    return str(path)
+
+def test_hash_file_matches_sha256(video_file):
+    """Testa que o hash com buffer grande é o SHA-256 do arquivo."""
+    with open(video_file, "rb") as f:
+        expected = hashlib.sha256(f.read()).hexdigest()
+    assert hash_file(video_file) == expected
+    assert hash_file(video_file, buffer_size=4096) == expected
+
+def test_sampled_fingerprint(video_file):
+    """Testa o fingerprint amostrado."""
+    # Arquivos pequenos são lidos por inteiro
+    assert sampled_fingerprint(video_file, block_size=65536, num_blocks=8) == hash_file(video_file)
+
+    sampled = sampled_fingerprint(video_file, block_size=1024, num_blocks=4)
+    assert sampled != hash_file(video_file)
+    assert sampled == sampled_fingerprint(video_file, block_size=1024, num_blocks=4)
+
+    # Mudanças no início ou no fim alteram o fingerprint
+    with open(video_file, "r+b") as f:
+        f.seek(-10, os.SEEK_END)
+        f.write(b"\x00" * 10)
+    assert sampled_fingerprint(video_file, block_size=1024, num_blocks=4) != sampled
+
+def test_fingerprinter_uses_index(video_file, tmp_path):
+    """Testa que arquivos não modificados são resolvidos pelo índice sem releitura."""
+    index_path = tmp_path / "index.json"
+    fingerprinter = VideoFingerprinter(index_path)
+    first = fingerprinter.fingerprint(video_file)
+    assert first == hash_file(video_file)
+
+    with patch.object(video_fingerprint, "hash_file", side_effect=AssertionError("releitura")):
+        assert fingerprinter.fingerprint(video_file) == first
+        # O índice persiste entre instâncias
+        assert VideoFingerprinter(index_path).fingerprint(video_file) == first
+    assert fingerprinter.stats() == {"hits": 1, "misses": 1}
+
+    # Alterar o arquivo invalida a entrada
+    with open(video_file, "ab") as f:
+        f.write(b"extra")
+    assert fingerprinter.fingerprint(video_file) == hash_file(video_file) != first
+    assert fingerprinter.stats()["misses"] == 2
+
+def test_index_modes_are_separate(video_file):
+    """Testa que os modos full e sampled têm entradas separadas no índice."""
+    index = FingerprintIndex()
+    stat = os.stat(video_file)
+    index.set(video_file, stat, "full", "abc")
+    assert index.get(video_file, stat, "full") == "abc"
+    assert index.get(video_file, stat, "sampled") is None
+
+def test_index_prunes_missing_files_and_caps_size(tmp_path):
+    """Testa que o índice descarta arquivos removidos e respeita o número máximo de entradas."""
+    index_path = tmp_path / "index.json"
+    paths = []
+    for i in range(4):
+        path = tmp_path / f"upload{i}.mp4"
+        path.write_bytes(os.urandom(1000))
+        paths.append(str(path))
+
+    index = FingerprintIndex(index_path, max_entries=2)
+    index.set(paths[0], os.stat(paths[0]), "full", "h0")
+    os.remove(paths[0])
+    index.set(paths[1], os.stat(paths[1]), "full", "h1")
+    assert len(index) == 1
+    for i in (2, 3):
+        index.set(paths[i], os.stat(paths[i]), "full", f"h{i}")
+
+    reloaded = FingerprintIndex(index_path)
+    assert len(reloaded) == 2
+    assert reloaded.get(paths[1], os.stat(paths[1]), "full") is None
+    assert reloaded.get(paths[3], os.stat(paths[3]), "full") == "h3"
+    with pytest.raises(ValueError):
+        FingerprintIndex(max_entries=0)
+
+def test_index_instances_share_file(tmp_path):
+    """Testa que instâncias sobre o mesmo arquivo veem e preservam as entradas umas das outras."""
+    index_path = tmp_path / "index.json"
+    paths = []
+    for i in range(2):
+        path = tmp_path / f"video{i}.mp4"
+        path.write_bytes(os.urandom(1000))
+        paths.append(str(path))
+
+    first, second = FingerprintIndex(index_path), FingerprintIndex(index_path)
+    assert len(first) == 0 and len(second) == 0
+    first.set(paths[0], os.stat(paths[0]), "full", "h0")
+    # A segunda instância já tinha carregado o índice (vazio) e grava o próprio registro
+    second.set(paths[1], os.stat(paths[1]), "full", "h1")
+
+    assert first.get(paths[1], os.stat(paths[1]), "full") == "h1"
+    assert second.get(paths[0], os.stat(paths[0]), "full") == "h0"
+    assert len(FingerprintIndex(index_path)) == 2
+
+def test_invalid_mode():
+    """Testa a validação do modo de fingerprint."""
+    with pytest.raises(ValueError):
+        VideoFingerprinter(mode="invalid")
+
+def test_pose_storage_fingerprint(video_file, tmp_path):
+    """Testa que o PoseStorage usa o índice de fingerprints."""
+    storage = PoseStorage(tmp_path / "pose")
+    assert storage._generate_video_hash(video_file) == hash_file(video_file)
+    assert (tmp_path / "pose" / FINGERPRINT_INDEX_NAME).exists()
+    assert storage._generate_video_hash(video_file) == hash_file(video_file)
+    assert storage.fingerprinter.stats() == {"hits": 1, "misses": 1}
+    # O índice não é confundido com dados de pose na migração
+    assert storage.migrate_to_npy() == 0